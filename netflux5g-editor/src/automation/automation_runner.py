@@ -11,6 +11,10 @@ from manager.controller import ControllerManager
 from utils.debug import debug_print, error_print, warning_print
 from prerequisites.checker import PrerequisitesChecker
 from utils.docker_utils import DockerUtils
+from utils.log_archive import index_run_logs
+from utils.capture_metrics import analyze_run_captures
+from utils.procedure_tracer import export_run_latencies
+from utils.topology_io import create_export_dir, copy_5g_configs, MININET_SCRIPT_NAME
 
 class AutomationRunner(QObject):
     """Handler for running automated deployment of Mininet scripts."""
@@ -50,29 +54,11 @@ class AutomationRunner(QObject):
     
     def _create_working_directory(self):
         """Create a working directory for the deployment."""
-        from datetime import datetime
-        
-        # Create a timestamped directory in the mininet folder with proper numbering
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Get the base directory (where the main script is located)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-        # Create mininet directory if it doesn't exist
-        mininet_dir = os.path.join(base_dir, "export","mininet")
-        os.makedirs(mininet_dir, exist_ok=True)
-        
-        # Create timestamped export directory
-        export_dir = os.path.join(mininet_dir, f"netflux5g_export_{timestamp}")
-        os.makedirs(export_dir, exist_ok=True)
-        
-        debug_print(f"Created working directory: {export_dir}")
-        return export_dir
+        return create_export_dir()
     
     def _generate_mininet_script(self):
         """Generate Mininet script."""
-        script_name = "netflux5g_topology.py"
-        self.mininet_script_path = os.path.join(self.export_dir, script_name)
+        self.mininet_script_path = os.path.join(self.export_dir, MININET_SCRIPT_NAME)
         self.mininet_exporter.export_to_mininet_script(self.mininet_script_path)
         
         # Verify the script was created
@@ -111,163 +97,11 @@ class AutomationRunner(QObject):
     
     def _copy_5g_configs(self):
         """Copy 5G configuration files from VGCore components to export directory."""
-        import shutil
-        import os
-        
-        # Get nodes to check for VGCore components
         nodes, _ = self.main_window.extractTopology()
-        core5g_components = [n for n in nodes if n['type'] == 'VGcore']
-        
-        if not core5g_components:
-            debug_print("DEBUG: No VGCore components found, skipping config copy")
-            return
-        
-        # Create 5g-configs directory
-        configs_dir = os.path.join(self.export_dir, "5g-configs")
-        os.makedirs(configs_dir, exist_ok=True)
-        debug_print(f"DEBUG: Created 5g-configs directory: {configs_dir}")
-        
-        missing_configs = []
-        copied_configs = []
-        
-        for component in core5g_components:
-            component_name = component.get('name', 'Unknown')
-            properties = component.get('properties', {})
-            debug_print(f"DEBUG: Processing VGCore component '{component_name}' with {len(properties)} properties")
-            
-            # Debug component properties structure
-            self._debug_component_properties(component)
-            
-            # Check for 5G component configurations using the correct key format
-            component_types = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
-            
-            for comp_type in component_types:
-                # Use the correct key format: {comp_type}_configs
-                config_key = f'{comp_type}_configs'
-                
-                if config_key in properties:
-                    config_data = properties[config_key]
-                    debug_print(f"DEBUG: Found {config_key} with {len(config_data) if isinstance(config_data, list) else 'non-list'} items")
-                    
-                    if isinstance(config_data, list):
-                        for i, config_item in enumerate(config_data):
-                            if not isinstance(config_item, dict):
-                                continue
-                                
-                            # Get the configuration name
-                            config_name = config_item.get('name', f"{comp_type.lower()}{i + 1}")
-                            
-                            # Try to get the config file path from multiple possible sources
-                            config_file_path = None
-                            config_content = None
-                            
-                            # Method 1: Direct file path stored in config_file_path
-                            if 'config_file_path' in config_item and config_item['config_file_path']:
-                                config_file_path = config_item['config_file_path']
-                                debug_print(f"DEBUG: Found config_file_path: {config_file_path}")
-                            
-                            # Method 2: Path stored in config_path column
-                            elif 'config_path' in config_item and config_item['config_path']:
-                                config_file_path = config_item['config_path']
-                                debug_print(f"DEBUG: Found config_path: {config_file_path}")
-                            
-                            # Method 3: Check if config content is embedded
-                            if 'config_content' in config_item and config_item['config_content']:
-                                config_content = config_item['config_content']
-                                debug_print(f"DEBUG: Found embedded config content for {config_name}")
-                            
-                            # Process the configuration
-                            if config_file_path and os.path.isfile(config_file_path):
-                                # Copy the actual file with simplified naming
-                                try:
-                                    # Use simplified naming: {comp_type.lower()}.yaml or {comp_type.lower()}_{index}.yaml
-                                    if i == 0:  # First instance gets simple name
-                                        dest_filename = f"{comp_type.lower()}.yaml"
-                                    else:  # Additional instances get numbered
-                                        dest_filename = f"{comp_type.lower()}_{i+1}.yaml"
-                                    
-                                    dest_path = os.path.join(configs_dir, dest_filename)
-                                    shutil.copy2(config_file_path, dest_path)
-                                    copied_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'source': config_file_path,
-                                        'destination': dest_path,
-                                        'filename': dest_filename
-                                    })
-                                    debug_print(f"DEBUG: Copied {config_file_path} to {dest_path}")
-                                except Exception as e:
-                                    error_msg = f"Failed to copy {config_file_path}: {str(e)}"
-                                    debug_print(f"DEBUG: {error_msg}")
-                                    missing_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'path': config_file_path,
-                                        'error': error_msg
-                                    })
-                            
-                            elif config_content:
-                                # Save embedded content to file with simplified naming
-                                try:
-                                    # Use simplified naming: {comp_type.lower()}.yaml or {comp_type.lower()}_{index}.yaml
-                                    if i == 0:  # First instance gets simple name
-                                        dest_filename = f"{comp_type.lower()}.yaml"
-                                    else:  # Additional instances get numbered
-                                        dest_filename = f"{comp_type.lower()}_{i+1}.yaml"
-                                    
-                                    dest_path = os.path.join(configs_dir, dest_filename)
-                                    
-                                    # Save the content to file
-                                    if isinstance(config_content, str):
-                                        with open(dest_path, 'w', encoding='utf-8') as f:
-                                            f.write(config_content)
-                                    else:
-                                        # Assume it's structured data that needs YAML formatting
-                                        import yaml
-                                        with open(dest_path, 'w', encoding='utf-8') as f:
-                                            yaml.dump(config_content, f, default_flow_style=False)
-                                    
-                                    copied_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'source': 'embedded_content',
-                                        'destination': dest_path,
-                                        'filename': dest_filename
-                                    })
-                                    debug_print(f"DEBUG: Saved embedded config content to {dest_path}")
-                                except Exception as e:
-                                    error_msg = f"Failed to save embedded config for {config_name}: {str(e)}"
-                                    debug_print(f"DEBUG: {error_msg}")
-                                    missing_configs.append({
-                                        'component': comp_type,
-                                        'name': config_name,
-                                        'path': 'embedded_content',
-                                        'error': error_msg
-                                    })
-                            
-                            else:
-                                # No configuration found
-                                missing_configs.append({
-                                    'component': comp_type,
-                                    'name': config_name,
-                                    'path': 'not_specified',
-                                    'error': 'No configuration file path or content specified'
-                                })
-                                debug_print(f"DEBUG: No config found for {comp_type} component '{config_name}'")
-                else:
-                    debug_print(f"DEBUG: Key {config_key} not found in properties")
-        
-        # Report results
-        if copied_configs:
-            debug_print(f"DEBUG: Successfully copied {len(copied_configs)} configuration files:")
-            for config in copied_configs:
-                debug_print(f"  - {config['component']} '{config['name']}': {config['source']} -> {config['filename']}")
-        
-        if missing_configs:
-            debug_print(f"DEBUG: {len(missing_configs)} configuration files could not be copied:")
-            for config in missing_configs:
-                debug_print(f"  - {config['component']} '{config['name']}': {config['error']}")
-        
+        for component in nodes:
+            if component['type'] == 'VGcore':
+                self._debug_component_properties(component)
+        copied_configs, missing_configs = copy_5g_configs(nodes, self.export_dir)
         return len(copied_configs), len(missing_configs)
 
     def _start_mininet(self):
@@ -364,6 +198,10 @@ read
                 "No network components found to export and run."
             )
             return
+        
+        # Check the topology before deploying it
+        if hasattr(self.main_window, 'validation_manager') and not self.main_window.validation_manager.confirmExport():
+            return
             
         # Show progress dialog
         self.progress_dialog = QProgressDialog(
@@ -508,4 +346,28 @@ read
             # Close progress dialog on main thread using signal
             self.close_progress_dialog.emit()
             debug_print("Topology cleanup completed")
-            self.execution_finished.emit(True, "Topology cleanup completed")
\ No newline at end of file
+            self.execution_finished.emit(True, "Topology cleanup completed")
+            self._start_post_run_analysis(self.export_dir)
+
+    def _start_post_run_analysis(self, export_dir):
+        """Process the artifacts of a finished run in the background."""
+        if not export_dir or not os.path.isdir(export_dir):
+            return
+        analysis_thread = threading.Thread(target=self._run_post_run_analysis, args=(export_dir,))
+        analysis_thread.daemon = True
+        analysis_thread.start()
+
+    def _run_post_run_analysis(self, export_dir):
+        """Index the logs, compute capture KPIs and trace procedure latencies of a finished run."""
+        try:
+            added = index_run_logs(export_dir)
+            debug_print(f"Archived {added} log lines from {os.path.basename(export_dir)}")
+        except Exception as e:
+            warning_print(f"WARNING: Post-run log indexing failed: {e}")
+        try:
+            rows = analyze_run_captures(export_dir)
+            debug_print(f"Computed {len(rows)} capture KPIs for {os.path.basename(export_dir)}")
+        except Exception as e:
+            warning_print(f"WARNING: Post-run capture analysis failed: {e}")
+        # Runs after the capture analysis so wire-level NGAP latencies are included
+        export_run_latencies(export_dir)
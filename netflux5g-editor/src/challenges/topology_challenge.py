@@ -70,6 +70,11 @@ class ChallengeProgressTracker(QThread):
         self.deployed_components = {}
         self.objective_status = {}
         
+        # Topology-derived results, valid while the snapshot version is unchanged
+        self._topology_version = None
+        self._topology_components = []
+        self._config_progress = {}  # (objective id, component name) -> config progress
+        
         # Initialize objective status
         for obj in self.challenge.objectives:
             self.objective_status[obj.id] = {
@@ -180,26 +185,36 @@ class ChallengeProgressTracker(QThread):
         return progress_data
     
     def _get_topology_components(self) -> List[Dict[str, Any]]:
-        """Get all components from the current topology."""
-        components = []
+        """Get all components from the latest published topology snapshot.
         
+        This runs off the GUI thread, so it never touches the graphics items;
+        it reads the immutable snapshot the GUI thread publishes after each change.
+        """
         try:
             if (hasattr(self.main_window, 'canvas_view') and 
                 hasattr(self.main_window.canvas_view, 'scene')):
                 
-                from gui.components import NetworkComponent
-                for item in self.main_window.canvas_view.scene.items():
-                    if isinstance(item, NetworkComponent):
-                        components.append({
-                            'name': item.display_name,
-                            'type': item.component_type,
-                            'properties': item.getProperties(),
-                            'component': item
-                        })
+                model = getattr(self.main_window.canvas_view.scene, 'topology_model', None)
+                if model is None:
+                    return []
+                snapshot = model.snapshot
+                if snapshot.version == self._topology_version:
+                    return self._topology_components
+                
+                self._topology_components = [{
+                    'name': record.name,
+                    'type': record.type,
+                    'number': record.number,
+                    'properties': record.properties,
+                } for record in snapshot.components]
+                self._topology_version = snapshot.version
+                self._config_progress.clear()
+                debug_print(f"Challenge tracker: topology snapshot v{snapshot.version}, "
+                            f"{len(snapshot.components)} components")
         except Exception as e:
             error_print(f"Failed to get topology components: {e}")
         
-        return components
+        return self._topology_components
     
     def _check_component_objective(self, component: Dict[str, Any], objective: ChallengeObjective) -> float:
         """Check progress for a specific component against an objective."""
@@ -208,7 +223,12 @@ class ChallengeProgressTracker(QThread):
         try:
             # Check configuration requirements
             if objective.config_requirements:
-                config_progress = self._check_config_requirements(component, objective.config_requirements)
+                # Configuration only changes with the topology snapshot
+                key = (objective.id, component['name'])
+                config_progress = self._config_progress.get(key)
+                if config_progress is None:
+                    config_progress = self._check_config_requirements(component, objective.config_requirements)
+                    self._config_progress[key] = config_progress
                 progress += config_progress * 0.6  # 60% for config
             else:
                 progress += 60.0  # If no config requirements, give full config score
@@ -311,10 +331,11 @@ class ChallengeProgressTracker(QThread):
     def _get_component_container_name(self, component: Dict[str, Any]) -> Optional[str]:
         """Get the container name for a component."""
         try:
-            # Use the same logic as NetworkComponent._getContainerName()
-            comp_obj = component.get('component')
-            if comp_obj and hasattr(comp_obj, '_getContainerName'):
-                return comp_obj._getContainerName()
+            # Use the same logic as NetworkComponent._getContainerName(), on data only
+            if 'number' in component:
+                from gui.components import NetworkComponent
+                return NetworkComponent.containerNameFor(component['name'], component['type'],
+                                                         component['number'], self.deployed_components)
             
             # Fallback logic
             name = component['name'].lower().replace(' ', '').replace('#', '')
@@ -12,15 +12,19 @@ configured in the NetFlux5G UI. It supports:
 
 The generated scripts follow mininet-wifi best practices and are compatible with
 the mininet-wifi examples structure.
+
+Generating a script does not need Qt: PyQt5 is only imported by the
+interactive export_to_mininet() and its save prompt, so the headless command
+line (netflux5g.py) can use the exporter with a stand-in main window.
 """
 
 import os
 import re
+import time
 import traceback
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
-from PyQt5.QtCore import QDateTime
 from utils.configmap import ConfigurationMapper
 from utils.debug import debug_print, error_print, warning_print
+from utils.topology_validator import sanitize_name
 
 class MininetExporter:
     """Handler for exporting network topology to Mininet scripts with Level 2 features."""
@@ -51,10 +55,16 @@ class MininetExporter:
             skip_save_check (bool): If True, skip the unsaved changes check.
                                    Useful for automated exports.
         """
+        from PyQt5.QtWidgets import QFileDialog
+        
         # Check for unsaved changes or unsaved file (unless skipped)
         if not skip_save_check and not self._check_save_status():
             return  # User cancelled or chose not to proceed
         
+        # Check the topology itself (utils/topology_validator.py)
+        if hasattr(self.main_window, 'validation_manager') and not self.main_window.validation_manager.confirmExport():
+            return
+        
         filename, _ = QFileDialog.getSaveFileName(
             self.main_window, 
             "Export to Mininet Script", 
@@ -168,7 +178,7 @@ class MininetExporter:
         f.write('"""\n')
         f.write('NetFlux5G - Mininet-WiFi Topology\n')
         f.write('Generated by NetFlux5G Editor\n')
-        f.write(f'Generated on: {QDateTime.currentDateTime().toString()}\n')
+        f.write(f'Generated on: {time.ctime()}\n')
         
         # Add Docker network information
         network_name = "netflux5g"
@@ -232,6 +242,7 @@ class MininetExporter:
         f.write('import threading\n')
         f.write('import subprocess\n')
         f.write('import signal\n')
+        f.write('import shlex\n')
         
         # Always include argparse since we always have capture functionality
         if capture_always_enabled:
@@ -443,6 +454,7 @@ class MininetExporter:
         f.write('TRAFFIC_CONFIG = {\n')
         f.write('    "duration": 60,\n')
         f.write('    "capture_duration": 75,\n')
+        f.write('    "capture_filter": "",\n')
         f.write('    "bandwidth": "2000M",\n')
         f.write('    "max_bandwidth": "5000M",\n')
         f.write('    "streams": 2,\n')
@@ -468,6 +480,12 @@ class MininetExporter:
         f.write('    info("*** Starting packet captures on all nodes\\n")\n')
         f.write('    capture_duration = TRAFFIC_CONFIG["capture_duration"]\n')
         f.write('    \n')
+        f.write('    # Optional BPF capture filter keeps uninteresting traffic out of the capture files\n')
+        f.write('    capture_filter = ""\n')
+        f.write('    if TRAFFIC_CONFIG["capture_filter"]:\n')
+        f.write('        capture_filter = f" -f {shlex.quote(TRAFFIC_CONFIG[\'capture_filter\'])}"\n')
+        f.write('        info(f"*** Capture filter: {TRAFFIC_CONFIG[\'capture_filter\']}\\n")\n')
+        f.write('    \n')
         f.write('    # Get all nodes from the network\n')
         f.write('    all_nodes = []\n')
         f.write('    all_nodes.extend(net.hosts)\n')
@@ -487,11 +505,11 @@ class MininetExporter:
         f.write('        if is_docker_node:\n')
         f.write('            # Docker node - start tshark inside container, save to mounted /captures volume\n')
         f.write('            container_capture_path = f"/captures/{node_name}.pcapng"\n')
-        f.write('            cmd_str = f"setsid nohup tshark -i any -w {container_capture_path} -F pcapng -a duration:{capture_duration} 2>&1 | tee -a /logging/{node_name}_capture.log &"\n')
+        f.write('            cmd_str = f"setsid nohup tshark -i any -w {container_capture_path} -F pcapng -a duration:{capture_duration}{capture_filter} 2>&1 | tee -a /logging/{node_name}_capture.log &"\n')
         f.write('            node.cmd(cmd_str)\n')
         f.write('        elif hasattr(node, \'cmd\'):\n')
         f.write('            # Regular mininet node - start tshark directly\n')
-        f.write('            cmd_str = f"setsid nohup tshark -i any -w {capture_file} -F pcapng -a duration:{capture_duration} 2>&1 > /dev/null &"\n')
+        f.write('            cmd_str = f"setsid nohup tshark -i any -w {capture_file} -F pcapng -a duration:{capture_duration}{capture_filter} 2>&1 > /dev/null &"\n')
         f.write('            node.cmd(cmd_str)\n')
         f.write('    \n')
         f.write('    info("*** All packet captures started\\n")\n')
@@ -1742,6 +1760,7 @@ class MininetExporter:
                                 has_config = (
                                     (config_file_path and config_file_path.strip()) or 
                                     row_data.get('config_content') or
+                                    row_data.get('config_ref') or
                                     row_data.get('imported', False)
                                 )
 
@@ -1755,6 +1774,7 @@ class MininetExporter:
                                         'config_file': config_file,
                                         'config_file_path': config_file_path,
                                         'config_content': row_data.get('config_content', {}),
+                                        'config_ref': row_data.get('config_ref'),
                                         'imported': row_data.get('imported', False),
                                         'component_type': comp_type,
                                         'row_data': row_data
@@ -2058,6 +2078,8 @@ class MininetExporter:
             f.write('                        help="Traffic generation duration in seconds")\n')
         f.write('    parser.add_argument("--capture-duration", type=int, default=75,\n')
         f.write('                        help="Packet capture duration in seconds")\n')
+        f.write('    parser.add_argument("--capture-filter", default="",\n')
+        f.write('                        help="BPF capture filter applied by tshark (e.g., \'sctp or udp port 8805\')")\n')
         if traffic_enabled:
             f.write('    parser.add_argument("--bandwidth", default="2000M",\n')
             f.write('                        help="Traffic bandwidth (e.g., 100M, 1G)")\n')
@@ -2081,6 +2103,8 @@ class MininetExporter:
         
         f.write('    if hasattr(args, "capture_duration"):\n')
         f.write('        TRAFFIC_CONFIG["capture_duration"] = args.capture_duration\n')
+        f.write('    if getattr(args, "capture_filter", ""):\n')
+        f.write('        TRAFFIC_CONFIG["capture_filter"] = args.capture_filter\n')
         f.write('    \n')
         f.write('    # Show configuration\n')
         f.write('    print("=== NetFlux5G Configuration ===")\n')
@@ -2101,12 +2125,8 @@ class MininetExporter:
 
     def sanitize_variable_name(self, name):
         """Convert display name to valid Python variable name."""
-        # Remove special characters and spaces
-        clean_name = re.sub(r'[^a-zA-Z0-9_]', '_', str(name))
-        # Ensure it starts with a letter or underscore
-        if clean_name and clean_name[0].isdigit():
-            clean_name = '_' + clean_name
-        return clean_name or 'node'
+        # Shared with the validator, which reports names that collide once sanitized
+        return sanitize_name(name)
     
     def _check_save_status(self):
         """Check if topology should be saved before export and prompt user if needed.
@@ -2114,6 +2134,8 @@ class MininetExporter:
         Returns:
             bool: True if export should continue, False if user cancelled
         """
+        from PyQt5.QtWidgets import QMessageBox
+        
         debug_print("Checking save status before export...")
         
         # Check if there are unsaved changes or no file is saved
@@ -0,0 +1,290 @@
+"""
+Canvas Benchmarks for NetFlux5G Editor
+
+Small, self-contained rendering benchmarks for the canvas items. They run
+offscreen against a private QGraphicsScene, so they need a QApplication but
+no main window. Run them with:
+
+    python3 main.py --benchmark link_paint
+    python3 main.py --benchmark drag_latency
+    python3 main.py --benchmark topology_load
+    python3 main.py --benchmark undo_properties
+
+Each benchmark prints its results and returns them as a dict, or None if
+the canvas did not behave as expected.
+"""
+
+import os
+import json
+import math
+import time
+import tempfile
+from types import SimpleNamespace
+from PyQt5.QtWidgets import QApplication, QGraphicsScene, QStyleOptionGraphicsItem
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QImage, QPainter, QColor
+from utils.debug import error_print
+
+# Frame budget for a smooth 60 fps drag
+FRAME_BUDGET_MS = 1000.0 / 60
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark function under name."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def run_benchmark(name):
+    """Run a registered benchmark. Returns its results or None if it is unknown."""
+    func = BENCHMARKS.get(name)
+    if func is None:
+        error_print(f"Unknown benchmark '{name}'. Available: {', '.join(sorted(BENCHMARKS))}")
+        return None
+    return func()
+
+
+def _build_star(scene, link_count, hub_type="Switch", hub_icon="switch.png"):
+    """Place a hub component linked to link_count peers on a circle around it."""
+    from gui.components import NetworkComponent
+    from gui.links import NetworkLink
+    from gui.pixmap_cache import ICON_DIR
+
+    host_icon = os.path.join(ICON_DIR, "host.png")
+    hub = NetworkComponent(hub_type, os.path.join(ICON_DIR, hub_icon))
+    scene.addItem(hub)
+    hub.setPos(0, 0)
+    links = []
+    for i in range(link_count):
+        angle = 2 * math.pi * i / link_count
+        peer = NetworkComponent("Host", host_icon)
+        scene.addItem(peer)
+        peer.setPos(400 * math.cos(angle), 400 * math.sin(angle))
+        link = NetworkLink(hub, peer)
+        scene.addItem(link)
+        links.append(link)
+    return hub, links
+
+
+@benchmark("link_paint")
+def link_paint(link_count=50, frames=200):
+    """Measure NetworkLink.paint per link and full frames while dragging a hub with link_count links."""
+    scene = QGraphicsScene()
+    scene.setSceneRect(QRectF(-600, -600, 1200, 1200))
+    hub, links = _build_star(scene, link_count)
+
+    image = QImage(1200, 1200, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor("white"))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.translate(600, 600)
+    option = QStyleOptionGraphicsItem()
+
+    # Paint only: geometry is already cached
+    start = time.perf_counter()
+    for _ in range(frames):
+        for link in links:
+            link.paint(painter, option, None)
+    paint_us = (time.perf_counter() - start) * 1e6 / (frames * link_count)
+
+    # Drag: move the hub (geometry update of every link) and render the scene
+    start = time.perf_counter()
+    for frame in range(frames):
+        hub.setPos(20 * math.cos(frame / 10), 20 * math.sin(frame / 10))
+        scene.render(painter, QRectF(-600, -600, 1200, 1200), scene.sceneRect())
+    frame_ms = (time.perf_counter() - start) * 1000 / frames
+    painter.end()
+
+    results = {
+        'links': link_count,
+        'frames': frames,
+        'paint_us_per_link': paint_us,
+        'drag_frame_ms': frame_ms,
+        'fps': 1000.0 / frame_ms if frame_ms else float('inf'),
+    }
+    print(f"link_paint: {link_count} links, {frames} frames")
+    print(f"  paint:      {paint_us:.1f} us per link")
+    print(f"  drag frame: {frame_ms:.2f} ms ({results['fps']:.0f} fps, budget {FRAME_BUDGET_MS:.1f} ms)")
+    return results
+
+
+@benchmark("drag_latency")
+def drag_latency(radio_count=40, link_count=20, steps=200):
+    """Measure per-step latency and repainted area while dragging a gNB among radio_count other radios."""
+    from gui.components import NetworkComponent
+    from gui.pixmap_cache import ICON_DIR
+
+    scene = QGraphicsScene()
+    scene.setSceneRect(QRectF(-2500, -2500, 5000, 5000))
+    hub, _links = _build_star(scene, link_count, "GNB", "gNB.png")
+    for i in range(radio_count):
+        radio = NetworkComponent("AP", os.path.join(ICON_DIR, "AP.png"))
+        scene.addItem(radio)
+        radio.setPos(-2000 + (i % 8) * 500, -2000 + (i // 8) * 500)
+
+    damaged = []
+    scene.changed.connect(lambda rects: damaged.append(rects))
+    image = QImage(1000, 1000, QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    QApplication.processEvents()
+    damaged.clear()
+
+    latencies = []
+    areas = []
+    for step in range(steps):
+        start = time.perf_counter()
+        hub.setPos(30 * math.cos(step / 10), 30 * math.sin(step / 10))
+        # Deliver the pending scene update and repaint only the damaged region
+        QApplication.processEvents()
+        region = QRectF()
+        for rects in damaged:
+            for rect in rects:
+                region = region.united(rect)
+        damaged.clear()
+        if not region.isEmpty():
+            scene.render(painter, QRectF(image.rect()), region)
+        latencies.append((time.perf_counter() - start) * 1000)
+        areas.append(region.width() * region.height())
+    painter.end()
+
+    latencies.sort()
+    scene_area = scene.sceneRect().width() * scene.sceneRect().height()
+    results = {
+        'steps': steps,
+        'latency_ms_p50': latencies[len(latencies) // 2],
+        'latency_ms_p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        'damaged_fraction': (sum(areas) / len(areas)) / scene_area if areas else 0.0,
+    }
+    print(f"drag_latency: gNB with {link_count} links among {radio_count} radios, {steps} steps")
+    print(f"  latency: p50 {results['latency_ms_p50']:.2f} ms, p95 {results['latency_ms_p95']:.2f} ms "
+          f"(budget {FRAME_BUDGET_MS:.1f} ms)")
+    print(f"  repainted area per step: {results['damaged_fraction'] * 100:.1f}% of the scene")
+    return results
+
+
+def _synthetic_topology(node_count):
+    """Return .nf5g data for node_count components: switches in a chain, each with hosts and an AP."""
+    nodes = []
+    links = []
+    per_switch = 10
+    for i in range(node_count):
+        group, slot = divmod(i, per_switch)
+        if slot == 0:
+            name, node_type = f"Switch #{group + 1}", "Switch"
+        elif slot == 1:
+            name, node_type = f"AP #{group + 1}", "AP"
+        else:
+            name, node_type = f"Host #{group * per_switch + slot}", "Host"
+        nodes.append({
+            'name': name, 'type': node_type,
+            'x': (group % 40) * 600 + slot * 50, 'y': (group // 40) * 400 + (slot % 2) * 150,
+            'properties': {'name': name, 'type': node_type},
+        })
+        switch = f"Switch #{group + 1}"
+        if slot == 0 and group > 0:
+            links.append({'source': f"Switch #{group}", 'destination': switch, 'type': 'ethernet', 'properties': {}})
+        elif slot > 0:
+            links.append({'source': switch, 'destination': name, 'type': 'ethernet', 'properties': {}})
+    return {'version': '1.1', 'type': 'NetFlux5G_Topology', 'metadata': {},
+            'nodes': nodes, 'links': links, 'canvas_properties': {}}
+
+
+@benchmark("topology_load")
+def topology_load(sizes=(1000, 5000)):
+    """Measure parsing and bulk item creation of synthetic topologies with the given node counts."""
+    from gui.canvas import Canvas
+    from gui.pixmap_cache import ICON_DIR
+    from manager.file import FileManager
+
+    main_window = SimpleNamespace(component_icon_map={
+        "Host": os.path.join(ICON_DIR, "host.png"),
+        "AP": os.path.join(ICON_DIR, "AP.png"),
+        "Switch": os.path.join(ICON_DIR, "switch.png"),
+    })
+    main_window.canvas_view = Canvas(main_window)
+    main_window.canvas_view.resize(1200, 800)
+    main_window.canvas_view.show()
+    file_manager = FileManager(main_window)
+
+    results = {}
+    for node_count in sizes:
+        data = _synthetic_topology(node_count)
+        with tempfile.NamedTemporaryFile('w', suffix='.nf5g', delete=False) as f:
+            json.dump(data, f)
+            path = f.name
+        try:
+            main_window.canvas_view.clearScene()
+            QApplication.processEvents()
+
+            start = time.perf_counter()
+            topology_data = file_manager.parseTopologyFile(path)
+            parse_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            file_manager.buildTopology(topology_data)
+            build_s = time.perf_counter() - start
+
+            # First repaint of the loaded scene
+            start = time.perf_counter()
+            main_window.canvas_view.viewport().repaint()
+            paint_s = time.perf_counter() - start
+        finally:
+            os.unlink(path)
+
+        results[node_count] = {
+            'links': len(data['links']),
+            'parse_s': parse_s,
+            'build_s': build_s,
+            'first_paint_s': paint_s,
+        }
+        print(f"topology_load: {node_count} nodes, {len(data['links'])} links")
+        print(f"  parse (worker thread): {parse_s * 1000:.0f} ms")
+        print(f"  build items (bulk):    {build_s * 1000:.0f} ms ({build_s * 1e6 / node_count:.0f} us per node)")
+        print(f"  first repaint:         {paint_s * 1000:.0f} ms")
+
+    main_window.canvas_view.clearScene()
+    return results
+
+
+@benchmark("undo_properties")
+def undo_properties(node_count=200):
+    """Measure undo and redo of one property edit of node_count components, and check that
+    undoing it restores the properties exactly (keys the edit added are removed)."""
+    from gui.undo_stack import UndoStack
+
+    scene = QGraphicsScene()
+    hub, links = _build_star(scene, node_count - 1)
+    components = [hub] + [link.dest_node for link in links]
+    before = [json.dumps(component.properties, sort_keys=True) for component in components]
+    stack = UndoStack.forScene(scene)
+
+    stack.beginGroup("Edit properties")
+    for i, component in enumerate(components):
+        component.setProperties({'benchmark_prop': i})
+    stack.endGroup()
+
+    start = time.perf_counter()
+    stack.undo()
+    undo_s = time.perf_counter() - start
+    # Fails if an added key comes back as the MISSING sentinel (not JSON serializable)
+    after_undo = [json.dumps(component.properties, sort_keys=True) for component in components]
+
+    start = time.perf_counter()
+    stack.redo()
+    redo_s = time.perf_counter() - start
+    redone = all(component.properties.get('benchmark_prop') == i for i, component in enumerate(components))
+
+    results = {'components': node_count, 'undo_ms': undo_s * 1000, 'redo_ms': redo_s * 1000}
+    print(f"undo_properties: one edit of {node_count} components")
+    print(f"  undo: {results['undo_ms']:.1f} ms, redo: {results['redo_ms']:.1f} ms")
+    if after_undo != before:
+        error_print("undo_properties: undo did not restore the original properties")
+        return None
+    if not redone:
+        error_print("undo_properties: redo did not re-apply the edit")
+        return None
+    return results
@@ -1,11 +1,19 @@
 import os
+import math
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QLabel, QGraphicsSceneContextMenuEvent, QMenu, QGraphicsItem
 from PyQt5.QtCore import Qt, QPoint, QRectF, QTimer
-from PyQt5.QtGui import QPen, QCursor
-from .widgets.Dialog import *
+from PyQt5.QtGui import QPen, QCursor, QBrush, QPixmap, QPainter, QTransform
 from .components import NetworkComponent
+from .topology_model import TopologyModel
+from .undo_stack import UndoStack
 from utils.debug import debug_print, error_print, warning_print
 
+GRID_SIZE = 35
+# Grid tiles are rendered per quarter power of two of the zoom level
+GRID_ZOOM_BUCKETS_PER_OCTAVE = 4
+# Below this on-screen spacing (px) the grid is not drawn
+GRID_MIN_SPACING_PX = 4
+
 class Canvas(QGraphicsView):
     def __init__(self, app_instance, parent=None):
         super().__init__(parent)
@@ -21,8 +29,10 @@ class Canvas(QGraphicsView):
         self.setAcceptDrops(True)
 
         self.show_grid = False
+        self._grid_brushes = {}  # zoom bucket -> tiled grid QBrush
         self.zoom_level = 1.0
         self.link_mode = False
+        self.bulk_loading = False  # Set between beginBulkLoad() and endBulkLoad()
         
         self.is_panning = False
         self.pan_start_point = QPoint()
@@ -81,6 +91,34 @@ class Canvas(QGraphicsView):
         self.resetTransform()
         self.zoom_level = 1.0
 
+    def clearScene(self):
+        """Remove all items from the scene, including the coverage layer."""
+        self.scene.clear()
+        # Items are deleted without scene-change notifications, so reset the registries.
+        # The coverage layer was deleted with the items; radios recreate it when added
+        TopologyModel.forScene(self.scene).reset()
+        UndoStack.forScene(self.scene).clear()
+        self.scene.coverage_overlay = None
+
+    def beginBulkLoad(self):
+        """Suspend indexing, repaints and scene signals while many items are added."""
+        self.bulk_loading = True
+        UndoStack.forScene(self.scene).suspend()
+        self.setUpdatesEnabled(False)
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.scene.blockSignals(True)
+
+    def endBulkLoad(self):
+        """Rebuild the item index and repaint once after beginBulkLoad()."""
+        self.scene.blockSignals(False)
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setUpdatesEnabled(True)
+        self.bulk_loading = False
+        # A loaded topology starts a new history
+        UndoStack.forScene(self.scene).resume()
+        UndoStack.forScene(self.scene).clear()
+        self.viewport().update()
+
     def setShowGrid(self, show):
         self.show_grid = show
         self.viewport().update()
@@ -88,20 +126,34 @@ class Canvas(QGraphicsView):
     def drawBackground(self, painter, rect):
         super().drawBackground(painter, rect)
         if self.show_grid:
+            scale = painter.worldTransform().m11()
+            if scale * GRID_SIZE < GRID_MIN_SPACING_PX:
+                return
+            # One fill with a tiled brush instead of a drawLine per grid line
+            painter.fillRect(rect, self._gridBrush(scale))
+
+    def _gridBrush(self, scale):
+        """Return the cached grid brush for a zoom level, one tile per grid cell."""
+        bucket = round(math.log2(scale) * GRID_ZOOM_BUCKETS_PER_OCTAVE)
+        brush = self._grid_brushes.get(bucket)
+        if brush is None:
+            # Render the tile at screen resolution so lines stay one pixel wide
+            tile_size = max(1, int(round(GRID_SIZE * 2 ** (bucket / GRID_ZOOM_BUCKETS_PER_OCTAVE))))
+            tile = QPixmap(tile_size, tile_size)
+            tile.fill(Qt.transparent)
+            tile_painter = QPainter(tile)
             pen = QPen(Qt.lightGray)
             pen.setWidth(0)
-            painter.setPen(pen)
-
-            grid_size = 35
-            left = int(rect.left()) - (int(rect.left()) % grid_size)
-            top = int(rect.top()) - (int(rect.top()) % grid_size)
-            right = int(rect.right())
-            bottom = int(rect.bottom())
+            tile_painter.setPen(pen)
+            tile_painter.drawLine(0, 0, tile_size, 0)
+            tile_painter.drawLine(0, 0, 0, tile_size)
+            tile_painter.end()
 
-            for x in range(left, right, grid_size):
-                painter.drawLine(int(x), int(rect.top()), int(x), int(rect.bottom()))
-            for y in range(top, bottom, grid_size):
-                painter.drawLine(int(rect.left()), int(y), int(rect.right()), int(y))
+            # Map the tile back to GRID_SIZE scene units; lines fall on multiples of GRID_SIZE
+            brush = QBrush(tile)
+            brush.setTransform(QTransform.fromScale(GRID_SIZE / tile_size, GRID_SIZE / tile_size))
+            self._grid_brushes[bucket] = brush
+        return brush
 
     def wheelEvent(self, event):
         modifiers = event.modifiers()
@@ -293,17 +345,15 @@ class Canvas(QGraphicsView):
     def cleanupBrokenLinks(self):
         """Remove any links that reference deleted components."""
         try:
-            from .links import NetworkLink
-            
             items_to_remove = []
+            model = TopologyModel.forScene(self.scene)
             
-            for item in self.scene.items():
-                if isinstance(item, NetworkLink):
-                    # Check if either the source or destination node still exists in the scene
-                    if (not item.source_node or item.source_node not in self.scene.items() or
-                        not item.dest_node or item.dest_node not in self.scene.items()):
-                        items_to_remove.append(item)
-                        debug_print(f"DEBUG: Found broken link to remove: {item}")
+            for item in model.links():
+                # Check if either the source or destination node still exists in the scene
+                if (not item.source_node or not model.containsComponent(item.source_node) or
+                    not item.dest_node or not model.containsComponent(item.dest_node)):
+                    items_to_remove.append(item)
+                    debug_print(f"DEBUG: Found broken link to remove: {item}")
             
             # Remove broken links
             for link in items_to_remove:
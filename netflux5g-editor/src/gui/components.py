@@ -1,11 +1,13 @@
 from PyQt5.QtWidgets import QGraphicsPixmapItem, QGraphicsItem, QMenu, QGraphicsSceneContextMenuEvent, QInputDialog
 from PyQt5.QtCore import Qt, QRectF, QPointF
-from PyQt5.QtGui import QPixmap, QPen, QColor
-from .widgets.Dialog import *
-from .widgets.LogViewer import LogViewerDialog
-from .widgets.PacketCaptureViewer import PacketCaptureViewerDialog
+from PyQt5.QtGui import QPen, QFont, QFontMetricsF, QStaticText, QTransform
 from utils.debug import debug_print, error_print, warning_print
 from utils.power_range_calculator import PowerRangeCalculator
+from .pixmap_cache import icon_pixmap
+from .lod import level_of_detail, glyph_color, LOD_FULL, LOD_GLYPH
+from .coverage_layer import CoverageOverlayItem, RADIO_TYPES
+from .topology_model import TopologyModel
+from .undo_stack import UndoStack
 import subprocess
 import os
 
@@ -13,16 +15,17 @@ import os
 class NetworkComponent(QGraphicsPixmapItem):
     """Network component (node) that can be placed on the canvas"""
 
-    # Map component types to their respective dialog classes
+    # Map component types to their dialog classes in widgets/Dialog.py, which is
+    # imported when the first properties dialog is opened
     PROPERTIES_MAP = {
-        "Host": HostPropertiesWindow,
-        "STA": STAPropertiesWindow,
-        "UE": UEPropertiesWindow,
-        "GNB": GNBPropertiesWindow,
-        "DockerHost": DockerHostPropertiesWindow,
-        "AP": APPropertiesWindow,
-        "VGcore": Component5GPropertiesWindow,
-        "Controller": ControllerPropertiesWindow,
+        "Host": "HostPropertiesWindow",
+        "STA": "STAPropertiesWindow",
+        "UE": "UEPropertiesWindow",
+        "GNB": "GNBPropertiesWindow",
+        "DockerHost": "DockerHostPropertiesWindow",
+        "AP": "APPropertiesWindow",
+        "VGcore": "Component5GPropertiesWindow",
+        "Controller": "ControllerPropertiesWindow",
     }
 
     # Track the count of each component type
@@ -53,6 +56,10 @@ class NetworkComponent(QGraphicsPixmapItem):
         
         # Set the display name (e.g., "Host #1")
         self.display_name = f"{component_type} #{self.component_number}"
+        self._label_cache = None  # (display name, QStaticText, font, top offset)
+        self._move_pending = False  # Moved during a drag, reported on release
+        self._revision = 0  # Bumped on every change; lets topology snapshots reuse unchanged records
+        self._deferred_properties = None  # Loader of heavy properties not read yet (binary topologies)
     
         # Initialize properties dictionary to store configuration
         self.properties = {
@@ -87,8 +94,7 @@ class NetworkComponent(QGraphicsPixmapItem):
                 if os.path.exists(multi_ue_icon):
                     actual_icon_path = multi_ue_icon
         
-        pixmap = QPixmap(actual_icon_path).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.setPixmap(pixmap)
+        self.setPixmap(icon_pixmap(actual_icon_path, 80))
         # Store the actual icon path being used
         self.icon_path = actual_icon_path
     
@@ -120,13 +126,22 @@ class NetworkComponent(QGraphicsPixmapItem):
         self.properties["x"] = current_pos.x()
         self.properties["y"] = current_pos.y()
 
+    def markChanged(self):
+        """Record a change of this component for the next topology snapshot."""
+        self._revision += 1
+        if self.scene():
+            TopologyModel.forScene(self.scene()).scheduleSnapshot()
+
     def setProperties(self, properties_dict):
         """Update the component's properties dictionary"""
+        if self.scene():
+            UndoStack.forScene(self.scene()).noteProperties(self, properties_dict)
         self.properties.update(properties_dict)
+        self.markChanged()
         
         # Update the component's name if it exists in properties
         if "name" in properties_dict:
-            self.display_name = properties_dict["name"]
+            self.setDisplayName(properties_dict["name"])
         
         # Update position if provided in properties
         if "x" in properties_dict and "y" in properties_dict:
@@ -155,105 +170,103 @@ class NetworkComponent(QGraphicsPixmapItem):
             new_icon_path = os.path.join(icon_base_path, "ue.png")
             
         if os.path.exists(new_icon_path) and new_icon_path != self.icon_path:
-            pixmap = QPixmap(new_icon_path).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.setPixmap(pixmap)
+            self.setPixmap(icon_pixmap(new_icon_path, 80))
             self.icon_path = new_icon_path
             
-            # Force scene update
-            if hasattr(self, 'scene') and self.scene():
-                self.scene().update()
+            # Repaint only this item
+            self.update()
                 
             debug_print(f"DEBUG: Updated UE icon to {'multiue.png' if num_ue > 1 else 'ue.png'} for {num_ue} UEs")
 
+    def setDisplayName(self, name):
+        """Rename the component; the label width is part of the bounding rect."""
+        if name != self.display_name:
+            self.prepareGeometryChange()
+            old_name = self.display_name
+            self.display_name = name
+            self._revision += 1
+            if self.scene():
+                TopologyModel.forScene(self.scene()).renameComponent(self, old_name)
+            self.update()
+
     def getProperties(self):
         """Get the current properties including updated position."""
+        self.ensurePropertiesLoaded()
         self.updatePositionProperties()  # Ensure position is current
         return self.properties.copy()
 
+    def deferProperties(self, loader):
+        """Merge the properties returned by loader() when they are first needed."""
+        self._deferred_properties = loader
+
+    def ensurePropertiesLoaded(self):
+        """Load deferred properties; values set in the meantime take precedence."""
+        loader = self._deferred_properties
+        if loader is None:
+            return
+        self._deferred_properties = None
+        for key, value in loader().items():
+            self.properties.setdefault(key, value)
+        self.markChanged()
+        debug_print(f"DEBUG: Loaded deferred properties of {self.display_name}")
+
     def boundingRect(self):
         """Define the bounding rectangle for the component including text."""
-        if self.component_type in ["AP", "GNB"]:
-            radius = self.coverage_radius
-            # Icon is now 80x80, text below, add extra padding
-            return QRectF(-radius, -radius, radius * 2 + 80, radius * 2 + 80 + 30)
-        else:
-            # For all other components (including DockerHost and Controller)
-            # Use consistent dimensions: icon + text + extra padding
-            return QRectF(-10, -10, 100, 120)  # Icon 80x80 + text + margins
+        # Icon 80x80 + text + margins; coverage circles live in the coverage layer
+        rect = QRectF(-10, -10, 100, 120)
+        # Long names are wider than the icon
+        return rect.united(self._labelRect().adjusted(-2, -2, 2, 2))
+    
+    def _labelRect(self):
+        """Return the white background rectangle of the name label."""
+        text_size = self._labelText()[0].size()
+        return QRectF(
+            (80 - text_size.width()) / 2 - 4,  # x position with padding
+            85,  # y position (below icon)
+            text_size.width() + 8,  # width with padding
+            text_size.height() + 8  # height with padding
+        )
+    
+    def _labelText(self):
+        """Return the cached QStaticText layout of the display name and its top offset."""
+        if self._label_cache is None or self._label_cache[0] != self.display_name:
+            font = QFont()
+            font.setPointSize(12)  # Larger font size
+            font.setBold(True)
+            static_text = QStaticText(self.display_name)
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.prepare(QTransform(), font)
+            metrics = QFontMetricsF(font)
+            self._label_cache = (self.display_name, static_text, font, metrics.height() - metrics.ascent())
+        return self._label_cache[1:]
     
     def paint(self, painter, option, widget):
-        """Draw the component."""
+        """Draw the component, with less detail when zoomed out."""
+        # Coverage circles of APs and gNBs are drawn by the scene's coverage layer
+        lod = level_of_detail(painter, option)
         painter.save()
-        # Draw coverage circle for wireless components first (so it's behind the icon)
-        if self.component_type in ["AP", "GNB"]:
-            # Get current range to determine color intensity
-            range_meters = self.getCurrentRange()
-            
-            # Color-code based on range (coverage area)
-            # Larger range = more intense/warmer color
-            if range_meters <= 50:
-                # Short range: Blue-green
-                color = QColor(0, 150, 100, 40)
-                border_color = QColor(0, 100, 70, 120)
-            elif range_meters <= 100:
-                # Medium range: Blue
-                color = QColor(0, 128, 255, 50)
-                border_color = QColor(0, 100, 200, 140)
-            elif range_meters <= 200:
-                # Long range: Orange
-                color = QColor(255, 150, 0, 60)
-                border_color = QColor(200, 120, 0, 160)
-            else:
-                # Very long range: Red
-                color = QColor(255, 50, 50, 70)
-                border_color = QColor(200, 30, 30, 180)
-            
-            # Set up the fill and border for the coverage area
-            painter.setBrush(color)
-            painter.setPen(QPen(border_color, 2, Qt.DashLine))
-            
-            # Draw the coverage circle using QRectF to handle float values
-            circle_rect = QRectF(
-                40 - self.coverage_radius,  # x (centered for 80x80 icon)
-                40 - self.coverage_radius,  # y
-                self.coverage_radius * 2,
-                self.coverage_radius * 2
-            )
-            painter.drawEllipse(circle_rect)
-        painter.restore()
-        painter.save()
-        # Draw the component icon (now 80x80)
-        if not self.pixmap().isNull():
+        
+        if lod < LOD_GLYPH:
+            # Far zoomed out: a colored glyph is cheaper than the scaled icon
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(glyph_color(self.component_type))
+            painter.drawRect(QRectF(8, 8, 64, 64))
+        elif not self.pixmap().isNull():
+            # Draw the component icon (now 80x80)
             painter.drawPixmap(0, 0, 80, 80, self.pixmap())
     
         # Draw the component name below the icon with larger font
-        painter.setPen(Qt.black)
-        font = painter.font()
-        font.setPointSize(12)  # Larger font size
-        font.setBold(True)
-        painter.setFont(font)
-        
-        # Calculate text metrics
-        text_width = painter.fontMetrics().width(self.display_name)
-        text_height = painter.fontMetrics().height()
-        
-        # Clear the text area with white background to prevent traces
-        text_rect = QRectF(
-            (80 - text_width) / 2 - 4,  # x position with padding
-            85,  # y position (below icon)
-            text_width + 8,  # width with padding
-            text_height + 8  # height with padding
-        )
-        
-        # Fill text background with white to clear any traces
-        painter.fillRect(text_rect, Qt.white)
-        
-        # Draw the text
-        painter.drawText(
-            int((80 - text_width) / 2),  # Center horizontally (ensure integer)
-            85 + text_height,  # Position below the icon
-            self.display_name
-        )
+        if lod >= LOD_FULL:
+            static_text, font, top_offset = self._labelText()
+            text_size = static_text.size()
+            
+            # Clear the text area with white background
+            painter.fillRect(self._labelRect(), Qt.white)
+            
+            # Draw the text centered below the icon
+            painter.setPen(Qt.black)
+            painter.setFont(font)
+            painter.drawStaticText(QPointF(int((80 - text_size.width()) / 2), 85 + top_offset), static_text)
     
         # Restore painter state
         painter.restore()
@@ -286,43 +299,55 @@ class NetworkComponent(QGraphicsPixmapItem):
     def itemChange(self, change, value):
         """Handle position changes and update connected links."""
         if change == QGraphicsItem.ItemPositionChange and self.scene():
+            UndoStack.forScene(self.scene()).noteMove(self, self.pos())
             # Update position properties when position changes
             if hasattr(value, 'x') and hasattr(value, 'y'):
                 self.properties["x"] = value.x()
                 self.properties["y"] = value.y()
-            
-            # If we have connected links, update them
-            if hasattr(self, 'connected_links'):
-                for link in self.connected_links:
-                    link.updatePosition()
+        
+        # Keep the scene's topology model, coverage layer and undo history in sync
+        if change == QGraphicsItem.ItemSceneChange and self.scene():
+            TopologyModel.forScene(self.scene()).removeComponent(self)
+            UndoStack.forScene(self.scene()).noteRemoved(self)
+            self._invalidateCoverage()
+        if change == QGraphicsItem.ItemSceneHasChanged and self.scene():
+            TopologyModel.forScene(self.scene()).addComponent(self)
+            UndoStack.forScene(self.scene()).noteAdded(self)
+            self._invalidateCoverage()
         
         # For position changes, update the coverage area for AP/GNB components
         if change == QGraphicsItem.ItemPositionHasChanged and self.scene():
             # Final position update after the move is complete
             self.updatePositionProperties()
+            self._invalidateCoverage()
+            self.markChanged()
             
-            # Mark topology as modified when component is moved
-            if self.main_window and hasattr(self.main_window, 'onTopologyChanged'):
-                self.main_window.onTopologyChanged()
-            
-            # Force a comprehensive scene update to clear any traces
-            if self.scene():
-                # Update a larger area around the component to ensure text traces are cleared
-                expanded_rect = self.sceneBoundingRect().adjusted(-20, -20, 20, 20)
-                self.scene().update(expanded_rect)
-            
-            # Force a complete repaint for this item
-            self.update()
+            # Links cache their geometry, so recompute it once the new position is set
+            if hasattr(self, 'connected_links'):
+                for link in self.connected_links:
+                    link.updatePosition()
             
-            if self.component_type in ["AP", "GNB"]:
-                # Additional update for coverage circles
-                self.scene().update()
+            # The scene repaints the old and new bounding rects of this item and,
+            # through updatePosition(), of its links; no wider update is needed.
+            # Mark topology as modified once the move (or drag) is complete.
+            grabber = self.scene().mouseGrabberItem()
+            if isinstance(grabber, NetworkComponent):
+                grabber._move_pending = True
+            else:
+                self._notifyTopologyChanged()
         
-        if change == QGraphicsItem.ItemPositionHasChanged:
-            pos = value
-            debug_print(f"Component '{self.display_name}' moved to position: x={pos.x()}, y={pos.y()}")
         return super().itemChange(change, value)
 
+    def _invalidateCoverage(self):
+        """Schedule a rebuild of the scene's coverage layer if this is a radio."""
+        if self.component_type in RADIO_TYPES and self.scene():
+            CoverageOverlayItem.forScene(self.scene()).invalidate()
+
+    def _notifyTopologyChanged(self):
+        """Tell the main window that the topology was modified."""
+        if self.main_window and hasattr(self.main_window, 'onTopologyChanged'):
+            self.main_window.onTopologyChanged()
+
     def contextMenuEvent(self, event: QGraphicsSceneContextMenuEvent):
         """Handle right-click context menu events."""
         # Always reset dragging state and offset on context menu
@@ -434,14 +459,13 @@ class NetworkComponent(QGraphicsPixmapItem):
         # Only paste if types match
         props = NetworkComponent.copied_properties
         if props and props.get('type') == self.component_type:
-            # Don't overwrite name/number/position
-            for k, v in props.items():
-                if k not in ["x", "y", "name", "type"]:
-                    self.properties[k] = v
+            # Don't overwrite name/number/position; setProperties() records the edit for undo
+            self.setProperties({k: v for k, v in props.items() if k not in ["x", "y", "name", "type"]})
             # Optionally, update dialog if open
             if hasattr(self, 'dialog') and self.dialog is not None:
                 self.dialog.loadProperties()
             # Optionally, visually indicate update
+            self.updateCoverageRadius()
             self.update()
             # Show status and debug
             scene = self.scene()
@@ -532,11 +556,12 @@ class NetworkComponent(QGraphicsPixmapItem):
 
     def openPropertiesDialog(self):
         """Open the properties dialog for the component."""
-        dialog_class = self.PROPERTIES_MAP.get(self.component_type)
-        if dialog_class:
-            # Pass the component reference to the dialog
-            dialog = dialog_class(label_text=self.display_name, parent=self.scene().views()[0], component=self)
-            dialog.show()
+        class_name = self.PROPERTIES_MAP.get(self.component_type)
+        if class_name:
+            from .widgets import Dialog
+            dialog_class = getattr(Dialog, class_name)
+            # Pass the component reference to the dialog (a closed one is reused)
+            Dialog.open_properties_window(dialog_class, self.display_name, parent=self.scene().views()[0], component=self)
             # After dialog closes, always reset dragging state and offset
             self.dragging = False
             self._drag_start_pos = None
@@ -573,6 +598,13 @@ class NetworkComponent(QGraphicsPixmapItem):
         self.dragging = False
         self._drag_start_pos = None
         super().mouseReleaseEvent(event)
+        # Moves during the drag (of this and any co-selected items) are reported once
+        if self.scene():
+            UndoStack.forScene(self.scene()).flush()
+        if self._move_pending:
+            self._move_pending = False
+            debug_print(f"Component '{self.display_name}' moved to position: x={self.pos().x()}, y={self.pos().y()}")
+            self._notifyTopologyChanged()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Delete:
@@ -628,15 +660,11 @@ class NetworkComponent(QGraphicsPixmapItem):
                 return 30.0
 
     def updateCoverageRadius(self):
-        """Update the coverage radius and trigger a repaint."""
+        """Update the coverage radius and rebuild the coverage layer."""
         if self.component_type in ["AP", "GNB"]:
-            old_radius = self.coverage_radius
             self.coverage_radius = self.calculateCoverageRadius()
-            
-            # Only update scene if radius changed significantly
-            if abs(old_radius - self.coverage_radius) > 5.0:
-                self.prepareGeometryChange()
-                self.update()
+            # Range also selects the coverage color, so always rebuild
+            self._invalidateCoverage()
 
     def getCurrentRange(self):
         """Get the current range setting for this component (in meters) calculated from power.
@@ -683,17 +711,26 @@ class NetworkComponent(QGraphicsPixmapItem):
 
     def _getAvailableContainers(self):
         """Get available containers for this component from the deployed topology."""
+        return NetworkComponent.findContainers(self.display_name, self.component_type, self.component_number)
+
+    @staticmethod
+    def findContainers(display_name, component_type, component_number, deployed_components=None):
+        """Get the deployed containers of a component given only its data.
+
+        Does not touch any graphics item, so it is safe to call from worker threads.
+        """
         from .widgets.LogViewer import DeployedComponentsExtractor
         
         # Get all deployed components from the Mininet script
-        deployed_components = DeployedComponentsExtractor.extractDeployedComponents()
+        if deployed_components is None:
+            deployed_components = DeployedComponentsExtractor.extractDeployedComponents()
         
         if not deployed_components:
             debug_print("No deployed components found")
             return []
         
         # For VGCore components, find all 5G core components
-        if self.component_type == "VGcore":
+        if component_type == "VGcore":
             core_types = ['AMF', 'SMF', 'UPF', 'NRF', 'UDR', 'UDM', 'AUSF', 'PCF', 'NSSF', 'BSF', 'SCP']
             available_containers = []
             
@@ -708,7 +745,7 @@ class NetworkComponent(QGraphicsPixmapItem):
         else:
             # Get the sanitized name (same as mininet export)
             import re
-            sanitized_base = re.sub(r'[^a-zA-Z0-9_]', '_', self.display_name.lower())
+            sanitized_base = re.sub(r'[^a-zA-Z0-9_]', '_', display_name.lower())
             if sanitized_base and sanitized_base[0].isdigit():
                 sanitized_base = '_' + sanitized_base
             
@@ -719,32 +756,38 @@ class NetworkComponent(QGraphicsPixmapItem):
                 container_lower = container_name.lower()
                 
                 # Check if this container matches our component
-                if self.component_type == "UE" and info['type'] == 'UE':
-                    if sanitized_base in container_lower or f"ue__{self.component_number}" in container_lower:
+                if component_type == "UE" and info['type'] == 'UE':
+                    if sanitized_base in container_lower or f"ue__{component_number}" in container_lower:
                         matching_containers.append(info['container_name'])
-                elif self.component_type == "GNB" and info['type'] == 'GNB':
-                    if sanitized_base in container_lower or f"gnb__{self.component_number}" in container_lower:
+                elif component_type == "GNB" and info['type'] == 'GNB':
+                    if sanitized_base in container_lower or f"gnb__{component_number}" in container_lower:
                         matching_containers.append(info['container_name'])
-                elif self.component_type == "Host" and "host" in container_lower:
-                    if sanitized_base in container_lower or f"host{self.component_number}" in container_lower:
+                elif component_type == "Host" and "host" in container_lower:
+                    if sanitized_base in container_lower or f"host{component_number}" in container_lower:
                         matching_containers.append(info['container_name'])
-                elif self.component_type == "STA" and "sta" in container_lower:
-                    if sanitized_base in container_lower or f"sta{self.component_number}" in container_lower:
+                elif component_type == "STA" and "sta" in container_lower:
+                    if sanitized_base in container_lower or f"sta{component_number}" in container_lower:
                         matching_containers.append(info['container_name'])
-                elif self.component_type == "AP" and "ap" in container_lower:
-                    if sanitized_base in container_lower or f"ap{self.component_number}" in container_lower:
+                elif component_type == "AP" and "ap" in container_lower:
+                    if sanitized_base in container_lower or f"ap{component_number}" in container_lower:
                         matching_containers.append(info['container_name'])
             
-            debug_print(f"Found {len(matching_containers)} containers for {self.component_type} {self.display_name}")
+            debug_print(f"Found {len(matching_containers)} containers for {component_type} {display_name}")
             return matching_containers
 
     def _getContainerName(self):
         """Get the container name for this component based on the running topology."""
-        available_containers = self._getAvailableContainers()
+        return NetworkComponent.containerNameFor(self.display_name, self.component_type, self.component_number)
+
+    @staticmethod
+    def containerNameFor(display_name, component_type, component_number, deployed_components=None):
+        """Get the container name of a component given only its data (thread-safe)."""
+        available_containers = NetworkComponent.findContainers(
+            display_name, component_type, component_number, deployed_components)
         
         if not available_containers:
             # Fallback to old logic
-            sanitized_name = self.display_name.lower().replace(' ', '').replace('#', '')
+            sanitized_name = display_name.lower().replace(' ', '').replace('#', '')
             return f"mn.{sanitized_name}"
         
         # Return the first available container
@@ -832,6 +875,7 @@ class NetworkComponent(QGraphicsPixmapItem):
         
         # Open the log viewer dialog
         try:
+            from .widgets.LogViewer import LogViewerDialog
             log_viewer = LogViewerDialog(
                 component_name=self.display_name,
                 component_type=self.component_type,
@@ -917,6 +961,7 @@ class NetworkComponent(QGraphicsPixmapItem):
         
         # Open the packet capture viewer dialog
         try:
+            from .widgets.PacketCaptureViewer import PacketCaptureViewerDialog
             capture_viewer = PacketCaptureViewerDialog(
                 component_name=self.display_name,
                 component_type=self.component_type,
@@ -953,47 +998,19 @@ class NetworkComponent(QGraphicsPixmapItem):
         
         # Find the scene to scan components
         scene = None
-        
-        # Try to get scene from provided main_window
         if main_window and hasattr(main_window, 'canvas_view') and hasattr(main_window.canvas_view, 'scene'):
             scene = main_window.canvas_view.scene
-        else:
-            # Fallback: find a canvas widget with scene
-            import PyQt5.QtWidgets as widgets
-            app = widgets.QApplication.instance()
-            if app:
-                for widget in app.allWidgets():
-                    widget_scene = None
-                    
-                    # Handle different ways widgets can have a scene
-                    if hasattr(widget, 'scene'):
-                        if callable(widget.scene):
-                            try:
-                                widget_scene = widget.scene()
-                            except:
-                                continue
-                        else:
-                            widget_scene = widget.scene
-                    
-                    # Check if this is a canvas widget with an app_instance
-                    if widget_scene and hasattr(widget, 'app_instance'):
-                        scene = widget_scene
-                        break
         
         if not scene:
             debug_print("No scene found for component scanning")
             return
             
-        # Scan all components in the scene
+        # Collect the numbers in use from the scene's component registry
         components_by_type = {}
-        for item in scene.items():
-            if isinstance(item, NetworkComponent):
-                comp_type = item.component_type
-                comp_number = getattr(item, 'component_number', 0)
-                if comp_number > 0:
-                    if comp_type not in components_by_type:
-                        components_by_type[comp_type] = []
-                    components_by_type[comp_type].append(comp_number)
+        for item in TopologyModel.forScene(scene).components():
+            comp_number = getattr(item, 'component_number', 0)
+            if comp_number > 0:
+                components_by_type.setdefault(item.component_type, []).append(comp_number)
         
         # Update counts and find available numbers
         for comp_type in NetworkComponent.component_counts:
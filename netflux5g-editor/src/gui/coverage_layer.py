@@ -0,0 +1,134 @@
+"""
+Coverage Overlay Layer for NetFlux5G Editor
+
+Coverage areas of APs and gNBs are drawn by a single overlay item below all
+components instead of inside each component's paint(). The overlay renders
+every coverage circle into one cached QImage, which is rebuilt (coalesced
+with a short timer) only when a radio is added, removed, moved or its power
+or range changes. Components therefore keep small bounding rects and their
+paint cost no longer depends on the coverage size.
+"""
+
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtCore import Qt, QRectF, QTimer
+from PyQt5.QtGui import QImage, QPainter, QPen, QColor, QPainterPath
+from PyQt5 import sip
+from utils.debug import debug_print
+from .topology_model import TopologyModel
+
+RADIO_TYPES = ("AP", "GNB")
+
+# Coalesce bursts of changes (e.g. a drag) into one rebuild
+REBUILD_DELAY_MS = 30
+
+# Largest side of the cached image; bigger layers are rendered downscaled
+MAX_LAYER_SIZE = 2048
+
+
+def coverage_colors(range_meters):
+    """Return the (fill, border) colors for a coverage range: larger range = warmer color."""
+    if range_meters <= 50:
+        # Short range: Blue-green
+        return QColor(0, 150, 100, 40), QColor(0, 100, 70, 120)
+    elif range_meters <= 100:
+        # Medium range: Blue
+        return QColor(0, 128, 255, 50), QColor(0, 100, 200, 140)
+    elif range_meters <= 200:
+        # Long range: Orange
+        return QColor(255, 150, 0, 60), QColor(200, 120, 0, 160)
+    else:
+        # Very long range: Red
+        return QColor(255, 50, 50, 70), QColor(200, 30, 30, 180)
+
+
+class CoverageOverlayItem(QGraphicsItem):
+    """Scene-wide layer with the cached coverage circles of all radios."""
+
+    def __init__(self):
+        super().__init__()
+        self.setZValue(-10)  # Below links and components
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self._image = None
+        self._image_rect = QRectF()
+        self._rebuild_pending = False
+
+    @staticmethod
+    def forScene(scene):
+        """Return the overlay of a scene, creating it if the scene has none (or it was cleared)."""
+        overlay = getattr(scene, 'coverage_overlay', None)
+        if overlay is None or sip.isdeleted(overlay) or overlay.scene() is not scene:
+            overlay = CoverageOverlayItem()
+            scene.addItem(overlay)
+            scene.coverage_overlay = overlay
+        return overlay
+
+    def invalidate(self):
+        """Schedule a rebuild of the cached layer."""
+        if not self._rebuild_pending:
+            self._rebuild_pending = True
+            QTimer.singleShot(REBUILD_DELAY_MS, self._rebuildIfAlive)
+
+    def _rebuildIfAlive(self):
+        if not sip.isdeleted(self):
+            self.rebuild()
+
+    def _radios(self):
+        """Return (center, radius, range) of every radio in the scene."""
+        radios = []
+        scene = self.scene()
+        if not scene:
+            return radios
+        for item in TopologyModel.forScene(scene).componentsOfType(*RADIO_TYPES):
+            if item.coverage_radius > 0:
+                # Coverage is centered on the 80x80 icon
+                center = item.pos() + QRectF(0, 0, 80, 80).center()
+                radios.append((center, item.coverage_radius, item.getCurrentRange()))
+        return radios
+
+    def rebuild(self):
+        """Render all coverage circles into the cached image."""
+        self._rebuild_pending = False
+        radios = self._radios()
+
+        layer_rect = QRectF()
+        for center, radius, _range in radios:
+            layer_rect = layer_rect.united(QRectF(center.x() - radius, center.y() - radius, radius * 2, radius * 2))
+        layer_rect = layer_rect.adjusted(-2, -2, 2, 2) if radios else QRectF()
+
+        self.prepareGeometryChange()
+        self._image_rect = layer_rect
+        if not radios:
+            self._image = None
+            self.update()
+            return
+
+        scale = min(1.0, MAX_LAYER_SIZE / max(layer_rect.width(), layer_rect.height()))
+        image = QImage(max(1, int(layer_rect.width() * scale) + 1), max(1, int(layer_rect.height() * scale) + 1),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(scale, scale)
+        painter.translate(-layer_rect.topLeft())
+        for center, radius, range_meters in radios:
+            color, border_color = coverage_colors(range_meters)
+            painter.setBrush(color)
+            painter.setPen(QPen(border_color, 2, Qt.DashLine))
+            painter.drawEllipse(center, radius, radius)
+        painter.end()
+
+        self._image = image
+        self.update()
+        debug_print(f"DEBUG: Rebuilt coverage layer for {len(radios)} radios ({image.width()}x{image.height()})")
+
+    def boundingRect(self):
+        return self._image_rect
+
+    def shape(self):
+        """The layer is never hit: clicks and selection go to the items below it."""
+        return QPainterPath()
+
+    def paint(self, painter, option, widget):
+        if self._image is not None:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(self._image_rect, self._image)
@@ -1,9 +1,12 @@
-import os
 import math
 from PyQt5.QtWidgets import QGraphicsItem
 from PyQt5.QtCore import Qt, QRectF, QPointF, QLineF
-from PyQt5.QtGui import QPen, QPixmap, QTransform, QColor, QPainterPath, QPainterPathStroker
-from utils.debug import debug_print, error_print
+from PyQt5.QtGui import QPen, QColor, QPainterPath, QPainterPathStroker
+from utils.debug import debug_print, error_print, is_debug_enabled
+from .pixmap_cache import cable_pixmap, cable_segment
+from .lod import level_of_detail, LOD_FULL
+from .topology_model import TopologyModel
+from .undo_stack import UndoStack
 
 class NetworkLink(QGraphicsItem):
     """Link/connection between two network components using a cable image"""
@@ -45,48 +48,54 @@ class NetworkLink(QGraphicsItem):
             dest_node.connected_links = [self]
             
         # Set Z-value based on link type - controller links should be below regular links
-        is_controller_link = False
+        self.is_controller_link = False
         for node in (source_node, dest_node):
             if hasattr(node, 'component_type') and node.component_type == 'Controller':
-                is_controller_link = True
+                self.is_controller_link = True
                 break
             if hasattr(node, 'object_type') and node.object_type == 'Controller':
-                is_controller_link = True
+                self.is_controller_link = True
                 break
         
-        if is_controller_link:
+        if self.is_controller_link:
             self.setZValue(-2)  # Controller links below regular links
         else:
             self.setZValue(-1)  # Regular links below components but above controller links
         
-        # Load the cable image
-        self.cable_pixmap = None
-        icon_base_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui", "Icon")
-        cable_path = os.path.join(icon_base_path, "link cable.png")
-        
-        if os.path.exists(cable_path):
-            self.cable_pixmap = QPixmap(cable_path)
-            debug_print(f"DEBUG: Cable image loaded from {cable_path}")
-        else:
-            error_print(f"ERROR: Cable image not found at {cable_path}")
+        # Cable image is shared by all links (see gui/pixmap_cache.py)
+        self.cable_pixmap = cable_pixmap()
             
-        # Create cable segments
+        # Geometry is cached and recomputed only when an endpoint moves;
+        # cable_segments holds (top-left, pre-rotated pixmap) per segment
         self.cable_segments = []
         self.segment_count = 1  # Start with a single segment
+        self._geometry_key = None
+        self._revision = 0  # Bumped on every property change (see markChanged())
         
         # Update position
         self.updatePosition()
         
-        # Set initial tooltip
-        self.updateTooltip()
+        # The tooltip is built on first hover rather than for every link created
+        self.setAcceptHoverEvents(True)
         
         # Mark topology as modified when link is created
         if self.main_window and hasattr(self.main_window, 'onTopologyChanged'):
             self.main_window.onTopologyChanged()
     
+    def markChanged(self):
+        """Record a change of this link's properties for snapshots and saves."""
+        self._revision += 1
+        if self.scene():
+            TopologyModel.forScene(self.scene()).scheduleSnapshot()
+
     def updateTooltip(self):
         """Update the tooltip with current properties."""
         self.setToolTip(self.getPropertiesSummary())
+
+    def hoverEnterEvent(self, event):
+        """Refresh the tooltip before Qt shows it."""
+        self.updateTooltip()
+        super().hoverEnterEvent(event)
     
     def getPropertiesSummary(self):
         """Get a summary of link properties for tooltips."""
@@ -209,37 +218,90 @@ class NetworkLink(QGraphicsItem):
         return QPointF(intersection_x, intersection_y)
         
     def updatePosition(self):
-        """Update the link's position and trigger a redraw"""
+        """Recompute the cached link geometry after an endpoint moved and trigger a redraw"""
         self.prepareGeometryChange()
+        self._computeGeometry()
         if self.scene():
             self.update()
-            
-    def boundingRect(self):
-        """Define the bounding rectangle for the cable"""
+
+    def _ensureGeometry(self):
+        """Recompute the cached geometry if an endpoint moved without updatePosition()."""
+        if self._geometry_key != (self.source_node.pos(), self.dest_node.pos()):
+            self._computeGeometry()
+
+    def _computeGeometry(self):
+        """Compute centers, edge points, bounding rect, paths and cable segments once per move."""
+        self._geometry_key = (self.source_node.pos(), self.dest_node.pos())
         source_center = self.get_center_point(self.source_node)
         dest_center = self.get_center_point(self.dest_node)
-        
+        self._line = QLineF(source_center, dest_center)
+
         # Create a bounding rectangle that encompasses both points with some padding
         min_x = min(source_center.x(), dest_center.x()) - 20
         min_y = min(source_center.y(), dest_center.y()) - 20
         width = abs(source_center.x() - dest_center.x()) + 40
         height = abs(source_center.y() - dest_center.y()) + 40
-        
-        return QRectF(min_x, min_y, width, height)
+        self._bounding_rect = QRectF(min_x, min_y, width, height)
+
+        # Stroked path along the line for hit detection, wider than the visual line
+        path = QPainterPath()
+        path.moveTo(source_center)
+        path.lineTo(dest_center)
+        stroker = QPainterPathStroker()
+        stroker.setWidth(10)
+        stroker.setCapStyle(Qt.RoundCap)
+        self._shape = stroker.createStroke(path)
+
+        self.cable_segments = []
+        if self.is_controller_link or not self.cable_pixmap:
+            return
+
+        # Calculate edge points where the link should start and end
+        source_edge = self.get_intersection_point(source_center, dest_center, self.get_object_radius(self.source_node))
+        dest_edge = self.get_intersection_point(dest_center, source_center, self.get_object_radius(self.dest_node))
+        if is_debug_enabled():
+            debug_print(f"DEBUG: Link from {source_edge.x():.1f},{source_edge.y():.1f} to {dest_edge.x():.1f},{dest_edge.y():.1f}")
+
+        # Calculate angle and distance between edge points
+        line = QLineF(source_edge, dest_edge)
+        angle = line.angle()  # Angle in degrees
+        length = line.length()
+
+        # Determine number of segments based on length
+        if length > 150:
+            self.segment_count = 3  # Use 3 segments for long connections
+        elif length > 75:
+            self.segment_count = 2  # Use 2 segments for medium connections
+        else:
+            self.segment_count = 1  # Use 1 segment for short connections
+
+        # Calculate cable segment size (scale to fit connection length)
+        segment_length = length / self.segment_count
+        cable_width = max(12, min(20, int(segment_length / 4)))  # Adaptive width
+        cable_height = int(self.cable_pixmap.height() * (cable_width / self.cable_pixmap.width()))
+
+        # Pre-rotated cable image (negative angle to match Qt's coordinate system)
+        segment = cable_segment(cable_width, cable_height, -angle)
+        for i in range(self.segment_count):
+            # Calculate segment position (evenly spaced)
+            if self.segment_count == 1:
+                segment_pos = 0.5  # Center the single segment
+            else:
+                segment_pos = i / (self.segment_count - 1)  # Distribute segments
+
+            x = source_edge.x() + segment_pos * (dest_edge.x() - source_edge.x())
+            y = source_edge.y() + segment_pos * (dest_edge.y() - source_edge.y())
+            self.cable_segments.append((QPointF(x - segment.width() / 2, y - segment.height() / 2), segment))
+
+    def boundingRect(self):
+        """Define the bounding rectangle for the cable"""
+        self._ensureGeometry()
+        return self._bounding_rect
     
     def paint(self, painter, option, widget):
         """Draw the cable between components"""
-        # Determine if this is a Controller link
-        is_controller_link = False
-        for node in (self.source_node, self.dest_node):
-            # Check for both QGraphicsPixmapItem and QLabel based nodes
-            if hasattr(node, 'component_type') and node.component_type == 'Controller':
-                is_controller_link = True
-                break
-            if hasattr(node, 'object_type') and node.object_type == 'Controller':
-                is_controller_link = True
-                break
-        
+        self._ensureGeometry()
+
         # Check if link has custom properties
         has_custom_properties = False
         if hasattr(self, 'properties'):
@@ -256,7 +318,7 @@ class NetworkLink(QGraphicsItem):
             pen.setCapStyle(Qt.RoundCap)
             painter.setPen(pen)
         else:
-            if is_controller_link:
+            if self.is_controller_link:
                 # Make controller links semi-transparent so they don't interfere as much
                 controller_color = QColor(220, 0, 0, 180)  # Red with alpha transparency
                 pen = QPen(controller_color, 2, Qt.DotLine)  # Thinner line
@@ -269,74 +331,23 @@ class NetworkLink(QGraphicsItem):
             painter.setPen(pen)
 
         # Draw the cable as a line between the centers
-        src = self.get_center_point(self.source_node)
-        dst = self.get_center_point(self.dest_node)
-        painter.drawLine(QLineF(src, dst))
+        painter.drawLine(self._line)
+
+        # Draw the pre-rotated cable images for non-controller links, unless zoomed out
+        if self.cable_segments and level_of_detail(painter, option) >= LOD_FULL:
+            for position, segment in self.cable_segments:
+                painter.drawPixmap(position, segment)
+        
+    def itemChange(self, change, value):
+        """Keep the scene's topology model and undo history in sync."""
+        if change == QGraphicsItem.ItemSceneChange and self.scene():
+            TopologyModel.forScene(self.scene()).removeLink(self)
+            UndoStack.forScene(self.scene()).noteRemoved(self)
+        if change == QGraphicsItem.ItemSceneHasChanged and self.scene():
+            TopologyModel.forScene(self.scene()).addLink(self)
+            UndoStack.forScene(self.scene()).noteAdded(self)
+        return super().itemChange(change, value)
 
-        # Optionally, draw the cable image for non-controller links
-        if not is_controller_link and self.cable_pixmap:
-            # Get center positions of source and destination nodes
-            source_center = self.get_center_point(self.source_node)
-            dest_center = self.get_center_point(self.dest_node)
-            
-            # Get the appropriate radii for connection points
-            source_radius = self.get_object_radius(self.source_node)
-            dest_radius = self.get_object_radius(self.dest_node)
-            
-            # Calculate edge points where the link should start and end
-            source_edge = self.get_intersection_point(source_center, dest_center, source_radius)
-            dest_edge = self.get_intersection_point(dest_center, source_center, dest_radius)
-            
-            # Debug output
-            debug_print(f"DEBUG: Link from {source_edge.x():.1f},{source_edge.y():.1f} to {dest_edge.x():.1f},{dest_edge.y():.1f}")
-            
-            # Calculate angle and distance between edge points
-            line = QLineF(source_edge, dest_edge)
-            angle = line.angle()  # Angle in degrees
-            length = line.length()
-            
-            # Save painter state
-            painter.save()
-            
-            # Determine number of segments based on length
-            if length > 150:
-                self.segment_count = 3  # Use 3 segments for long connections
-            elif length > 75:
-                self.segment_count = 2  # Use 2 segments for medium connections
-            else:
-                self.segment_count = 1  # Use 1 segment for short connections
-            
-            # Calculate cable segment size (scale to fit connection length)
-            segment_length = length / self.segment_count
-            cable_width = max(12, min(20, int(segment_length / 4)))  # Adaptive width
-            cable_height = int(self.cable_pixmap.height() * (cable_width / self.cable_pixmap.width()))
-            
-            # Draw cable segments
-            for i in range(self.segment_count):
-                # Calculate segment position (evenly spaced)
-                if self.segment_count == 1:
-                    segment_pos = 0.5  # Center the single segment
-                else:
-                    segment_pos = i / (self.segment_count - 1)  # Distribute segments
-                
-                x = source_edge.x() + segment_pos * (dest_edge.x() - source_edge.x()) - cable_width / 2
-                y = source_edge.y() + segment_pos * (dest_edge.y() - source_edge.y()) - cable_height / 2
-                
-                # Create transform to rotate around center
-                transform = QTransform()
-                transform.translate(x + cable_width / 2, y + cable_height / 2)
-                transform.rotate(-angle)  # Negative angle to match Qt's coordinate system
-                transform.translate(-cable_width / 2, -cable_height / 2)
-                
-                # Apply transform
-                painter.setTransform(transform)
-                
-                # Draw the scaled cable image
-                painter.drawPixmap(0, 0, cable_width, cable_height, self.cable_pixmap)
-            
-            # Restore painter state
-            painter.restore()
-        
     def mousePressEvent(self, event):
         """Handle mouse press events."""
         # Check if we're in delete mode
@@ -380,15 +391,15 @@ class NetworkLink(QGraphicsItem):
     def openPropertiesDialog(self):
         """Open the link properties dialog."""
         try:
-            from .widgets.Dialog import LinkPropertiesWindow
+            from .widgets.Dialog import LinkPropertiesWindow, open_properties_window
             
-            # Create and show the properties dialog
-            properties_dialog = LinkPropertiesWindow(
+            # Show the properties dialog (a closed one is reused)
+            open_properties_window(
+                LinkPropertiesWindow,
                 self.name,
                 parent=self.scene().views()[0] if self.scene() and self.scene().views() else None,
                 component=self
             )
-            properties_dialog.show()
             
         except Exception as e:
             error_print(f"ERROR: Failed to open link properties dialog: {e}")
@@ -414,18 +425,5 @@ class NetworkLink(QGraphicsItem):
     
     def shape(self):
         """Define the shape for precise hit detection"""
-        # Create a path along the link line
-        path = QPainterPath()
-        source_center = self.get_center_point(self.source_node)
-        dest_center = self.get_center_point(self.dest_node)
-        
-        path.moveTo(source_center)
-        path.lineTo(dest_center)
-        
-        # Create a stroker to make the path wider for easier selection
-        stroker = QPainterPathStroker()
-        stroker.setWidth(10)  # Make selection area wider than visual line
-        stroker.setCapStyle(Qt.RoundCap)
-        
-        # Return the stroked path for hit detection
-        return stroker.createStroke(path)
\ No newline at end of file
+        self._ensureGeometry()
+        return self._shape
@@ -0,0 +1,39 @@
+"""
+Level-of-Detail Rendering for NetFlux5G Editor
+
+Canvas items pick how much to draw from the scale they are painted at
+(the canvas zoom combined with any render transform). Zoomed out on large
+topologies, labels, coverage fills and cable images are unreadable anyway,
+so they are skipped and components are drawn as colored glyphs.
+"""
+
+from PyQt5.QtGui import QColor
+
+# At or above this scale everything is drawn
+LOD_FULL = 0.5
+# Below this scale components are drawn as colored glyphs instead of icons
+LOD_GLYPH = 0.25
+
+GLYPH_COLORS = {
+    "Host": QColor(70, 130, 180),
+    "STA": QColor(100, 149, 237),
+    "UE": QColor(46, 139, 87),
+    "GNB": QColor(220, 120, 0),
+    "DockerHost": QColor(0, 150, 200),
+    "AP": QColor(255, 165, 0),
+    "VGcore": QColor(148, 0, 211),
+    "Controller": QColor(200, 30, 30),
+    "Router": QColor(105, 105, 105),
+    "Switch": QColor(60, 60, 60),
+}
+DEFAULT_GLYPH_COLOR = QColor(128, 128, 128)
+
+
+def level_of_detail(painter, option):
+    """Return the scale an item is being painted at (1.0 at 100% zoom)."""
+    return option.levelOfDetailFromTransform(painter.worldTransform())
+
+
+def glyph_color(component_type):
+    """Return the glyph color for a component type."""
+    return GLYPH_COLORS.get(component_type, DEFAULT_GLYPH_COLOR)
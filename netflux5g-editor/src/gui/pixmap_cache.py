@@ -0,0 +1,104 @@
+"""
+Shared Pixmap Cache for NetFlux5G Editor
+
+Component icons and the link cable image are decoded and scaled once per
+process and shared by every item on the canvas, instead of every
+NetworkComponent and NetworkLink loading its own copy from disk.
+
+Entries are keyed by (path, size, rotation) and kept in a bounded LRU.
+Rotated cable segments are pre-rendered per angle bucket, so painting a link
+draws a ready image instead of transforming the painter per segment.
+"""
+
+import os
+from collections import OrderedDict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QTransform
+from utils.debug import debug_print, error_print
+
+ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Icon")
+CABLE_ICON_PATH = os.path.join(ICON_DIR, "link cable.png")
+
+# Rotated cable segments are rendered once per bucket of this many degrees
+CABLE_ANGLE_STEP = 5
+
+MAX_ENTRIES = 1024
+
+
+class PixmapCache:
+    """Process-wide LRU of decoded, scaled and rotated pixmaps."""
+
+    _entries = OrderedDict()
+    _missing = set()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, path, width=None, height=None, angle=0):
+        """
+        Return the pixmap at path, scaled to fit width x height and rotated by angle degrees.
+
+        Returns:
+            QPixmap (null if the file cannot be loaded)
+        """
+        path = os.path.normpath(path)
+        key = (path, width, height, angle)
+        pixmap = cls._entries.get(key)
+        if pixmap is not None:
+            cls._entries.move_to_end(key)
+            cls.hits += 1
+            return pixmap
+
+        cls.misses += 1
+        if angle:
+            pixmap = cls.get(path, width, height).transformed(QTransform().rotate(angle), Qt.SmoothTransformation)
+        elif width is not None and height is not None:
+            pixmap = cls.get(path).scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        else:
+            pixmap = QPixmap(path)
+            if pixmap.isNull():
+                if path not in cls._missing:
+                    cls._missing.add(path)
+                    error_print(f"ERROR: Could not load image {path}")
+                return pixmap
+            debug_print(f"DEBUG: Loaded image {path}")
+
+        cls._entries[key] = pixmap
+        if len(cls._entries) > MAX_ENTRIES:
+            cls._entries.popitem(last=False)
+        return pixmap
+
+    @classmethod
+    def clear(cls):
+        """Drop all cached pixmaps."""
+        cls._entries.clear()
+        cls._missing.clear()
+
+
+def icon_pixmap(path, size=80):
+    """Return a component icon scaled to size x size."""
+    return PixmapCache.get(path, size, size)
+
+
+def cable_pixmap():
+    """Return the full-size cable image, or None if it is missing."""
+    pixmap = PixmapCache.get(CABLE_ICON_PATH)
+    return None if pixmap.isNull() else pixmap
+
+
+def cable_angle_bucket(angle):
+    """Round an angle in degrees to its pre-rendered bucket."""
+    return int(round(angle / CABLE_ANGLE_STEP) * CABLE_ANGLE_STEP) % 360
+
+
+def cable_segment(width, height, angle):
+    """
+    Return the cable image scaled to width x height and rotated by angle.
+
+    Args:
+        angle: Rotation in degrees (clockwise, as QTransform.rotate), bucketed by CABLE_ANGLE_STEP
+
+    Returns:
+        QPixmap sized to the rotated bounding box; draw it centered on the segment
+    """
+    return PixmapCache.get(CABLE_ICON_PATH, width, height, cable_angle_bucket(angle))
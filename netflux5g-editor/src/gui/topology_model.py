@@ -0,0 +1,201 @@
+"""
+Topology Model for NetFlux5G Editor
+
+Typed registries of the components and links placed on a canvas scene.
+Components and links register themselves when they are added to or removed
+from a scene, so listings and lookups by name or type no longer walk
+scene.items() and classify every graphics item.
+
+The model is attached to its scene as scene.topology_model and must be reset
+whenever the scene is cleared (see Canvas.clearScene()).
+
+Background threads must not touch the live graphics items. Instead, the GUI
+thread publishes an immutable, versioned TopologySnapshot shortly after each
+change (coalesced), and workers read model.snapshot without locking. Records
+of components that did not change are shared between consecutive snapshots,
+and the version only advances when the content changed, so workers can skip
+re-evaluation when it is unchanged.
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+from PyQt5.QtCore import QTimer
+
+# Coalesce bursts of changes (e.g. a drag) into one snapshot
+PUBLISH_DELAY_MS = 100
+
+ComponentRecord = namedtuple('ComponentRecord', ['name', 'type', 'number', 'x', 'y', 'properties'])
+LinkRecord = namedtuple('LinkRecord', ['name', 'type', 'source', 'destination', 'properties'])
+
+
+def freeze(value):
+    """Return a deeply immutable copy of a properties value."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    return value
+
+
+class TopologySnapshot(namedtuple('TopologySnapshot', ['version', 'components', 'links', 'by_name'])):
+    """Immutable view of a topology: tuples of records plus a read-only name index."""
+
+    __slots__ = ()
+
+    def componentsOfType(self, *component_types):
+        return [c for c in self.components if c.type in component_types]
+
+    def componentNamed(self, name):
+        return self.by_name.get(name)
+
+
+EMPTY_SNAPSHOT = TopologySnapshot(0, (), (), MappingProxyType({}))
+
+
+class TopologyModel:
+    """Registries of the NetworkComponents and NetworkLinks of one scene."""
+
+    def __init__(self):
+        self._components = {}   # id -> component, in insertion order
+        self._by_type = {}      # component type -> {id: component}
+        self._by_name = {}      # display name -> component
+        self._links = {}        # id -> link, in insertion order
+        self.snapshot = EMPTY_SNAPSHOT
+        self._records = {}      # id -> (item revision, ComponentRecord) shared across snapshots
+        self._publish_pending = False
+
+    @staticmethod
+    def forScene(scene):
+        """Return the model of a scene, creating it on first use."""
+        model = getattr(scene, 'topology_model', None)
+        if model is None:
+            model = TopologyModel()
+            scene.topology_model = model
+        return model
+
+    def reset(self):
+        """Forget all items (after the scene was cleared)."""
+        self._components.clear()
+        self._by_type.clear()
+        self._by_name.clear()
+        self._links.clear()
+        self._records.clear()
+        self.scheduleSnapshot()
+
+    # Registration
+
+    def addComponent(self, component):
+        key = id(component)
+        self._components[key] = component
+        self._by_type.setdefault(component.component_type, {})[key] = component
+        self._by_name[component.display_name] = component
+        self.scheduleSnapshot()
+
+    def removeComponent(self, component):
+        key = id(component)
+        if self._components.pop(key, None) is None:
+            return
+        self._by_type.get(component.component_type, {}).pop(key, None)
+        self._records.pop(key, None)
+        self._unmapName(component, component.display_name)
+        self.scheduleSnapshot()
+
+    def renameComponent(self, component, old_name):
+        """Update the name registry after a component's display name changed."""
+        if id(component) not in self._components:
+            return
+        self._unmapName(component, old_name)
+        self._by_name[component.display_name] = component
+        self.scheduleSnapshot()
+
+    def _unmapName(self, component, name):
+        if self._by_name.get(name) is not component:
+            return
+        del self._by_name[name]
+        # Names are not guaranteed unique; keep another holder of the name reachable
+        for other in self._components.values():
+            if other.display_name == name:
+                self._by_name[name] = other
+                break
+
+    def addLink(self, link):
+        self._links[id(link)] = link
+        self.scheduleSnapshot()
+
+    def removeLink(self, link):
+        if self._links.pop(id(link), None) is not None:
+            self.scheduleSnapshot()
+
+    # Queries
+
+    def components(self):
+        """Return all components in the order they were added."""
+        return list(self._components.values())
+
+    def componentsOfType(self, *component_types):
+        """Return the components of the given types."""
+        result = []
+        for component_type in component_types:
+            result.extend(self._by_type.get(component_type, {}).values())
+        return result
+
+    def componentNamed(self, name):
+        """Return the component with the given display name, or None."""
+        return self._by_name.get(name)
+
+    def containsComponent(self, item):
+        return id(item) in self._components and self._components[id(item)] is item
+
+    def links(self):
+        """Return all links in the order they were added."""
+        return list(self._links.values())
+
+    def counts(self):
+        """Return (number of components, number of links)."""
+        return len(self._components), len(self._links)
+
+    # Snapshots (GUI thread only)
+
+    def scheduleSnapshot(self):
+        """Publish a new snapshot soon; call after any change to the topology."""
+        if not self._publish_pending:
+            self._publish_pending = True
+            QTimer.singleShot(PUBLISH_DELAY_MS, self.publishSnapshot)
+
+    def publishSnapshot(self):
+        """Build and publish a snapshot now. Returns the published snapshot."""
+        self._publish_pending = False
+        components = []
+        for key, component in self._components.items():
+            revision = getattr(component, '_revision', None)
+            cached = self._records.get(key)
+            if cached is not None and revision is not None and cached[0] == revision:
+                record = cached[1]
+            else:
+                pos = component.pos()
+                record = ComponentRecord(component.display_name, component.component_type,
+                                         getattr(component, 'component_number', 0), pos.x(), pos.y(),
+                                         freeze(component.properties))
+                if cached is not None and cached[1] == record:
+                    record = cached[1]
+                self._records[key] = (revision, record)
+            components.append(record)
+
+        links = []
+        for link in self._links.values():
+            links.append(LinkRecord(getattr(link, 'name', ''), getattr(link, 'link_type', 'ethernet'),
+                                    getattr(link.source_node, 'display_name', ''),
+                                    getattr(link.dest_node, 'display_name', ''),
+                                    freeze(getattr(link, 'properties', {}))))
+
+        components = tuple(components)
+        links = tuple(links)
+        previous = self.snapshot
+        if components == previous.components and links == previous.links:
+            return previous
+
+        self.snapshot = TopologySnapshot(previous.version + 1, components, links,
+                                         MappingProxyType({c.name: c for c in components}))
+        return self.snapshot
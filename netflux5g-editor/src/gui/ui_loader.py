@@ -0,0 +1,137 @@
+"""
+UI Loader for NetFlux5G Editor
+
+uic.loadUi() parses the Qt Designer XML and builds the widgets through PyQt's
+dynamic loader every time a window is opened, which was a large part of the
+cost of showing the main window and of opening a properties dialog.
+load_ui() compiles each .ui file to Python once (as pyuic5 does), caches the
+generated module in a __uicache__ directory next to the .ui files, and then
+only has to import it and run its setupUi().
+
+A cached module is named after its .ui file and a hash of the file's path,
+size and modification time and of the PyQt version, so editing a .ui file or
+upgrading PyQt compiles it again. Icons in .ui files are relative to the .ui
+file, as uic.loadUi() resolves them; the generated code is patched to do the
+same instead of resolving them against the working directory. If a .ui file
+cannot be compiled, it is loaded with uic.loadUi() as before.
+"""
+
+import os
+import re
+import glob
+import hashlib
+import tempfile
+import importlib.util
+from io import StringIO
+from PyQt5 import uic
+from PyQt5.QtCore import PYQT_VERSION_STR
+from utils.debug import debug_print, warning_print
+
+UI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ui")
+CACHE_DIR_NAME = "__uicache__"
+
+# Image paths as written by the pyuic code generator
+_PIXMAP_PATTERN = re.compile(r'QtGui\.QPixmap\("((?:[^"\\]|\\.)*)"\)')
+
+_PATH_HELPER = (
+    "import os\n"
+    "_UI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))\n\n"
+)
+
+_form_classes = {}  # cached module path -> generated Ui_* class
+
+
+def _cache_path(ui_file):
+    ui_file = os.path.abspath(ui_file)
+    st = os.stat(ui_file)
+    key = f"{ui_file}|{st.st_size}|{st.st_mtime_ns}|{PYQT_VERSION_STR}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(ui_file))[0]
+    return os.path.join(os.path.dirname(ui_file), CACHE_DIR_NAME, f"{stem}-{digest}.py")
+
+
+def _resolve_pixmap(match):
+    path = match.group(1)
+    if not path or path.startswith(':') or os.path.isabs(path):
+        return match.group(0)
+    return f'QtGui.QPixmap(os.path.join(_UI_DIR, "{path}"))'
+
+
+def _compile(ui_file, target):
+    """Compile ui_file to the Python module target, replacing older versions of it."""
+    buffer = StringIO()
+    uic.compileUi(ui_file, buffer)
+    code = _PATH_HELPER + _PIXMAP_PATTERN.sub(_resolve_pixmap, buffer.getvalue())
+
+    cache_dir = os.path.dirname(target)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(code)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    stem = os.path.basename(target).rsplit('-', 1)[0]
+    for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(stem)}-*.py")):
+        if stale != target:
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass
+    debug_print(f"DEBUG: Compiled {os.path.basename(ui_file)} to {os.path.basename(target)}")
+
+
+def ui_form_class(ui_file):
+    """Return the generated Ui_* class of a .ui file, compiling it if needed."""
+    target = _cache_path(ui_file)
+    form_class = _form_classes.get(target)
+    if form_class is not None:
+        return form_class
+
+    if not os.path.isfile(target):
+        _compile(ui_file, target)
+    module_name = "uicache_" + os.path.splitext(os.path.basename(target))[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(module_name, target)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    form_class = next(value for name, value in vars(module).items()
+                      if name.startswith('Ui_') and isinstance(value, type))
+    _form_classes[target] = form_class
+    return form_class
+
+
+def load_ui(ui_file, widget):
+    """Build the widgets of a .ui file into widget, like uic.loadUi(ui_file, widget)."""
+    if not os.path.isfile(ui_file):
+        return uic.loadUi(ui_file, widget)
+    try:
+        form_class = ui_form_class(ui_file)
+    except Exception as e:
+        warning_print(f"WARNING: Could not compile {os.path.basename(ui_file)}, loading it dynamically: {e}")
+        return uic.loadUi(ui_file, widget)
+
+    form = form_class()
+    form.setupUi(widget)
+    # Like uic.loadUi(), make the named widgets, layouts and actions attributes of widget
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
+    return widget
+
+
+def compile_all(ui_dir=UI_DIR):
+    """Compile every .ui file of ui_dir ahead of time. Returns the number of failures."""
+    failures = 0
+    for ui_file in sorted(glob.glob(os.path.join(ui_dir, "*.ui"))):
+        try:
+            ui_form_class(ui_file)
+        except Exception as e:
+            warning_print(f"WARNING: Could not compile {os.path.basename(ui_file)}: {e}")
+            failures += 1
+    return failures
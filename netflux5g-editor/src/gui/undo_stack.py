@@ -0,0 +1,403 @@
+"""
+Undo Stack for NetFlux5G Editor
+
+Command-based undo/redo history of a canvas scene. Components and links report
+changes to their scene's stack as they happen: the position before a move, the
+previous values of the property keys being set, and items added to or removed
+from the scene. Everything reported during one operation becomes a single
+command holding only those diffs. Undoing re-applies the diffs, so undoing a
+paste of 200 nodes removes 200 items rather than reloading the topology;
+removed items are kept alive by the command instead of being serialized.
+
+Changes reported in the same event-loop iteration form one command (e.g. a
+deleted selection together with its links), a drag is recorded when the mouse
+is released, and repeated moves or edits of the same items within
+MERGE_WINDOW_S merge into the previous command. beginGroup()/endGroup() make
+one command of longer operations. The history is bounded by MAX_COMMANDS and
+by the total number of recorded changes (MAX_CHANGES).
+
+The stack is attached to its scene as scene.undo_stack and must be cleared
+whenever the scene is cleared (see Canvas.clearScene()), since the items it
+references are deleted with the scene.
+"""
+
+import copy
+import time
+from collections import deque
+from PyQt5.QtCore import QTimer, QPointF
+from utils.debug import debug_print
+
+MAX_COMMANDS = 200
+MAX_CHANGES = 50000
+
+# Moves or property edits of the same items closer than this merge into one command
+MERGE_WINDOW_S = 0.5
+
+# Value of a property key that did not exist
+MISSING = object()
+
+
+def _isLink(item):
+    return hasattr(item, 'source_node') and hasattr(item, 'dest_node')
+
+
+def _itemName(item):
+    return getattr(item, 'display_name', None) or getattr(item, 'name', 'item')
+
+
+class MoveChange:
+    """An item moved from old to new (scene coordinates)."""
+
+    __slots__ = ('item', 'old', 'new')
+
+    def __init__(self, item, old):
+        self.item = item
+        self.old = QPointF(old)
+        self.new = None
+
+    def finish(self):
+        """Capture the final position. Returns False if the item did not move."""
+        self.new = QPointF(self.item.pos())
+        return self.new != self.old
+
+    @property
+    def cost(self):
+        return 1
+
+    def undo(self):
+        self.item.setPos(self.old)
+
+    def redo(self):
+        self.item.setPos(self.new)
+
+
+class PropertyChange:
+    """Changed property keys of an item: {key: value} before and after."""
+
+    __slots__ = ('item', 'old', 'new')
+
+    def __init__(self, item):
+        self.item = item
+        self.old = {}
+        self.new = None
+
+    def note(self, keys):
+        """Remember the current values of keys that are not recorded yet."""
+        properties = self.item.properties
+        for key in keys:
+            if key not in self.old:
+                # MISSING itself is kept: a copy of it would no longer be MISSING
+                old = properties.get(key, MISSING)
+                self.old[key] = old if old is MISSING else copy.deepcopy(old)
+
+    def finish(self):
+        """Capture the new values and drop unchanged keys. Returns False if nothing changed."""
+        properties = self.item.properties
+        self.new = {}
+        for key in list(self.old):
+            value = properties.get(key, MISSING)
+            if value == self.old[key]:
+                del self.old[key]
+            else:
+                self.new[key] = value if value is MISSING else copy.deepcopy(value)
+        return bool(self.new)
+
+    @property
+    def cost(self):
+        return 1 + len(self.old)
+
+    def _apply(self, values):
+        item = self.item
+        for key, value in values.items():
+            if value is MISSING:
+                item.properties.pop(key, None)
+        update = {k: copy.deepcopy(v) for k, v in values.items() if v is not MISSING}
+        if _isLink(item):
+            item.properties.update(update)
+            if update.get('name'):
+                item.name = update['name']
+            item.markChanged()
+            item.update()
+        else:
+            item.setProperties(update)
+
+    def undo(self):
+        self._apply(self.old)
+
+    def redo(self):
+        self._apply(self.new)
+
+
+class SceneChange:
+    """An item added to (added=True) or removed from the scene."""
+
+    __slots__ = ('scene', 'item', 'added')
+
+    def __init__(self, scene, item, added):
+        self.scene = scene
+        self.item = item
+        self.added = added
+
+    def finish(self):
+        return True
+
+    @property
+    def cost(self):
+        return 1
+
+    def _attach(self):
+        item = self.item
+        if _isLink(item):
+            for node in (item.source_node, item.dest_node):
+                links = getattr(node, 'connected_links', None)
+                if links is None:
+                    node.connected_links = [item]
+                elif item not in links:
+                    links.append(item)
+        elif hasattr(item, 'component_number'):
+            # Take the number back from the free list (see NetworkComponent.deleteComponent())
+            type(item).available_numbers.get(item.component_type, set()).discard(item.component_number)
+        if item.scene() is not self.scene:
+            self.scene.addItem(item)
+        if _isLink(item):
+            item.updatePosition()
+
+    def _detach(self):
+        item = self.item
+        if _isLink(item):
+            for node in (item.source_node, item.dest_node):
+                links = getattr(node, 'connected_links', None)
+                if links and item in links:
+                    links.remove(item)
+        elif hasattr(item, 'deleteComponent'):
+            item.deleteComponent()
+        if item.scene() is self.scene:
+            self.scene.removeItem(item)
+
+    def undo(self):
+        self._detach() if self.added else self._attach()
+
+    def redo(self):
+        self._attach() if self.added else self._detach()
+
+
+class Command:
+    """One undoable operation: an ordered list of changes."""
+
+    def __init__(self, changes, description=None):
+        self.changes = changes
+        self.description = description or self._describe()
+        self.timestamp = time.monotonic()
+        self.cost = sum(change.cost for change in changes)
+
+    def _describe(self):
+        added = sum(1 for c in self.changes if isinstance(c, SceneChange) and c.added)
+        removed = sum(1 for c in self.changes if isinstance(c, SceneChange) and not c.added)
+        moved = sum(1 for c in self.changes if isinstance(c, MoveChange))
+        if added and removed:
+            return f"add {added} and remove {removed} item(s)"
+        if added:
+            return f"add {added} item(s)"
+        if removed:
+            return f"remove {removed} item(s)"
+        if moved:
+            return f"move {moved} item(s)"
+        if len(self.changes) == 1:
+            return f"edit {_itemName(self.changes[0].item)}"
+        return f"edit {len(self.changes)} item(s)"
+
+    def _kindAndItems(self):
+        kinds = {type(c) for c in self.changes}
+        if len(kinds) != 1 or SceneChange in kinds:
+            return None
+        return kinds.pop(), frozenset(id(c.item) for c in self.changes)
+
+    def mergeWith(self, other):
+        """Absorb a following command that only moves or edits the same items. Returns success."""
+        if other.timestamp - self.timestamp > MERGE_WINDOW_S:
+            return False
+        mine = self._kindAndItems()
+        if mine is None or mine != other._kindAndItems():
+            return False
+        by_item = {id(c.item): c for c in self.changes}
+        for change in other.changes:
+            target = by_item[id(change.item)]
+            if isinstance(change, MoveChange):
+                target.new = change.new
+            else:
+                for key, value in change.old.items():
+                    target.old.setdefault(key, value)
+                target.new.update(change.new)
+        self.timestamp = other.timestamp
+        self.cost = sum(change.cost for change in self.changes)
+        return True
+
+    def undo(self):
+        for change in reversed(self.changes):
+            change.undo()
+
+    def redo(self):
+        for change in self.changes:
+            change.redo()
+
+
+class UndoStack:
+    """Undo/redo history of one scene, recorded from reported item changes."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self._undo = deque()
+        self._redo = []
+        self._cost = 0
+        self._pending = []        # changes of the operation in progress, in order
+        self._pending_index = {}  # (change class, item id) -> pending change
+        self._flush_pending = False
+        self._group_depth = 0
+        self._group_description = None
+        self._suspended = 0
+
+    @staticmethod
+    def forScene(scene):
+        """Return the undo stack of a scene, creating it on first use."""
+        stack = getattr(scene, 'undo_stack', None)
+        if stack is None:
+            stack = UndoStack(scene)
+            scene.undo_stack = stack
+        return stack
+
+    # Recording
+
+    def isRecording(self):
+        return not self._suspended
+
+    def suspend(self):
+        """Stop recording (e.g. while a topology is loaded); calls nest."""
+        self._suspended += 1
+
+    def resume(self):
+        self._suspended = max(0, self._suspended - 1)
+
+    def _pendingChange(self, cls, item, *args):
+        key = (cls, id(item))
+        change = self._pending_index.get(key)
+        if change is None or change.item is not item:
+            change = cls(item, *args)
+            self._pending_index[key] = change
+            self._pending.append(change)
+        self._scheduleFlush()
+        return change
+
+    def noteMove(self, item, old_pos):
+        """Report that an item is about to move away from old_pos."""
+        if self.isRecording() and item.scene() is self.scene:
+            self._pendingChange(MoveChange, item, old_pos)
+
+    def noteProperties(self, item, keys):
+        """Report that the given property keys of an item are about to change."""
+        if self.isRecording() and item.scene() is self.scene:
+            self._pendingChange(PropertyChange, item).note(keys)
+
+    def noteAdded(self, item):
+        if self.isRecording():
+            self._pending.append(SceneChange(self.scene, item, True))
+            self._scheduleFlush()
+
+    def noteRemoved(self, item):
+        if self.isRecording():
+            self._pending.append(SceneChange(self.scene, item, False))
+            self._scheduleFlush()
+
+    def beginGroup(self, description=None):
+        """Record everything until the matching endGroup() as one command."""
+        if self._group_depth == 0:
+            self.flush()
+            self._group_description = description
+        self._group_depth += 1
+
+    def endGroup(self):
+        self._group_depth = max(0, self._group_depth - 1)
+        if self._group_depth == 0:
+            self.flush()
+
+    def _scheduleFlush(self):
+        if not self._flush_pending:
+            self._flush_pending = True
+            QTimer.singleShot(0, self._deferredFlush)
+
+    def _deferredFlush(self):
+        self._flush_pending = False
+        # A drag in progress is recorded when the mouse is released
+        if self.scene.mouseGrabberItem() is None:
+            self.flush()
+
+    def flush(self):
+        """Turn the pending changes into a command now."""
+        if self._group_depth or not self._pending:
+            return
+        changes = [change for change in self._pending if change.finish()]
+        description = self._group_description
+        self._pending = []
+        self._pending_index = {}
+        self._group_description = None
+        if changes:
+            self._push(Command(changes, description))
+
+    def _push(self, command):
+        self._redo.clear()
+        top = self._undo[-1] if self._undo else None
+        top_cost = top.cost if top else 0
+        if top is not None and top.mergeWith(command):
+            self._cost += top.cost - top_cost
+        else:
+            self._undo.append(command)
+            self._cost += command.cost
+            debug_print(f"DEBUG: Recorded '{command.description}' ({command.cost} changes)")
+        # Drop the oldest commands; removed items they kept alive are released
+        while len(self._undo) > 1 and (len(self._undo) > MAX_COMMANDS or self._cost > MAX_CHANGES):
+            self._cost -= self._undo.popleft().cost
+
+    # Undo / redo
+
+    def canUndo(self):
+        return bool(self._undo or self._pending)
+
+    def canRedo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Revert the last command. Returns it, or None if there is nothing to undo."""
+        self.flush()
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        self._cost -= command.cost
+        self._apply(command.undo)
+        self._redo.append(command)
+        return command
+
+    def redo(self):
+        """Re-apply the last undone command. Returns it, or None."""
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        self._apply(command.redo)
+        self._undo.append(command)
+        self._cost += command.cost
+        return command
+
+    def _apply(self, action):
+        self.suspend()
+        try:
+            action()
+        finally:
+            self.resume()
+
+    def clear(self):
+        """Forget the whole history (after the scene was cleared or a topology loaded)."""
+        self._undo.clear()
+        self._redo.clear()
+        self._cost = 0
+        self._pending = []
+        self._pending_index = {}
+        self._group_depth = 0
+        self._group_description = None
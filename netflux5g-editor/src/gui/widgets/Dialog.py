@@ -1,12 +1,59 @@
 import os
+import copy
 from PyQt5.QtWidgets import QMainWindow, QLineEdit, QComboBox, QCheckBox, QTableWidget, QTableWidgetItem, QSpinBox, QDoubleSpinBox, QTextEdit, QPlainTextEdit, QPushButton, QFileDialog, QMessageBox
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QPixmap
-from PyQt5 import uic
+from PyQt5.QtGui import QIcon
+from PyQt5 import sip
 from utils.debug import debug_print, error_print, warning_print
+from utils.config_store import intern_config, resolve_config, NF_CONFIG_TYPES
+from gui.pixmap_cache import icon_pixmap
+from gui.ui_loader import load_ui
+from gui.undo_stack import UndoStack
+
+# Closed properties windows kept for reuse per window class (see open_properties_window())
+MAX_POOLED_WINDOWS = 4
+
+_window_pool = {}  # window class -> [windows]
+
+
+def open_properties_window(window_class, label_text, parent=None, component=None):
+    """Show the properties window of a component.
+
+    Building a window (its widgets, defaults and tables) is the slow part of
+    opening it, so closed windows are kept per class and rebound to the next
+    component instead of being created again. A component that already has an
+    open window gets that window raised.
+    """
+    windows = _window_pool.setdefault(window_class, [])
+    # Windows are deleted along with their parent view
+    windows[:] = [window for window in windows if not sip.isdeleted(window)]
+
+    for window in windows:
+        if window.isVisible() and window.component is component:
+            window.raise_()
+            window.activateWindow()
+            return window
+
+    for window in windows:
+        if not window.isVisible() and window.parent() is parent:
+            window.rebind(label_text, component)
+            window.show()
+            return window
+
+    window = window_class(label_text, parent=parent, component=component)
+    if len(windows) < MAX_POOLED_WINDOWS:
+        windows.append(window)
+    else:
+        window.setAttribute(Qt.WA_DeleteOnClose)
+    window.show()
+    return window
+
 
 class BasePropertiesWindow(QMainWindow):
     """Base class for all properties windows that automatically sets the icon."""
+
+    # Window title, formatted with the component name
+    window_title = "Properties - {}"
     
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(parent)
@@ -30,6 +77,58 @@ class BasePropertiesWindow(QMainWindow):
         """Setup connections for OK and Cancel buttons - to be implemented by subclasses"""
         pass
 
+    def captureDefaults(self):
+        """Remember the initial values of the named input widgets, restored by rebind()."""
+        self._defaults = []
+        for widget_class in (QLineEdit, QComboBox, QCheckBox, QSpinBox, QDoubleSpinBox, QTextEdit, QPlainTextEdit):
+            for widget in self.findChildren(widget_class):
+                if not widget.objectName():
+                    continue
+                if isinstance(widget, QLineEdit):
+                    value = widget.text()
+                elif isinstance(widget, QComboBox):
+                    value = (widget.count(), widget.currentIndex(), widget.currentText())
+                elif isinstance(widget, QCheckBox):
+                    value = widget.isChecked()
+                elif isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                    value = widget.value()
+                else:
+                    value = widget.toPlainText()
+                self._defaults.append((widget, value))
+
+    def restoreDefaults(self):
+        """Reset the input widgets to the values captured by captureDefaults()."""
+        for widget, value in getattr(self, '_defaults', []):
+            if isinstance(widget, QLineEdit):
+                widget.setText(value)
+            elif isinstance(widget, QComboBox):
+                count, index, text = value
+                # Drop the items loadProperties() added for unknown values
+                while widget.count() > count:
+                    widget.removeItem(count)
+                widget.setCurrentIndex(index)
+                if widget.isEditable():
+                    widget.setEditText(text)
+            elif isinstance(widget, QCheckBox):
+                widget.setChecked(value)
+            elif isinstance(widget, (QSpinBox, QDoubleSpinBox)):
+                widget.setValue(value)
+            else:
+                widget.setPlainText(value)
+
+    def rebind(self, label_text, component):
+        """Reuse this window for another component (see open_properties_window())."""
+        self.component_name = label_text
+        self.component = component
+        self.setWindowTitle(self.window_title.format(label_text))
+        self.restoreDefaults()
+        self.loadProperties()
+
+    def closeEvent(self, event):
+        # A closed window waits in the pool; do not keep the component alive
+        self.component = None
+        super().closeEvent(event)
+
     def saveProperties(self):
         """Save all UI values to the component's properties with validation and cleanup."""
         if not self.component:
@@ -113,25 +212,32 @@ class BasePropertiesWindow(QMainWindow):
             if hasattr(view, 'app_instance') and hasattr(view.app_instance, 'onTopologyChanged'):
                 view.app_instance.onTopologyChanged()
 
+    def find5GComponentTable(self, component_type):
+        """Return the table of a 5G component type, whatever naming the .ui file uses."""
+        possible_table_names = [
+            f'Component5G_{component_type}table',
+            f'{component_type}table',
+            f'{component_type}Table',
+            f'Component5G_{component_type}Table',
+            f'{component_type}_table'
+        ]
+        for name in possible_table_names:
+            if hasattr(self, name):
+                return getattr(self, name)
+        return None
+
     def save5GComponentTableData(self, properties):
         """Save data from all 5G component tables with cleaned structure."""
-        component_types = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
+        pending = getattr(self, '_pending_table_rows', {})
         
-        for component_type in component_types:
-            # Try different possible table name patterns
-            possible_table_names = [
-                f'Component5G_{component_type}table',
-                f'{component_type}table',
-                f'{component_type}Table',
-                f'Component5G_{component_type}Table',
-                f'{component_type}_table'
-            ]
-            
-            table = None
-            for name in possible_table_names:
-                if hasattr(self, name):
-                    table = getattr(self, name)
-                    break
+        for component_type in NF_CONFIG_TYPES:
+            # Tables that were never shown still hold the loaded rows unchanged
+            if component_type in pending:
+                if pending[component_type]:
+                    properties[f"{component_type}_configs"] = copy.deepcopy(pending[component_type])
+                continue
+            
+            table = self.find5GComponentTable(component_type)
             
             if table and hasattr(table, 'rowCount'):
                 # Extract table data
@@ -164,7 +270,13 @@ class BasePropertiesWindow(QMainWindow):
                         row_data['config_display'] = config_text if config_text else "(Double-click to import)"
                         
                         # Check if this row has imported configuration data
-                        if hasattr(config_item, 'config_data') and config_item.config_data:
+                        if getattr(config_item, 'config_ref', None):
+                            # Loaded from the config store and not re-imported since
+                            row_data['config_ref'] = config_item.config_ref
+                            row_data['imported'] = True
+                            row_data['config_filename'] = getattr(config_item, 'config_filename', f"{component_type.lower()}.yaml")
+                            row_data['config_file_path'] = getattr(config_item, 'config_file_path', '')
+                        elif hasattr(config_item, 'config_data') and config_item.config_data:
                             row_data['config_content'] = config_item.config_data
                             row_data['imported'] = True
                             row_data['config_filename'] = getattr(config_item, 'config_filename', f"{component_type.lower()}.yaml")
@@ -193,7 +305,8 @@ class BasePropertiesWindow(QMainWindow):
                     
                     # Only add non-empty configurations
                     if row_data['name'] and (row_data['imported'] or row_data['config_display'] != "(Double-click to import)"):
-                        table_data.append(row_data)
+                        # Keep only a reference to the config in the topology
+                        table_data.append(intern_config(row_data))
                 
                 # Store in properties with a key specific to this component type
                 if table_data:  # Only store if we have actual data
@@ -308,10 +421,17 @@ class BasePropertiesWindow(QMainWindow):
         debug_print(f"DEBUG: Loaded properties for {self.component_name}")
         
     def load5GComponentTableData(self, properties):
-        """Load data into all 5G component tables with validation."""
-        component_types = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
+        """Queue the rows of all 5G component tables; each table is filled when its tab is shown."""
+        self._pending_table_rows = {}
         
-        for component_type in component_types:
+        for component_type in NF_CONFIG_TYPES:
+            table = self.find5GComponentTable(component_type)
+            if not table or not hasattr(table, 'setRowCount'):
+                continue
+            
+            # Clear existing rows (a pooled window may show another component's)
+            table.setRowCount(0)
+            
             config_key = f"{component_type}_configs"
             if config_key not in properties:
                 continue
@@ -320,51 +440,48 @@ class BasePropertiesWindow(QMainWindow):
             if not isinstance(table_data, list):
                 warning_print(f"WARNING: Invalid table data format for {component_type}")
                 continue
-                
-            # Find the table
-            possible_table_names = [
-                f'Component5G_{component_type}table',
-                f'{component_type}table',
-                f'{component_type}Table',
-                f'Component5G_{component_type}Table',
-                f'{component_type}_table'
-            ]
-            
-            table = None
-            for name in possible_table_names:
-                if hasattr(self, name):
-                    table = getattr(self, name)
-                    break
             
-            if not table or not hasattr(table, 'setRowCount'):
-                warning_print(f"WARNING: Table not found for {component_type}")
-                continue
-                
-            # Clear existing rows
-            table.setRowCount(0)
-            
-            # Load each row
-            for i, row_data in enumerate(table_data):
-                if not isinstance(row_data, dict):
-                    warning_print(f"WARNING: Invalid row data format for {component_type} row {i}")
-                    continue
-                    
-                table.insertRow(i)
-                
+            self._pending_table_rows[component_type] = table_data
+    
+    def ensure5GComponentTable(self, component_type):
+        """Fill the table of a component type from its queued rows, if it was not filled yet."""
+        table_data = getattr(self, '_pending_table_rows', {}).pop(component_type, None)
+        if table_data is None:
+            return
+        table = self.find5GComponentTable(component_type)
+        if not table:
+            warning_print(f"WARNING: Table not found for {component_type}")
+            return
+        
+        rows = []
+        for i, row_data in enumerate(table_data):
+            if isinstance(row_data, dict):
+                rows.append(row_data)
+            else:
+                warning_print(f"WARNING: Invalid row data format for {component_type} row {i}")
+        
+        # Size the table once and fill it without repainting every row
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(len(rows))
+            for i, row_data in enumerate(rows):
                 # Name (column 0)
                 name_value = row_data.get('name', f"{component_type.lower()}{i + 1}")
-                name_item = QTableWidgetItem(str(name_value))
-                table.setItem(i, 0, name_item)
+                table.setItem(i, 0, QTableWidgetItem(str(name_value)))
                 
                 # Config file info (column 1)
                 config_display = row_data.get('config_display', '(Double-click to import)')
                 config_item = QTableWidgetItem(str(config_display))
                 config_item.setToolTip("Double-click to import YAML configuration file")
                 
-                # Restore imported configuration data to the item
+                # Keep a reference to the imported configuration; it is only
+                # read from the config store when the summary needs it
                 if row_data.get('imported', False):
-                    if 'config_content' in row_data and row_data['config_content']:
+                    if row_data.get('config_content'):
                         config_item.config_data = row_data['config_content']
+                    elif row_data.get('config_ref'):
+                        config_item.config_ref = row_data['config_ref']
+                    if row_data.get('config_content') or row_data.get('config_ref'):
                         config_item.config_filename = row_data.get('config_filename', f"{component_type.lower()}.yaml")
                     if 'config_file_path' in row_data and row_data['config_file_path']:
                         config_item.config_file_path = row_data['config_file_path']
@@ -373,21 +490,34 @@ class BasePropertiesWindow(QMainWindow):
                 
                 # Config Path (column 2, if exists)
                 if table.columnCount() > 2:
-                    config_path_value = row_data.get('config_path', '')
-                    config_path_item = QTableWidgetItem(str(config_path_value))
+                    config_path_item = QTableWidgetItem(str(row_data.get('config_path', '')))
                     config_path_item.setToolTip("Path to imported configuration file")
                     table.setItem(i, 2, config_path_item)
-            
-            debug_print(f"DEBUG: Loaded {len(table_data)} {component_type} configurations into table")
+        finally:
+            table.setUpdatesEnabled(True)
+        
+        debug_print(f"DEBUG: Loaded {len(rows)} {component_type} configurations into table")
+
+    @staticmethod
+    def configItemData(config_item):
+        """Return the imported configuration of a table item, reading it from the config store if needed."""
+        config_data = getattr(config_item, 'config_data', None)
+        if not config_data and getattr(config_item, 'config_ref', None):
+            config_data = resolve_config({'config_ref': config_item.config_ref})
+            config_item.config_data = config_data
+        return config_data
 
 class HostPropertiesWindow(BasePropertiesWindow):
+    window_title = "Host Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "Host_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"Host Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
+        self.captureDefaults()
         self.loadProperties()
 
     def setupConnections(self):
@@ -403,13 +533,16 @@ class HostPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class STAPropertiesWindow(BasePropertiesWindow):
+    window_title = "STA Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "STA_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"STA Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
+        self.captureDefaults()
         self.loadProperties()
 
     def setupConnections(self):
@@ -425,13 +558,16 @@ class STAPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class APPropertiesWindow(BasePropertiesWindow):
+    window_title = "AP Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "AP_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"AP Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
+        self.captureDefaults()
         self.loadProperties()
 
     def setupConnections(self):
@@ -470,13 +606,16 @@ class APPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class ControllerPropertiesWindow(BasePropertiesWindow):
+    window_title = "Controller Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "Controller_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"Controller Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
+        self.captureDefaults()
         self.loadProperties()
 
     def setupConnections(self):
@@ -492,13 +631,16 @@ class ControllerPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class DockerHostPropertiesWindow(BasePropertiesWindow):
+    window_title = "Docker Host Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "DockerHost_properties.ui")
-        uic.loadUi(ui_file, self)
-        self.setWindowTitle(f"Docker Host Properties - {label_text}")
+        load_ui(ui_file, self)
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
+        self.captureDefaults()
         self.loadProperties()
 
     def setupConnections(self):
@@ -516,6 +658,8 @@ class DockerHostPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class GNBPropertiesWindow(BasePropertiesWindow):
+    window_title = "gNB Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         # Try to load enhanced UI first, fall back to basic UI if not found
@@ -523,16 +667,17 @@ class GNBPropertiesWindow(BasePropertiesWindow):
         basic_ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "GNB_properties.ui")
         
         if os.path.exists(enhanced_ui_file):
-            uic.loadUi(enhanced_ui_file, self)
+            load_ui(enhanced_ui_file, self)
             debug_print("DEBUG: Loaded enhanced gNB UI with AP functionality")
         else:
-            uic.loadUi(basic_ui_file, self)
+            load_ui(basic_ui_file, self)
             debug_print("DEBUG: Loaded basic gNB UI (enhanced UI not found)")
             
-        self.setWindowTitle(f"gNB Properties - {label_text}")
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.setupDefaultValues()
+        self.captureDefaults()
         self.loadProperties()
 
     def setupConnections(self):
@@ -743,26 +888,26 @@ class GNBPropertiesWindow(BasePropertiesWindow):
         if self.component:
             # Store AP configuration
             ap_config = self.getAPConfiguration()
-            self.component.properties.update({f"ap_{k.lower()}": v for k, v in ap_config.items()})
+            self.component.setProperties({f"ap_{k.lower()}": v for k, v in ap_config.items()})
             
             # Store OVS configuration
             ovs_config = self.getOVSConfiguration()
-            self.component.properties.update({f"ovs_{k.lower()}": v for k, v in ovs_config.items()})
+            self.component.setProperties({f"ovs_{k.lower()}": v for k, v in ovs_config.items()})
             
             # Store 5G configuration
             config_5g = self.get5GConfiguration()
-            self.component.properties.update({f"5g_{k.lower()}": v for k, v in config_5g.items()})
+            self.component.setProperties({f"5g_{k.lower()}": v for k, v in config_5g.items()})
             
             # Store network configuration
             network_config = self.getNetworkConfiguration()
-            self.component.properties.update({f"network_{k.lower()}": v for k, v in network_config.items()})
+            self.component.setProperties({f"network_{k.lower()}": v for k, v in network_config.items()})
             
             # Store wireless configuration
             wireless_config = self.getWirelessConfiguration()
-            self.component.properties.update({f"wireless_{k}": v for k, v in wireless_config.items()})
+            self.component.setProperties({f"wireless_{k}": v for k, v in wireless_config.items()})
             
             # Set component type for UERANSIM
-            self.component.properties['ueransim_component'] = 'gnb'
+            self.component.setProperties({'ueransim_component': 'gnb'})
             
             debug_print(f"DEBUG: Saved enhanced gNB configuration for {self.component_name}")
             
@@ -772,6 +917,8 @@ class GNBPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class UEPropertiesWindow(BasePropertiesWindow):
+    window_title = "UE Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         # Try to load enhanced UI first, fall back to basic UI if not found
@@ -779,16 +926,17 @@ class UEPropertiesWindow(BasePropertiesWindow):
         basic_ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "UE_properties.ui")
         
         if os.path.exists(enhanced_ui_file):
-            uic.loadUi(enhanced_ui_file, self)
+            load_ui(enhanced_ui_file, self)
             debug_print("DEBUG: Loaded enhanced UE UI with wireless and network functionality")
         else:
-            uic.loadUi(basic_ui_file, self)
+            load_ui(basic_ui_file, self)
             debug_print("DEBUG: Loaded basic UE UI (enhanced UI not found)")
             
-        self.setWindowTitle(f"UE Properties - {label_text}")
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         self.setupConnections()
         self.setupDefaultValues()
+        self.captureDefaults()
         self.loadProperties()
         
         # Update icon based on number of UEs after loading properties
@@ -796,6 +944,11 @@ class UEPropertiesWindow(BasePropertiesWindow):
             num_ue = self.UE_NumberOfUE.value()
             self.onNumberOfUEChanged(num_ue)
 
+    def rebind(self, label_text, component):
+        super().rebind(label_text, component)
+        if hasattr(self, 'UE_NumberOfUE') and self.component:
+            self.onNumberOfUEChanged(self.UE_NumberOfUE.value())
+
     def setupConnections(self):
         # Connect OK and Cancel buttons
         self.UE_OKButton.clicked.connect(self.onOK)
@@ -888,8 +1041,7 @@ class UEPropertiesWindow(BasePropertiesWindow):
             
             # Update the component's icon
             if os.path.exists(new_icon_path):
-                pixmap = QPixmap(new_icon_path).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.component.setPixmap(pixmap)
+                self.component.setPixmap(icon_pixmap(new_icon_path, 80))
                 self.component.icon_path = new_icon_path
                 
                 # Force update the canvas
@@ -978,18 +1130,18 @@ class UEPropertiesWindow(BasePropertiesWindow):
         if self.component:
             # Store 5G configuration
             config_5g = self.get5GConfiguration()
-            self.component.properties.update({f"5g_{k.lower()}": v for k, v in config_5g.items()})
+            self.component.setProperties({f"5g_{k.lower()}": v for k, v in config_5g.items()})
             
             # Store network configuration
             network_config = self.getNetworkConfiguration()
-            self.component.properties.update({f"network_{k.lower()}": v for k, v in network_config.items()})
+            self.component.setProperties({f"network_{k.lower()}": v for k, v in network_config.items()})
             
             # Store wireless configuration
             wireless_config = self.getWirelessConfiguration()
-            self.component.properties.update({f"wireless_{k}": v for k, v in wireless_config.items()})
+            self.component.setProperties({f"wireless_{k}": v for k, v in wireless_config.items()})
             
             # Set component type for UERANSIM
-            self.component.properties['ueransim_component'] = 'ue'
+            self.component.setProperties({'ueransim_component': 'ue'})
             
             debug_print(f"DEBUG: Saved enhanced UE configuration for {self.component_name}")
             
@@ -1037,18 +1189,18 @@ class UEPropertiesWindow(BasePropertiesWindow):
         if self.component:
             # Store 5G configuration
             config_5g = self.get5GConfiguration()
-            self.component.properties.update({f"5g_{k.lower()}": v for k, v in config_5g.items()})
+            self.component.setProperties({f"5g_{k.lower()}": v for k, v in config_5g.items()})
             
             # Store network configuration
             network_config = self.getNetworkConfiguration()
-            self.component.properties.update({f"network_{k.lower()}": v for k, v in network_config.items()})
+            self.component.setProperties({f"network_{k.lower()}": v for k, v in network_config.items()})
             
             # Store wireless configuration
             wireless_config = self.getWirelessConfiguration()
-            self.component.properties.update({f"wireless_{k}": v for k, v in wireless_config.items()})
+            self.component.setProperties({f"wireless_{k}": v for k, v in wireless_config.items()})
             
             # Set component type for UERANSIM
-            self.component.properties['ueransim_component'] = 'ue'
+            self.component.setProperties({'ueransim_component': 'ue'})
             
             debug_print(f"DEBUG: Saved enhanced UE configuration for {self.component_name}")
             
@@ -1058,6 +1210,8 @@ class UEPropertiesWindow(BasePropertiesWindow):
         self.close()
 
 class Component5GPropertiesWindow(BasePropertiesWindow):
+    window_title = "5G Core Properties - {}"
+
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
         # Try to load enhanced UI first, fall back to basic UI if not found
@@ -1065,23 +1219,36 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
         basic_ui_file = os.path.join(os.path.dirname(__file__), "..", "ui", "Component5G_properties.ui")
         
         if os.path.exists(enhanced_ui_file):
-            uic.loadUi(enhanced_ui_file, self)
+            load_ui(enhanced_ui_file, self)
             debug_print("DEBUG: Loaded enhanced 5G Core UI with Open5GS configuration")
         else:
-            uic.loadUi(basic_ui_file, self)
+            load_ui(basic_ui_file, self)
             debug_print("DEBUG: Loaded basic 5G Core UI (enhanced UI not found)")
             
-        self.setWindowTitle(f"5G Core Properties - {label_text}")
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setWindowFlags(Qt.Window)
         
         self.setupConnections()
         self.setupDefaultValues()
+        self.captureDefaults()
         self.loadProperties()
         
-        # Update configuration summary after loading properties
-        # Use QTimer to ensure UI is fully initialized first
-        from PyQt5.QtCore import QTimer
-        QTimer.singleShot(100, self.updateConfigurationSummary)
+        # Fill the table or summary of the tab shown first; the other NF
+        # tables are filled when their tab is selected
+        self.refreshCurrentTab()
+
+    def restoreDefaults(self):
+        super().restoreDefaults()
+        # Empty the NF tables; loadProperties() skips them for components without properties
+        self.load5GComponentTableData({})
+
+    def rebind(self, label_text, component):
+        super().rebind(label_text, component)
+        self.refreshCurrentTab()
+
+    def refreshCurrentTab(self):
+        if hasattr(self, 'Component5G'):
+            self.onTabChanged(self.Component5G.currentIndex())
 
     def setupConnections(self):
         # Connect OK and Cancel buttons
@@ -1376,6 +1543,11 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
                         self.updateConfigurationSummary()
                     else:
                         debug_print(f"DEBUG: Not summary tab, widget name is '{widget_name}'")
+                        # Fill the NF table on this tab if it was not shown yet
+                        for component_type in list(getattr(self, '_pending_table_rows', {})):
+                            table = self.find5GComponentTable(component_type)
+                            if table and current_widget.isAncestorOf(table):
+                                self.ensure5GComponentTable(component_type)
                 else:
                     debug_print("DEBUG: Current widget is None")
         except Exception as e:
@@ -1430,6 +1602,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
     def addComponentType(self, component_type):
         """Add a new component instance to the corresponding table."""
         debug_print(f"DEBUG: Adding {component_type} component...")
+        self.ensure5GComponentTable(component_type)
         
         # Try different possible table name patterns
         possible_table_names = [
@@ -1497,6 +1670,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
 
     def removeComponentType(self, component_type):
         """Remove selected component instance from the corresponding table."""
+        self.ensure5GComponentTable(component_type)
         # Try different possible table name patterns
         possible_table_names = [
             f'Component5G_{component_type}table',
@@ -1565,6 +1739,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
                     config = properties[config_key][row]
                     config['imported'] = False
                     config['config_content'] = {}
+                    config.pop('config_ref', None)
                     config['config_file_path'] = ''
                     config['config_file'] = f"{config.get('name', component_type.lower())}.yaml"
                     self.component.setProperties(properties)
@@ -1687,6 +1862,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
                 config_item.setText(f"✓ {os.path.basename(file_path)}")
                 config_item.setToolTip(f"Imported from: {file_path}")
                 config_item.config_data = yaml_content
+                config_item.config_ref = None
                 config_item.config_file_path = file_path
                 config_item.config_filename = os.path.basename(file_path)
                 
@@ -1860,6 +2036,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
             'config_filename': os.path.basename(file_path),
             'imported': True
         })
+        intern_config(properties[config_key][row])
         
         # Save back to component
         self.component.setProperties(properties)
@@ -1877,6 +2054,11 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
         if not table:
             debug_print(f"DEBUG: Table {table_name} not found")
             return []
+        
+        # A table that was not shown yet is summarized from its queued rows
+        pending = getattr(self, '_pending_table_rows', {})
+        if component_type in pending:
+            return self.extractPendingTableData(component_type, pending[component_type])
             
         table_data = []
         debug_print(f"DEBUG: Extracting data from {table_name}, rows: {table.rowCount()}")
@@ -1896,7 +2078,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
             config_item = table.item(row, 1)
             if config_item:
                 # First check if config data is stored as attributes
-                if hasattr(config_item, 'config_data') and config_item.config_data:
+                if self.configItemData(config_item):
                     row_data['config_content'] = config_item.config_data
                     row_data['imported'] = True
                     row_data['config_file'] = getattr(config_item, 'config_filename', f"{row_data['name']}.yaml")
@@ -1951,6 +2133,26 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
         debug_print(f"DEBUG: Extracted {len(table_data)} items from {component_type} table")
         return table_data
 
+    def extractPendingTableData(self, component_type, rows):
+        """Like extractTableData(), for rows queued by load5GComponentTableData()."""
+        table_data = []
+        for row in rows:
+            if not isinstance(row, dict) or not row.get('name'):
+                continue
+            config_content = resolve_config(row) if row.get('imported', False) else None
+            table_data.append({
+                'name': row['name'],
+                'config_content': config_content or {},
+                'imported': bool(config_content),
+                'config_file': row.get('config_filename', f"{row['name']}.yaml"),
+                'config_file_path': row.get('config_file_path', ''),
+                'settings': row.get('config_path', ''),
+                'image': 'adaptive/open5gs:latest',
+                'component_type': component_type,
+                'volumes': []
+            })
+        return table_data
+
     def loadTableData(self, component_type, table_data):
         """Load data into a component type table including imported configurations."""
         table_name = f'Component5G_{component_type}table'
@@ -1983,7 +2185,7 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
                 # Store the configuration data
                 config_data = {
                     'file_path': row_data.get('config_file_path', ''),
-                    'config_content': row_data.get('config_content', {}),
+                    'config_content': resolve_config(row_data) or {},
                     'config_filename': config_filename,
                     'imported': True
                 }
@@ -2428,15 +2630,15 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
         if self.component:
             # Store Docker configuration
             docker_config = self.getDockerConfiguration()
-            self.component.properties.update({f"docker_{k.lower()}": v for k, v in docker_config.items()})
+            self.component.setProperties({f"docker_{k.lower()}": v for k, v in docker_config.items()})
             
             # Store 5G Core configuration
             core_config = self.get5GCoreConfiguration()
-            self.component.properties.update({f"5gcore_{k.lower()}": v for k, v in core_config.items()})
+            self.component.setProperties({f"5gcore_{k.lower()}": v for k, v in core_config.items()})
             
             # Store OVS configuration
             ovs_config = self.getOVSConfiguration()
-            self.component.properties.update({f"ovs_{k.lower()}": v for k, v in ovs_config.items()})
+            self.component.setProperties({f"ovs_{k.lower()}": v for k, v in ovs_config.items()})
             
             debug_print(f"DEBUG: Enhanced 5G Core configuration saved for {self.component_name}")
             
@@ -2461,8 +2663,13 @@ class Component5GPropertiesWindow(BasePropertiesWindow):
     def onCancel(self):
         self.close()
 
+# Link properties written by LinkPropertiesWindow.saveProperties()
+LINK_PROPERTY_KEYS = ['name', 'type', 'bandwidth', 'delay', 'loss', 'enable_ip', 'source_ip', 'dest_ip']
+
 class LinkPropertiesWindow(BasePropertiesWindow):
     """Properties window for network links with bandwidth, delay, and loss settings."""
+
+    window_title = "Link Properties - {}"
     
     def __init__(self, label_text, parent=None, component=None):
         super().__init__(label_text, parent, component)
@@ -2470,14 +2677,14 @@ class LinkPropertiesWindow(BasePropertiesWindow):
         # Load the UI file
         ui_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "ui", "Link_properties.ui")
         if os.path.exists(ui_file):
-            uic.loadUi(ui_file, self)
+            load_ui(ui_file, self)
             debug_print(f"DEBUG: Loaded Link properties UI from {ui_file}")
         else:
             error_print(f"ERROR: Link properties UI file not found: {ui_file}")
             return
             
         # Set window properties
-        self.setWindowTitle(f"Link Properties - {label_text}")
+        self.setWindowTitle(self.window_title.format(label_text))
         self.setFixedSize(450, 470)  # Increased height for IP configuration
         
         # Load existing properties
@@ -2566,6 +2773,9 @@ class LinkPropertiesWindow(BasePropertiesWindow):
         if not self.component:
             warning_print("WARNING: No component reference to save properties to")
             return
+        
+        if self.component.scene():
+            UndoStack.forScene(self.component.scene()).noteProperties(self.component, LINK_PROPERTY_KEYS)
             
         # Update basic properties
         self.component.properties['name'] = self.lineEdit_name.text()
@@ -2606,6 +2816,7 @@ class LinkPropertiesWindow(BasePropertiesWindow):
         # Update display name if name was changed
         if self.lineEdit_name.text():
             self.component.name = self.lineEdit_name.text()
+        self.component.markChanged()
         
         # Update tooltip and visual appearance
         if hasattr(self.component, 'updateTooltip'):
@@ -8,17 +8,31 @@ from deployed components including 5G Core, gNBs, UEs, and other network compone
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTextEdit, 
                            QPushButton, QLabel, QComboBox, QCheckBox, 
                            QSpinBox, QGroupBox, QSplitter, QFileDialog,
-                           QMessageBox, QProgressBar, QFrame)
+                           QMessageBox, QProgressBar, QFrame, QLineEdit,
+                           QDateTimeEdit, QTableWidget, QTableWidgetItem,
+                           QHeaderView, QAbstractItemView)
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QDateTime
-from PyQt5.QtGui import QFont, QTextCursor, QIcon
+from PyQt5.QtGui import QFont, QTextCursor, QIcon, QColor
 import subprocess
+import threading
+import shlex
 import os
 import re
+import time
 from utils.debug import debug_print, error_print, warning_print
+from utils.log_archive import LogArchive, SEVERITY_LEVELS
 
 
 class DeployedComponentsExtractor:
-    """Extract deployed components from the exported Mininet script."""
+    """Extract deployed components from the exported Mininet script.
+
+    The parsed manifest is kept process-wide per script version, so context
+    menus, the deployment monitor and challenges of every open topology share
+    one parse instead of reading the script on each call.
+    """
+    
+    _manifest = None  # ((script_path, mtime), deployed components)
+    _manifest_lock = threading.Lock()
     
     @staticmethod
     def extractDeployedComponents():
@@ -31,6 +45,17 @@ class DeployedComponentsExtractor:
             debug_print("No exported Mininet script found")
             return deployed_components
         
+        try:
+            key = (mininet_script_path, os.path.getmtime(mininet_script_path))
+        except OSError as e:
+            error_print(f"Error reading Mininet script: {e}")
+            return deployed_components
+        with DeployedComponentsExtractor._manifest_lock:
+            manifest = DeployedComponentsExtractor._manifest
+        if manifest is not None and manifest[0] == key:
+            # Callers may modify what they get
+            return {name: dict(info) for name, info in manifest[1].items()}
+        
         debug_print(f"Reading deployed components from: {mininet_script_path}")
         
         try:
@@ -47,6 +72,9 @@ class DeployedComponentsExtractor:
             error_print(f"Error reading Mininet script: {e}")
             return deployed_components
         
+        with DeployedComponentsExtractor._manifest_lock:
+            DeployedComponentsExtractor._manifest = (key, {name: dict(info) for name, info in deployed_components.items()})
+        
         debug_print(f"Extracted {len(deployed_components)} deployed components from Mininet script:")
         for name, info in deployed_components.items():
             debug_print(f"  - {name}: {info['container_name']} ({info['type']})")
@@ -193,6 +221,100 @@ class DeployedComponentsExtractor:
         return 'Container'
 
 
+class LogPathCache:
+    """Process-wide cache of the log file location of each container.
+
+    Entries come from the exported Mininet script (every component started by
+    it tees its output to /logging/<name>.log) or from a single discovery exec,
+    and are dropped when the container restarts or the cached path fails.
+    """
+
+    TEE_LOG_PATTERN = re.compile(r"tee -a /logging/(\w+)\.log")
+
+    _entries = {}  # container_name -> {'path': str, 'started_at': str or None}
+    _seeded_script = None  # (script_path, mtime) the cache was last seeded from
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, container_name):
+        """Return the cached log path for a container, or None."""
+        cls.seedFromManifest()
+        with cls._lock:
+            entry = cls._entries.get(container_name)
+            return entry['path'] if entry else None
+
+    @classmethod
+    def store(cls, container_name, path, started_at=None):
+        """Remember where a container writes its log."""
+        with cls._lock:
+            cls._entries[container_name] = {'path': path, 'started_at': started_at}
+
+    @classmethod
+    def invalidate(cls, container_name):
+        """Forget the cached log path of a container."""
+        with cls._lock:
+            if cls._entries.pop(container_name, None):
+                debug_print(f"Invalidated cached log path for {container_name}")
+
+    @classmethod
+    def noteContainerStart(cls, container_name, started_at):
+        """Drop the cached path if the container restarted since it was cached."""
+        with cls._lock:
+            entry = cls._entries.get(container_name)
+            if not entry:
+                return
+            if entry['started_at'] is None:
+                entry['started_at'] = started_at
+            elif entry['started_at'] != started_at:
+                del cls._entries[container_name]
+                debug_print(f"Container {container_name} restarted, dropped cached log path")
+
+    @classmethod
+    def seedFromManifest(cls):
+        """Fill the cache from the latest exported Mininet script, once per script version."""
+        script_path = DeployedComponentsExtractor._findLatestMininetScript()
+        if not script_path:
+            return
+        try:
+            key = (script_path, os.path.getmtime(script_path))
+            if key == cls._seeded_script:
+                return
+            with open(script_path, 'r') as f:
+                names = set(cls.TEE_LOG_PATTERN.findall(f.read()))
+        except Exception as e:
+            debug_print(f"Could not seed log path cache from {script_path}: {e}")
+            return
+
+        with cls._lock:
+            if key == cls._seeded_script:
+                return
+            # A new deployment replaces whatever the previous one told us
+            if cls._seeded_script is not None:
+                cls._entries.clear()
+            cls._seeded_script = key
+            for name in names:
+                if name.endswith('_capture'):
+                    continue
+                cls._entries.setdefault(f"mn.{name}", {'path': f"/logging/{name}.log", 'started_at': None})
+        debug_print(f"Seeded log path cache with {len(names)} entries from {script_path}")
+
+    @staticmethod
+    def discover(container_name, candidate_paths):
+        """Find the first existing candidate path with a single docker exec."""
+        script = "ls -1 {} 2>/dev/null; true".format(" ".join(shlex.quote(p) for p in candidate_paths))
+        try:
+            result = subprocess.run(['docker', 'exec', container_name, 'sh', '-c', script],
+                                    capture_output=True, text=True, timeout=5)
+        except Exception as e:
+            debug_print(f"Log path discovery failed for {container_name}: {e}")
+            return None
+        existing = set(line.strip() for line in result.stdout.splitlines())
+        for path in candidate_paths:
+            if path in existing:
+                return path
+        return None
+
+
 class LogReaderWorker(QThread):
     """Worker thread to read logs without blocking the UI."""
     
@@ -292,63 +414,65 @@ class LogReaderWorker(QThread):
             self.log_error.emit(f"Error reading docker logs: {str(e)}")
     
     def _read_from_single_path(self):
-        """Read logs from a single file path inside the container."""
+        """Read logs from a single file path inside the container.
+
+        Returns:
+            bool: False if the file could not be read (e.g. it does not exist)
+        """
         try:
-            # First, try to get existing logs
-            cmd = ['docker', 'exec', self.container_name, 'tail', f'-{self.lines}', self.log_file_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            # One exec serves both the existing lines and, when following, new ones
+            cmd = ['docker', 'exec', self.container_name, 'tail', '-n', str(self.lines)]
+            if self.follow:
+                cmd.append('-f')
+            cmd.append(self.log_file_path)
+            self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                          universal_newlines=True, bufsize=1)
             
-            if result.returncode == 0 and result.stdout:
-                for line in result.stdout.splitlines():
-                    if not self.running:
-                        break
+            for line in iter(self.process.stdout.readline, ''):
+                if not self.running:
+                    break
+                if line:
                     timestamp = QDateTime.currentDateTime().toString("hh:mm:ss.zzz")
-                    formatted_line = f"[{timestamp}] {line}\n"
+                    formatted_line = f"[{timestamp}] {line.rstrip()}\n"
                     self.new_log_data.emit(formatted_line)
-            
-            # If follow is enabled, continue monitoring
-            if self.follow and self.running:
-                cmd = ['docker', 'exec', self.container_name, 'tail', '-f', self.log_file_path]
-                self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                                              universal_newlines=True, bufsize=1)
-                
-                for line in iter(self.process.stdout.readline, ''):
-                    if not self.running:
-                        break
-                    if line:
-                        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss.zzz")
-                        formatted_line = f"[{timestamp}] {line.rstrip()}\n"
-                        self.new_log_data.emit(formatted_line)
+
+            if self.running and self.process.wait() != 0:
+                stderr = self.process.stderr.read().strip()
+                debug_print(f"tail of {self.log_file_path} in {self.container_name} failed: {stderr}")
+                return False
+            return True
                         
         except Exception as e:
             self.log_error.emit(f"Error reading from {self.log_file_path}: {str(e)}")
+            return True
     
     def _read_from_multiple_paths(self):
-        """Try reading from multiple possible log file paths."""
-        log_found = False
-        
-        for log_path in self.log_file_path:
-            try:
-                # Check if log file exists
-                cmd = ['docker', 'exec', self.container_name, 'test', '-f', log_path]
-                result = subprocess.run(cmd, capture_output=True, timeout=5)
-                
-                if result.returncode == 0:
-                    debug_print(f"Found log file at {log_path} for {self.container_name}")
-                    self.log_file_path = log_path
-                    log_found = True
-                    self._read_from_single_path()
-                    return
-                    
-            except Exception as e:
-                debug_print(f"Failed to check log path {log_path}: {e}")
-                continue
-        
-        if not log_found:
-            # Fallback to docker logs
-            self.log_error.emit(f"No log files found in container, falling back to docker logs")
-            self.log_file_path = "docker_logs"
-            self._read_docker_logs()
+        """Read from the cached log path, discovering it first if needed."""
+        candidate_paths = self.log_file_path
+
+        cached_path = LogPathCache.get(self.container_name)
+        if cached_path:
+            self.log_file_path = cached_path
+            if self._read_from_single_path():
+                return
+            # Stale entry (container recreated or path moved); rediscover
+            LogPathCache.invalidate(self.container_name)
+            if not self.running:
+                return
+
+        log_path = LogPathCache.discover(self.container_name, candidate_paths)
+        if log_path:
+            debug_print(f"Found log file at {log_path} for {self.container_name}")
+            LogPathCache.store(self.container_name, log_path)
+            self.log_file_path = log_path
+            if self._read_from_single_path():
+                return
+            LogPathCache.invalidate(self.container_name)
+
+        # Fallback to docker logs
+        self.log_error.emit(f"No log files found in container, falling back to docker logs")
+        self.log_file_path = "docker_logs"
+        self._read_docker_logs()
 
 
 class LogViewerDialog(QDialog):
@@ -432,11 +556,14 @@ class LogViewerDialog(QDialog):
         self.clear_btn = QPushButton("Clear")
         self.save_btn = QPushButton("Save to File")
         self.stop_btn = QPushButton("Stop Following")
+        self.history_btn = QPushButton("History...")
+        self.history_btn.setToolTip("Search the archived logs of finished runs")
         
         control_layout.addWidget(self.refresh_btn)
         control_layout.addWidget(self.clear_btn)
         control_layout.addWidget(self.save_btn)
         control_layout.addWidget(self.stop_btn)
+        control_layout.addWidget(self.history_btn)
         
         layout.addWidget(control_panel)
         
@@ -467,6 +594,7 @@ class LogViewerDialog(QDialog):
         self.clear_btn.clicked.connect(self.clearLogs)
         self.save_btn.clicked.connect(self.saveLogs)
         self.stop_btn.clicked.connect(self.stopFollowing)
+        self.history_btn.clicked.connect(self.openLogHistory)
         
         # Connect container selector if available
         if self.container_selector:
@@ -547,6 +675,12 @@ class LogViewerDialog(QDialog):
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to save logs: {str(e)}")
     
+    def openLogHistory(self):
+        """Open the archive search for finished runs, scoped to this component."""
+        component = self.container_name[3:] if self.container_name.startswith('mn.') else self.container_name
+        dialog = LogArchiveDialog(self, component=component)
+        dialog.show()
+
     def stopFollowing(self):
         """Stop following logs."""
         if self.log_worker:
@@ -560,3 +694,211 @@ class LogViewerDialog(QDialog):
             self.log_worker.stop()
             self.log_worker.wait()
         event.accept()
+
+
+class LogArchiveIndexWorker(QThread):
+    """Worker thread that indexes the logs of all finished runs."""
+
+    indexing_finished = pyqtSignal(int, int)  # runs, lines added
+    indexing_error = pyqtSignal(str)
+
+    def run(self):
+        """Index every run found under export/mininet."""
+        archive = None
+        try:
+            archive = LogArchive()
+            results = archive.index_all_runs()
+            self.indexing_finished.emit(len(results), sum(results.values()))
+        except Exception as e:
+            self.indexing_error.emit(str(e))
+        finally:
+            if archive:
+                archive.close()
+
+
+class LogArchiveDialog(QDialog):
+    """Dialog for searching the indexed logs of finished runs."""
+
+    SEVERITY_COLORS = {
+        'WARNING': '#b58900',
+        'ERROR': '#dc322f',
+        'FATAL': '#d33682',
+    }
+
+    def __init__(self, parent=None, component=None):
+        super().__init__(parent)
+        self.archive = LogArchive()
+        self.index_worker = None
+        self.initial_component = component
+
+        self.setupUI()
+        self.setupConnections()
+        self.reloadRuns()
+        self.reindexRuns()
+
+    def setupUI(self):
+        """Setup the user interface."""
+        self.setWindowTitle("Log History - Finished Runs")
+        self.resize(1000, 600)
+
+        layout = QVBoxLayout(self)
+
+        filter_panel = QGroupBox("Search")
+        filter_layout = QVBoxLayout(filter_panel)
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Run:"))
+        self.run_selector = QComboBox()
+        self.run_selector.setMinimumWidth(240)
+        row.addWidget(self.run_selector)
+        row.addWidget(QLabel("Component:"))
+        self.component_selector = QComboBox()
+        self.component_selector.setMinimumWidth(140)
+        row.addWidget(self.component_selector)
+        row.addWidget(QLabel("Min. severity:"))
+        self.severity_selector = QComboBox()
+        self.severity_selector.addItem("Any")
+        self.severity_selector.addItems(SEVERITY_LEVELS)
+        row.addWidget(self.severity_selector)
+        row.addStretch()
+        filter_layout.addLayout(row)
+
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Keywords:"))
+        self.keyword_edit = QLineEdit()
+        self.keyword_edit.setPlaceholderText("e.g. registration imsi-001010000000001")
+        row.addWidget(self.keyword_edit)
+        self.time_range_cb = QCheckBox("From")
+        row.addWidget(self.time_range_cb)
+        self.start_time_edit = QDateTimeEdit(QDateTime.currentDateTime().addSecs(-3600))
+        self.start_time_edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.start_time_edit.setCalendarPopup(True)
+        self.start_time_edit.setEnabled(False)
+        row.addWidget(self.start_time_edit)
+        row.addWidget(QLabel("to"))
+        self.end_time_edit = QDateTimeEdit(QDateTime.currentDateTime())
+        self.end_time_edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.end_time_edit.setCalendarPopup(True)
+        self.end_time_edit.setEnabled(False)
+        row.addWidget(self.end_time_edit)
+        self.search_btn = QPushButton("Search")
+        self.search_btn.setDefault(True)
+        row.addWidget(self.search_btn)
+        self.reindex_btn = QPushButton("Re-index")
+        self.reindex_btn.setToolTip("Index logs of runs that are not in the archive yet")
+        row.addWidget(self.reindex_btn)
+        filter_layout.addLayout(row)
+
+        layout.addWidget(filter_panel)
+
+        self.results_table = QTableWidget(0, 5)
+        self.results_table.setHorizontalHeaderLabels(["Time", "Run", "Component", "Severity", "Message"])
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.setFont(QFont("Courier", 9))
+        header = self.results_table.horizontalHeader()
+        for column in range(4):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(4, QHeaderView.Stretch)
+        layout.addWidget(self.results_table)
+
+        self.status_label = QLabel("Ready")
+        layout.addWidget(self.status_label)
+
+    def setupConnections(self):
+        """Setup signal connections."""
+        self.search_btn.clicked.connect(self.runSearch)
+        self.keyword_edit.returnPressed.connect(self.runSearch)
+        self.reindex_btn.clicked.connect(self.reindexRuns)
+        self.run_selector.currentIndexChanged.connect(self.reloadComponents)
+        self.time_range_cb.toggled.connect(self.start_time_edit.setEnabled)
+        self.time_range_cb.toggled.connect(self.end_time_edit.setEnabled)
+
+    def reloadRuns(self):
+        """Refresh the run selector from the archive."""
+        current = self.run_selector.currentData()
+        self.run_selector.blockSignals(True)
+        self.run_selector.clear()
+        self.run_selector.addItem("All runs", None)
+        for run in self.archive.list_runs():
+            self.run_selector.addItem(run['run_id'], run['run_id'])
+        index = self.run_selector.findData(current)
+        self.run_selector.setCurrentIndex(index if index >= 0 else 0)
+        self.run_selector.blockSignals(False)
+        self.reloadComponents()
+
+    def reloadComponents(self):
+        """Refresh the component selector for the selected run."""
+        current = self.component_selector.currentData() or self.initial_component
+        self.component_selector.clear()
+        self.component_selector.addItem("All components", None)
+        for component in self.archive.list_components(self.run_selector.currentData()):
+            self.component_selector.addItem(component, component)
+        index = self.component_selector.findData(current)
+        self.component_selector.setCurrentIndex(index if index >= 0 else 0)
+
+    def reindexRuns(self):
+        """Index new or grown run logs in the background."""
+        if self.index_worker and self.index_worker.isRunning():
+            return
+        self.reindex_btn.setEnabled(False)
+        self.status_label.setText("Indexing finished runs...")
+        self.index_worker = LogArchiveIndexWorker()
+        self.index_worker.indexing_finished.connect(self.onIndexingFinished)
+        self.index_worker.indexing_error.connect(self.onIndexingError)
+        self.index_worker.start()
+
+    def onIndexingFinished(self, runs, lines):
+        """Handle completion of background indexing."""
+        self.reindex_btn.setEnabled(True)
+        self.initial_component = self.component_selector.currentData() or self.initial_component
+        self.reloadRuns()
+        self.status_label.setText(f"Archive up to date: {runs} runs, {lines} new lines indexed")
+
+    def onIndexingError(self, error_msg):
+        """Handle a background indexing failure."""
+        self.reindex_btn.setEnabled(True)
+        error_print(f"Log archive indexing failed: {error_msg}")
+        self.status_label.setText(f"Indexing failed: {error_msg}")
+
+    def runSearch(self):
+        """Query the archive with the current filters and show the results."""
+        start_ms = end_ms = None
+        if self.time_range_cb.isChecked():
+            start_ms = self.start_time_edit.dateTime().toMSecsSinceEpoch()
+            end_ms = self.end_time_edit.dateTime().toMSecsSinceEpoch()
+        severity = self.severity_selector.currentText()
+
+        started = time.time()
+        rows = self.archive.search(
+            keyword=self.keyword_edit.text().strip() or None,
+            run_id=self.run_selector.currentData(),
+            component=self.component_selector.currentData(),
+            min_severity=None if severity == "Any" else severity,
+            start_ms=start_ms,
+            end_ms=end_ms,
+        )
+        elapsed_ms = (time.time() - started) * 1000
+
+        self.results_table.setUpdatesEnabled(False)
+        self.results_table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            stamp = QDateTime.fromMSecsSinceEpoch(row['ts']).toString("yyyy-MM-dd HH:mm:ss.zzz") if row['ts'] else ""
+            values = [stamp, row['run_id'], row['component'], row['severity'], row['message']]
+            color = self.SEVERITY_COLORS.get(row['severity'])
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if color:
+                    item.setForeground(QColor(color))
+                self.results_table.setItem(i, column, item)
+        self.results_table.setUpdatesEnabled(True)
+
+        self.status_label.setText(f"{len(rows)} lines found in {elapsed_ms:.1f} ms")
+
+    def closeEvent(self, event):
+        """Handle window close event."""
+        if self.index_worker and self.index_worker.isRunning():
+            self.index_worker.wait()
+        self.archive.close()
+        event.accept()
@@ -20,7 +20,11 @@ import subprocess
 import os
 import re
 import time
+import shutil
 from utils.debug import debug_print, error_print, warning_print
+from utils.capture_index import CaptureIndex, compile_filter, FilterSyntaxError, FilterNeedsDissection
+
+FRAME_HEADER_RE = re.compile(r'^Frame (\d+):', re.MULTILINE)
 
 
 class DeployedComponentsExtractor:
@@ -216,6 +220,10 @@ class PacketReaderWorker(QThread):
         self.capture_file_path = None
         self.process = None
         self.last_packet_count = 0
+        self.capture_index = None
+        self.index_predicate = None
+        self.index_position = 0  # index records already scanned in follow mode
+        self.index_unusable = False
         
         # Determine capture file path based on component
         self._determine_capture_file_path()
@@ -228,8 +236,63 @@ class PacketReaderWorker(QThread):
         # Standard capture file path: /captures/{component_name}.pcapng
         self.capture_file_path = f"/captures/{actual_component_name}.pcapng"
         
+        # The captures folder is bind-mounted from the latest export, so the
+        # same file can be indexed on the host without going through docker
+        self.host_capture_path = None
+        script_path = DeployedComponentsExtractor._findLatestMininetScript()
+        if script_path:
+            self.host_capture_path = os.path.join(os.path.dirname(script_path), 'captures',
+                                                  f"{actual_component_name}.pcapng")
+        
         debug_print(f"Capture file path for {self.container_name}: {self.capture_file_path}")
     
+    def _open_capture_index(self):
+        """Open the frame index of the capture if the display filter can be evaluated on it."""
+        if self.index_unusable or not self.host_capture_path or not os.path.exists(self.host_capture_path):
+            return False
+        try:
+            self.index_predicate = compile_filter(self.display_filter)
+        except FilterSyntaxError as e:
+            debug_print(f"Display filter not indexable ({e}), using tshark -Y")
+            return False
+        try:
+            self.capture_index = CaptureIndex(self.host_capture_path)
+            self.capture_index.update()
+            return True
+        except Exception as e:
+            warning_print(f"Could not index {self.host_capture_path}: {e}")
+            self.capture_index = None
+            return False
+    
+    def _dissect_indexed_frames(self, records, exact=True):
+        """Run full tshark dissection on the given indexed frames only.
+
+        Unless exact, the frames are candidates (see CaptureIndex.scan()) and
+        the display filter is applied to them with tshark -Y.
+        """
+        subset_name = f".viewer_{os.path.basename(self.host_capture_path)}"
+        subset_path = os.path.join(os.path.dirname(self.host_capture_path), subset_name)
+        self.capture_index.write_subset(records, subset_path)
+        
+        if shutil.which('tshark'):
+            tshark_cmd = ['tshark', '-r', subset_path, '-T', 'text', '-V']
+        else:
+            tshark_cmd = ['docker', 'exec', self.container_name,
+                          'tshark', '-r', f"/captures/{subset_name}", '-T', 'text', '-V']
+        if not exact:
+            tshark_cmd.extend(['-c', str(self.packet_count), '-Y', self.display_filter.strip()])
+        
+        debug_print(f"Dissecting {len(records)} indexed frames: {' '.join(tshark_cmd)}")
+        result = subprocess.run(tshark_cmd, capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            raise RuntimeError(f"tshark error: {result.stderr}" if result.stderr else "tshark command failed")
+        
+        # Frames are renumbered in the subset; label them with their capture numbers
+        def capture_number(match):
+            position = int(match.group(1)) - 1
+            return f"Frame {records[position].number if position < len(records) else match.group(1)}:"
+        return FRAME_HEADER_RE.sub(capture_number, result.stdout)
+    
     def stop(self):
         """Stop the packet reading thread."""
         self.running = False
@@ -257,6 +320,20 @@ class PacketReaderWorker(QThread):
     def _read_static_capture(self):
         """Read a static capture file (non-follow mode)."""
         try:
+            if self._open_capture_index():
+                try:
+                    records, exact = self.capture_index.select(self.index_predicate, limit=self.packet_count)
+                except FilterNeedsDissection as e:
+                    debug_print(f"Display filter not decidable on the index ({e}), using tshark -Y")
+                    records = None
+                if records is not None:
+                    packet_data = self._dissect_indexed_frames(records, exact) if records else None
+                    if packet_data:
+                        self.new_packet_data.emit(packet_data)
+                    else:
+                        self.capture_error.emit("No packets found matching the criteria")
+                    return
+            
             # Check if capture file exists first
             check_cmd = ['docker', 'exec', self.container_name, 'test', '-f', self.capture_file_path]
             result = subprocess.run(check_cmd, capture_output=True, timeout=5)
@@ -302,53 +379,16 @@ class PacketReaderWorker(QThread):
         try:
             # In follow mode, we periodically check for new packets
             while self.running:
-                # Check if capture file exists
-                check_cmd = ['docker', 'exec', self.container_name, 'test', '-f', self.capture_file_path]
-                result = subprocess.run(check_cmd, capture_output=True, timeout=5)
-                
-                if result.returncode != 0:
-                    # File doesn't exist yet, wait a bit
-                    time.sleep(2)
-                    continue
-                
-                # Get current packet count
-                count_cmd = [
-                    'docker', 'exec', self.container_name,
-                    'tshark', '-r', self.capture_file_path, '-T', 'fields', '-e', 'frame.number'
-                ]
-                
                 try:
-                    count_result = subprocess.run(count_cmd, capture_output=True, text=True, timeout=10)
-                    if count_result.returncode == 0:
-                        lines = count_result.stdout.strip().split('\n')
-                        current_packet_count = len([line for line in lines if line.strip()])
-                        
-                        # Check if there are new packets
-                        if current_packet_count > self.last_packet_count:
-                            # Read new packets
-                            new_packets_to_read = min(10, current_packet_count - self.last_packet_count)  # Read max 10 new packets at a time
-                            
-                            # Read the new packets
-                            tshark_cmd = [
-                                'docker', 'exec', self.container_name,
-                                'tshark', '-r', self.capture_file_path,
-                                '-T', 'text', '-V',
-                                '-c', str(new_packets_to_read),
-                                '-o', f'frame.offset:{self.last_packet_count}'
-                            ]
-                            
-                            # Add display filter if specified
-                            if self.display_filter.strip():
-                                tshark_cmd.extend(['-Y', self.display_filter.strip()])
-                            
-                            packet_result = subprocess.run(tshark_cmd, capture_output=True, text=True, timeout=15)
-                            
-                            if packet_result.returncode == 0 and packet_result.stdout:
-                                timestamp = QDateTime.currentDateTime().toString("hh:mm:ss.zzz")
-                                formatted_output = f"\n[{timestamp}] === New packets detected ===\n{packet_result.stdout}\n"
-                                self.new_packet_data.emit(formatted_output)
-                            
-                            self.last_packet_count = current_packet_count
+                    if self.capture_index is not None or self._open_capture_index():
+                        packet_data = self._read_new_indexed_packets()
+                    else:
+                        packet_data = self._read_new_packets_in_container()
+                    
+                    if packet_data:
+                        timestamp = QDateTime.currentDateTime().toString("hh:mm:ss.zzz")
+                        formatted_output = f"\n[{timestamp}] === New packets detected ===\n{packet_data}\n"
+                        self.new_packet_data.emit(formatted_output)
                 
                 except subprocess.TimeoutExpired:
                     pass  # Continue monitoring
@@ -361,6 +401,55 @@ class PacketReaderWorker(QThread):
                     
         except Exception as e:
             self.capture_error.emit(f"Error following capture file: {str(e)}")
+    
+    def _read_new_indexed_packets(self):
+        """Index frames appended since the last poll and dissect the matching ones."""
+        generation = self.capture_index.generation
+        self.capture_index.update()
+        if self.capture_index.generation != generation:
+            # The capture was restarted and indexed again
+            self.index_position = 0
+        try:
+            records, exact, self.index_position = self.capture_index.scan(self.index_predicate, self.index_position,
+                                                                          limit=self.packet_count)
+        except FilterNeedsDissection as e:
+            debug_print(f"Display filter not decidable on the index ({e}), using tshark -Y")
+            self.capture_index = None
+            self.index_unusable = True
+            return self._read_new_packets_in_container()
+        if not records:
+            return None
+        self.last_packet_count = records[-1].number
+        return self._dissect_indexed_frames(records, exact)
+    
+    def _read_new_packets_in_container(self):
+        """Read frames after the last seen one with tshark inside the container."""
+        check_cmd = ['docker', 'exec', self.container_name, 'test', '-f', self.capture_file_path]
+        result = subprocess.run(check_cmd, capture_output=True, timeout=5)
+        if result.returncode != 0:
+            # File doesn't exist yet
+            return None
+        
+        display_filter = f"frame.number > {self.last_packet_count}"
+        if self.display_filter.strip():
+            display_filter += f" and ({self.display_filter.strip()})"
+        
+        tshark_cmd = [
+            'docker', 'exec', self.container_name,
+            'tshark', '-r', self.capture_file_path,
+            '-T', 'text', '-V',
+            '-c', str(self.packet_count),
+            '-Y', display_filter
+        ]
+        
+        packet_result = subprocess.run(tshark_cmd, capture_output=True, text=True, timeout=15)
+        if packet_result.returncode != 0 or not packet_result.stdout:
+            return None
+        
+        numbers = [int(n) for n in FRAME_HEADER_RE.findall(packet_result.stdout)]
+        if numbers:
+            self.last_packet_count = max(numbers)
+        return packet_result.stdout
 
 
 class PacketCaptureViewerDialog(QDialog):
@@ -1,10 +1,15 @@
 import os
 import sys
 import traceback
-from PyQt5.QtWidgets import QApplication, QMainWindow, QSplitter, QMenuBar, QMenu, QAction, QMessageBox
+
+# Startup profiling (--profile-startup) has to start before the modules it measures are imported
+from utils import startup_profiler
+if "--profile-startup" in sys.argv:
+    startup_profiler.enable()
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QSplitter, QMenuBar, QMenu, QAction
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon, QKeySequence, QPixmap, QCursor
-from PyQt5 import uic
 
 # Import
 from gui.canvas import Canvas
@@ -13,75 +18,85 @@ from gui.window import WindowManager
 from gui.status import StatusManager
 from gui.component_panel import ComponentPanelManager
 from gui.welcome import WelcomeScreenManager
+from gui.topology_model import TopologyModel
+from gui.undo_stack import UndoStack
+from gui.ui_loader import load_ui
 from manager.file import FileManager
+from manager.journal import JournalManager
+from manager.workspace import WorkspaceManager
+from manager.validation import ValidationManager
 from manager.tool import ToolManager
 from manager.canvas import CanvasManager
 from manager.automation import AutomationManager
 from manager.keyboard import KeyboardManager
 from manager.component_operations import ComponentOperationsManager
-from manager.docker_network import DockerNetworkManager
-from manager.database import DatabaseManager
-from manager.monitoring import MonitoringManager
-from manager.controller import ControllerManager
-from manager.packet_analyzer import PacketAnalyzerManager
-from manager.deployment_monitor import DeploymentMonitorManager
-from manager.challenge import ChallengeManager
 from utils.debug import debug_print, error_print, warning_print, set_debug_enabled, is_debug_enabled
 from utils.template_updater import TemplateUpdater
-
-from export.mininet_export import MininetExporter
-from automation.automation_runner import AutomationRunner
+from utils.lazy_loader import LazyManager, is_created
+from utils.startup_profiler import measure
 
 # Load the UI file
 UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gui", "ui", "Main_Window.ui")
 
 class NetFlux5GApp(QMainWindow):
+    # Managers only needed to deploy, monitor or export are imported and
+    # created the first time they are used (see utils/lazy_loader.py)
+    docker_network_manager = LazyManager('manager.docker_network', 'DockerNetworkManager')
+    database_manager = LazyManager('manager.database', 'DatabaseManager')
+    monitoring_manager = LazyManager('manager.monitoring', 'MonitoringManager')
+    controller_manager = LazyManager('manager.controller', 'ControllerManager')
+    packet_analyzer_manager = LazyManager('manager.packet_analyzer', 'PacketAnalyzerManager')
+    deployment_monitor_manager = LazyManager('manager.deployment_monitor', 'DeploymentMonitorManager')
+    challenge_manager = LazyManager('manager.challenge', 'ChallengeManager')
+    mininet_exporter = LazyManager('export.mininet_export', 'MininetExporter')
+    automation_runner = LazyManager(
+        'automation.automation_runner', 'AutomationRunner',
+        on_create=lambda window, runner: runner.execution_finished.connect(window.onTopologyExecutionFinished))
+
     def __init__(self, show_welcome=True):
         super().__init__()
         
         # Load the UI file
-        uic.loadUi(UI_FILE, self)
+        with measure("Load Main_Window.ui"):
+            load_ui(UI_FILE, self)
 
         # Initialize component mapping for icons FIRST
         self.setupComponentIconMap()
         
         # Initialize managers
-        self.window_manager = WindowManager(self)
-        self.status_manager = StatusManager(self)
-        self.component_panel_manager = ComponentPanelManager(self)
-        self.file_manager = FileManager(self)
-        self.tool_manager = ToolManager(self)
-        self.canvas_manager = CanvasManager(self)
-        self.automation_manager = AutomationManager(self)
-        self.keyboard_manager = KeyboardManager(self)
-        self.component_operations_manager = ComponentOperationsManager(self)
-        self.welcome_manager = WelcomeScreenManager(self)
-        self.docker_network_manager = DockerNetworkManager(self)
-        self.database_manager = DatabaseManager(self)
-        self.monitoring_manager = MonitoringManager(self)
-        self.controller_manager = ControllerManager(self)
-        self.packet_analyzer_manager = PacketAnalyzerManager(self)
-        self.deployment_monitor_manager = DeploymentMonitorManager(self)
-        self.challenge_manager = ChallengeManager(self)
-        self.template_updater = TemplateUpdater(self)
-        
-        # Initialize other components
-        self.toolbar_functions = ToolbarFunctions(self)
-        self.mininet_exporter = MininetExporter(self)
-        self.automation_runner = AutomationRunner(self)
+        with measure("Create managers"):
+            self.window_manager = WindowManager(self)
+            self.status_manager = StatusManager(self)
+            self.component_panel_manager = ComponentPanelManager(self)
+            self.file_manager = FileManager(self)
+            self.tool_manager = ToolManager(self)
+            self.canvas_manager = CanvasManager(self)
+            self.automation_manager = AutomationManager(self)
+            self.keyboard_manager = KeyboardManager(self)
+            self.component_operations_manager = ComponentOperationsManager(self)
+            self.welcome_manager = WelcomeScreenManager(self)
+            self.template_updater = TemplateUpdater(self)
+            self.journal_manager = JournalManager(self)
+            self.workspace_manager = WorkspaceManager(self)
+            self.validation_manager = ValidationManager(self)
+            
+            # Initialize other components
+            self.toolbar_functions = ToolbarFunctions(self)
 
         # Initialize grid attribute
         self.show_grid = False
         
         # Setup window
-        self.window_manager.setupWindow()
+        with measure("Setup window"):
+            self.window_manager.setupWindow()
         
         # Add Debug menu
         self.setupDebugMenu()
         
         # Set up the canvas and component panel
-        self.setupCanvas()
-        self.component_panel_manager.setupComponentPanel()
+        with measure("Setup canvas and component panel"):
+            self.setupCanvas()
+            self.component_panel_manager.setupComponentPanel()
         # self.component_panel_manager.setupComponentPanelToggle()
         
         # Initialize attributes
@@ -96,27 +111,27 @@ class NetFlux5GApp(QMainWindow):
         self.placement_component_type = None
         
         # Setup all connections
-        self.setupConnections()
+        with measure("Setup connections and UI states"):
+            self.setupConnections()
 
-        # Setup initial UI states
-        self.setupInitialUIStates()
+            # Setup initial UI states
+            self.setupInitialUIStates()
 
-        # Debug menu actions
-        self.debugMenuActions()
+            # Debug menu actions
+            self.debugMenuActions()
 
-        # Update template files with correct config paths
-        debug_print("Updating template configuration paths...")
-        if self.template_updater.update_all_templates():
-            debug_print("Template configuration paths updated successfully")
+        # Check template config paths (only templates changed since the last run are read)
+        debug_print("Checking template configuration paths...")
+        with measure("Check template paths"):
+            templates_checked = self.template_updater.update_all_templates()
+        if templates_checked:
+            debug_print("Template configuration paths checked successfully")
         else:
             warning_print("Failed to update some template configuration paths")
 
-        # Setup challenge directories
-        debug_print("Setting up challenge system...")
-        if self.challenge_manager.setupChallengeDirectories():
-            debug_print("Challenge system setup completed")
-        else:
-            warning_print("Failed to setup challenge directories")
+        # Start the crash-safe autosave journal
+        with measure("Start autosave journal"):
+            self.journal_manager.start()
 
         # Initialize window title
         self.updateWindowTitle()
@@ -161,7 +176,8 @@ class NetFlux5GApp(QMainWindow):
                 self.ObjectFrame.setMinimumWidth(240)
                 self.ObjectFrame.setMaximumWidth(240)
             self.canvas_view = Canvas(self)
-            self.main_splitter.addWidget(self.canvas_view)
+            # Open topologies are tabs above the canvas
+            self.main_splitter.addWidget(self.workspace_manager.setupWorkspace())
             self.main_splitter.setSizes([240, 1000])
             self.main_splitter.setStretchFactor(0, 0)
             self.main_splitter.setStretchFactor(1, 1)
@@ -174,6 +190,7 @@ class NetFlux5GApp(QMainWindow):
         except Exception as e:
             error_print(f"ERROR: Failed to setup canvas: {e}")
             self.canvas_view = Canvas(self)
+            self.workspace_manager.setupWorkspace()
             self.setCentralWidget(self.canvas_view)
 
     def onSplitterMoved(self, pos, index):
@@ -198,9 +215,9 @@ class NetFlux5GApp(QMainWindow):
         try:
             # Menu connections
             if hasattr(self, 'actionNew'):
-                self.actionNew.triggered.connect(self.file_manager.newTopology)
+                self.actionNew.triggered.connect(self.workspace_manager.newTopology)
             if hasattr(self, 'actionOpen'):
-                self.actionOpen.triggered.connect(self.file_manager.openTopology)
+                self.actionOpen.triggered.connect(self.workspace_manager.openTopology)
             if hasattr(self, 'actionSave'):
                 self.actionSave.triggered.connect(self.file_manager.saveTopology)
             if hasattr(self, 'actionSave_As'):
@@ -208,7 +225,11 @@ class NetFlux5GApp(QMainWindow):
             if hasattr(self, 'actionExport_to_Level_2_Script'):
                 self.actionExport_to_Level_2_Script.triggered.connect(self.automation_manager.exportToMininet)
 
-            # Edit menu connections - Cut, Copy, Paste
+            # Edit menu connections - Undo, Redo, Cut, Copy, Paste
+            if hasattr(self, 'actionUndo'):
+                self.actionUndo.triggered.connect(self.undo)
+            if hasattr(self, 'actionRedo'):
+                self.actionRedo.triggered.connect(self.redo)
             if hasattr(self, 'actionCut'):
                 self.actionCut.triggered.connect(self.component_operations_manager.cutComponent)
             if hasattr(self, 'actionCopy'):
@@ -242,55 +263,61 @@ class NetFlux5GApp(QMainWindow):
             if hasattr(self, 'actionStop'):
                 self.actionStop.triggered.connect(self.automation_manager.stopTopology)
 
+            # The managers below are created on first use, so the actions look them up when triggered
+
             # Docker network connections
             if hasattr(self, 'actionCreate_Docker_Network'):
-                self.actionCreate_Docker_Network.triggered.connect(self.docker_network_manager.create_docker_network)
+                self.actionCreate_Docker_Network.triggered.connect(lambda: self.docker_network_manager.create_docker_network())
             if hasattr(self, 'actionDelete_Docker_Network'):
-                self.actionDelete_Docker_Network.triggered.connect(self.docker_network_manager.delete_docker_network)
+                self.actionDelete_Docker_Network.triggered.connect(lambda: self.docker_network_manager.delete_docker_network())
 
             # Database connections
             if hasattr(self, 'actionDeploy_Database'):
-                self.actionDeploy_Database.triggered.connect(self.database_manager.deployDatabase)
+                self.actionDeploy_Database.triggered.connect(lambda: self.database_manager.deployDatabase())
             if hasattr(self, 'actionStop_Database'):
-                self.actionStop_Database.triggered.connect(self.database_manager.stopDatabase)
+                self.actionStop_Database.triggered.connect(lambda: self.database_manager.stopDatabase())
 
             # Web UI connections
             if hasattr(self, 'actionDeploy_User_Manager'):
-                self.actionDeploy_User_Manager.triggered.connect(self.database_manager.deployWebUI)
+                self.actionDeploy_User_Manager.triggered.connect(lambda: self.database_manager.deployWebUI())
             if hasattr(self, 'actionStop_User_Manager'):
-                self.actionStop_User_Manager.triggered.connect(self.database_manager.stopWebUI)
+                self.actionStop_User_Manager.triggered.connect(lambda: self.database_manager.stopWebUI())
 
             # Monitoring connections
             if hasattr(self, 'actionDeploy_Monitoring'):
-                self.actionDeploy_Monitoring.triggered.connect(self.monitoring_manager.deployMonitoring)
+                self.actionDeploy_Monitoring.triggered.connect(lambda: self.monitoring_manager.deployMonitoring())
             if hasattr(self, 'actionStop_Monitoring'):
-                self.actionStop_Monitoring.triggered.connect(self.monitoring_manager.stopMonitoring)
+                self.actionStop_Monitoring.triggered.connect(lambda: self.monitoring_manager.stopMonitoring())
 
             # Packet Analyzer connections
             if hasattr(self, 'actionDeploy_Packet_Analyzer'):
-                self.actionDeploy_Packet_Analyzer.triggered.connect(self.packet_analyzer_manager.deployPacketAnalyzer)
+                self.actionDeploy_Packet_Analyzer.triggered.connect(lambda: self.packet_analyzer_manager.deployPacketAnalyzer())
             if hasattr(self, 'actionStop_Packet_Analyzer'):
-                self.actionStop_Packet_Analyzer.triggered.connect(self.packet_analyzer_manager.stopPacketAnalyzer)
+                self.actionStop_Packet_Analyzer.triggered.connect(lambda: self.packet_analyzer_manager.stopPacketAnalyzer())
 
             # Ryu Controller connections
             if hasattr(self, 'actionDeploy_Ryu_Controller'):
-                self.actionDeploy_Ryu_Controller.triggered.connect(self.controller_manager.deployRyuController)
+                self.actionDeploy_Ryu_Controller.triggered.connect(lambda: self.controller_manager.deployRyuController())
             if hasattr(self, 'actionStop_Ryu_Controller'):
-                self.actionStop_Ryu_Controller.triggered.connect(self.controller_manager.stopRyuController)
+                self.actionStop_Ryu_Controller.triggered.connect(lambda: self.controller_manager.stopRyuController())
             
             # ONOS Controller connections
             if hasattr(self, 'actionDeploy_ONOS_Controller'):
-                self.actionDeploy_ONOS_Controller.triggered.connect(self.controller_manager.deployOnosController)
+                self.actionDeploy_ONOS_Controller.triggered.connect(lambda: self.controller_manager.deployOnosController())
             if hasattr(self, 'actionStop_ONOS_Controller'):
-                self.actionStop_ONOS_Controller.triggered.connect(self.controller_manager.stopOnosController)
+                self.actionStop_ONOS_Controller.triggered.connect(lambda: self.controller_manager.stopOnosController())
 
             # Clear MongoDB data
             if hasattr(self, 'actionClear_DB_Data'):
-                self.actionClear_DB_Data.triggered.connect(self.database_manager.cleanupDatabase)
+                self.actionClear_DB_Data.triggered.connect(lambda: self.database_manager.cleanupDatabase())
 
-            # Automation runner signal connections
-            if hasattr(self, 'automation_runner'):
-                self.automation_runner.execution_finished.connect(self.onTopologyExecutionFinished)
+            # Challenge connections
+            if hasattr(self, 'actionShowChallengePanel'):
+                self.actionShowChallengePanel.triggered.connect(lambda: self.challenge_manager.toggleChallengePanel())
+            if hasattr(self, 'actionStartBasicChallenge'):
+                self.actionStartBasicChallenge.triggered.connect(lambda: self.challenge_manager.startBasicChallenge())
+            if hasattr(self, 'actionCreateCustomChallenge'):
+                self.actionCreateCustomChallenge.triggered.connect(lambda: self.challenge_manager.createCustomChallenge())
 
             # Component button connections
             if hasattr(self.component_panel_manager, 'component_widgets'):
@@ -386,6 +413,25 @@ class NetFlux5GApp(QMainWindow):
         """Delegate to canvas manager."""
         self.canvas_manager.toggleGrid()
 
+    # Undo/redo of canvas operations
+    def undo(self):
+        """Revert the last canvas operation."""
+        command = UndoStack.forScene(self.canvas_view.scene).undo()
+        if command:
+            self.onTopologyChanged()
+            self.showCanvasStatus(f"Undo: {command.description}")
+        else:
+            self.showCanvasStatus("Nothing to undo")
+
+    def redo(self):
+        """Re-apply the last undone canvas operation."""
+        command = UndoStack.forScene(self.canvas_view.scene).redo()
+        if command:
+            self.onTopologyChanged()
+            self.showCanvasStatus(f"Redo: {command.description}")
+        else:
+            self.showCanvasStatus("Nothing to redo")
+
     # Component operations delegates
     def cutComponent(self):
         """Delegate to component operations manager."""
@@ -409,13 +455,13 @@ class NetFlux5GApp(QMainWindow):
                 QTimer.singleShot(2000, self.deployment_monitor_manager.showMonitoringPanel)
             
             # Notify challenge system of successful topology deployment
-            if hasattr(self, 'challenge_manager'):
+            if is_created(self, 'challenge_manager'):
                 self.challenge_manager.onTopologyDeployed()
         else:
             error_print(f"Topology deployment failed: {message}")
             
             # Notify challenge system of deployment failure
-            if hasattr(self, 'challenge_manager'):
+            if is_created(self, 'challenge_manager'):
                 self.challenge_manager.onTopologyDeploymentFailed(message)
 
     def setupDebugMenu(self):
@@ -520,7 +566,8 @@ class NetFlux5GApp(QMainWindow):
         help_message = (
             "Mouse Navigation: Middle-click + drag to pan | Ctrl + Mouse wheel to zoom | "
             "Keyboard: P=Pick, D=Delete, L=Link, G=Grid, +/-=Zoom, 0=Reset Zoom, ESC=Pick Tool | "
-            "Edit: Ctrl+X=Cut, Ctrl+C=Copy, Ctrl+V=Paste | "
+            "Edit: Ctrl+Z=Undo, Ctrl+Shift+Z=Redo, Ctrl+X=Cut, Ctrl+C=Copy, Ctrl+V=Paste | "
+            "Tabs: Ctrl+Tab=Next Topology, Ctrl+W=Close Topology | "
             "Debug: Ctrl+Shift+D=Toggle Debug"
         )
         # Show for 5 seconds, then return to ready state
@@ -529,35 +576,20 @@ class NetFlux5GApp(QMainWindow):
     def closeEvent(self, event):
         """Handle application close event."""
         try:
-            # Check for unsaved changes
-            if self.has_unsaved_changes:
-                reply = QMessageBox.question(
-                    self,
-                    "Unsaved Changes",
-                    "You have unsaved changes in your topology.\n\n"
-                    "Do you want to save your changes before exiting?",
-                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
-                    QMessageBox.Save
-                )
-                
-                if reply == QMessageBox.Save:
-                    # Try to save the file
-                    self.file_manager.saveTopology()
-                    # Check if save was successful (user didn't cancel save dialog)
-                    if self.has_unsaved_changes:
-                        # Save was cancelled, so don't close
-                        event.ignore()
-                        return
-                elif reply == QMessageBox.Cancel:
-                    # User cancelled, don't close
-                    event.ignore()
-                    return
-                # If Discard was chosen, continue with closing
+            # Check every open topology for unsaved changes
+            if not self.workspace_manager.confirmCloseAll():
+                # Cancelled, or a save dialog was cancelled: don't close
+                event.ignore()
+                return
             
             # Clear component operations clipboard
             if hasattr(self, 'component_operations_manager'):
                 self.component_operations_manager.clearClipboard()
             
+            # Clean shutdown: the autosave journal is no longer needed
+            if hasattr(self, 'journal_manager'):
+                self.journal_manager.shutdown()
+            
             # Clean up status timer
             if hasattr(self.status_manager, '_status_timer') and self.status_manager._status_timer:
                 self.status_manager._status_timer.stop()
@@ -671,6 +703,8 @@ class NetFlux5GApp(QMainWindow):
     
     def markAsSaved(self):
         """Mark the current topology as saved (no unsaved changes)."""
+        if hasattr(self, 'journal_manager'):
+            self.journal_manager.noteSaved()
         if self.has_unsaved_changes:
             self.has_unsaved_changes = False
             self.updateWindowTitle()
@@ -692,10 +726,24 @@ class NetFlux5GApp(QMainWindow):
             title += " *"
         
         self.setWindowTitle(title)
+        if hasattr(self, 'workspace_manager'):
+            self.workspace_manager.updateTabTitle()
 
     def onTopologyChanged(self):
         """Called when the topology is changed (components added/removed/modified)."""
+        if hasattr(self, 'canvas_view') and self.canvas_view.bulk_loading:
+            # Items created by a bulk load are not user changes
+            return
         self.markAsModified()
+        # Publish a fresh snapshot for background workers (coalesced)
+        if hasattr(self, 'canvas_view'):
+            TopologyModel.forScene(self.canvas_view.scene).scheduleSnapshot()
+        # Journal the change for crash recovery (coalesced)
+        if hasattr(self, 'journal_manager'):
+            self.journal_manager.scheduleAutosave()
+        # Check the edited topology (coalesced)
+        if hasattr(self, 'validation_manager'):
+            self.validation_manager.scheduleValidation()
 
     def setupInitialUIStates(self):
         """Setup initial UI button states."""
@@ -748,22 +796,42 @@ if __name__ == "__main__":
     if update_templates_only:
         debug_print("Running template update only...")
         updater = TemplateUpdater()
-        if updater.update_all_templates():
+        if updater.update_all_templates(rewrite=True):
             print("Template configuration paths updated successfully")
             sys.exit(0)
         else:
             print("Failed to update template configuration paths")
             sys.exit(1)
     
+    # Compile all .ui files ahead of the first start and exit
+    if "--compile-ui" in sys.argv:
+        from gui.ui_loader import compile_all
+        sys.exit(1 if compile_all() else 0)
+    
+    # Run a canvas benchmark (e.g. --benchmark link_paint) and exit
+    if "--benchmark" in sys.argv:
+        from gui.benchmark import run_benchmark
+        index = sys.argv.index("--benchmark")
+        name = sys.argv[index + 1] if index + 1 < len(sys.argv) else "link_paint"
+        sys.exit(0 if run_benchmark(name) is not None else 1)
+    
     window = NetFlux5GApp(show_welcome)
     
-    if show_welcome:
-        # Show welcome screen first
-        if not window.welcome_manager.showWelcomeScreen():
-            # If welcome screen fails, show main window directly
+    with measure("Show first window"):
+        if show_welcome:
+            # Show welcome screen first
+            if not window.welcome_manager.showWelcomeScreen():
+                # If welcome screen fails, show main window directly
+                window.show()
+        else:
+            # Show main window directly
             window.show()
-    else:
-        # Show main window directly
-        window.show()
+    
+    # Offer to recover the unsaved work of a session that did not shut down cleanly
+    QTimer.singleShot(0, window.journal_manager.offerRecovery)
+
+    # Report startup costs once the event loop runs
+    if startup_profiler.is_enabled():
+        QTimer.singleShot(0, startup_profiler.report)
     
     sys.exit(app.exec_())
\ No newline at end of file
@@ -1,6 +1,7 @@
 from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QMessageBox, QInputDialog, QProgressDialog
 from utils.debug import debug_print, error_print, warning_print
+from utils.lazy_loader import is_created
 import os
 import subprocess
 
@@ -169,7 +170,7 @@ class AutomationManager:
         debug_print("DEBUG: Performing comprehensive stop of all services")
 
         # Hide deployment monitoring panel if active
-        if hasattr(self.main_window, 'deployment_monitor_manager'):
+        if is_created(self.main_window, 'deployment_monitor_manager'):
             self.main_window.deployment_monitor_manager.hideMonitoringPanel()
 
         # Show progress dialog for stopping services
@@ -278,7 +279,7 @@ class AutomationManager:
         debug_print("DEBUG: Stop topology triggered")
         
         # Hide deployment monitoring panel if active
-        if hasattr(self.main_window, 'deployment_monitor_manager'):
+        if is_created(self.main_window, 'deployment_monitor_manager'):
             self.main_window.deployment_monitor_manager.hideMonitoringPanel()
         
         # Show confirmation dialog
@@ -292,7 +293,7 @@ class AutomationManager:
         
         if reply == QMessageBox.Yes:
             # Notify challenge system that topology is being stopped
-            if hasattr(self.main_window, 'challenge_manager'):
+            if is_created(self.main_window, 'challenge_manager'):
                 self.main_window.challenge_manager.onTopologyStopped()
                 
             # Delegate to automation runner's stop_topology
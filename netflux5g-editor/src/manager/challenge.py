@@ -19,7 +19,10 @@ class ChallengeManager:
         self.challenge_panel = None
         self.challenge_dock = None
         
-        # Setup challenge system
+        # The manager is created when a challenge action is first used
+        # (see NetFlux5GApp.setupConnections()), so set everything up now
+        if not self.setupChallengeDirectories():
+            warning_print("Failed to setup challenge directories")
         self.setupChallengeSystem()
     
     def setupChallengeSystem(self):
@@ -50,23 +53,13 @@ class ChallengeManager:
             error_print(f"Failed to setup challenge system: {e}")
     
     def addChallengeMenu(self):
-        """Connect challenge menu actions to their handlers."""
-        try:
-            # Connect the UI-defined actions to their handlers
-            if hasattr(self.main_window, 'actionShowChallengePanel'):
-                self.main_window.actionShowChallengePanel.triggered.connect(self.toggleChallengePanel)
-                self.show_challenges_action = self.main_window.actionShowChallengePanel
-                
-            if hasattr(self.main_window, 'actionStartBasicChallenge'):
-                self.main_window.actionStartBasicChallenge.triggered.connect(self.startBasicChallenge)
-                
-            if hasattr(self.main_window, 'actionCreateCustomChallenge'):
-                self.main_window.actionCreateCustomChallenge.triggered.connect(self.createCustomChallenge)
-                
-            debug_print("Challenge menu actions connected successfully")
-            
-        except Exception as e:
-            error_print(f"Failed to connect challenge menu actions: {e}")
+        """Track the UI-defined challenge panel action.
+
+        The challenge actions are connected by the main window, which creates
+        this manager the first time one of them is triggered.
+        """
+        if hasattr(self.main_window, 'actionShowChallengePanel'):
+            self.show_challenges_action = self.main_window.actionShowChallengePanel
     
     def toggleChallengePanel(self):
         """Toggle the challenge panel visibility."""
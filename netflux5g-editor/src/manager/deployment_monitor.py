@@ -17,22 +17,33 @@ import subprocess
 import time
 from PyQt5.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QScrollArea, QWidget, QProgressBar,
-                           QSizePolicy, QGraphicsDropShadowEffect)
+                           QSizePolicy, QGraphicsDropShadowEffect, QFileDialog,
+                           QMessageBox)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QThread
 from PyQt5.QtGui import QFont, QColor, QPalette, QPixmap, QIcon
 from utils.debug import debug_print, error_print, warning_print
 from utils.docker_utils import DockerUtils
+from gui.widgets.LogViewer import LogPathCache, DeployedComponentsExtractor
+from utils.log_archive import run_start_time
+from utils.procedure_tracer import ProcedureTracer, write_latency_export
 
 class ComponentStatusWorker(QThread):
     """Worker thread to check component status without blocking the UI."""
     
     status_updated = pyqtSignal(dict)  # {component_name: status_info}
+    latency_updated = pyqtSignal(dict)  # ProcedureTracer.to_dict() snapshot
     
     def __init__(self, deployed_components):
         super().__init__()
         self.deployed_components = deployed_components
         self.running = True
         
+        # Procedure latencies are traced from the same log reads as the connection checks
+        script_path = DeployedComponentsExtractor._findLatestMininetScript()
+        run_start = run_start_time(os.path.dirname(script_path)) if script_path else None
+        self.tracer = ProcedureTracer(run_start)
+        self._traced_count = -1
+        
     def stop(self):
         """Stop the monitoring thread."""
         self.running = False
@@ -89,6 +100,9 @@ class ComponentStatusWorker(QThread):
                     }
             
             self.status_updated.emit(status_dict)
+            if len(self.tracer.completed) != self._traced_count:
+                self._traced_count = len(self.tracer.completed)
+                self.latency_updated.emit(self.tracer.to_dict())
             
             # Wait 3 seconds before next check
             for _ in range(30):  # 30 * 0.1 = 3 seconds
@@ -114,6 +128,8 @@ class ComponentStatusWorker(QThread):
                 if uptime_result.returncode == 0:
                     started_at = uptime_result.stdout.strip()
                     uptime = f"Started: {started_at[:19]}"  # Just date and time
+                    # A restarted container may log elsewhere; let log viewers rediscover
+                    LogPathCache.noteContainerStart(container_name, started_at)
                 
                 return f"{state.title()} ({uptime})"
             else:
@@ -233,6 +249,7 @@ class ComponentStatusWorker(QThread):
             
             log_content = result.stdout + result.stderr
             debug_print(f"Read {len(log_content)} characters from log file for {container_name}")
+            self.tracer.feed_text(actual_component_name, result.stdout)
             
             # Check connection status based on component type
             connection_status = 'unknown'
@@ -632,6 +649,7 @@ class DeploymentMonitorPanel(QFrame):
         self.deployed_components = deployed_components
         self.component_widgets = {}
         self.monitor_worker = None
+        self.latency_snapshot = None
         
         # Movement and resize state
         self.dragging = False
@@ -759,6 +777,13 @@ class DeploymentMonitorPanel(QFrame):
         scroll_area.setWidget(self.components_widget)
         layout.addWidget(scroll_area)
         
+        # Control-plane procedure latencies (p50/p95/p99)
+        self.latency_label = QLabel("Procedure latency: waiting for UE procedures...")
+        self.latency_label.setFont(QFont("Segoe UI", 8))
+        self.latency_label.setWordWrap(True)
+        self.latency_label.setStyleSheet("color: #495057; border: none; background: transparent; padding: 4px;")
+        layout.addWidget(self.latency_label)
+        
         # Refresh button
         refresh_layout = QHBoxLayout()
         refresh_button = QPushButton("🔄 Refresh")
@@ -779,8 +804,15 @@ class DeploymentMonitorPanel(QFrame):
             }
         """)
         refresh_button.clicked.connect(self.refreshStatus)
+        
+        self.export_latency_button = QPushButton("Export Latency")
+        self.export_latency_button.setStyleSheet(refresh_button.styleSheet())
+        self.export_latency_button.setEnabled(False)
+        self.export_latency_button.clicked.connect(self.exportLatencies)
+        
         refresh_layout.addStretch()
         refresh_layout.addWidget(refresh_button)
+        refresh_layout.addWidget(self.export_latency_button)
         refresh_layout.addStretch()
         layout.addLayout(refresh_layout)
         
@@ -806,6 +838,7 @@ class DeploymentMonitorPanel(QFrame):
         
         self.monitor_worker = ComponentStatusWorker(self.deployed_components)
         self.monitor_worker.status_updated.connect(self.updateComponentStatus)
+        self.monitor_worker.latency_updated.connect(self.updateLatencies)
         self.monitor_worker.start()
         
     def updateComponentStatus(self, status_dict):
@@ -837,6 +870,31 @@ class DeploymentMonitorPanel(QFrame):
         
         self.summary_label.setText(summary_text)
         
+    def updateLatencies(self, snapshot):
+        """Show the latest procedure latency histograms."""
+        self.latency_snapshot = snapshot
+        lines = snapshot.get('summary', [])
+        if lines:
+            self.latency_label.setText("<b>Procedure latency</b><br>" + "<br>".join(lines))
+            self.export_latency_button.setEnabled(True)
+
+    def exportLatencies(self):
+        """Save the current procedure latencies to a JSON or CSV file."""
+        if not self.latency_snapshot:
+            return
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Procedure Latencies",
+            "procedure_latency.json",
+            "JSON Files (*.json);;CSV Files (*.csv);;All Files (*)"
+        )
+        if filename:
+            try:
+                write_latency_export(self.latency_snapshot, filename)
+                self.main_window.status_manager.showCanvasStatus(f"Procedure latencies exported to {filename}")
+            except Exception as e:
+                QMessageBox.warning(self, "Error", f"Failed to export latencies: {str(e)}")
+
     def refreshStatus(self):
         """Manually refresh the status."""
         if self.monitor_worker:
@@ -1020,36 +1078,8 @@ class DeploymentMonitorManager:
         debug_print(f"Deployment monitoring panel shown with {len(deployed_components)} components")
         
     def extractDeployedComponents(self):
-        """Extract deployed components from the exported Mininet script."""
-        deployed_components = {}
-        
-        # Find the most recent exported Mininet script
-        mininet_script_path = self._findLatestMininetScript()
-        if not mininet_script_path:
-            debug_print("No exported Mininet script found")
-            return deployed_components
-        
-        debug_print(f"Reading deployed components from: {mininet_script_path}")
-        
-        try:
-            with open(mininet_script_path, 'r') as f:
-                script_content = f.read()
-            
-            # Parse Docker containers from the script
-            deployed_components.update(self._parseDockerContainers(script_content))
-            
-            # Parse Docker stations (UE devices) from the script  
-            deployed_components.update(self._parseDockerStations(script_content))
-            
-        except Exception as e:
-            error_print(f"Error reading Mininet script: {e}")
-            return deployed_components
-        
-        debug_print(f"Extracted {len(deployed_components)} deployed components from Mininet script:")
-        for name, info in deployed_components.items():
-            debug_print(f"  - {name}: {info['container_name']} ({info['type']})")
-        
-        return deployed_components
+        """Extract deployed components from the exported Mininet script (shared, parsed once per export)."""
+        return DeployedComponentsExtractor.extractDeployedComponents()
     
     def _findLatestMininetScript(self):
         """Find the most recent exported Mininet script."""
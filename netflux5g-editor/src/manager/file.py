@@ -2,18 +2,48 @@ import os
 import json
 import yaml
 from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QApplication
-from PyQt5.QtCore import QDateTime, Qt
+from PyQt5.QtCore import QDateTime, Qt, QThread, QEventLoop
 from utils.debug import debug_print, error_print, warning_print
+from utils.topology_writer import write_topology, encode
+from utils.config_store import default_store, config_refs
+from utils.topology_binary import BINARY_SUFFIX, write_binary
+from utils.topology_io import read_topology_file, resolve_config_file_paths
+from utils.topology_validator import summarize
 import traceback
 
+# Items created between two turns of the event loop while loading a topology
+LOAD_BATCH_SIZE = 250
+
+
+class TopologyParseWorker(QThread):
+    """Worker thread that reads and validates a topology file."""
+    
+    def __init__(self, file_manager, filename):
+        super().__init__()
+        self.file_manager = file_manager
+        self.filename = filename
+        self.topology_data = None
+        self.error = None
+    
+    def run(self):
+        try:
+            self.topology_data = self.file_manager.readTopologyFile(self.filename)
+        except Exception as e:
+            self.error = str(e)
+
+
 class FileManager:
     def __init__(self, main_window):
         self.main_window = main_window
+        self.created_date = None  # Creation date of the current topology, kept across saves
+        self.journal_base = None  # File whose items match the canvas one to one (see manager/journal.py)
         
     def newTopology(self):
         """Create a new topology."""
         if hasattr(self.main_window, 'canvas_view') and hasattr(self.main_window.canvas_view, 'scene'):
-            self.main_window.canvas_view.scene.clear()
+            self.main_window.canvas_view.clearScene()
+        self.created_date = None
+        self.journal_base = None
         
         # Reset component numbering system
         from gui.components import NetworkComponent
@@ -54,16 +84,22 @@ class FileManager:
             self.saveTopologyAs()
     
     def saveTopologyToFile(self, filename):
-        """Save topology data to file with enhanced configuration preservation."""
+        """Save topology data to file with enhanced configuration preservation.
+        
+        Nodes and links are streamed from cached JSON fragments; only items
+        changed since the last save are serialized again (see nodeFragment()).
+        """
         try:
-            nodes, links = self.extractTopology()
-            topology_data = {
+            now = QDateTime.currentDateTime().toString()
+            if not self.created_date:
+                self.created_date = now
+            header = {
                 "version": "1.1",  # Updated version for enhanced features
                 "type": "NetFlux5G_Topology",
                 "metadata": {
                     "created_with": "NetFlux5G Editor",
-                    "created_date": QDateTime.currentDateTime().toString(),
-                    "saved_date": QDateTime.currentDateTime().toString(),
+                    "created_date": self.created_date,
+                    "saved_date": now,
                     "canvas_size": {
                         "width": self.main_window.canvas_view.size().width() if hasattr(self.main_window, 'canvas_view') else 1161,
                         "height": self.main_window.canvas_view.size().height() if hasattr(self.main_window, 'canvas_view') else 1151
@@ -71,16 +107,37 @@ class FileManager:
                     "component_counts": getattr(self.main_window, 'component_counts', {}),
                     "editor_version": "2.0"
                 },
-                "nodes": nodes,
-                "links": links,
+            }
+            trailer = {
                 "canvas_properties": {
                     "zoom_level": getattr(self.main_window.canvas_view, 'zoom_level', 1.0) if hasattr(self.main_window, 'canvas_view') else 1.0,
                     "show_grid": getattr(self.main_window, 'show_grid', False)
                 }
             }
-            with open(filename, 'w') as f:
-                json.dump(topology_data, f, indent=2, ensure_ascii=False)
+            
+            nodes, links = [], []
+            refs = set()
+            if hasattr(self.main_window, 'canvas_view') and hasattr(self.main_window.canvas_view, 'scene'):
+                from gui.topology_model import TopologyModel
+                model = TopologyModel.forScene(self.main_window.canvas_view.scene)
+                nodes = [self.nodeFragment(item) for item in model.components()]
+                links = [self.linkFragment(item, i) for i, item in enumerate(model.links())]
+                for item in model.componentsOfType('VGcore'):
+                    refs |= item._json_fragment[2]
+            # Each distinct 5G config is written once, however many rows use it
+            if refs:
+                trailer["config_blobs"] = default_store().export_blobs(refs)
+            if filename.lower().endswith(BINARY_SUFFIX):
+                topology_data = dict(header)
+                topology_data['nodes'] = [json.loads(fragment) for fragment in nodes]
+                topology_data['links'] = [json.loads(fragment) for fragment in links]
+                topology_data.update(trailer)
+                write_binary(topology_data, filename)
+            else:
+                write_topology(filename, header, nodes, links, trailer)
+            
             self.main_window.current_file = filename
+            self.journal_base = filename
             # Clear template flags when saving as a new file
             if hasattr(self.main_window, 'is_template_loaded'):
                 self.main_window.is_template_loaded = False
@@ -93,7 +150,12 @@ class FileManager:
                 # Fallback for older versions
                 if hasattr(self.main_window, 'setWindowTitle'):
                     self.main_window.setWindowTitle(f"NetFlux5G Editor - {os.path.basename(filename)}")
-            self.main_window.status_manager.showCanvasStatus(f"Topology saved as {os.path.basename(filename)}")
+            status = f"Topology saved as {os.path.basename(filename)}"
+            if hasattr(self.main_window, 'validation_manager'):
+                issues = self.main_window.validation_manager.checkTopology()
+                if issues:
+                    status += f" ({summarize(issues)})"
+            self.main_window.status_manager.showCanvasStatus(status)
             debug_print(f"DEBUG: Topology saved successfully to {filename}")
             debug_print(f"DEBUG: Saved {len(nodes)} nodes and {len(links)} links")
         except Exception as e:
@@ -121,14 +183,16 @@ class FileManager:
             self.main_window, 
             "Save Topology", 
             "", 
-            "NetFlux5G Files (*.nf5g);;JSON Files (*.json);;All Files (*)"
+            "NetFlux5G Files (*.nf5g);;NetFlux5G Binary Files (*.nf5gb);;JSON Files (*.json);;All Files (*)"
         )
         debug_print(f"saveTopologyAs dialog result: filename={filename}, filter={selected_filter}")
         if not filename:
             self.main_window.status_manager.showCanvasStatus("Save cancelled", 2000)
             return
         # Ensure correct extension based on selected filter
-        if selected_filter.startswith("NetFlux5G") and not filename.endswith(".nf5g"):
+        if selected_filter.startswith("NetFlux5G Binary") and not filename.endswith(BINARY_SUFFIX):
+            filename += BINARY_SUFFIX
+        elif selected_filter.startswith("NetFlux5G Files") and not filename.endswith(".nf5g"):
             filename += ".nf5g"
         elif selected_filter.startswith("JSON") and not filename.endswith(".json"):
             filename += ".json"
@@ -153,7 +217,7 @@ class FileManager:
             self.main_window, 
             "Open Topology", 
             "", 
-            "NetFlux5G Files (*.nf5g);;JSON Files (*.json);;YAML Files (*.yaml *.yml);;All Files (*)"
+            "NetFlux5G Files (*.nf5g *.nf5gb);;JSON Files (*.json);;YAML Files (*.yaml *.yml);;All Files (*)"
         )
         if filename:
             self.loadTopologyFromFile(filename)
@@ -168,82 +232,41 @@ class FileManager:
             progress.show()
             QApplication.processEvents()
             
-            # Determine file type and load accordingly
-            file_ext = os.path.splitext(filename)[1].lower()
-            
             progress.setValue(10)
-            QApplication.processEvents()
             
-            if file_ext in ['.yaml', '.yml']:
-                topology_data = self.loadYamlFile(filename)
-            else:
-                topology_data = self.loadJsonFile(filename)
+            # Read and validate the file on a worker thread; the UI stays responsive
+            topology_data = self.parseTopologyFile(filename)
             
-            progress.setValue(20)
+            progress.setValue(30)
             QApplication.processEvents()
             
-            # Validate file format
-            if not self.validateTopologyFile(topology_data):
-                raise ValueError("Invalid topology file format")
-            
             # Clear current canvas
             if hasattr(self.main_window, 'canvas_view') and hasattr(self.main_window.canvas_view, 'scene'):
-                self.main_window.canvas_view.scene.clear()
-            
-            progress.setValue(30)
-            QApplication.processEvents()
+                self.main_window.canvas_view.clearScene()
             
             # Load metadata and canvas properties
+            self.created_date = topology_data.get('metadata', {}).get('created_date')
             self.loadCanvasProperties(topology_data)
             
             progress.setValue(40)
             QApplication.processEvents()
             
-            # Load nodes with enhanced configuration restoration
+            # Load nodes and links in bulk
             nodes = topology_data.get('nodes', [])
-            node_map = {}
-            
-            total_nodes = len(nodes)
-            for i, node_data in enumerate(nodes):
-                if progress.wasCanceled():
-                    return
-                    
-                component = self.createComponentFromData(node_data)
-                if component:
-                    node_map[node_data['name']] = component
-                
-                # Update progress
-                node_progress = 40 + int((i / max(total_nodes, 1)) * 40)
-                progress.setValue(node_progress)
-                QApplication.processEvents()
-            
-            progress.setValue(80)
-            QApplication.processEvents()
-            
-            # Load links with enhanced properties
             links = topology_data.get('links', [])
-            total_links = len(links)
-            
-            for i, link_data in enumerate(links):
-                if progress.wasCanceled():
-                    return
-                    
-                self.createLinkFromData(link_data, node_map)
-                
-                # Update progress
-                if total_links > 0:
-                    link_progress = 80 + int((i / total_links) * 15)
-                    progress.setValue(link_progress)
-                    QApplication.processEvents()
+            self.journal_base = None
+            built = self.buildTopology(topology_data, progress)
+            if built is None:
+                progress.close()
+                return
+            # The autosave journal can refer to the file if every item was created from it
+            node_map, link_count = built
+            if len(node_map) == len(nodes) and link_count == len(links):
+                self.journal_base = filename
             
             progress.setValue(95)
             QApplication.processEvents()
             
-            # Update canvas and finalize
-            if hasattr(self.main_window, 'canvas_view'):
-                self.main_window.canvas_view.scene.update()
-                self.main_window.canvas_view.viewport().update()
-            
             # Restore component counts if available
             self.restoreComponentCounts(topology_data)
             
@@ -297,78 +320,88 @@ class FileManager:
                 f"Failed to load topology file:\n\n{error_msg}\n\nPlease check the file format and try again."
             )
 
-    def loadJsonFile(self, filename):
-        """Load JSON topology file."""
-        try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON format: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Failed to read JSON file: {str(e)}")
+    def recoverTopology(self, topology_data, filename=None):
+        """Rebuild a topology recovered from the autosave journal. It stays marked as modified."""
+        canvas = self.main_window.canvas_view
+        canvas.clearScene()
+        self.journal_base = None
+        self.created_date = topology_data.get('metadata', {}).get('created_date')
+        self.loadCanvasProperties(topology_data)
+        self.buildTopology(topology_data)
+        
+        from gui.components import NetworkComponent
+        NetworkComponent.scanAndInitializeNumbering(self.main_window)
+        
+        self.main_window.current_file = filename
+        self.main_window.is_template_loaded = False
+        self.main_window.markAsModified()
+        self.main_window.onTopologyChanged()
+        self.main_window.status_manager.showCanvasStatus(
+            f"Recovered unsaved topology: {len(topology_data.get('nodes', []))} components, "
+            f"{len(topology_data.get('links', []))} links")
+
+    def parseTopologyFile(self, filename):
+        """Read and validate a topology file on a worker thread. Returns the topology data."""
+        worker = TopologyParseWorker(self, filename)
+        loop = QEventLoop()
+        worker.finished.connect(loop.quit)
+        worker.start()
+        if not worker.isFinished():
+            loop.exec_()
+        worker.wait()
+        
+        if worker.error:
+            raise ValueError(worker.error)
+        return worker.topology_data
+
+    def readTopologyFile(self, filename):
+        """Read and validate a topology file. Thread-safe: does not touch any widget."""
+        # Templates shipped with the editor get their config paths fixed here, not on disk
+        return read_topology_file(filename, getattr(self.main_window, 'template_updater', None))
 
-    def loadYamlFile(self, filename):
-        """Load YAML topology file and convert to standard format."""
+    def buildTopology(self, topology_data, progress=None):
+        """Create all components and links of parsed topology data in bulk.
+        
+        Scene indexing, repaints and per-item change notifications are suspended
+        while the items are added; the event loop only runs between batches and
+        the view repaints once at the end. Returns (node_map, number of links
+        created), or None if the progress dialog was canceled.
+        """
+        canvas = self.main_window.canvas_view
+        nodes = topology_data.get('nodes', [])
+        links = topology_data.get('links', [])
+        total_items = max(len(nodes) + len(links), 1)
+        node_map = {}
+        link_count = 0
+        
+        canvas.beginBulkLoad()
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                yaml_data = yaml.safe_load(f)
+            for i, node_data in enumerate(nodes):
+                component = self.createComponentFromData(node_data)
+                if component:
+                    node_map[node_data['name']] = component
+                if (i + 1) % LOAD_BATCH_SIZE == 0 and not self._reportLoadProgress(progress, i + 1, total_items):
+                    return None
             
-            # Convert YAML format to standard topology format if needed
-            if self.isYamlTopologyFormat(yaml_data):
-                return self.convertYamlToTopologyFormat(yaml_data)
-            else:
-                return yaml_data
-                
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML format: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Failed to read YAML file: {str(e)}")
-
-    def isYamlTopologyFormat(self, yaml_data):
-        """Check if YAML data is in topology format."""
-        return isinstance(yaml_data, dict) and ('nodes' in yaml_data or 'components' in yaml_data)
-
-    def convertYamlToTopologyFormat(self, yaml_data):
-        """Convert YAML topology format to standard JSON format."""
-        # Basic conversion - extend this based on your YAML topology format
-        topology_data = {
-            "version": "1.1",
-            "type": "NetFlux5G_Topology",
-            "metadata": {
-                "converted_from": "YAML",
-                "created_date": QDateTime.currentDateTime().toString(),
-                "editor_version": "2.0"
-            },
-            "nodes": yaml_data.get('nodes', yaml_data.get('components', [])),
-            "links": yaml_data.get('links', yaml_data.get('connections', [])),
-            "canvas_properties": yaml_data.get('canvas_properties', {})
-        }
-        return topology_data
-
-    def validateTopologyFile(self, topology_data):
-        """Validate topology file format."""
-        if not isinstance(topology_data, dict):
-            error_print("ERROR: Topology data is not a dictionary")
-            return False
-            
-        if 'nodes' not in topology_data and 'components' not in topology_data:
-            error_print("ERROR: No 'nodes' or 'components' section found")
-            return False
-            
-        # Check for required fields in nodes
-        nodes = topology_data.get('nodes', topology_data.get('components', []))
-        for i, node in enumerate(nodes):
-            if not isinstance(node, dict):
-                error_print(f"ERROR: Node {i} is not a dictionary")
-                return False
-                
-            required_fields = ['name', 'type']
-            for field in required_fields:
-                if field not in node:
-                    warning_print(f"WARNING: Node {i} missing required field '{field}'")
+            for i, link_data in enumerate(links):
+                if self.createLinkFromData(link_data, node_map):
+                    link_count += 1
+                done = len(nodes) + i + 1
+                if done % LOAD_BATCH_SIZE == 0 and not self._reportLoadProgress(progress, done, total_items):
+                    return None
+        finally:
+            canvas.endBulkLoad()
         
-        debug_print("DEBUG: Topology file validation passed")
-        return True
+        debug_print(f"DEBUG: Built {len(node_map)} components and {link_count} links")
+        return node_map, link_count
+
+    def _reportLoadProgress(self, progress, done, total_items):
+        """Update the progress dialog between batches. Returns False if canceled."""
+        if progress is None:
+            return True
+        progress.setValue(40 + int((done / total_items) * 55))
+        QApplication.processEvents()
+        return not progress.wasCanceled()
 
     def loadCanvasProperties(self, topology_data):
         """Load and apply canvas properties."""
@@ -446,7 +479,7 @@ class FileManager:
             component.setPosition(x, y)
 
             # Restore name and properties
-            component.display_name = name
+            component.setDisplayName(name)
             # Set component_number from name if possible (e.g., 'UE #5')
             import re
             match = re.match(rf"{component_type} #(\d+)", name)
@@ -457,6 +490,9 @@ class FileManager:
             if component_type == 'VGcore':
                 self.resolveConfigFilePaths(properties)
             component.setProperties(properties)
+            component.created_date = node_data.get('created_date')
+            if node_data.get('_deferred_properties'):
+                component.deferProperties(node_data['_deferred_properties'])
 
             # Add to scene
             self.main_window.canvas_view.scene.addItem(component)
@@ -475,35 +511,7 @@ class FileManager:
 
     def resolveConfigFilePaths(self, properties):
         """Resolve relative config file paths to absolute paths based on project root."""
-        try:
-            # Get the project root directory (where main.py is located)
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            
-            # Component types that might have configurations
-            component_types = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
-            
-            for comp_type in component_types:
-                config_key = f"{comp_type}_configs"
-                if config_key in properties:
-                    configs = properties[config_key]
-                    if isinstance(configs, list):
-                        for config in configs:
-                            if 'config_file_path' in config:
-                                file_path = config['config_file_path']
-                                # If it's a relative path starting with ./
-                                if file_path.startswith('./'):
-                                    # Convert to absolute path relative to project root
-                                    absolute_path = os.path.join(project_root, file_path[2:])
-                                    config['config_file_path'] = absolute_path
-                                    debug_print(f"DEBUG: Resolved config path: {file_path} -> {absolute_path}")
-                                elif not os.path.isabs(file_path) and file_path:
-                                    # Handle other relative paths
-                                    absolute_path = os.path.join(project_root, file_path)
-                                    config['config_file_path'] = absolute_path
-                                    debug_print(f"DEBUG: Resolved relative config path: {file_path} -> {absolute_path}")
-            
-        except Exception as e:
-            warning_print(f"WARNING: Failed to resolve config file paths: {e}")
+        resolve_config_file_paths(properties)
 
     def restore5GCoreConfigurations(self, component, properties):
         """Restore 5G Core component configurations including imported YAML files."""
@@ -518,7 +526,7 @@ class FileManager:
                     if isinstance(configs, list):
                         for config in configs:
                             # If this configuration was imported from a YAML file
-                            if config.get('imported', False) and config.get('config_content'):
+                            if config.get('imported', False) and (config.get('config_content') or config.get('config_ref')):
                                 debug_print(f"DEBUG: Restored imported {comp_type} configuration")
                                 # The configuration is already stored in properties, 
                                 # it will be available when the properties dialog is opened
@@ -551,6 +559,7 @@ class FileManager:
             link = NetworkLink(source_component, dest_component, main_window=self.main_window)
             link.link_type = link_type
             link.properties = properties
+            link.created_date = link_data.get('created_date')
             
             # Set additional link properties if available
             if 'name' in link_data:
@@ -591,47 +600,94 @@ class FileManager:
         if not hasattr(self.main_window, 'canvas_view') or not hasattr(self.main_window.canvas_view, 'scene'):
             return nodes, links
         
-        from gui.links import NetworkLink
+        from gui.topology_model import TopologyModel
+        model = TopologyModel.forScene(self.main_window.canvas_view.scene)
         
-        for item in self.main_window.canvas_view.scene.items():
-            if hasattr(item, 'component_type'):  # NetworkComponent
-                # Extract comprehensive node data
-                node_data = {
-                    'name': getattr(item, 'display_name', item.component_type),
-                    'type': item.component_type,
-                    'x': item.pos().x(),
-                    'y': item.pos().y(),
-                    'properties': item.getProperties() if hasattr(item, 'getProperties') else {},
-                    'created_date': QDateTime.currentDateTime().toString(),
-                    'component_id': id(item)  # Unique identifier
-                }
-                
-                # Add additional metadata for special component types
-                if item.component_type == 'VGcore':
-                    # Ensure 5G Core configurations are properly preserved
-                    self.ensure5GCoreConfigsInProperties(node_data)
-                
-                nodes.append(node_data)
-                
-            elif isinstance(item, NetworkLink):  # NetworkLink
-                source_name = getattr(item.source_node, 'display_name', 
-                                    getattr(item.source_node, 'component_type', 'Unknown'))
-                dest_name = getattr(item.dest_node, 'display_name', 
-                                  getattr(item.dest_node, 'component_type', 'Unknown'))
-                
-                link_data = {
-                    'source': source_name,
-                    'destination': dest_name,
-                    'type': getattr(item, 'link_type', 'ethernet'),
-                    'properties': getattr(item, 'properties', {}),
-                    'name': getattr(item, 'name', f"link_{len(links)}"),
-                    'created_date': QDateTime.currentDateTime().toString()
-                }
-                links.append(link_data)
+        for item in model.components():
+            nodes.append(self.nodeData(item))
+        
+        for item in model.links():
+            links.append(self.linkData(item, len(links)))
         
         debug_print(f"DEBUG: Total extracted - {len(nodes)} nodes, {len(links)} links")
         return nodes, links
 
+    def nodeData(self, item):
+        """Extract comprehensive node data of a component."""
+        # The creation date is kept with the item, so unchanged nodes serialize identically
+        if not getattr(item, 'created_date', None):
+            item.created_date = QDateTime.currentDateTime().toString()
+        node_data = {
+            'name': getattr(item, 'display_name', item.component_type),
+            'type': item.component_type,
+            'x': item.pos().x(),
+            'y': item.pos().y(),
+            'properties': item.getProperties() if hasattr(item, 'getProperties') else {},
+            'created_date': item.created_date,
+            'component_id': id(item)  # Unique identifier
+        }
+        
+        # Add additional metadata for special component types
+        if item.component_type == 'VGcore':
+            # Ensure 5G Core configurations are properly preserved
+            self.ensure5GCoreConfigsInProperties(node_data)
+        
+        return node_data
+
+    def linkData(self, item, index):
+        """Extract the data of a link."""
+        if not getattr(item, 'created_date', None):
+            item.created_date = QDateTime.currentDateTime().toString()
+        source_name = getattr(item.source_node, 'display_name', 
+                            getattr(item.source_node, 'component_type', 'Unknown'))
+        dest_name = getattr(item.dest_node, 'display_name', 
+                          getattr(item.dest_node, 'component_type', 'Unknown'))
+        
+        return {
+            'source': source_name,
+            'destination': dest_name,
+            'type': getattr(item, 'link_type', 'ethernet'),
+            'properties': getattr(item, 'properties', {}),
+            'name': getattr(item, 'name', f"link_{index}"),
+            'created_date': item.created_date
+        }
+
+    @staticmethod
+    def nodeKey(item):
+        """Return what identifies the serialized state of a component (see nodeFragment())."""
+        pos = item.pos()
+        return (getattr(item, '_revision', None), item.display_name, pos.x(), pos.y())
+
+    @staticmethod
+    def linkKey(item):
+        """Return what identifies the serialized state of a link (see linkFragment())."""
+        return (getattr(item, '_revision', None), getattr(item.source_node, 'display_name', None),
+                getattr(item.dest_node, 'display_name', None), getattr(item, 'link_type', None),
+                getattr(item, 'name', None))
+
+    def nodeFragment(self, item):
+        """Return the serialized node data of a component, re-encoding it only if it changed.
+        
+        The fragment is cached on the item and keyed by its revision (bumped by
+        NetworkComponent.markChanged()), name and position.
+        """
+        key = self.nodeKey(item)
+        cached = getattr(item, '_json_fragment', None)
+        if cached is None or cached[0] != key or key[0] is None:
+            node_data = self.nodeData(item)
+            cached = (key, encode(node_data), config_refs(node_data['properties']))
+            item._json_fragment = cached
+        return cached[1]
+
+    def linkFragment(self, item, index):
+        """Return the serialized data of a link, re-encoding it only if it changed."""
+        key = self.linkKey(item)
+        cached = getattr(item, '_json_fragment', None)
+        if cached is None or cached[0] != key or key[0] is None:
+            cached = (key, encode(self.linkData(item, index)))
+            item._json_fragment = cached
+        return cached[1]
+
     def ensure5GCoreConfigsInProperties(self, node_data):
         """Ensure 5G Core component configurations are properly structured and serializable."""
         try:
@@ -662,12 +718,14 @@ class FileManager:
                                     'volumes': config.get('volumes', [])
                                 }
                                 
-                                # Only include config_content if it exists and is valid
+                                # Configs are saved as references to the config store
                                 if 'config_content' in config and config['config_content']:
                                     if isinstance(config['config_content'], dict):
-                                        cleaned_config['config_content'] = config['config_content']
+                                        cleaned_config['config_ref'] = default_store().put_content(config['config_content'])
                                     else:
                                         warning_print(f"WARNING: Invalid config_content for {comp_type}")
+                                elif config.get('config_ref'):
+                                    cleaned_config['config_ref'] = config['config_ref']
                                 
                                 # Only add if it has meaningful content
                                 if cleaned_config['imported'] or cleaned_config['config_display'] != '(Double-click to import)':
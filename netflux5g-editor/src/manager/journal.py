@@ -0,0 +1,515 @@
+"""
+Autosave Journal Manager for NetFlux5G Editor
+
+Crash-safe autosave through an append-only journal (a write-ahead log of
+topology edits). Shortly after each change, the items whose serialized state
+changed since the last autosave are appended as JSON lines (one record per
+added or changed node or link, one per deleted item). Changed items are found
+by comparing cheap keys (revision, name, position), and their JSON comes from
+the per-item fragment cache of the file manager, so an autosave costs
+milliseconds even for huge topologies.
+
+After a save or a complete load the journal is rebased: it only refers to the
+file that was written or read, and nothing is copied. Lines are written and
+fsynced in batches by a background thread. When the journal grows well beyond
+the size of the state it describes, it is compacted into one record per live
+item.
+
+Each running editor journals into its own session directory, which a clean
+shutdown removes. Every open topology (see manager/workspace.py) has its own
+journal file there, so switching tabs leaves the journals of the other
+topologies as they are. A session directory left behind by a process that is
+no longer running means an unclean shutdown; on startup each of its journals
+that holds unsaved changes is replayed (base file plus recorded edits) into a
+tab of its own.
+"""
+
+import os
+import json
+import time
+import queue
+import shutil
+import threading
+from collections import OrderedDict
+from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtCore import QTimer
+from utils.debug import debug_print, error_print, warning_print
+from utils.topology_writer import encode
+
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "export", "journal")
+JOURNAL_PREFIX = "journal-"
+SESSION_FILE = "session.json"
+
+# Coalesce bursts of changes (e.g. a drag) into one autosave
+AUTOSAVE_DELAY_MS = 1000
+
+# Records written within this window share one fsync
+FSYNC_BATCH_S = 0.2
+
+# Compact once the journal exceeds this size and twice the size of the state it describes
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+class JournalWriter(threading.Thread):
+    """Background thread that appends to (or rewrites) the journal files of a session with batched fsyncs."""
+
+    def __init__(self):
+        super().__init__(name="journal-writer", daemon=True)
+        self.tasks = queue.Queue()
+        self.failed = False
+
+    def append(self, path, text):
+        self.tasks.put(('append', path, text))
+
+    def rewrite(self, path, text):
+        """Replace the whole journal at path with text (compaction)."""
+        self.tasks.put(('rewrite', path, text))
+
+    def remove(self, path):
+        """Delete the journal at path (its topology was closed)."""
+        self.tasks.put(('remove', path, None))
+
+    def close(self):
+        """Write everything queued, then stop. Blocks until done."""
+        self.tasks.put(('close', None, None))
+        self.join()
+
+    def run(self):
+        files = {}
+        try:
+            while True:
+                batch = [self.tasks.get()]
+                deadline = time.monotonic() + FSYNC_BATCH_S
+                while batch[-1][0] != 'close':
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self.tasks.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                written = set()
+                for kind, path, text in batch:
+                    if kind == 'append':
+                        f = files.get(path)
+                        if f is None:
+                            f = files[path] = open(path, 'a', encoding='utf-8')
+                        f.write(text)
+                        written.add(path)
+                    elif kind in ('rewrite', 'remove'):
+                        written.discard(path)
+                        f = files.pop(path, None)
+                        if f is not None:
+                            f.close()
+                        if kind == 'rewrite':
+                            self._replace(path, text)
+                        elif os.path.exists(path):
+                            os.remove(path)
+                for path in written:
+                    files[path].flush()
+                    os.fsync(files[path].fileno())
+                if batch[-1][0] == 'close':
+                    break
+        except OSError as e:
+            self.failed = True
+            error_print(f"ERROR: Autosave journal disabled: {e}")
+        finally:
+            for f in files.values():
+                f.close()
+
+    def _replace(self, path, text):
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+
+def replay_journal(path):
+    """Read a journal. Returns a dict with the base file record, the live entries
+    ({id: ('node' | 'link', data or index in the base file)}), the last meta record
+    and whether the journal ends with unsaved changes."""
+    state = {'base': None, 'entries': OrderedDict(), 'meta': {}, 'unsaved': False}
+    entries = state['entries']
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A record cut short by the crash; everything before it is intact
+                warning_print(f"WARNING: Ignoring incomplete journal record in {path}")
+                break
+            op = record.get('op')
+            if op == 'base':
+                state['base'] = record
+                entries.clear()
+                entries.update((jid, ('node', i)) for i, jid in enumerate(record.get('nodes', [])))
+                entries.update((jid, ('link', i)) for i, jid in enumerate(record.get('links', [])))
+                state['unsaved'] = False
+            elif op in ('node', 'link'):
+                entries[record['id']] = (op, record['data'])
+                state['unsaved'] = True
+            elif op == 'delete':
+                entries.pop(record['id'], None)
+                state['unsaved'] = True
+            elif op == 'meta':
+                state['meta'] = record
+            elif op == 'saved':
+                state['unsaved'] = False
+    return state
+
+
+def _journalFiles(session_dir):
+    """Paths of the journals in a session directory, in the order their topologies were opened."""
+    numbered = []
+    for name in os.listdir(session_dir):
+        stem, ext = os.path.splitext(name)
+        number = stem[len(JOURNAL_PREFIX):]
+        if ext == ".log" and stem.startswith(JOURNAL_PREFIX) and number.isdigit():
+            numbered.append((int(number), os.path.join(session_dir, name)))
+    return [path for _number, path in sorted(numbered)]
+
+
+def _isRunning(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class DocumentJournal:
+    """Journal of one open topology: its file and what the file describes so far."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}        # id -> [kind, key, fragment or None if unchanged since the base]
+        self.base_ids = set()    # ids listed by the current base record
+        self.base_line = ""
+        self.meta = None
+        self.log_bytes = 0
+
+
+class JournalManager:
+    """Autosaves each open topology of the main window into its own journal of the session."""
+
+    def __init__(self, main_window, journal_dir=JOURNAL_DIR):
+        self.main_window = main_window
+        self.journal_dir = journal_dir
+        self.session_dir = os.path.join(journal_dir, str(os.getpid()))
+        self._writer = None
+        self._next_id = 0
+        self._journal_count = 0
+        self._autosave_pending = False
+
+    # Session
+
+    def start(self):
+        """Open this session's journal directory and journal the active topology."""
+        try:
+            os.makedirs(self.session_dir, exist_ok=True)
+            with open(os.path.join(self.session_dir, SESSION_FILE), 'w', encoding='utf-8') as f:
+                json.dump({"pid": os.getpid(), "started": time.time()}, f)
+        except OSError as e:
+            error_print(f"ERROR: Could not create autosave journal: {e}")
+            return False
+        self._writer = JournalWriter()
+        self._writer.start()
+        self.switchDocument()
+        debug_print(f"DEBUG: Autosave journal at {self.session_dir}")
+        return True
+
+    def shutdown(self):
+        """Clean shutdown: stop the writer and remove the session's journal."""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        shutil.rmtree(self.session_dir, ignore_errors=True)
+        debug_print("DEBUG: Autosave journal closed")
+
+    def _active(self):
+        return self._writer is not None and not self._writer.failed
+
+    def _scene(self):
+        canvas = getattr(self.main_window, 'canvas_view', None)
+        return getattr(canvas, 'scene', None)
+
+    def _idFor(self, item):
+        jid = getattr(item, '_journal_id', None)
+        if jid is None:
+            self._next_id += 1
+            jid = item._journal_id = self._next_id
+        return jid
+
+    def _journal(self):
+        """Return the journal of the active topology, starting an empty one on first use."""
+        scene = self._scene()
+        journal = getattr(scene, 'document_journal', None)
+        if journal is None:
+            self._journal_count += 1
+            journal = DocumentJournal(os.path.join(self.session_dir, f"{JOURNAL_PREFIX}{self._journal_count}.log"))
+            journal.base_line = encode({"op": "base", "file": None, "nodes": [], "links": []}) + "\n"
+            journal.log_bytes = len(journal.base_line)
+            self._writer.rewrite(journal.path, journal.base_line)
+            scene.document_journal = journal
+        return journal
+
+    def _append(self, journal, text):
+        journal.log_bytes += len(text)
+        self._writer.append(journal.path, text)
+
+    # Autosave
+
+    def scheduleAutosave(self):
+        """Autosave soon; call after any change to the topology."""
+        if self._active() and not self._autosave_pending:
+            self._autosave_pending = True
+            QTimer.singleShot(AUTOSAVE_DELAY_MS, self.autosave)
+
+    def flushAutosave(self):
+        """Autosave now if an autosave is pending, e.g. before another topology becomes active."""
+        if self._autosave_pending:
+            self.autosave()
+
+    def autosave(self):
+        """Append the items changed since the last autosave to the journal."""
+        self._autosave_pending = False
+        scene = self._scene()
+        if not self._active() or scene is None:
+            return
+        start = time.perf_counter()
+        from gui.topology_model import TopologyModel
+        file_manager = self.main_window.file_manager
+        model = TopologyModel.forScene(scene)
+        journal = self._journal()
+        entries = journal.entries
+
+        records = []
+        live = set()
+        for item in model.components():
+            jid = self._idFor(item)
+            live.add(jid)
+            key = file_manager.nodeKey(item)
+            entry = entries.get(jid)
+            if entry is None or entry[1] != key:
+                fragment = file_manager.nodeFragment(item)
+                entries[jid] = ['node', key, fragment]
+                records.append(f'{{"op": "node", "id": {jid}, "data": {fragment}}}\n')
+        for index, item in enumerate(model.links()):
+            jid = self._idFor(item)
+            live.add(jid)
+            key = file_manager.linkKey(item)
+            entry = entries.get(jid)
+            if entry is None or entry[1] != key:
+                fragment = file_manager.linkFragment(item, index)
+                entries[jid] = ['link', key, fragment]
+                records.append(f'{{"op": "link", "id": {jid}, "data": {fragment}}}\n')
+        for jid in [jid for jid in entries if jid not in live]:
+            del entries[jid]
+            records.append(f'{{"op": "delete", "id": {jid}}}\n')
+
+        meta = self._metaRecord()
+        if meta != journal.meta:
+            journal.meta = meta
+            records.append(meta)
+
+        if records:
+            self._append(journal, "".join(records))
+            if journal.log_bytes > COMPACT_MIN_BYTES and journal.log_bytes > 2 * self._stateBytes(journal):
+                self.compact(journal)
+        debug_print(f"DEBUG: Autosaved {len(records)} journal records in "
+                    f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def _metaRecord(self):
+        main_window = self.main_window
+        canvas = getattr(main_window, 'canvas_view', None)
+        return encode({
+            "op": "meta",
+            "file": main_window.current_file,
+            "template": getattr(main_window, 'template_name', None) if getattr(main_window, 'is_template_loaded', False) else None,
+            "created_date": main_window.file_manager.created_date,
+            "canvas_properties": {
+                "zoom_level": getattr(canvas, 'zoom_level', 1.0),
+                "show_grid": getattr(main_window, 'show_grid', False),
+            },
+        }) + "\n"
+
+    def _stateBytes(self, journal):
+        return len(journal.base_line) + sum(len(entry[2]) for entry in journal.entries.values() if entry[2])
+
+    def compact(self, journal):
+        """Rewrite the journal of the active topology as one record per live item."""
+        records = [journal.base_line]
+        records.extend(f'{{"op": "delete", "id": {jid}}}\n' for jid in journal.base_ids if jid not in journal.entries)
+        for jid, (kind, _key, fragment) in journal.entries.items():
+            if fragment is not None:
+                records.append(f'{{"op": "{kind}", "id": {jid}, "data": {fragment}}}\n')
+        records.append(journal.meta or self._metaRecord())
+        if not self.main_window.has_unsaved_changes:
+            records.append('{"op": "saved"}\n')
+        text = "".join(records)
+        debug_print(f"DEBUG: Compacting autosave journal from {journal.log_bytes} to {len(text)} bytes")
+        journal.log_bytes = len(text)
+        self._writer.rewrite(journal.path, text)
+
+    def noteSaved(self):
+        """The topology now matches a file (or is empty): rebase the journal on it."""
+        scene = self._scene()
+        if not self._active() or scene is None:
+            return
+        from gui.topology_model import TopologyModel
+        file_manager = self.main_window.file_manager
+        model = TopologyModel.forScene(scene)
+        journal = self._journal()
+        base_file = getattr(file_manager, 'journal_base', None)
+        if base_file is None and (model.components() or model.links()):
+            # Not backed by a complete file: keep journaling the items themselves
+            self.autosave()
+            self._append(journal, '{"op": "saved"}\n')
+            return
+
+        journal.entries = {}
+        nodes, links = [], []
+        for item in model.components():
+            jid = self._idFor(item)
+            journal.entries[jid] = ['node', file_manager.nodeKey(item), None]
+            nodes.append(jid)
+        for item in model.links():
+            jid = self._idFor(item)
+            journal.entries[jid] = ['link', file_manager.linkKey(item), None]
+            links.append(jid)
+        journal.base_ids = set(journal.entries)
+        base = {"op": "base", "file": base_file, "nodes": nodes, "links": links}
+        if base_file and os.path.isfile(base_file):
+            stat = os.stat(base_file)
+            base.update(size=stat.st_size, mtime=stat.st_mtime)
+        journal.base_line = encode(base) + "\n"
+        journal.meta = self._metaRecord()
+        journal.log_bytes = len(journal.base_line) + len(journal.meta)
+        self._writer.rewrite(journal.path, journal.base_line + journal.meta)
+
+    def switchDocument(self):
+        """Another open topology became active (see manager/workspace.py). Its journal, if it
+        has one, is still current; a topology journaled for the first time gets a new one."""
+        scene = self._scene()
+        if not self._active() or scene is None or getattr(scene, 'document_journal', None) is not None:
+            return
+        self._journal()
+        if self.main_window.has_unsaved_changes:
+            # Record every item, so its unsaved changes can be recovered
+            self.autosave()
+        else:
+            self.noteSaved()
+
+    def closeDocument(self, scene):
+        """A topology was closed: remove its journal."""
+        journal = getattr(scene, 'document_journal', None)
+        if journal is None or not self._active():
+            return
+        scene.document_journal = None
+        self._writer.remove(journal.path)
+
+    # Recovery
+
+    def findUnsavedSession(self):
+        """Return the newest session that did not shut down cleanly and has unsaved changes,
+        as (session directory, replayed states of its journals with unsaved changes, in the
+        order their topologies were opened), or None. Stale sessions without unsaved changes
+        are removed."""
+        found = []
+        try:
+            names = os.listdir(self.journal_dir)
+        except OSError:
+            return None
+        for name in names:
+            session_dir = os.path.join(self.journal_dir, name)
+            if session_dir == self.session_dir or not name.isdigit() or _isRunning(int(name)):
+                continue
+            states, mtime = [], 0
+            for path in _journalFiles(session_dir):
+                try:
+                    state = replay_journal(path)
+                    mtime = max(mtime, os.path.getmtime(path))
+                except OSError:
+                    continue
+                if state['unsaved']:
+                    states.append(state)
+            if not states:
+                shutil.rmtree(session_dir, ignore_errors=True)
+                continue
+            found.append((mtime, session_dir, states))
+        if not found:
+            return None
+        found.sort(key=lambda entry: entry[0])
+        return found[-1][1], found[-1][2]
+
+    def buildRecoveredTopology(self, state):
+        """Turn a replayed journal into topology data (see FileManager.readTopologyFile())."""
+        base_data = {}
+        base = state['base']
+        if base and base.get('file') and any(not isinstance(data, dict) for _kind, data in state['entries'].values()):
+            stat = os.stat(base['file'])
+            if (stat.st_size, stat.st_mtime) != (base.get('size'), base.get('mtime')):
+                warning_print(f"WARNING: {base['file']} changed since it was autosaved; recovered items may differ")
+            base_data = self.main_window.file_manager.readTopologyFile(base['file'])
+
+        topology_data = {key: value for key, value in base_data.items() if key not in ('nodes', 'links')}
+        topology_data.setdefault('version', "1.1")
+        topology_data.setdefault('type', "NetFlux5G_Topology")
+        topology_data['nodes'], topology_data['links'] = [], []
+        for kind, data in state['entries'].values():
+            if not isinstance(data, dict):
+                data = base_data[f"{kind}s"][data]
+            topology_data['nodes' if kind == 'node' else 'links'].append(data)
+
+        meta = state['meta']
+        topology_data.setdefault('metadata', {})['created_date'] = meta.get('created_date')
+        if meta.get('canvas_properties'):
+            topology_data['canvas_properties'] = meta['canvas_properties']
+        return topology_data
+
+    def offerRecovery(self):
+        """After an unclean shutdown, offer to restore the unsaved topologies from their
+        journals, each in its own tab."""
+        try:
+            session = self.findUnsavedSession()
+            if session is None:
+                return
+            session_dir, states = session
+            names = []
+            for state in states:
+                meta = state['meta']
+                name = os.path.basename(meta['file']) if meta.get('file') else (meta.get('template') or "Untitled")
+                names.append(f"'{name}'")
+            reply = QMessageBox.question(
+                self.main_window,
+                "Recover Unsaved Work",
+                f"NetFlux5G Editor was not shut down properly.\n\n"
+                f"Do you want to recover the unsaved changes of "
+                f"{', '.join(names)}?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.Yes
+            )
+            if reply == QMessageBox.Yes:
+                workspace = getattr(self.main_window, 'workspace_manager', None)
+                for state in states:
+                    start = time.perf_counter()
+                    if workspace is not None and not workspace.isCurrentEmpty():
+                        workspace.newDocument()
+                    topology_data = self.buildRecoveredTopology(state)
+                    self.main_window.file_manager.recoverTopology(topology_data, state['meta'].get('file'))
+                    debug_print(f"DEBUG: Recovered {len(topology_data['nodes'])} nodes and "
+                                f"{len(topology_data['links'])} links in {(time.perf_counter() - start) * 1000:.0f} ms")
+                welcome = getattr(self.main_window.welcome_manager, 'welcome_window', None)
+                if welcome is not None and welcome.isVisible():
+                    welcome.close()
+                self.main_window.show()
+            shutil.rmtree(session_dir, ignore_errors=True)
+        except Exception as e:
+            error_print(f"ERROR: Failed to recover autosaved topology: {e}")
@@ -35,9 +35,18 @@ class KeyboardManager:
             if event.key() == Qt.Key_S:
                 self.main_window.file_manager.saveTopology()
             elif event.key() == Qt.Key_N:
-                self.main_window.file_manager.newTopology()
+                self.main_window.workspace_manager.newTopology()
             elif event.key() == Qt.Key_O:
-                self.main_window.file_manager.openTopology()
+                self.main_window.workspace_manager.openTopology()
+            elif event.key() == Qt.Key_W:
+                # Ctrl+W closes the current topology tab
+                self.main_window.workspace_manager.closeCurrentDocument()
+            elif event.key() == Qt.Key_Tab:
+                # Ctrl+Tab switches to the next topology tab
+                self.main_window.workspace_manager.nextDocument()
+            elif event.key() == Qt.Key_Backtab:
+                # Ctrl+Shift+Tab switches to the previous one
+                self.main_window.workspace_manager.nextDocument(-1)
             elif event.key() == Qt.Key_X:
                 # Ctrl+X for cut component
                 if hasattr(self.main_window, 'component_operations_manager'):
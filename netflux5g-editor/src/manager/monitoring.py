@@ -62,8 +62,12 @@ class MonitoringDeploymentWorker(QThread):
         'node-exporter': {
             'image': 'prom/node-exporter',
             'ports': [],
-            'volumes': ['/:/host:ro,rslave'],
-            'extra_args': ['--path.rootfs=/host'],
+            'volumes': [
+                '/:/host:ro,rslave',
+                # KPIs computed from run captures (utils/capture_metrics.py)
+                cwd + '/export/mininet/metrics:/textfile:ro'
+            ],
+            'extra_args': ['--path.rootfs=/host', '--collector.textfile.directory=/textfile'],
             'pid_mode': 'host'
         },
         'cadvisor': {
@@ -102,6 +106,11 @@ class MonitoringDeploymentWorker(QThread):
                     self.progress_updated.emit(current_progress)
                     self.status_updated.emit(f"Docker Image doesn't exist. Pulling image {config['image']}...")
                     DockerUtils.pull_image(config['image'])
+                # Create bind-mounted host directories so Docker does not create them as root
+                for volume in config.get('volumes', []):
+                    host_path = volume.split(':')[0]
+                    if host_path.startswith(cwd) and not os.path.exists(host_path):
+                        os.makedirs(host_path, exist_ok=True)
                 builder = DockerContainerBuilder(image=config['image'], container_name=full_container_name)
                 builder.set_network(self.network_name)
                 for port in config.get('ports', []):
@@ -2,6 +2,8 @@ from PyQt5.QtWidgets import QGraphicsView
 from PyQt5.QtCore import Qt, QMimeData
 from PyQt5.QtGui import QDrag, QPixmap, QCursor
 from gui.links import NetworkLink
+from gui.pixmap_cache import icon_pixmap
+from gui.topology_model import TopologyModel
 from utils.debug import debug_print, error_print, warning_print
 import os
 
@@ -38,8 +40,7 @@ class ToolManager:
         icon_path = self.main_window.component_icon_map.get(component_type)
         if icon_path and os.path.exists(icon_path):
             # Always scale the pixmap to a small size for smooth dragging
-            pixmap = QPixmap(icon_path).scaled(48, 48, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            drag.setPixmap(pixmap)
+            drag.setPixmap(icon_pixmap(icon_path, 48))
         else:
             # Use a default small pixmap if icon not found
             drag.setPixmap(QPixmap(48, 48))
@@ -117,9 +118,8 @@ class ToolManager:
     def updateAllLinks(self):
         """Update all links in the scene."""
         if hasattr(self.main_window, 'canvas_view') and hasattr(self.main_window.canvas_view, 'scene'):
-            for item in self.main_window.canvas_view.scene.items():
-                if isinstance(item, NetworkLink):
-                    item.updatePosition()
+            for item in TopologyModel.forScene(self.main_window.canvas_view.scene).links():
+                item.updatePosition()
 
     def enablePickTool(self):
         """Restore the pick tool state."""
@@ -0,0 +1,106 @@
+"""
+Topology Validation Manager for NetFlux5G Editor
+
+Runs utils/topology_validator.py on the topology of the current tab: shortly
+after each change (coalesced, like the autosave), when the topology is saved
+and before it is exported or run. The validator works on the TopologySnapshot
+of the scene and reuses what it extracted from components that did not
+change, so the live check costs milliseconds even for large topologies.
+
+Live results are shown in the canvas status bar when they change; a save
+reports the problems found, and exporting or running a topology with errors
+asks for confirmation first.
+"""
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QMessageBox
+from utils.debug import debug_print, error_print
+from utils.topology_validator import TopologyValidator, DEFERRED_PROPERTY_TYPES, errors, summarize
+
+# Validate once the user paused editing
+VALIDATE_DELAY_MS = 500
+
+# Problems listed in the confirmation before an export
+MAX_LISTED_ISSUES = 10
+
+
+class ValidationManager:
+    """Validates the current topology live, on save and before export."""
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.validator = TopologyValidator()
+        self.issues = []
+        self._checked = None  # (model id, snapshot version) of self.issues
+        self._validate_pending = False
+
+    def _model(self):
+        canvas = getattr(self.main_window, 'canvas_view', None)
+        scene = getattr(canvas, 'scene', None)
+        if scene is None:
+            return None
+        from gui.topology_model import TopologyModel
+        return TopologyModel.forScene(scene)
+
+    def scheduleValidation(self):
+        """Validate soon; call after any change to the topology."""
+        if not self._validate_pending:
+            self._validate_pending = True
+            QTimer.singleShot(VALIDATE_DELAY_MS, self.validateLive)
+
+    def checkTopology(self):
+        """Validate the current topology now. Returns its Issues, errors first."""
+        model = self._model()
+        if model is None:
+            return []
+        # Snapshots freeze component.properties as they are; the *_configs rows of
+        # a binary topology stay in the deferred heavy chunk until loaded
+        for component in model.componentsOfType(*DEFERRED_PROPERTY_TYPES):
+            component.ensurePropertiesLoaded()
+        snapshot = model.publishSnapshot()
+        checked = (id(model), snapshot.version)
+        if checked != self._checked:
+            try:
+                self.issues = self.validator.validate(snapshot.components, snapshot.links)
+            except Exception as e:
+                error_print(f"ERROR: Topology validation failed: {e}")
+                self.issues = []
+            self._checked = checked
+        return self.issues
+
+    def validateLive(self):
+        """Validate after edits and show the result if it changed."""
+        self._validate_pending = False
+        previous = self.issues
+        previous_checked = self._checked
+        issues = self.checkTopology()
+        if self._checked == previous_checked or issues == previous:
+            return
+        debug_print(f"DEBUG: Topology validation: {summarize(issues)}")
+        if issues:
+            self.main_window.status_manager.showCanvasStatus(f"Topology check: {summarize(issues)}", 5000)
+        elif previous:
+            self.main_window.status_manager.showCanvasStatus("Topology check: no problems")
+
+    def switchDocument(self):
+        """Forget the results of the previous tab's topology."""
+        self.issues = []
+        self._checked = None
+
+    def confirmExport(self):
+        """Return True if the current topology may be exported: it has no errors or the user accepts them."""
+        problems = errors(self.checkTopology())
+        if not problems:
+            return True
+        listed = "\n".join(f"• {issue}" for issue in problems[:MAX_LISTED_ISSUES])
+        if len(problems) > MAX_LISTED_ISSUES:
+            listed += f"\n• ... and {len(problems) - MAX_LISTED_ISSUES} more"
+        reply = QMessageBox.warning(
+            self.main_window,
+            "Topology Problems",
+            f"The topology has {len(problems)} problem(s) that will likely make the deployment fail:\n\n"
+            f"{listed}\n\nDo you want to continue anyway?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
@@ -0,0 +1,358 @@
+"""
+Workspace Manager for NetFlux5G Editor
+
+Keeps several topologies open at once, one per tab above the canvas. Each
+open topology is a TopologyDocument that owns its QGraphicsScene, and with it
+the scene's component registry, undo history and coverage layer (see
+TopologyModel.forScene() and UndoStack.forScene()), plus the few values the
+rest of the editor keeps on the main window, the file manager and
+NetworkComponent: file name, template and unsaved flags, creation date,
+journal base, component numbering and the view (zoom, scroll, grid). Each
+document also has its own autosave journal (see manager/journal.py).
+
+There is a single canvas view. Switching tabs stores those values in the
+document being left and puts the other document's back, then shows its scene
+with setScene(); nothing is reloaded, copied or repainted off screen.
+
+Everything that does not depend on a topology is shared by all tabs rather
+than held per document:
+- rendered icons and cable segments (gui/pixmap_cache.py),
+- 5G core configuration blobs, stored once by content hash
+  (utils/config_store.py),
+- the deployment manifest, i.e. the components of the latest exported
+  Mininet script and their log paths (DeployedComponentsExtractor and
+  LogPathCache in gui/widgets/LogViewer.py),
+- the Docker state polled by the deployment monitor and the clipboard, which
+  belong to the main window.
+So a second topology costs its items and scene index, not another copy of
+the icons and configurations they use.
+"""
+
+import os
+import time
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTabBar, QGraphicsScene, QFileDialog, QMessageBox
+from PyQt5.QtGui import QTransform
+from utils.debug import debug_print, error_print
+
+
+class TopologyDocument:
+    """State of one open topology; the active document's state lives on the main window."""
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.current_file = None
+        self.is_template_loaded = False
+        self.template_name = None
+        self.has_unsaved_changes = False
+        self.created_date = None
+        self.journal_base = None
+        self.component_counts = None  # None: numbering is initialized when first shown
+        self.available_numbers = None
+        self.transform = QTransform()
+        self.zoom_level = 1.0
+        self.show_grid = False
+        self.scroll = None
+
+    def displayName(self):
+        if self.current_file:
+            return os.path.basename(self.current_file)
+        if self.is_template_loaded and self.template_name:
+            return f"{self.template_name} (Template)"
+        return "Untitled"
+
+
+class WorkspaceManager:
+    """Open topologies of the main window, shown one at a time in the canvas."""
+
+    def __init__(self, main_window):
+        self.main_window = main_window
+        self.documents = []
+        self.current = None
+        self.tab_bar = None
+
+    def setupWorkspace(self):
+        """Adopt the canvas scene as the first document. Returns the tab bar and canvas in one widget."""
+        canvas = self.main_window.canvas_view
+        self.current = TopologyDocument(canvas.scene)
+        self.documents = [self.current]
+
+        self.tab_bar = QTabBar()
+        self.tab_bar.setDocumentMode(True)
+        self.tab_bar.setTabsClosable(True)
+        self.tab_bar.setMovable(True)
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.addTab("Untitled")
+        self.tab_bar.currentChanged.connect(self.onTabChanged)
+        self.tab_bar.tabCloseRequested.connect(self.closeDocument)
+        self.tab_bar.tabMoved.connect(self.onTabMoved)
+
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self.tab_bar)
+        layout.addWidget(canvas)
+        return container
+
+    # Document state
+
+    def _captureState(self, document):
+        """Store the active topology's state held outside its scene in document."""
+        from gui.components import NetworkComponent
+        from gui.undo_stack import UndoStack
+        main_window = self.main_window
+        canvas = main_window.canvas_view
+        UndoStack.forScene(document.scene).flush()
+        document.current_file = main_window.current_file
+        document.is_template_loaded = getattr(main_window, 'is_template_loaded', False)
+        document.template_name = getattr(main_window, 'template_name', None)
+        document.has_unsaved_changes = main_window.has_unsaved_changes
+        document.created_date = main_window.file_manager.created_date
+        document.journal_base = main_window.file_manager.journal_base
+        document.component_counts = NetworkComponent.component_counts
+        document.available_numbers = NetworkComponent.available_numbers
+        document.transform = canvas.transform()
+        document.zoom_level = canvas.zoom_level
+        document.show_grid = getattr(main_window, 'show_grid', False)
+        document.scroll = (canvas.horizontalScrollBar().value(), canvas.verticalScrollBar().value())
+
+    def _applyState(self, document):
+        """Show document in the canvas and make its state the main window's."""
+        from gui.components import NetworkComponent
+        main_window = self.main_window
+        canvas = main_window.canvas_view
+        canvas.scene = document.scene
+        canvas.setScene(document.scene)
+        canvas.updateSceneSize()
+        canvas.setTransform(document.transform)
+        canvas.zoom_level = document.zoom_level
+        main_window.show_grid = document.show_grid
+        canvas.setShowGrid(document.show_grid)
+        if hasattr(main_window, 'actionShowGrid'):
+            main_window.actionShowGrid.setChecked(document.show_grid)
+        if document.scroll is not None:
+            canvas.horizontalScrollBar().setValue(document.scroll[0])
+            canvas.verticalScrollBar().setValue(document.scroll[1])
+
+        main_window.current_file = document.current_file
+        main_window.is_template_loaded = document.is_template_loaded
+        main_window.template_name = document.template_name
+        main_window.has_unsaved_changes = document.has_unsaved_changes
+        main_window.file_manager.created_date = document.created_date
+        main_window.file_manager.journal_base = document.journal_base
+        if document.component_counts is None:
+            NetworkComponent.scanAndInitializeNumbering(main_window)
+        else:
+            NetworkComponent.component_counts = document.component_counts
+            NetworkComponent.available_numbers = document.available_numbers
+
+        # A link being drawn or a selection in the other topology does not carry over
+        main_window.current_link_source = None
+        main_window.selected_component = None
+
+    def currentIndex(self):
+        return self.documents.index(self.current)
+
+    def isCurrentEmpty(self):
+        """True if the active tab is an untouched, empty, untitled topology."""
+        from gui.topology_model import TopologyModel
+        main_window = self.main_window
+        if main_window.current_file or getattr(main_window, 'is_template_loaded', False):
+            return False
+        if main_window.has_unsaved_changes:
+            return False
+        model = TopologyModel.forScene(main_window.canvas_view.scene)
+        return not model.components() and not model.links()
+
+    def updateTabTitle(self):
+        """Show the active topology's name and modified flag on its tab."""
+        if self.tab_bar is None or self.current is None:
+            return
+        main_window = self.main_window
+        document = self.current
+        document.current_file = main_window.current_file
+        document.is_template_loaded = getattr(main_window, 'is_template_loaded', False)
+        document.template_name = getattr(main_window, 'template_name', None)
+        name = document.displayName()
+        index = self.currentIndex()
+        self.tab_bar.setTabText(index, name + (" *" if main_window.has_unsaved_changes else ""))
+        self.tab_bar.setTabToolTip(index, main_window.current_file or name)
+
+    # Switching
+
+    def switchTo(self, index):
+        """Make the document at index the active one."""
+        if not 0 <= index < len(self.documents):
+            return
+        document = self.documents[index]
+        if document is self.current:
+            return
+        canvas = self.main_window.canvas_view
+        if canvas.bulk_loading:
+            # Not while a topology is being built into the current scene
+            self._selectTab(self.currentIndex())
+            return
+        start = time.perf_counter()
+        try:
+            if hasattr(self.main_window, 'journal_manager'):
+                # Journal the edits of the topology being left before its scene goes away
+                self.main_window.journal_manager.flushAutosave()
+            if self.current is not None:
+                self._captureState(self.current)
+            self.current = document
+            self._applyState(document)
+            self._selectTab(index)
+            self.main_window.updateWindowTitle()
+            # Autosave into the journal of the active topology
+            if hasattr(self.main_window, 'journal_manager'):
+                self.main_window.journal_manager.switchDocument()
+            if hasattr(self.main_window, 'validation_manager'):
+                self.main_window.validation_manager.switchDocument()
+            self.main_window.showCanvasStatus(f"Switched to {document.displayName()}")
+            debug_print(f"DEBUG: Switched to topology tab {index} in "
+                        f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        except Exception as e:
+            error_print(f"ERROR: Failed to switch topology tab: {e}")
+
+    def _selectTab(self, index):
+        if self.tab_bar is not None and self.tab_bar.currentIndex() != index:
+            self.tab_bar.blockSignals(True)
+            self.tab_bar.setCurrentIndex(index)
+            self.tab_bar.blockSignals(False)
+
+    def onTabChanged(self, index):
+        self.switchTo(index)
+
+    def onTabMoved(self, from_index, to_index):
+        self.documents.insert(to_index, self.documents.pop(from_index))
+
+    def nextDocument(self, step=1):
+        """Activate the next (or, with step=-1, previous) tab."""
+        if len(self.documents) > 1:
+            self.switchTo((self.currentIndex() + step) % len(self.documents))
+
+    # Opening and closing
+
+    def newDocument(self):
+        """Open an empty topology in a new tab. Returns the new document."""
+        if self.tab_bar is None:
+            self.main_window.file_manager.newTopology()
+            return self.current
+        scene = QGraphicsScene(self.main_window.canvas_view)
+        document = TopologyDocument(scene)
+        self.documents.append(document)
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.addTab(document.displayName())
+        self.tab_bar.blockSignals(False)
+        self.switchTo(len(self.documents) - 1)
+        return document
+
+    def newTopology(self):
+        """New topology: reuse the active tab if it is empty, otherwise open a new tab."""
+        if self.isCurrentEmpty():
+            self.main_window.file_manager.newTopology()
+        else:
+            self.newDocument()
+            self.main_window.showCanvasStatus("New topology created")
+
+    def openTopology(self):
+        """Ask for a topology file and open it in a tab."""
+        filename, _ = QFileDialog.getOpenFileName(
+            self.main_window,
+            "Open Topology",
+            "",
+            "NetFlux5G Files (*.nf5g *.nf5gb);;JSON Files (*.json);;YAML Files (*.yaml *.yml);;All Files (*)"
+        )
+        if filename:
+            self.openFile(filename)
+
+    def openFile(self, filename):
+        """Open a topology file in its own tab, or switch to it if it is open already."""
+        path = os.path.abspath(filename)
+        for index, document in enumerate(self.documents):
+            current_file = self.main_window.current_file if document is self.current else document.current_file
+            if current_file and os.path.abspath(current_file) == path:
+                self.switchTo(index)
+                return
+        file_manager = self.main_window.file_manager
+        if self.isCurrentEmpty() or self.tab_bar is None:
+            file_manager.loadTopologyFromFile(filename)
+            return
+        document = self.newDocument()
+        file_manager.loadTopologyFromFile(filename)
+        if self.current is document and not self.main_window.current_file:
+            # Loading failed: drop the empty tab again
+            self.closeDocument(self.currentIndex())
+
+    def confirmDiscard(self):
+        """Ask to save the active topology if it has unsaved changes. Returns False to cancel."""
+        main_window = self.main_window
+        if not main_window.has_unsaved_changes:
+            return True
+        self.updateTabTitle()
+        reply = QMessageBox.question(
+            main_window,
+            "Unsaved Changes",
+            f"'{self.current.displayName()}' has unsaved changes.\n\n"
+            "Do you want to save your changes before closing it?",
+            QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
+            QMessageBox.Save
+        )
+        if reply == QMessageBox.Save:
+            main_window.file_manager.saveTopology()
+            # The save dialog may have been cancelled
+            return not main_window.has_unsaved_changes
+        return reply == QMessageBox.Discard
+
+    def confirmCloseAll(self):
+        """Offer to save every modified topology before exiting. Returns False to cancel."""
+        if self.current is None:
+            return True
+        if not self.confirmDiscard():
+            return False
+        for document in list(self.documents):
+            if document is not self.current and document.has_unsaved_changes:
+                self.switchTo(self.documents.index(document))
+                if not self.confirmDiscard():
+                    return False
+        return True
+
+    def closeDocument(self, index):
+        """Close the tab at index, asking to save unsaved changes. Returns True if it was closed."""
+        if not 0 <= index < len(self.documents):
+            return False
+        self.switchTo(index)
+        if self.current is not self.documents[index] or not self.confirmDiscard():
+            return False
+        if len(self.documents) == 1:
+            # The last tab stays, with an empty topology
+            self.main_window.file_manager.newTopology()
+            return True
+
+        document = self.current
+        self.switchTo(index - 1 if index > 0 else 1)
+        self.documents.remove(document)
+        self.tab_bar.blockSignals(True)
+        self.tab_bar.removeTab(index)
+        self.tab_bar.blockSignals(False)
+        self._selectTab(self.currentIndex())
+        self._releaseDocument(document)
+        return True
+
+    def closeCurrentDocument(self):
+        if self.current is not None:
+            self.closeDocument(self.currentIndex())
+
+    def _releaseDocument(self, document):
+        """Delete a closed document's scene and everything its registries reference."""
+        from gui.topology_model import TopologyModel
+        from gui.undo_stack import UndoStack
+        scene = document.scene
+        if hasattr(self.main_window, 'journal_manager'):
+            self.main_window.journal_manager.closeDocument(scene)
+        UndoStack.forScene(scene).clear()
+        scene.clear()
+        TopologyModel.forScene(scene).reset()
+        scene.coverage_overlay = None
+        scene.deleteLater()
+        debug_print(f"DEBUG: Closed topology tab {document.displayName()}, {len(self.documents)} open")
@@ -0,0 +1,254 @@
+"""
+NetFlux5G command line
+
+Validates, exports and deploys topologies without the GUI; nothing here
+imports Qt, so it runs in CI and batch pipelines:
+
+    python3 netflux5g.py validate topo.nf5g ...
+    python3 netflux5g.py export topo.nf5g ... [-o DIR] [-j JOBS] [--traffic] [--json]
+    python3 netflux5g.py deploy topo.nf5g [--traffic]
+
+Validation errors (dangling links, address collisions, PLMNs the 5G core
+does not serve...; see utils/topology_validator.py) make a file fail, and
+warnings are reported. An export writes the same working directory as running a topology from the
+editor (the Mininet script and the 5G core configs), plus a manifest.json
+describing what was exported. Several topologies are exported in parallel
+worker processes, and the time spent in each step is reported.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from utils.debug import error_print, set_debug_enabled
+from utils.topology_io import (read_topology_file, resolve_config_file_paths, create_export_dir,
+                               copy_5g_configs, EXPORT_BASE_DIR, MININET_SCRIPT_NAME)
+from utils.topology_validator import validate_topology as validate_topology_data, ERROR
+
+MANIFEST_NAME = "manifest.json"
+
+
+class _StatusLog:
+    """Collects the status messages the exporter shows on the canvas in the GUI."""
+
+    def __init__(self):
+        self.messages = []
+
+    def showCanvasStatus(self, message, timeout=0):
+        self.messages.append(message)
+
+
+class _Toggle:
+    """A checkable action that is always in one state."""
+
+    def __init__(self, checked):
+        self.checked = checked
+
+    def isChecked(self):
+        return self.checked
+
+
+class HeadlessMainWindow:
+    """Stand-in for the editor's main window, holding a topology read from a file.
+
+    Provides what MininetExporter uses: extractTopology(), status_manager,
+    actionGenerate_Load_Traffic and the file/unsaved state.
+    """
+
+    def __init__(self, topology_data, filename, traffic=False):
+        self.nodes = topology_data.get('nodes', topology_data.get('components', []))
+        self.links = topology_data.get('links', topology_data.get('connections', []))
+        self.current_file = filename
+        self.has_unsaved_changes = False
+        self.status_manager = _StatusLog()
+        self.actionGenerate_Load_Traffic = _Toggle(traffic)
+        # As when a topology is loaded into the editor (FileManager.createComponentFromData())
+        for node in self.nodes:
+            if node.get('type') == 'VGcore':
+                resolve_config_file_paths(node.setdefault('properties', {}))
+
+    def extractTopology(self):
+        return self.nodes, self.links
+
+    def showCanvasStatus(self, message, timeout=0):
+        self.status_manager.showCanvasStatus(message, timeout)
+
+
+def _load(filename, result, store_configs=True):
+    """Read and validate a topology file; errors go to result['problems'], the rest to result['warnings'].
+
+    With store_configs=False nothing is written (see read_topology_file()).
+    """
+    from utils.template_updater import TemplateUpdater
+    timings = result['timings']
+    start = time.perf_counter()
+    topology_data = read_topology_file(filename, TemplateUpdater(), lazy=False, store_configs=store_configs)
+    timings['read'] = time.perf_counter() - start
+    start = time.perf_counter()
+    issues = validate_topology_data(topology_data)
+    timings['validate'] = time.perf_counter() - start
+    result['problems'] = [str(issue) for issue in issues if issue.severity == ERROR]
+    result['warnings'] = [str(issue) for issue in issues if issue.severity != ERROR]
+    return topology_data
+
+
+def validate_topology(filename):
+    """Read and check one topology file (utils/topology_validator.py). Returns a result dict."""
+    result = {'file': filename, 'ok': False, 'problems': [], 'warnings': [], 'timings': {}}
+    try:
+        # Validating only reads: the file's 5G configs are not added to the config store
+        topology_data = _load(filename, result, store_configs=False)
+        result['nodes'] = len(topology_data.get('nodes', []))
+        result['links'] = len(topology_data.get('links', []))
+        result['ok'] = not result['problems']
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def export_topology(filename, output_dir=None, traffic=False):
+    """Validate one topology file and export its Mininet script, 5G configs and manifest.
+
+    The export directory is netflux5g_export_<time>_<file name> in output_dir
+    (export/mininet by default). Returns a result dict.
+    """
+    from export.mininet_export import MininetExporter
+    total_start = time.perf_counter()
+    result = {'file': filename, 'ok': False, 'problems': [], 'warnings': [], 'timings': {}}
+    timings = result['timings']
+    try:
+        topology_data = _load(filename, result)
+        if result['problems']:
+            return result
+
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        export_dir = create_export_dir(output_dir or EXPORT_BASE_DIR, stem)
+        window = HeadlessMainWindow(topology_data, os.path.abspath(filename), traffic)
+        nodes, links = window.extractTopology()
+
+        start = time.perf_counter()
+        copied, missing = copy_5g_configs(nodes, export_dir)
+        timings['configs'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        script_path = os.path.join(export_dir, MININET_SCRIPT_NAME)
+        MininetExporter(window).export_to_mininet_script(script_path)
+        if not os.path.isfile(script_path):
+            messages = window.status_manager.messages
+            raise RuntimeError(messages[-1] if messages else "Mininet script was not generated")
+        os.chmod(script_path, 0o755)
+        timings['script'] = time.perf_counter() - start
+
+        manifest = {
+            'source': os.path.abspath(filename),
+            'generated': time.ctime(),
+            'script': MININET_SCRIPT_NAME,
+            'traffic': traffic,
+            'warnings': result['warnings'],
+            'components': [{'name': node.get('name'), 'type': node.get('type')} for node in nodes],
+            'links': [{'source': link.get('source'), 'destination': link.get('destination'),
+                       'type': link.get('type')} for link in links],
+            '5g_configs': [{key: config[key] for key in ('component', 'name', 'filename', 'source')}
+                           for config in copied],
+            'missing_5g_configs': [{key: config[key] for key in ('component', 'name', 'error')}
+                                   for config in missing],
+        }
+        with open(os.path.join(export_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        result.update(ok=True, export_dir=export_dir, script=script_path,
+                      nodes=len(nodes), links=len(links), configs=len(copied), missing_configs=len(missing))
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        timings['total'] = time.perf_counter() - total_start
+    return result
+
+
+def _run_batch(function, filenames, jobs, *args):
+    """Run function(filename, *args) for every file, in worker processes if there are several."""
+    if jobs <= 1 or len(filenames) <= 1:
+        return [function(filename, *args) for filename in filenames]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(filenames))) as executor:
+        futures = [executor.submit(function, filename, *args) for filename in filenames]
+        return [future.result() for future in futures]
+
+
+def _format_timings(timings):
+    return ", ".join(f"{step} {seconds * 1000:.0f} ms" for step, seconds in timings.items())
+
+
+def _report(results, wall_time, as_json, verb):
+    if as_json:
+        print(json.dumps({'results': results, 'wall_time': wall_time}, indent=2))
+    else:
+        for result in results:
+            status = "OK  " if result['ok'] else "FAIL"
+            details = result.get('error') or "; ".join(result['problems'])
+            if result['ok'] and result.get('export_dir'):
+                details = f"{result['nodes']} components, {result['links']} links -> {result['export_dir']}"
+            elif result['ok']:
+                details = f"{result['nodes']} components, {result['links']} links"
+            print(f"{status} {result['file']}: {details}")
+            for warning in result.get('warnings', []):
+                print(f"     warning: {warning}")
+            if result['timings']:
+                print(f"     {_format_timings(result['timings'])}")
+        succeeded = sum(1 for result in results if result['ok'])
+        work = sum(sum(t for step, t in result['timings'].items() if step != 'total') for result in results)
+        print(f"{verb} {succeeded}/{len(results)} topologies in {wall_time:.2f} s "
+              f"({work:.2f} s of work)")
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="netflux5g", description="Validate, export and deploy NetFlux5G topologies without the GUI.")
+    parser.add_argument('--debug', action='store_true', help="print debug messages")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    validate_parser = commands.add_parser('validate', help="check topology files")
+    validate_parser.add_argument('files', nargs='+')
+    validate_parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="worker processes")
+    validate_parser.add_argument('--json', action='store_true', help="print the results as JSON")
+
+    export_parser = commands.add_parser('export', help="export Mininet scripts, 5G configs and manifests")
+    export_parser.add_argument('files', nargs='+')
+    export_parser.add_argument('-o', '--output-dir', help=f"directory of the export directories (default: {EXPORT_BASE_DIR})")
+    export_parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="worker processes")
+    export_parser.add_argument('--traffic', action='store_true', help="include traffic generation")
+    export_parser.add_argument('--json', action='store_true', help="print the results as JSON")
+
+    deploy_parser = commands.add_parser('deploy', help="export a topology and run it in Mininet (needs sudo)")
+    deploy_parser.add_argument('file')
+    deploy_parser.add_argument('--traffic', action='store_true', help="include traffic generation")
+
+    args = parser.parse_args(argv)
+    if args.debug:
+        set_debug_enabled(True)
+
+    if args.command == 'deploy':
+        result = export_topology(args.file, None, args.traffic)
+        if not result['ok']:
+            return _report([result], result['timings'].get('total', 0.0), False, "Exported")
+        print(f"Exported {args.file} to {result['export_dir']} ({_format_timings(result['timings'])})")
+        try:
+            return subprocess.call(["sudo", "python3", result['script']], cwd=result['export_dir'])
+        except (OSError, KeyboardInterrupt) as e:
+            error_print(f"Failed to run Mininet: {e}")
+            return 1
+
+    start = time.perf_counter()
+    if args.command == 'validate':
+        results = _run_batch(validate_topology, args.files, args.jobs)
+        verb = "Validated"
+    else:
+        results = _run_batch(export_topology, args.files, args.jobs, args.output_dir, args.traffic)
+        verb = "Exported"
+    return _report(results, time.perf_counter() - start, args.json, verb)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
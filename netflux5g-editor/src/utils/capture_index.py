@@ -0,0 +1,533 @@
+"""
+Capture Frame Index for NetFlux5G Editor
+
+This module builds a lightweight per-capture frame index (file offset,
+timestamp, 5-tuple and IP version) and stores it next to the capture: the
+fixed-size records in <capture>.idx, which only grows, and the reader state
+and address table in <capture>.idx.json. The index is extended incrementally
+as the capture grows; new records are appended, not the whole index rewritten.
+
+Display filters over exact header fields (addresses, ports, ip.proto, frame
+numbers) are evaluated against the index, and only the matching frames are
+copied into a small capture for full dissection by tshark. Tunneled frames
+(e.g. GTP-U on N3) whose inner packet may decide the match are copied too,
+and the small capture is then filtered with tshark -Y. Filters naming a
+dissector (gtp, pfcp, ngap, dns, http...) or other fields cannot be answered
+from headers the way tshark -Y answers them; callers fall back to tshark -Y.
+"""
+
+import os
+import re
+import json
+import bisect
+import struct
+import ipaddress
+from functools import lru_cache
+from utils.debug import debug_print, warning_print
+from utils.pcapng import (PcapngReader, decode_packet, read_block_at, BLOCK_SECTION_HEADER,
+                          BLOCK_INTERFACE_DESCRIPTION, IPPROTO_TCP, IPPROTO_UDP, IPPROTO_SCTP,
+                          IPPROTO_ICMP, IPPROTO_ICMPV6)
+
+INDEX_MAGIC = b'NF5GIDX2'
+INDEX_SUFFIX = ".idx"
+STATE_SUFFIX = ".idx.json"
+
+# offset, frame number, timestamp, src index, dst index, ip proto, sport, dport, flags
+RECORD_FORMAT = '<QIdIIBHHH'
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+FLAG_IPV4 = 0x0001
+FLAG_IPV6 = 0x0002
+FLAG_TUNNEL = 0x0004  # may carry an inner IP packet, which tshark dissects too
+
+# GTP-U (N3/N9) and IP-in-IP/GRE tunnels
+TUNNEL_UDP_PORTS = frozenset([2152])
+TUNNEL_IP_PROTOCOLS = frozenset([4, 41, 47])
+
+# Protocol names answered exactly from the IP header
+IP_VERSION_FLAGS = {'ip': FLAG_IPV4, 'ipv6': FLAG_IPV6}
+TRANSPORT_PROTOCOLS = {
+    'tcp': IPPROTO_TCP,
+    'udp': IPPROTO_UDP,
+    'sctp': IPPROTO_SCTP,
+    'icmp': IPPROTO_ICMP,
+    'icmpv6': IPPROTO_ICMPV6,
+}
+
+
+def classify(info):
+    """Return the IP version and tunnel flags of a decoded packet."""
+    flags = FLAG_IPV6 if ':' in info.src else FLAG_IPV4
+    if info.proto in TUNNEL_IP_PROTOCOLS or (info.proto == IPPROTO_UDP and
+                                             (info.sport in TUNNEL_UDP_PORTS or info.dport in TUNNEL_UDP_PORTS)):
+        flags |= FLAG_TUNNEL
+    return flags
+
+
+class IndexRecord:
+    """One indexed frame."""
+
+    __slots__ = ('offset', 'number', 'timestamp', 'src', 'dst', 'proto', 'sport', 'dport', 'flags')
+
+    def __init__(self, offset, number, timestamp, src, dst, proto, sport, dport, flags):
+        self.offset = offset
+        self.number = number
+        self.timestamp = timestamp
+        self.src = src
+        self.dst = dst
+        self.proto = proto
+        self.sport = sport
+        self.dport = dport
+        self.flags = flags
+
+
+class CaptureIndex:
+    """Persistent, incrementally extended frame index of one capture file."""
+
+    def __init__(self, capture_path):
+        self.capture_path = capture_path
+        self.index_path = capture_path + INDEX_SUFFIX
+        self.state_path = capture_path + STATE_SUFFIX
+        self.generation = 0  # advances when the index is rebuilt, invalidating scan positions
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.generation += 1
+        self.records = []
+        self.numbers = []  # frame numbers of the records, for bisection
+        self.addresses = []
+        self._address_ids = {}
+        self.reader_state = None
+        self._saved_records = 0  # records in the index file that the state file accounts for
+
+    def _load(self):
+        """Load the index files if they still match the capture."""
+        if not os.path.exists(self.index_path) or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            count = state.get('records', 0)
+            with open(self.index_path, 'rb') as f:
+                if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                    return
+                # Records appended after the state was last written are indexed again
+                data = f.read(count * RECORD_SIZE)
+        except (OSError, ValueError) as e:
+            warning_print(f"Ignoring unreadable capture index {self.index_path}: {e}")
+            return
+
+        # A capture that shrank was restarted; rebuild from scratch
+        if len(data) != count * RECORD_SIZE or self._restarted(state.get('reader')):
+            return
+
+        addresses = state.get('addresses', [])
+        records = []
+        try:
+            for fields in struct.iter_unpack(RECORD_FORMAT, data):
+                offset, number, timestamp, src, dst, proto, sport, dport, flags = fields
+                records.append(IndexRecord(offset, number, timestamp, addresses[src], addresses[dst],
+                                           proto, sport, dport, flags))
+        except IndexError:
+            warning_print(f"Ignoring inconsistent capture index {self.index_path}")
+            return
+        self.records = records
+        self.numbers = [record.number for record in records]
+        self.addresses = addresses
+        self._address_ids = {address: i for i, address in enumerate(addresses)}
+        self.reader_state = state.get('reader')
+        self._saved_records = count
+
+    def _restarted(self, reader_state):
+        """Return True if the capture is shorter than the indexed part (it was restarted)."""
+        return (reader_state or {}).get('offset', 0) > os.path.getsize(self.capture_path)
+
+    def _address_id(self, address):
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            address_id = self._address_ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return address_id
+
+    def update(self):
+        """Index frames appended since the last update. Returns the number of new frames."""
+        if not os.path.exists(self.capture_path):
+            return 0
+        if self._restarted(self.reader_state):
+            self._reset()
+        reader = PcapngReader(self.capture_path, self.reader_state)
+        added = 0
+        for packet in reader.packets():
+            info = decode_packet(packet.linktype, packet.data)
+            if info is None:
+                record = IndexRecord(packet.offset, packet.number, packet.timestamp, '', '', 0, 0, 0, 0)
+            else:
+                record = IndexRecord(packet.offset, packet.number, packet.timestamp, info.src, info.dst,
+                                     info.proto, info.sport or 0, info.dport or 0, classify(info))
+            self.records.append(record)
+            self.numbers.append(record.number)
+            added += 1
+        self.reader_state = reader.get_state()
+        if added:
+            self._save()
+            debug_print(f"Indexed {added} new frames of {os.path.basename(self.capture_path)}")
+        return added
+
+    def _save(self):
+        """Append the new records to the index file, then replace the (small) state file."""
+        if self._saved_records and not os.path.exists(self.index_path):
+            self._saved_records = 0  # the index file was removed; write every record again
+        packed = bytearray()
+        for r in self.records[self._saved_records:]:
+            packed += struct.pack(RECORD_FORMAT, r.offset, r.number, r.timestamp,
+                                  self._address_id(r.src), self._address_id(r.dst),
+                                  r.proto, r.sport, r.dport, r.flags)
+        state = {'reader': self.reader_state, 'addresses': self.addresses, 'records': len(self.records)}
+        tmp_path = self.state_path + ".tmp"
+        try:
+            if self._saved_records == 0:
+                with open(self.index_path, 'wb') as f:
+                    f.write(INDEX_MAGIC)
+                    f.write(packed)
+            else:
+                with open(self.index_path, 'r+b') as f:
+                    # Drop records a previous run appended without updating the state
+                    f.seek(len(INDEX_MAGIC) + self._saved_records * RECORD_SIZE)
+                    f.truncate()
+                    f.write(packed)
+            # The state is written last; until then the appended records are not used
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+            self._saved_records = len(self.records)
+        except OSError as e:
+            warning_print(f"Could not write capture index {self.index_path}: {e}")
+
+    def scan(self, predicate=None, start=0, limit=None):
+        """Match the records from position start on against a compiled filter.
+
+        Returns (candidates, exact, position). The candidates are the matching
+        frames plus the tunneled frames whose inner packet decides the match;
+        exact is False if there are any of the latter, and the candidates must
+        still be filtered with tshark -Y. limit counts frames known to match,
+        so the first limit matches are always among the candidates. Scanning
+        resumes from position, so a follower only looks at the records added
+        since its last scan.
+
+        Raises:
+            FilterNeedsDissection: if undecided frames would be filtered on
+                frame numbers, which differ in a subset of the capture
+        """
+        result = []
+        exact = True
+        matches = 0
+        records = self.records
+        position = start
+        while position < len(records):
+            record = records[position]
+            position += 1
+            matched = True if predicate is None else predicate(record)
+            if matched is None:
+                if predicate.uses_frame_numbers:
+                    raise FilterNeedsDissection(f"Frame {record.number} carries a tunneled packet")
+                result.append(record)
+                exact = False
+            elif matched:
+                result.append(record)
+                matches += 1
+                if limit and matches >= limit:
+                    break
+        return result, exact, position
+
+    def select(self, predicate=None, after_number=0, limit=None):
+        """Return (candidates, exact) after a frame number for a compiled filter (see scan())."""
+        start = bisect.bisect_right(self.numbers, after_number)
+        return self.scan(predicate, start, limit)[:2]
+
+    def write_subset(self, records, output_path):
+        """Copy the given frames, with the capture's headers, into a new capture file."""
+        state = self.reader_state or {}
+        endian = state.get('endian', '<')
+        with open(self.capture_path, 'rb') as src, open(output_path, 'wb') as dst:
+            if state.get('format') == 'pcap':
+                dst.write(src.read(24))
+                for record in records:
+                    src.seek(record.offset)
+                    header = src.read(16)
+                    cap_len = struct.unpack(endian + 'I', header[8:12])[0]
+                    dst.write(header + src.read(cap_len))
+                return output_path
+
+            # Section header and interface descriptions precede the first packet
+            offset = 0
+            first_packet = records[0].offset if records else os.path.getsize(self.capture_path)
+            while offset < first_packet:
+                block = read_block_at(src, offset, endian)
+                if len(block) < 12:
+                    break
+                block_type = struct.unpack(endian + 'I', block[:4])[0]
+                if block_type in (BLOCK_SECTION_HEADER, BLOCK_INTERFACE_DESCRIPTION):
+                    dst.write(block)
+                offset += len(block)
+            for record in records:
+                dst.write(read_block_at(src, record.offset, endian))
+        return output_path
+
+
+class FilterSyntaxError(Exception):
+    """Raised when a display filter uses syntax or fields the index cannot evaluate."""
+
+
+class FilterNeedsDissection(FilterSyntaxError):
+    """Raised when frames the index cannot decide can only be filtered by tshark on the whole capture."""
+
+
+FILTER_TOKEN_RE = re.compile(r'\s*(\(|\)|&&|\|\||==|!=|>=|<=|>|<|!|[A-Za-z0-9_.:\-]+)')
+
+ADDRESS_FIELDS = {
+    'ip.addr': ('src', 'dst'), 'ipv6.addr': ('src', 'dst'),
+    'ip.src': ('src',), 'ipv6.src': ('src',),
+    'ip.dst': ('dst',), 'ipv6.dst': ('dst',),
+}
+PORT_FIELDS = {'port': ('sport', 'dport'), 'srcport': ('sport',), 'dstport': ('dport',)}
+PORT_PROTOCOLS = {'tcp': IPPROTO_TCP, 'udp': IPPROTO_UDP, 'sctp': IPPROTO_SCTP}
+COMPARISON_WORDS = {'eq': '==', 'ne': '!=', 'gt': '>', 'lt': '<', 'ge': '>=', 'le': '<='}
+COMPARATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b,
+    '>=': lambda a, b: a >= b,
+    '<=': lambda a, b: a <= b,
+}
+
+
+@lru_cache(maxsize=4096)
+def _address_number(text):
+    """Return an IP address as an integer, or None if text is not one.
+
+    IPv4 octets may have leading zeros (10.0.0.05), as in Wireshark filters.
+    """
+    try:
+        if ':' in text:
+            return int(ipaddress.IPv6Address(text))
+        octets = [int(octet, 10) for octet in text.split('.')]
+        if len(octets) != 4:
+            return None
+        return int.from_bytes(bytes(octets), 'big')
+    except ValueError:
+        return None
+
+
+class CompiledFilter:
+    """A display filter compiled into a three-valued predicate over IndexRecord."""
+
+    __slots__ = ('predicate', 'uses_frame_numbers')
+
+    def __init__(self, predicate, uses_frame_numbers):
+        self.predicate = predicate
+        self.uses_frame_numbers = uses_frame_numbers
+
+    def __call__(self, record):
+        return self.predicate(record)
+
+
+def compile_filter(text):
+    """
+    Compile a Wireshark-style display filter into a predicate over IndexRecord.
+
+    Only fields the index holds exactly are supported: ip and ipv6, the IP
+    protocols tcp, udp, sctp, icmp and icmpv6, ip.proto, ip/ipv6
+    .addr/.src/.dst, tcp/udp/sctp .port/.srcport/.dstport and frame.number,
+    combined with and/or/not, &&/||/! and parentheses. Addresses compare
+    numerically, as in tshark. Protocols found by
+    dissection (gtp, pfcp, ngap, dns, http...) are rejected so callers use
+    tshark -Y, which would not match e.g. a bare TCP ACK on port 80 as http.
+
+    The predicate returns None for a tunneled frame (GTP-U, IP-in-IP, GRE)
+    whose outer headers do not decide the match: tshark also matches the
+    inner packet's fields. CaptureIndex.scan() keeps such frames as
+    candidates for tshark -Y.
+
+    Returns:
+        CompiledFilter or None for an empty filter
+
+    Raises:
+        FilterSyntaxError: if the filter needs fields that are not indexed
+    """
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = FILTER_TOKEN_RE.match(text, pos)
+        if not match:
+            raise FilterSyntaxError(f"Unsupported syntax at '{text[pos:]}'")
+        tokens.append(match.group(1))
+        pos = match.end()
+    if not tokens:
+        return None
+    parser = _FilterParser(tokens)
+    predicate = parser.parse_or()
+    if parser.pos != len(tokens):
+        raise FilterSyntaxError(f"Unexpected '{tokens[parser.pos]}'")
+    return CompiledFilter(predicate, parser.uses_frame_numbers)
+
+
+def _header_term(test, decisive, present=None):
+    """Wrap a test of outer header fields; for tunneled frames only the decisive result is certain.
+
+    Tests with "any field matches" semantics are decided by a True outer
+    result, "no field matches" (!=) tests by a False one from a field the
+    outer headers have (present(record)).
+    """
+    def term(record):
+        result = test(record)
+        if record.flags & FLAG_TUNNEL and (result != decisive or (present is not None and not present(record))):
+            return None
+        return result
+    return term
+
+
+def _and(a, b):
+    def both(record):
+        left = a(record)
+        if left is False:
+            return False
+        right = b(record)
+        if right is False:
+            return False
+        return True if left and right else None
+    return both
+
+
+def _or(a, b):
+    def either(record):
+        left = a(record)
+        if left:
+            return True
+        right = b(record)
+        if right:
+            return True
+        return False if left is False and right is False else None
+    return either
+
+
+def _not(a):
+    def negated(record):
+        result = a(record)
+        return None if result is None else not result
+    return negated
+
+
+class _FilterParser:
+    """Recursive-descent parser for the indexed display filter subset.
+
+    Predicates are three-valued: True, False or None (undecided, see compile_filter()).
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.uses_frame_numbers = False
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise FilterSyntaxError("Unexpected end of filter")
+        self.pos += 1
+        return token
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self._peek() in ('or', '||'):
+            self.pos += 1
+            left = _or(left, self.parse_and())
+        return left
+
+    def parse_and(self):
+        left = self.parse_not()
+        while self._peek() in ('and', '&&'):
+            self.pos += 1
+            left = _and(left, self.parse_not())
+        return left
+
+    def parse_not(self):
+        if self._peek() in ('not', '!'):
+            self.pos += 1
+            return _not(self.parse_not())
+        if self._peek() == '(':
+            self.pos += 1
+            inner = self.parse_or()
+            if self._next() != ')':
+                raise FilterSyntaxError("Missing ')'")
+            return inner
+        return self.parse_term()
+
+    def parse_term(self):
+        field = self._next().lower()
+        operator = self._peek()
+        operator = COMPARISON_WORDS.get(operator, operator)
+
+        if operator not in COMPARATORS:
+            if field in IP_VERSION_FLAGS:
+                flag = IP_VERSION_FLAGS[field]
+                return _header_term(lambda r: bool(r.flags & flag), True)
+            if field in TRANSPORT_PROTOCOLS:
+                ip_proto = TRANSPORT_PROTOCOLS[field]
+                return _header_term(lambda r: r.proto == ip_proto and bool(r.flags), True)
+            raise FilterSyntaxError(f"Protocol '{field}' needs dissection")
+
+        self.pos += 1
+        value = self._next()
+        compare = COMPARATORS[operator]
+
+        if field in ADDRESS_FIELDS:
+            attributes = ADDRESS_FIELDS[field]
+            flag = FLAG_IPV6 if field.startswith('ipv6.') else FLAG_IPV4
+            number = _address_number(value)
+            if number is None or (':' in value) != (flag == FLAG_IPV6):
+                raise FilterSyntaxError(f"Invalid address '{value}' for {field}")
+            if operator == '!=':
+                # Wireshark semantics: the field exists and no occurrence equals the value
+                return _header_term(lambda r: bool(r.flags & flag) and
+                                    all(_address_number(getattr(r, a)) != number for a in attributes),
+                                    False, lambda r: r.flags & flag)
+            return _header_term(lambda r: bool(r.flags & flag) and
+                                any(compare(_address_number(getattr(r, a)) or 0, number) for a in attributes),
+                                True)
+
+        if field == 'ip.proto':
+            number = self._number(value, "protocol number")
+            if operator == '!=':
+                return _header_term(lambda r: bool(r.flags & FLAG_IPV4) and r.proto != number,
+                                    False, lambda r: r.flags & FLAG_IPV4)
+            return _header_term(lambda r: bool(r.flags & FLAG_IPV4) and compare(r.proto, number), True)
+
+        protocol, _, port_field = field.partition('.')
+        if protocol in PORT_PROTOCOLS and port_field in PORT_FIELDS:
+            number = self._number(value, "port")
+            ip_proto = PORT_PROTOCOLS[protocol]
+            attributes = PORT_FIELDS[port_field]
+            if operator == '!=':
+                return _header_term(lambda r: r.proto == ip_proto and all(getattr(r, a) != number for a in attributes),
+                                    False, lambda r: r.proto == ip_proto)
+            return _header_term(lambda r: r.proto == ip_proto and any(compare(getattr(r, a), number) for a in attributes),
+                                True)
+
+        if field == 'frame.number':
+            self.uses_frame_numbers = True
+            number = self._number(value, "frame number")
+            return lambda r: compare(r.number, number)
+
+        raise FilterSyntaxError(f"Field '{field}' is not indexed")
+
+    @staticmethod
+    def _number(value, what):
+        try:
+            return int(value, 0)
+        except ValueError:
+            raise FilterSyntaxError(f"Invalid {what} '{value}'")
@@ -0,0 +1,529 @@
+"""
+Capture-to-Metrics Pipeline for NetFlux5G Editor
+
+This module turns the packet captures of a run (captures/<node>.pcapng) into
+per-node KPIs without the GUI or tshark:
+- GTP-U throughput per TEID
+- NGAP procedure latencies (NG setup, registration, PDU session setup) and
+  NAS authentication latency when the NAS messages are readable
+- PFCP request/response round-trip times
+- SCTP retransmissions per association
+
+Captures are read incrementally; the reader state is kept in
+captures/.capture_metrics_state.json so repeated runs only parse new frames.
+Results are written to a compact columnar file (captures/capture_kpis.json.gz)
+and to a Prometheus text exposition file that the monitoring stack's
+node-exporter picks up through its textfile collector.
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import math
+import struct
+import time
+from collections import OrderedDict, deque
+from utils.debug import debug_print, error_print, warning_print
+from utils.pcapng import PcapngReader, decode_packet, iter_sctp_chunks, IPPROTO_UDP, IPPROTO_SCTP
+
+GTPU_PORT = 2152
+PFCP_PORT = 8805
+NGAP_PPID = 60
+
+STATE_FILENAME = ".capture_metrics_state.json"
+COLUMNAR_FILENAME = "capture_kpis.json.gz"
+PROMETHEUS_FILENAME = "capture_kpis.prom"
+
+# Directory scraped by the node-exporter textfile collector (see manager/monitoring.py)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMETHEUS_TEXTFILE_DIR = os.path.join(BASE_DIR, "export", "mininet", "metrics")
+
+# PFCP request message type -> response message type (TS 29.244 section 7.3)
+PFCP_REQUESTS = {
+    1: (2, 'heartbeat'),
+    3: (4, 'pfd_management'),
+    5: (6, 'association_setup'),
+    7: (8, 'association_update'),
+    9: (10, 'association_release'),
+    12: (13, 'node_report'),
+    14: (15, 'session_set_deletion'),
+    50: (51, 'session_establishment'),
+    52: (53, 'session_modification'),
+    54: (55, 'session_deletion'),
+    56: (57, 'session_report'),
+}
+PFCP_RESPONSES = {response: request for request, (response, _name) in PFCP_REQUESTS.items()}
+
+# NGAP procedure codes (TS 38.413 section 9.4.7)
+NGAP_INITIAL_CONTEXT_SETUP = 14
+NGAP_INITIAL_UE_MESSAGE = 15
+NGAP_NG_SETUP = 21
+NGAP_PDU_SESSION_RESOURCE_SETUP = 29
+NGAP_DOWNLINK_NAS_TRANSPORT = 4
+NGAP_UPLINK_NAS_TRANSPORT = 46
+
+NGAP_IE_AMF_UE_NGAP_ID = 10
+NGAP_IE_NAS_PDU = 38
+NGAP_IE_RAN_UE_NGAP_ID = 85
+
+NAS_EPD_5GMM = 0x7E
+NAS_AUTHENTICATION_REQUEST = 0x56
+NAS_AUTHENTICATION_RESPONSE = 0x57
+
+# Pending-request bookkeeping is bounded so a lost response cannot grow memory
+MAX_PENDING = 10000
+SCTP_TSN_WINDOW = 8192
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    """Return count/min/mean/p50/p95/p99/max of a list of samples."""
+    values = sorted(samples)
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'min': values[0],
+        'mean': sum(values) / len(values),
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99),
+        'max': values[-1],
+    }
+
+
+def read_aper_length(data, pos):
+    """Read an APER length determinant. Returns (length, new_pos)."""
+    first = data[pos]
+    if first & 0x80 == 0:
+        return first, pos + 1
+    if first & 0xC0 == 0x80:
+        return ((first & 0x3F) << 8) | data[pos + 1], pos + 2
+    raise ValueError("Fragmented APER length not supported")
+
+
+def read_ngap_ue_id(value, length_bits):
+    """Decode an APER constrained INTEGER UE NGAP ID."""
+    num_bytes = (value[0] >> (8 - length_bits)) + 1
+    return int.from_bytes(value[1:1 + num_bytes], 'big')
+
+
+def parse_ngap(data):
+    """
+    Decode the outer structure of an NGAP PDU.
+
+    Returns:
+        tuple: (pdu_kind, procedure_code, ies) where pdu_kind is 0 for
+        initiatingMessage, 1 for successfulOutcome and 2 for
+        unsuccessfulOutcome and ies maps IE id to raw value bytes, or
+        None if the PDU cannot be decoded
+    """
+    try:
+        pdu_kind = (data[0] >> 5) & 0x03
+        procedure_code = data[1]
+        _value_length, pos = read_aper_length(data, 3)
+        # SEQUENCE extension bit, then a 16-bit IE count
+        ie_count = struct.unpack('!H', data[pos + 1:pos + 3])[0]
+        pos += 3
+        ies = {}
+        for _ in range(ie_count):
+            ie_id = struct.unpack('!H', data[pos:pos + 2])[0]
+            length, pos = read_aper_length(data, pos + 3)
+            ies[ie_id] = data[pos:pos + length]
+            pos += length
+        return pdu_kind, procedure_code, ies
+    except (IndexError, ValueError, struct.error):
+        return None
+
+
+def nas_message_type(nas_pdu):
+    """Return the 5GMM message type of a NAS PDU, looking through null-ciphered protection."""
+    try:
+        # NAS-PDU is an OCTET STRING: strip its own length prefix
+        length, pos = read_aper_length(nas_pdu, 0)
+        nas = nas_pdu[pos:pos + length]
+        if nas[0] != NAS_EPD_5GMM:
+            return None
+        security_header = nas[1] & 0x0F
+        if security_header == 0:
+            return nas[2]
+        # Security protected: EPD, header type, MAC(4), SQN(1), then the inner message
+        inner = nas[7:]
+        if inner and inner[0] == NAS_EPD_5GMM and (inner[1] & 0x0F) == 0:
+            return inner[2]
+    except (IndexError, ValueError):
+        pass
+    return None
+
+
+class CaptureAnalyzer:
+    """Streaming KPI computation over the packets of one capture file."""
+
+    def __init__(self, node_name):
+        self.node_name = node_name
+        self.packets = 0
+        self.first_ts = None
+        self.last_ts = None
+
+        # teid -> [packets, bytes, first_ts, last_ts, src, dst]
+        self.gtpu_flows = {}
+        # (sender, receiver, seq) -> (timestamp, procedure)
+        self.pfcp_pending = OrderedDict()
+        self.pfcp_rtt = {}
+        # association -> [seen TSN set, TSN order deque, data chunks, retransmissions]
+        self.sctp_associations = {}
+        # (association, ran_ue_id, procedure) -> timestamp
+        self.ngap_pending = OrderedDict()
+        self.ngap_latency = {}
+
+    def process(self, packet):
+        """Account one Packet from PcapngReader."""
+        info = decode_packet(packet.linktype, packet.data)
+        self.packets += 1
+        if self.first_ts is None:
+            self.first_ts = packet.timestamp
+        self.last_ts = packet.timestamp
+        if info is None or info.sport is None:
+            return
+
+        if info.proto == IPPROTO_UDP:
+            if GTPU_PORT in (info.sport, info.dport):
+                self._process_gtpu(packet.timestamp, info)
+            elif PFCP_PORT in (info.sport, info.dport):
+                self._process_pfcp(packet.timestamp, info)
+        elif info.proto == IPPROTO_SCTP:
+            self._process_sctp(packet.timestamp, info)
+
+    def _process_gtpu(self, timestamp, info):
+        """Count G-PDU payload bytes per TEID."""
+        payload = info.payload
+        if len(payload) < 8 or payload[1] != 0xFF:
+            return
+        flags = payload[0]
+        length, teid = struct.unpack('!HI', payload[2:8])
+        # Optional sequence/N-PDU fields and extension headers (e.g. the PDU
+        # session container) are counted in 'length' but are not user data
+        pos = 8
+        if flags & 0x07:
+            pos = 12
+            next_extension = payload[11] if len(payload) >= 12 else 0
+            while flags & 0x04 and next_extension and pos < len(payload):
+                extension_length = payload[pos] * 4
+                if extension_length == 0:
+                    break
+                next_extension = payload[pos + extension_length - 1] if pos + extension_length <= len(payload) else 0
+                pos += extension_length
+        inner_bytes = max(0, length - (pos - 8))
+        flow = self.gtpu_flows.get(teid)
+        if flow is None:
+            self.gtpu_flows[teid] = [1, inner_bytes, timestamp, timestamp, info.src, info.dst]
+        else:
+            flow[0] += 1
+            flow[1] += inner_bytes
+            flow[3] = timestamp
+
+    def _process_pfcp(self, timestamp, info):
+        """Match PFCP requests and responses by sequence number."""
+        payload = info.payload
+        if len(payload) < 8:
+            return
+        message_type = payload[1]
+        if payload[0] & 0x01:  # SEID present
+            if len(payload) < 16:
+                return
+            seq = int.from_bytes(payload[12:15], 'big')
+        else:
+            seq = int.from_bytes(payload[4:7], 'big')
+
+        if message_type in PFCP_REQUESTS:
+            self.pfcp_pending[(info.src, info.dst, seq)] = (timestamp, PFCP_REQUESTS[message_type][1])
+            if len(self.pfcp_pending) > MAX_PENDING:
+                self.pfcp_pending.popitem(last=False)
+        elif message_type in PFCP_RESPONSES:
+            pending = self.pfcp_pending.pop((info.dst, info.src, seq), None)
+            if pending:
+                sent, name = pending
+                self.pfcp_rtt.setdefault(name, []).append((timestamp - sent) * 1000.0)
+
+    def _process_sctp(self, timestamp, info):
+        """Count DATA chunk retransmissions and feed NGAP payloads."""
+        association = tuple(sorted([(info.src, info.sport), (info.dst, info.dport)]))
+        direction = (info.src, info.sport)
+        state = self.sctp_associations.get(association)
+        if state is None:
+            state = self.sctp_associations[association] = [set(), deque(), 0, 0]
+
+        for chunk_type, flags, value in iter_sctp_chunks(info.payload):
+            if chunk_type != 0 or len(value) < 12:
+                continue
+            tsn, _stream, _ssn, ppid = struct.unpack('!IHHI', value[:12])
+            key = (direction, tsn)
+            state[2] += 1
+            if key in state[0]:
+                state[3] += 1
+                continue
+            state[0].add(key)
+            state[1].append(key)
+            if len(state[1]) > SCTP_TSN_WINDOW:
+                state[0].discard(state[1].popleft())
+            # Only unfragmented user messages (B and E bits set) are decoded
+            if ppid == NGAP_PPID and flags & 0x03 == 0x03:
+                self._process_ngap(timestamp, association, value[12:])
+
+    def _process_ngap(self, timestamp, association, data):
+        """Measure NGAP procedure and NAS authentication latencies."""
+        parsed = parse_ngap(data)
+        if not parsed:
+            return
+        pdu_kind, procedure_code, ies = parsed
+
+        ran_ue_id = None
+        if NGAP_IE_RAN_UE_NGAP_ID in ies:
+            ran_ue_id = read_ngap_ue_id(ies[NGAP_IE_RAN_UE_NGAP_ID], 2)
+
+        if procedure_code == NGAP_NG_SETUP:
+            self._ngap_step(timestamp, pdu_kind, (association, None, 'ng_setup'))
+        elif procedure_code == NGAP_PDU_SESSION_RESOURCE_SETUP and ran_ue_id is not None:
+            self._ngap_step(timestamp, pdu_kind, (association, ran_ue_id, 'pdu_session_setup'))
+        elif procedure_code == NGAP_INITIAL_UE_MESSAGE and ran_ue_id is not None:
+            self._ngap_start((association, ran_ue_id, 'registration'), timestamp)
+        elif procedure_code == NGAP_INITIAL_CONTEXT_SETUP and pdu_kind == 1 and ran_ue_id is not None:
+            self._ngap_finish((association, ran_ue_id, 'registration'), timestamp)
+        elif procedure_code in (NGAP_DOWNLINK_NAS_TRANSPORT, NGAP_UPLINK_NAS_TRANSPORT) and ran_ue_id is not None:
+            message_type = nas_message_type(ies.get(NGAP_IE_NAS_PDU, b''))
+            if message_type == NAS_AUTHENTICATION_REQUEST:
+                self._ngap_start((association, ran_ue_id, 'authentication'), timestamp)
+            elif message_type == NAS_AUTHENTICATION_RESPONSE:
+                self._ngap_finish((association, ran_ue_id, 'authentication'), timestamp)
+
+    def _ngap_step(self, timestamp, pdu_kind, key):
+        """Start on an initiatingMessage, finish on a successfulOutcome."""
+        if pdu_kind == 0:
+            self._ngap_start(key, timestamp)
+        elif pdu_kind == 1:
+            self._ngap_finish(key, timestamp)
+        else:
+            self.ngap_pending.pop(key, None)
+
+    def _ngap_start(self, key, timestamp):
+        self.ngap_pending[key] = timestamp
+        if len(self.ngap_pending) > MAX_PENDING:
+            self.ngap_pending.popitem(last=False)
+
+    def _ngap_finish(self, key, timestamp):
+        started = self.ngap_pending.pop(key, None)
+        if started is not None:
+            self.ngap_latency.setdefault(key[2], []).append((timestamp - started) * 1000.0)
+
+    def to_state(self):
+        """Serialise accumulated results so analysis can resume after new frames."""
+        return {
+            'packets': self.packets,
+            'first_ts': self.first_ts,
+            'last_ts': self.last_ts,
+            'gtpu_flows': {str(teid): flow for teid, flow in self.gtpu_flows.items()},
+            'pfcp_rtt': self.pfcp_rtt,
+            'ngap_latency': self.ngap_latency,
+            'sctp': [[list(map(list, assoc)), state[2], state[3]] for assoc, state in self.sctp_associations.items()],
+        }
+
+    @classmethod
+    def from_state(cls, node_name, state):
+        """Rebuild an analyzer from to_state() output."""
+        analyzer = cls(node_name)
+        analyzer.packets = state.get('packets', 0)
+        analyzer.first_ts = state.get('first_ts')
+        analyzer.last_ts = state.get('last_ts')
+        analyzer.gtpu_flows = {int(teid): flow for teid, flow in state.get('gtpu_flows', {}).items()}
+        analyzer.pfcp_rtt = state.get('pfcp_rtt', {})
+        analyzer.ngap_latency = state.get('ngap_latency', {})
+        for assoc, chunks, retransmissions in state.get('sctp', []):
+            key = tuple(tuple(endpoint) for endpoint in assoc)
+            # The TSN window restarts empty; only the counters carry over
+            analyzer.sctp_associations[key] = [set(), deque(), chunks, retransmissions]
+        return analyzer
+
+    def kpi_rows(self):
+        """Return KPI rows: (node, kpi, key, count, value, p50, p95, p99, max)."""
+        rows = []
+        for teid, (packets, total_bytes, first_ts, last_ts, src, dst) in sorted(self.gtpu_flows.items()):
+            duration = last_ts - first_ts
+            throughput = total_bytes * 8 / duration if duration > 0 else 0.0
+            rows.append((self.node_name, 'gtpu_throughput_bps', f"teid=0x{teid:08x} {src}->{dst}",
+                         packets, throughput, None, None, None, None))
+            rows.append((self.node_name, 'gtpu_bytes', f"teid=0x{teid:08x} {src}->{dst}",
+                         packets, float(total_bytes), None, None, None, None))
+        for name, samples in sorted(self.pfcp_rtt.items()):
+            stats = summarize(samples)
+            rows.append((self.node_name, 'pfcp_rtt_ms', name, stats['count'], stats['mean'],
+                         stats['p50'], stats['p95'], stats['p99'], stats['max']))
+        for name, samples in sorted(self.ngap_latency.items()):
+            stats = summarize(samples)
+            rows.append((self.node_name, 'ngap_procedure_latency_ms', name, stats['count'], stats['mean'],
+                         stats['p50'], stats['p95'], stats['p99'], stats['max']))
+        for association, state in sorted(self.sctp_associations.items()):
+            key = " <-> ".join(f"{ip}:{port}" for ip, port in association)
+            rows.append((self.node_name, 'sctp_retransmissions', key, state[2], float(state[3]),
+                         None, None, None, None))
+        return rows
+
+
+KPI_COLUMNS = ['node', 'kpi', 'key', 'count', 'value', 'p50', 'p95', 'p99', 'max']
+
+
+def analyze_capture_file(capture_path, node_name, saved_state=None):
+    """
+    Analyze new frames of one capture file.
+
+    Args:
+        capture_path: Path to a .pcapng/.pcap file
+        node_name: Node the capture belongs to
+        saved_state: State dict from a previous call for the same file
+
+    Returns:
+        tuple: (CaptureAnalyzer, state dict to pass next time)
+    """
+    saved_state = saved_state or {}
+    reader = PcapngReader(capture_path, saved_state.get('reader'))
+    if saved_state.get('analyzer'):
+        analyzer = CaptureAnalyzer.from_state(node_name, saved_state['analyzer'])
+    else:
+        analyzer = CaptureAnalyzer(node_name)
+
+    for packet in reader.packets():
+        analyzer.process(packet)
+
+    return analyzer, {'reader': reader.get_state(), 'analyzer': analyzer.to_state()}
+
+
+def write_columnar(rows, output_path):
+    """Write KPI rows column-wise into a gzip compressed JSON file."""
+    columns = {name: [row[i] for row in rows] for i, name in enumerate(KPI_COLUMNS)}
+    tmp_path = output_path + ".tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump({'version': 1, 'generated': time.time(), 'rows': len(rows), 'columns': columns},
+                  f, separators=(',', ':'))
+    os.replace(tmp_path, output_path)
+
+
+def read_columnar(path):
+    """Read a file written by write_columnar back into a list of row dicts."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        columns = json.load(f)['columns']
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*(columns[n] for n in names))]
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def to_prometheus_text(rows, run_id):
+    """Render KPI rows in the Prometheus text exposition format."""
+    metrics = OrderedDict()
+    for node, kpi, key, count, value, p50, p95, p99, max_value in rows:
+        labels = f'run="{_escape_label(run_id)}",node="{_escape_label(node)}",key="{_escape_label(key)}"'
+        samples = metrics.setdefault(kpi, [])
+        if kpi in ('pfcp_rtt_ms', 'ngap_procedure_latency_ms'):
+            for quantile, quantile_value in (('0.5', p50), ('0.95', p95), ('0.99', p99)):
+                if quantile_value is not None:
+                    samples.append(f'netflux5g_{kpi}{{{labels},quantile="{quantile}"}} {quantile_value:.3f}')
+            samples.append(f'netflux5g_{kpi}_count{{{labels}}} {count}')
+        else:
+            samples.append(f'netflux5g_{kpi}{{{labels}}} {value:.3f}')
+
+    types = {
+        'gtpu_throughput_bps': 'gauge',
+        'gtpu_bytes': 'counter',
+        'pfcp_rtt_ms': 'summary',
+        'ngap_procedure_latency_ms': 'summary',
+        'sctp_retransmissions': 'counter',
+    }
+    lines = []
+    for kpi, samples in metrics.items():
+        lines.append(f'# TYPE netflux5g_{kpi} {types.get(kpi, "gauge")}')
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def _write_text_atomic(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def analyze_run_captures(export_dir, publish_prometheus=True):
+    """
+    Compute capture KPIs for every node capture of a run.
+
+    Args:
+        export_dir: Path to a netflux5g_export_* directory
+        publish_prometheus: Also update the node-exporter textfile directory
+
+    Returns:
+        list: KPI rows (see KPI_COLUMNS), empty if the run has no captures
+    """
+    captures_dir = os.path.join(export_dir, "captures")
+    capture_files = sorted(glob.glob(os.path.join(captures_dir, "*.pcapng")) +
+                           glob.glob(os.path.join(captures_dir, "*.pcap")))
+    if not capture_files:
+        debug_print(f"No captures to analyze in {captures_dir}")
+        return []
+
+    state_path = os.path.join(captures_dir, STATE_FILENAME)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            saved_states = json.load(f)
+    except (OSError, ValueError):
+        saved_states = {}
+
+    start = time.time()
+    rows = []
+    new_states = {}
+    for capture_path in capture_files:
+        name = os.path.basename(capture_path)
+        node_name = os.path.splitext(name)[0]
+        saved = saved_states.get(name)
+        # A capture that shrank was restarted; analyze it from the beginning
+        if saved and saved.get('reader', {}).get('offset', 0) > os.path.getsize(capture_path):
+            saved = None
+        try:
+            analyzer, new_states[name] = analyze_capture_file(capture_path, node_name, saved)
+            rows.extend(analyzer.kpi_rows())
+        except Exception as e:
+            warning_print(f"Failed to analyze capture {capture_path}: {e}")
+
+    try:
+        _write_text_atomic(state_path, json.dumps(new_states))
+        write_columnar(rows, os.path.join(captures_dir, COLUMNAR_FILENAME))
+        run_id = os.path.basename(os.path.normpath(export_dir))
+        prometheus_text = to_prometheus_text(rows, run_id)
+        _write_text_atomic(os.path.join(captures_dir, PROMETHEUS_FILENAME), prometheus_text)
+        if publish_prometheus:
+            os.makedirs(PROMETHEUS_TEXTFILE_DIR, exist_ok=True)
+            _write_text_atomic(os.path.join(PROMETHEUS_TEXTFILE_DIR, "netflux5g_capture_kpis.prom"), prometheus_text)
+    except Exception as e:
+        error_print(f"Failed to write capture KPIs for {export_dir}: {e}")
+
+    debug_print(f"Analyzed {len(capture_files)} captures ({len(rows)} KPI rows) in {(time.time() - start) * 1000:.0f} ms")
+    return rows
+
+
+if __name__ == "__main__":
+    # Offline use: python3 -m utils.capture_metrics <export_dir> [...]
+    if len(sys.argv) < 2:
+        print("Usage: python3 -m utils.capture_metrics <netflux5g_export_dir> [...]")
+        sys.exit(1)
+    for run_dir in sys.argv[1:]:
+        for row in analyze_run_captures(run_dir, publish_prometheus=False):
+            print("\t".join("" if v is None else f"{v:.3f}" if isinstance(v, float) else str(v) for v in row))
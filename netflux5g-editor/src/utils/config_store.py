@@ -0,0 +1,197 @@
+"""
+Content-Addressed Config Store for NetFlux5G Editor
+
+Imported 5G core network function configs (the YAML of an AMF, SMF, UPF...)
+used to be embedded as parsed dicts (config_content) in every VGcore row, so
+copies, templates and saved topologies carried many duplicates of nearly the
+same Open5GS configs. Instead, each distinct config is stored once as a blob
+named by the SHA-256 of its YAML text, and rows only hold that hash as
+config_ref. Rows are resolved lazily (resolve_config()) when a dialog or an
+export needs the content.
+
+Saved .nf5g files carry the blobs they reference once, in a config_blobs
+section, and loading imports them back into the store. Exports hardlink the
+blob files instead of serializing the YAML again.
+"""
+
+import os
+import copy
+import shutil
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import yaml
+from utils.debug import debug_print, warning_print
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "export", "config-store")
+
+# Network function types whose configs live in "<type>_configs" rows of a VGcore
+NF_CONFIG_TYPES = ['UPF', 'AMF', 'SMF', 'NRF', 'SCP', 'AUSF', 'BSF', 'NSSF', 'PCF', 'UDM', 'UDR']
+
+# Parsed configs kept in memory
+MAX_PARSED_ENTRIES = 256
+
+
+class ConfigStore:
+    """Directory of config blobs keyed by the SHA-256 of their content."""
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+        self._parsed = OrderedDict()  # ref -> parsed content
+        self._lock = threading.Lock()
+
+    def path(self, ref):
+        """Return the file of a blob (which may not exist)."""
+        return os.path.join(self.root, ref[:2], f"{ref}.yaml")
+
+    def contains(self, ref):
+        return bool(ref) and os.path.isfile(self.path(ref))
+
+    def put_bytes(self, data):
+        """Store raw YAML bytes. Returns their ref."""
+        ref = hashlib.sha256(data).hexdigest()
+        path = self.path(ref)
+        if os.path.isfile(path):
+            return ref
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # Blobs are shared through hardlinks; keep them read-only
+            os.chmod(temp_path, 0o444)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        debug_print(f"DEBUG: Stored config blob {ref[:12]} ({len(data)} bytes)")
+        return ref
+
+    def put_content(self, content):
+        """Store a config given as YAML text or as parsed data. Returns its ref."""
+        if isinstance(content, str):
+            text = content
+        else:
+            text = yaml.dump(content, default_flow_style=False)
+        ref = self.put_bytes(text.encode('utf-8'))
+        if not isinstance(content, str):
+            self._remember(ref, content)
+        return ref
+
+    def get_text(self, ref):
+        """Return the YAML text of a blob, or None if it is missing or corrupted."""
+        try:
+            with open(self.path(ref), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if hashlib.sha256(data).hexdigest() != ref:
+            warning_print(f"WARNING: Config blob {ref[:12]} is corrupted, ignoring it")
+            return None
+        return data.decode('utf-8')
+
+    def get_content(self, ref):
+        """Return the parsed config of a blob (a private copy), or None."""
+        with self._lock:
+            parsed = self._parsed.get(ref)
+            if parsed is not None:
+                self._parsed.move_to_end(ref)
+                return copy.deepcopy(parsed)
+        text = self.get_text(ref)
+        if text is None:
+            return None
+        try:
+            parsed = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            warning_print(f"WARNING: Config blob {ref[:12]} is not valid YAML: {e}")
+            return None
+        self._remember(ref, parsed)
+        return copy.deepcopy(parsed)
+
+    def _remember(self, ref, parsed):
+        with self._lock:
+            self._parsed[ref] = copy.deepcopy(parsed)
+            self._parsed.move_to_end(ref)
+            while len(self._parsed) > MAX_PARSED_ENTRIES:
+                self._parsed.popitem(last=False)
+
+    def link(self, ref, dest_path):
+        """Place a blob at dest_path: hardlink it, or copy it across filesystems. Returns success."""
+        source = self.path(ref)
+        if not os.path.isfile(source):
+            return False
+        if os.path.lexists(dest_path):
+            os.unlink(dest_path)
+        try:
+            os.link(source, dest_path)
+        except OSError:
+            shutil.copyfile(source, dest_path)
+        return True
+
+    def import_blobs(self, blobs):
+        """Add the {ref: YAML text} blobs of a topology file that are not stored yet."""
+        for ref, text in (blobs or {}).items():
+            if self.contains(ref) or not isinstance(text, str):
+                continue
+            stored = self.put_bytes(text.encode('utf-8'))
+            if stored != ref:
+                warning_print(f"WARNING: Config blob {ref[:12]} does not match its content, stored as {stored[:12]}")
+
+    def export_blobs(self, refs):
+        """Return the {ref: YAML text} blobs for a topology file."""
+        blobs = {}
+        for ref in sorted(refs):
+            text = self.get_text(ref)
+            if text is None:
+                warning_print(f"WARNING: Config blob {ref[:12]} is missing from the store")
+                continue
+            blobs[ref] = text
+        return blobs
+
+
+_default_store = None
+
+
+def default_store():
+    """Return the project-local config store."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ConfigStore()
+    return _default_store
+
+
+def intern_config(row, store=None):
+    """Move the embedded config_content of a config row into the store, leaving a config_ref."""
+    content = row.get('config_content')
+    if content:
+        row['config_ref'] = (store or default_store()).put_content(content)
+    row.pop('config_content', None)
+    return row
+
+
+def resolve_config(row, store=None):
+    """Return the config of a row: embedded content (older files) or the referenced blob."""
+    content = row.get('config_content')
+    if content:
+        return content
+    ref = row.get('config_ref')
+    if ref:
+        return (store or default_store()).get_content(ref)
+    return None
+
+
+def config_refs(properties):
+    """Return the config refs used by the rows of a VGcore's properties."""
+    refs = set()
+    for nf_type in NF_CONFIG_TYPES:
+        rows = properties.get(f"{nf_type}_configs")
+        if isinstance(rows, list):
+            for row in rows:
+                if isinstance(row, dict) and row.get('config_ref'):
+                    refs.add(row['config_ref'])
+    return refs
@@ -0,0 +1,54 @@
+"""
+Lazy Managers for NetFlux5G Editor
+
+Most managers of the main window (Docker networks, database, monitoring,
+controllers, challenges, the Mininet exporter...) are only needed once the
+user deploys or exports something, but importing and creating all of them
+used to make up a large part of the startup time. A LazyManager class
+attribute imports the manager's module and creates the manager the first
+time the attribute is read, and stores it on the instance so later reads are
+plain attribute lookups.
+
+Existing code keeps working unchanged: self.main_window.database_manager and
+hasattr(self.main_window, 'database_manager') create the manager when needed.
+Use is_created() to check whether a manager exists without creating it.
+"""
+
+import importlib
+from utils.debug import debug_print
+from utils.startup_profiler import measure
+
+
+class LazyManager:
+    """Class attribute creating module_name.class_name(instance) on first access.
+
+    on_create(instance, manager) is called once the manager exists, e.g. to
+    connect its signals.
+    """
+
+    def __init__(self, module_name, class_name, on_create=None):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.on_create = on_create
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with measure(f"{self.class_name} (created on first use)"):
+            module = importlib.import_module(self.module_name)
+            manager = getattr(module, self.class_name)(instance)
+        # The instance attribute shadows this descriptor from now on
+        instance.__dict__[self.name] = manager
+        debug_print(f"DEBUG: Created {self.class_name} on first use")
+        if self.on_create:
+            self.on_create(instance, manager)
+        return manager
+
+
+def is_created(instance, name):
+    """Return True if the lazy manager attribute name of instance has been created."""
+    return name in vars(instance)
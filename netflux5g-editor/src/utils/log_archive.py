@@ -0,0 +1,422 @@
+"""
+Log Archive for NetFlux5G Editor
+
+This module indexes the log files written by finished runs
+(export/mininet/netflux5g_export_*/log/) into a local SQLite database with
+full-text search, so historical runs can be queried by keyword, component,
+severity and time range after their containers are gone.
+
+SQLite FTS5 is used when the interpreter's sqlite3 build provides it; otherwise
+the archive falls back to an indexed table queried with LIKE.
+"""
+
+import os
+import re
+import glob
+import time
+import sqlite3
+from datetime import datetime
+from utils.debug import debug_print, error_print, warning_print
+
+# Open5GS: "08/27 10:15:32.123: [amf] INFO: message (../src/amf/...)"
+OPEN5GS_LINE_RE = re.compile(
+    r'^(\d{2})/(\d{2}) (\d{2}):(\d{2}):(\d{2})\.(\d{3}): \[([^\]]+)\] ([A-Z]+): ?(.*)$'
+)
+# UERANSIM: "[2025-08-27 10:15:32.123] [nas] [info] message"
+UERANSIM_LINE_RE = re.compile(
+    r'^\[(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})\.(\d{3})\] \[([^\]]+)\] \[([a-z]+)\] ?(.*)$'
+)
+ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+RUN_DIR_RE = re.compile(r'netflux5g_export_(\d{8})_(\d{6})$')
+
+SEVERITY_ALIASES = {
+    'TRACE': 'DEBUG',
+    'DEBUG': 'DEBUG',
+    'INFO': 'INFO',
+    'WARN': 'WARNING',
+    'WARNING': 'WARNING',
+    'ERR': 'ERROR',
+    'ERROR': 'ERROR',
+    'FATAL': 'FATAL',
+    'CRITICAL': 'FATAL',
+}
+SEVERITY_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'FATAL']
+
+INSERT_BATCH_SIZE = 5000
+
+
+def normalize_severity(severity):
+    """Map Open5GS/UERANSIM severity spellings onto a common set."""
+    return SEVERITY_ALIASES.get(str(severity).upper(), 'INFO')
+
+
+def run_start_time(export_dir):
+    """Return the start time of a run from its export directory name, or None."""
+    match = RUN_DIR_RE.search(os.path.basename(os.path.normpath(export_dir)))
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1) + match.group(2), "%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+
+
+def parse_log_line(line, run_start=None):
+    """
+    Parse a single Open5GS or UERANSIM log line.
+
+    Args:
+        line: Raw log line without trailing newline
+        run_start: datetime of the run, used to supply the year that
+            Open5GS timestamps omit
+
+    Returns:
+        tuple: (timestamp_ms, severity, message), with timestamp_ms and
+        severity set to None when the line carries no header
+    """
+    line = ANSI_ESCAPE_RE.sub('', line)
+
+    match = OPEN5GS_LINE_RE.match(line)
+    if match:
+        month, day, hour, minute, second, millis = (int(g) for g in match.groups()[:6])
+        year = run_start.year if run_start else datetime.now().year
+        # Runs that cross new year log December dates against a January start
+        if run_start and month < run_start.month:
+            year += 1
+        try:
+            stamp = datetime(year, month, day, hour, minute, second, millis * 1000)
+            return int(stamp.timestamp() * 1000), normalize_severity(match.group(8)), line
+        except ValueError:
+            return None, None, line
+
+    match = UERANSIM_LINE_RE.match(line)
+    if match:
+        fields = [int(g) for g in match.groups()[:7]]
+        try:
+            stamp = datetime(*fields[:6], fields[6] * 1000)
+            return int(stamp.timestamp() * 1000), normalize_severity(match.group(9)), line
+        except ValueError:
+            return None, None, line
+
+    return None, None, line
+
+
+class LogArchive:
+    """SQLite-backed full-text index over the logs of finished runs."""
+
+    def __init__(self, db_path=None):
+        self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.mininet_dir = os.path.join(self.base_dir, "export", "mininet")
+        self.db_path = db_path or os.path.join(self.mininet_dir, "log_archive.db")
+        self.has_fts = False
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create tables and indexes if they do not exist yet."""
+        cursor = self.connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                export_dir TEXT NOT NULL,
+                started_at INTEGER,
+                indexed_at INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS log_files (
+                run_id TEXT NOT NULL,
+                component TEXT NOT NULL,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0,
+                mtime REAL NOT NULL DEFAULT 0,
+                offset INTEGER NOT NULL DEFAULT 0,
+                last_ts INTEGER,
+                PRIMARY KEY (run_id, component)
+            );
+            CREATE TABLE IF NOT EXISTS log_lines (
+                id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                component TEXT NOT NULL,
+                ts INTEGER,
+                severity TEXT NOT NULL,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_log_lines_run_component_ts
+                ON log_lines (run_id, component, ts);
+            CREATE INDEX IF NOT EXISTS idx_log_lines_ts ON log_lines (ts);
+        """)
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS log_fts USING fts5("
+                "message, content='log_lines', content_rowid='id')"
+            )
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            warning_print(f"SQLite FTS5 not available, log search falls back to LIKE: {e}")
+            self.has_fts = False
+        self.connection.commit()
+
+    def close(self):
+        """Close the database connection."""
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+    def find_run_directories(self):
+        """Return all export directories that have a log folder, oldest first."""
+        pattern = os.path.join(self.mininet_dir, "netflux5g_export_*")
+        return sorted(d for d in glob.glob(pattern) if os.path.isdir(os.path.join(d, "log")))
+
+    def index_all_runs(self):
+        """Index every run found under export/mininet. Returns lines added per run."""
+        results = {}
+        for export_dir in self.find_run_directories():
+            results[os.path.basename(export_dir)] = self.index_run(export_dir)
+        return results
+
+    def index_run(self, export_dir):
+        """
+        Index (or incrementally re-index) the log folder of one run.
+
+        Args:
+            export_dir: Path to a netflux5g_export_* directory
+
+        Returns:
+            int: Number of log lines added
+        """
+        log_dir = os.path.join(export_dir, "log")
+        if not os.path.isdir(log_dir):
+            debug_print(f"No log directory to index in {export_dir}")
+            return 0
+
+        run_id = os.path.basename(os.path.normpath(export_dir))
+        run_start = run_start_time(export_dir)
+        started_at = int(run_start.timestamp() * 1000) if run_start else None
+
+        start = time.time()
+        added = 0
+        try:
+            self.connection.execute(
+                "INSERT INTO runs (run_id, export_dir, started_at, indexed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(run_id) DO UPDATE SET export_dir=excluded.export_dir, indexed_at=excluded.indexed_at",
+                (run_id, os.path.abspath(export_dir), started_at, int(time.time() * 1000))
+            )
+            for log_path in sorted(glob.glob(os.path.join(log_dir, "*.log"))):
+                added += self._index_file(run_id, log_path, run_start, started_at)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            error_print(f"Failed to index logs of {run_id}: {e}")
+            return added
+
+        debug_print(f"Indexed {added} log lines for {run_id} in {(time.time() - start) * 1000:.0f} ms")
+        return added
+
+    def _index_file(self, run_id, log_path, run_start, started_at):
+        """Index the unread tail of a single log file."""
+        component = os.path.splitext(os.path.basename(log_path))[0]
+        try:
+            stat = os.stat(log_path)
+        except OSError as e:
+            warning_print(f"Cannot stat log file {log_path}: {e}")
+            return 0
+
+        row = self.connection.execute(
+            "SELECT size, mtime, offset, last_ts FROM log_files WHERE run_id=? AND component=?",
+            (run_id, component)
+        ).fetchone()
+
+        offset = 0
+        last_ts = started_at
+        if row:
+            if stat.st_size == row['size'] and stat.st_mtime == row['mtime']:
+                return 0
+            if stat.st_size >= row['offset']:
+                offset = row['offset']
+                last_ts = row['last_ts'] if row['last_ts'] is not None else started_at
+            else:
+                # File was truncated or replaced; drop what we had and start over
+                self._delete_component_lines(run_id, component)
+
+        added = 0
+        last_severity = 'INFO'
+        batch = []
+        with open(log_path, 'rb') as f:
+            f.seek(offset)
+            for raw_line in f:
+                if not raw_line.endswith(b'\n'):
+                    # Incomplete trailing line; picked up on the next pass
+                    break
+                offset += len(raw_line)
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                if not line.strip():
+                    continue
+
+                ts, severity, message = parse_log_line(line, run_start)
+                if ts is None:
+                    # Continuation lines inherit the previous header's time and level
+                    ts, severity = last_ts, last_severity
+                else:
+                    last_ts, last_severity = ts, severity
+
+                batch.append((run_id, component, ts, severity, message))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    added += self._insert_lines(batch)
+                    batch = []
+
+        if batch:
+            added += self._insert_lines(batch)
+
+        self.connection.execute(
+            "INSERT INTO log_files (run_id, component, path, size, mtime, offset, last_ts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(run_id, component) DO UPDATE SET path=excluded.path, size=excluded.size, "
+            "mtime=excluded.mtime, offset=excluded.offset, last_ts=excluded.last_ts",
+            (run_id, component, log_path, stat.st_size, stat.st_mtime, offset, last_ts)
+        )
+        return added
+
+    def _insert_lines(self, rows):
+        """Insert a batch of parsed lines into the line table and the FTS index."""
+        cursor = self.connection.cursor()
+        # The FTS rows take the ids the lines were actually given, which need not be consecutive
+        ids = []
+        for row in rows:
+            cursor.execute(
+                "INSERT INTO log_lines (run_id, component, ts, severity, message) VALUES (?, ?, ?, ?, ?)",
+                row
+            )
+            ids.append(cursor.lastrowid)
+        if self.has_fts:
+            cursor.executemany(
+                "INSERT INTO log_fts (rowid, message) VALUES (?, ?)",
+                zip(ids, (row[4] for row in rows))
+            )
+        return len(rows)
+
+    def _delete_component_lines(self, run_id, component):
+        """Remove all indexed lines of one component of a run."""
+        if self.has_fts:
+            self.connection.execute(
+                "INSERT INTO log_fts (log_fts, rowid, message) "
+                "SELECT 'delete', id, message FROM log_lines WHERE run_id=? AND component=?",
+                (run_id, component)
+            )
+        self.connection.execute(
+            "DELETE FROM log_lines WHERE run_id=? AND component=?", (run_id, component)
+        )
+
+    def remove_run(self, run_id):
+        """Remove a run and all of its indexed lines from the archive."""
+        try:
+            components = [r['component'] for r in self.connection.execute(
+                "SELECT component FROM log_files WHERE run_id=?", (run_id,))]
+            for component in components:
+                self._delete_component_lines(run_id, component)
+            self.connection.execute("DELETE FROM log_files WHERE run_id=?", (run_id,))
+            self.connection.execute("DELETE FROM runs WHERE run_id=?", (run_id,))
+            self.connection.commit()
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            error_print(f"Failed to remove run {run_id} from log archive: {e}")
+            return False
+
+    def list_runs(self):
+        """Return indexed runs, newest first."""
+        return [dict(r) for r in self.connection.execute(
+            "SELECT run_id, export_dir, started_at, indexed_at FROM runs ORDER BY run_id DESC")]
+
+    def list_components(self, run_id=None):
+        """Return the component names that have indexed logs."""
+        if run_id:
+            rows = self.connection.execute(
+                "SELECT DISTINCT component FROM log_files WHERE run_id=? ORDER BY component", (run_id,))
+        else:
+            rows = self.connection.execute(
+                "SELECT DISTINCT component FROM log_files ORDER BY component")
+        return [r['component'] for r in rows]
+
+    def search(self, keyword=None, run_id=None, component=None, min_severity=None,
+               start_ms=None, end_ms=None, limit=1000):
+        """
+        Query archived log lines.
+
+        Args:
+            keyword: Free text; every whitespace separated term must match
+                (as a word prefix when FTS5 is available)
+            run_id: Restrict to one run
+            component: Restrict to one component (log file stem)
+            min_severity: Lowest severity to include (e.g. 'WARNING')
+            start_ms: Inclusive lower time bound in epoch milliseconds
+            end_ms: Inclusive upper time bound in epoch milliseconds
+            limit: Maximum number of rows to return
+
+        Returns:
+            list: dicts with run_id, component, ts, severity and message,
+            ordered by time
+        """
+        conditions = []
+        params = []
+        terms = keyword.split() if keyword else []
+
+        if terms and self.has_fts:
+            sql = ("SELECT l.run_id, l.component, l.ts, l.severity, l.message "
+                   "FROM log_fts JOIN log_lines l ON l.id = log_fts.rowid")
+            conditions.append("log_fts MATCH ?")
+            # Quote every term so user input cannot break the FTS query syntax,
+            # and match it as a prefix so partial words still find lines
+            params.append(" ".join('"{}"*'.format(t.replace('"', '""')) for t in terms))
+        else:
+            sql = "SELECT l.run_id, l.component, l.ts, l.severity, l.message FROM log_lines l"
+            for term in terms:
+                conditions.append("l.message LIKE ? ESCAPE '\\'")
+                escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                params.append(f"%{escaped}%")
+
+        if run_id:
+            conditions.append("l.run_id = ?")
+            params.append(run_id)
+        if component:
+            conditions.append("l.component = ?")
+            params.append(component)
+        if min_severity and min_severity in SEVERITY_LEVELS:
+            allowed = SEVERITY_LEVELS[SEVERITY_LEVELS.index(min_severity):]
+            conditions.append(f"l.severity IN ({', '.join('?' * len(allowed))})")
+            params.extend(allowed)
+        if start_ms is not None:
+            conditions.append("l.ts >= ?")
+            params.append(int(start_ms))
+        if end_ms is not None:
+            conditions.append("l.ts <= ?")
+            params.append(int(end_ms))
+
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY l.ts, l.id LIMIT ?"
+        params.append(int(limit))
+
+        try:
+            return [dict(r) for r in self.connection.execute(sql, params)]
+        except sqlite3.Error as e:
+            error_print(f"Log archive query failed: {e}")
+            return []
+
+
+def index_run_logs(export_dir):
+    """Index the logs of a finished run; safe to call from a worker thread."""
+    archive = None
+    try:
+        archive = LogArchive()
+        return archive.index_run(export_dir)
+    except Exception as e:
+        error_print(f"Log archive indexing failed for {export_dir}: {e}")
+        return 0
+    finally:
+        if archive:
+            archive.close()
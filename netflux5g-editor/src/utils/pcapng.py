@@ -0,0 +1,314 @@
+"""
+Incremental pcap/pcapng reader for NetFlux5G Editor
+
+This module reads the capture files written by the exported topology
+(captures/<node>.pcapng) without tshark. Reading can resume from the last
+complete block, so files that are still being written can be processed in
+several passes. It also decodes the link, IP and transport headers needed by
+the capture analysis tools.
+"""
+
+import struct
+import socket
+from collections import namedtuple
+from utils.debug import debug_print, warning_print
+
+# pcapng block types
+BLOCK_SECTION_HEADER = 0x0A0D0D0A
+BLOCK_INTERFACE_DESCRIPTION = 0x00000001
+BLOCK_OBSOLETE_PACKET = 0x00000002
+BLOCK_SIMPLE_PACKET = 0x00000003
+BLOCK_ENHANCED_PACKET = 0x00000006
+BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+# Classic pcap magics (microsecond and nanosecond resolution)
+PCAP_MAGIC_US = 0xA1B2C3D4
+PCAP_MAGIC_NS = 0xA1B23C4D
+
+# Link types we can decode
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_IPV4 = 228
+LINKTYPE_IPV6 = 229
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86DD
+ETHERTYPE_VLAN = (0x8100, 0x88A8)
+
+IPPROTO_ICMP = 1
+IPPROTO_TCP = 6
+IPPROTO_UDP = 17
+IPPROTO_ICMPV6 = 58
+IPPROTO_SCTP = 132
+IPV6_EXTENSION_HEADERS = (0, 43, 60)
+
+# One captured frame: file offset of its block, 1-based frame number,
+# timestamp in seconds, link type and captured bytes
+Packet = namedtuple('Packet', ['offset', 'number', 'timestamp', 'linktype', 'data', 'orig_len'])
+
+# Decoded IP/transport headers; payload is the transport payload (for SCTP, the chunks)
+PacketInfo = namedtuple('PacketInfo', ['src', 'dst', 'proto', 'sport', 'dport', 'payload'])
+
+
+class PcapngReader:
+    """Read packets from a pcapng (or classic pcap) file, resumable by offset."""
+
+    def __init__(self, path, state=None):
+        """
+        Args:
+            path: Capture file path
+            state: Dict returned by get_state() after an earlier pass; reading
+                continues after the last complete block of that pass
+        """
+        self.path = path
+        state = state or {}
+        self.offset = state.get('offset', 0)
+        self.frame_number = state.get('frame_number', 0)
+        self.endian = state.get('endian', '<')
+        self.format = state.get('format')  # 'pcapng' or 'pcap'
+        # Per interface: [linktype, timestamp units per second, snaplen]
+        self.interfaces = [list(i) for i in state.get('interfaces', [])]
+
+    def get_state(self):
+        """Return a JSON-serialisable state to resume reading later."""
+        return {
+            'offset': self.offset,
+            'frame_number': self.frame_number,
+            'endian': self.endian,
+            'format': self.format,
+            'interfaces': self.interfaces,
+        }
+
+    def packets(self):
+        """Yield Packet tuples for every complete frame after the current offset."""
+        with open(self.path, 'rb') as f:
+            if self.format is None:
+                head = f.read(4)
+                if len(head) < 4:
+                    return
+                magic_le = struct.unpack('<I', head)[0]
+                magic_be = struct.unpack('>I', head)[0]
+                if magic_le == BLOCK_SECTION_HEADER:
+                    self.format = 'pcapng'
+                elif PCAP_MAGIC_US in (magic_le, magic_be) or PCAP_MAGIC_NS in (magic_le, magic_be):
+                    self.format = 'pcap'
+                else:
+                    warning_print(f"Unrecognised capture format: {self.path}")
+                    return
+
+            f.seek(self.offset)
+            if self.format == 'pcapng':
+                yield from self._read_pcapng(f)
+            else:
+                yield from self._read_pcap(f)
+
+    def _read_pcapng(self, f):
+        """Walk pcapng blocks, stopping at the first incomplete one."""
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return
+            block_type = struct.unpack(self.endian + 'I', header[:4])[0]
+
+            if block_type == BLOCK_SECTION_HEADER:
+                # Byte order of the section is given by the magic after the length
+                magic = f.read(4)
+                if len(magic) < 4:
+                    return
+                self.endian = '<' if struct.unpack('<I', magic)[0] == BYTE_ORDER_MAGIC else '>'
+                f.seek(-4, 1)
+                self.interfaces = []
+
+            block_length = struct.unpack(self.endian + 'I', header[4:8])[0]
+            if block_length < 12 or block_length % 4:
+                warning_print(f"Corrupt pcapng block at offset {self.offset} in {self.path}")
+                return
+            body = f.read(block_length - 8)
+            if len(body) < block_length - 8:
+                # Block still being written
+                return
+
+            block_offset = self.offset
+            self.offset += block_length
+            body = body[:-4]
+
+            if block_type == BLOCK_INTERFACE_DESCRIPTION:
+                self._add_interface(body)
+            elif block_type == BLOCK_ENHANCED_PACKET:
+                interface_id, ts_high, ts_low, cap_len, orig_len = struct.unpack(self.endian + 'IIIII', body[:20])
+                packet = self._make_packet(block_offset, interface_id, (ts_high << 32) | ts_low,
+                                           body[20:20 + cap_len], orig_len)
+                if packet:
+                    yield packet
+            elif block_type == BLOCK_SIMPLE_PACKET:
+                orig_len = struct.unpack(self.endian + 'I', body[:4])[0]
+                snaplen = self.interfaces[0][2] if self.interfaces else 0
+                cap_len = min(orig_len, snaplen) if snaplen else orig_len
+                packet = self._make_packet(block_offset, 0, None, body[4:4 + cap_len], orig_len)
+                if packet:
+                    yield packet
+            elif block_type == BLOCK_OBSOLETE_PACKET:
+                interface_id, _drops, ts_high, ts_low, cap_len, orig_len = struct.unpack(self.endian + 'HHIIII', body[:20])
+                packet = self._make_packet(block_offset, interface_id, (ts_high << 32) | ts_low,
+                                           body[20:20 + cap_len], orig_len)
+                if packet:
+                    yield packet
+
+    def _add_interface(self, body):
+        """Register an interface description block."""
+        linktype, _reserved, snaplen = struct.unpack(self.endian + 'HHI', body[:8])
+        units = 1000000
+        pos = 8
+        while pos + 4 <= len(body):
+            code, length = struct.unpack(self.endian + 'HH', body[pos:pos + 4])
+            if code == 0:
+                break
+            if code == 9 and length >= 1:  # if_tsresol
+                value = body[pos + 4]
+                units = 2 ** (value & 0x7F) if value & 0x80 else 10 ** value
+            pos += 4 + length + (-length % 4)
+        self.interfaces.append([linktype, units, snaplen])
+
+    def _make_packet(self, offset, interface_id, raw_ts, data, orig_len):
+        """Build a Packet for a packet block."""
+        if interface_id >= len(self.interfaces):
+            debug_print(f"Packet references unknown interface {interface_id} in {self.path}")
+            return None
+        linktype, units, _snaplen = self.interfaces[interface_id]
+        self.frame_number += 1
+        timestamp = raw_ts / units if raw_ts is not None else 0.0
+        return Packet(offset, self.frame_number, timestamp, linktype, data, orig_len)
+
+    def _read_pcap(self, f):
+        """Walk a classic pcap file."""
+        if self.offset == 0:
+            header = f.read(24)
+            if len(header) < 24:
+                return
+            magic = struct.unpack('<I', header[:4])[0]
+            self.endian = '<' if magic in (PCAP_MAGIC_US, PCAP_MAGIC_NS) else '>'
+            magic = struct.unpack(self.endian + 'I', header[:4])[0]
+            snaplen, linktype = struct.unpack(self.endian + 'II', header[16:24])
+            units = 1000000000 if magic == PCAP_MAGIC_NS else 1000000
+            self.interfaces = [[linktype & 0xFFFF, units, snaplen]]
+            self.offset = 24
+
+        linktype, units, _snaplen = self.interfaces[0]
+        while True:
+            record = f.read(16)
+            if len(record) < 16:
+                return
+            ts_sec, ts_frac, cap_len, orig_len = struct.unpack(self.endian + 'IIII', record)
+            data = f.read(cap_len)
+            if len(data) < cap_len:
+                return
+            record_offset = self.offset
+            self.offset += 16 + cap_len
+            self.frame_number += 1
+            yield Packet(record_offset, self.frame_number, ts_sec + ts_frac / units, linktype, data, orig_len)
+
+
+def read_block_at(f, offset, endian='<'):
+    """Return the raw bytes of the pcapng block starting at offset."""
+    f.seek(offset)
+    header = f.read(8)
+    if len(header) < 8:
+        return b''
+    block_length = struct.unpack(endian + 'I', header[4:8])[0]
+    return header + f.read(block_length - 8)
+
+
+def decode_packet(linktype, data):
+    """
+    Decode link, IP and transport headers of a frame.
+
+    Args:
+        linktype: Link-layer type of the interface the frame was captured on
+        data: Captured frame bytes
+
+    Returns:
+        PacketInfo or None if the frame is not IP or is truncated
+    """
+    try:
+        if linktype == LINKTYPE_ETHERNET:
+            ethertype = struct.unpack('!H', data[12:14])[0]
+            pos = 14
+            while ethertype in ETHERTYPE_VLAN:
+                ethertype = struct.unpack('!H', data[pos + 2:pos + 4])[0]
+                pos += 4
+        elif linktype == LINKTYPE_LINUX_SLL:
+            ethertype = struct.unpack('!H', data[14:16])[0]
+            pos = 16
+        elif linktype == LINKTYPE_LINUX_SLL2:
+            ethertype = struct.unpack('!H', data[0:2])[0]
+            pos = 20
+        elif linktype in (LINKTYPE_RAW, LINKTYPE_IPV4, LINKTYPE_IPV6):
+            version = data[0] >> 4
+            ethertype = ETHERTYPE_IPV4 if version == 4 else ETHERTYPE_IPV6 if version == 6 else None
+            pos = 0
+        elif linktype == LINKTYPE_NULL:
+            family = struct.unpack('<I', data[:4])[0]
+            ethertype = ETHERTYPE_IPV4 if family == 2 else ETHERTYPE_IPV6 if family in (10, 24, 28, 30) else None
+            pos = 4
+        else:
+            return None
+        return decode_ip(data, pos, ethertype)
+    except (struct.error, IndexError):
+        return None
+
+
+def decode_ip(data, pos, ethertype):
+    """Decode an IPv4/IPv6 packet starting at pos."""
+    if ethertype == ETHERTYPE_IPV4:
+        header_length = (data[pos] & 0x0F) * 4
+        total_length = struct.unpack('!H', data[pos + 2:pos + 4])[0]
+        fragment = struct.unpack('!H', data[pos + 6:pos + 8])[0]
+        proto = data[pos + 9]
+        src = socket.inet_ntop(socket.AF_INET, data[pos + 12:pos + 16])
+        dst = socket.inet_ntop(socket.AF_INET, data[pos + 16:pos + 20])
+        end = pos + total_length if total_length else len(data)
+        if fragment & 0x1FFF:
+            # Non-first fragment: no transport header
+            return PacketInfo(src, dst, proto, None, None, b'')
+        return decode_transport(src, dst, proto, data[pos + header_length:end])
+    if ethertype == ETHERTYPE_IPV6:
+        payload_length = struct.unpack('!H', data[pos + 4:pos + 6])[0]
+        proto = data[pos + 6]
+        src = socket.inet_ntop(socket.AF_INET6, data[pos + 8:pos + 24])
+        dst = socket.inet_ntop(socket.AF_INET6, data[pos + 24:pos + 40])
+        end = pos + 40 + payload_length
+        pos += 40
+        while proto in IPV6_EXTENSION_HEADERS:
+            proto = data[pos]
+            pos += (data[pos + 1] + 1) * 8
+        return decode_transport(src, dst, proto, data[pos:end])
+    return None
+
+
+def decode_transport(src, dst, proto, segment):
+    """Decode the ports of a TCP, UDP or SCTP segment."""
+    if proto == IPPROTO_UDP and len(segment) >= 8:
+        sport, dport = struct.unpack('!HH', segment[:4])
+        return PacketInfo(src, dst, proto, sport, dport, segment[8:])
+    if proto == IPPROTO_TCP and len(segment) >= 20:
+        sport, dport = struct.unpack('!HH', segment[:4])
+        data_offset = (segment[12] >> 4) * 4
+        return PacketInfo(src, dst, proto, sport, dport, segment[data_offset:])
+    if proto == IPPROTO_SCTP and len(segment) >= 12:
+        sport, dport = struct.unpack('!HH', segment[:4])
+        return PacketInfo(src, dst, proto, sport, dport, segment[12:])
+    return PacketInfo(src, dst, proto, None, None, segment)
+
+
+def iter_sctp_chunks(chunks):
+    """Yield (type, flags, value) for each chunk of an SCTP packet."""
+    pos = 0
+    while pos + 4 <= len(chunks):
+        chunk_type, flags, length = struct.unpack('!BBH', chunks[pos:pos + 4])
+        if length < 4:
+            return
+        yield chunk_type, flags, chunks[pos + 4:pos + length]
+        pos += length + (-length % 4)
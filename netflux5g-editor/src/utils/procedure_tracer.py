@@ -0,0 +1,264 @@
+"""
+5G Control-Plane Procedure Latency Tracer for NetFlux5G Editor
+
+This module correlates timestamped events from UE, gNB, AMF, SMF and UPF logs
+(UERANSIM and Open5GS formats) to rebuild each procedure per UE/IMSI and
+report latency histograms (p50/p95/p99) for:
+- registration: UE starts initial registration -> registration successful
+- authentication: UE receives Authentication Request -> Security Mode Command
+- session_setup: UE sends PDU Session Establishment Request -> session up
+- session_n4: SMF creates the session -> UPF installs it (PFCP/N4)
+
+When a run has capture KPIs (see utils/capture_metrics.py), the NGAP/NAS
+latencies measured on the wire are reported alongside the log-derived ones.
+Logs are consumed incrementally, so the deployment monitor can feed the
+growing log of each container on every poll.
+"""
+
+import os
+import re
+import glob
+import json
+import time
+from utils.debug import debug_print, error_print, warning_print
+from utils.log_archive import parse_log_line, run_start_time
+from utils.capture_metrics import summarize, read_columnar, COLUMNAR_FILENAME
+
+EXPORT_FILENAME = "procedure_latency.json"
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+PROCEDURES = ['registration', 'authentication', 'session_setup', 'session_n4']
+
+IMSI_TAG_RE = re.compile(r'\[(imsi-\d+)\|')
+IMSI_RE = re.compile(r'\b(imsi-\d+)\b')
+SMF_SESSION_RE = re.compile(r'UE SUPI\[(imsi-\d+)\].*?IPv4\[([0-9.]+)\]')
+UPF_SESSION_RE = re.compile(r'UE F-SEID\[.*?IPv4\[([0-9.]+)\]')
+UE_TUN_RE = re.compile(r'TUN interface\[[^,]+, ([0-9.]+)\] is up')
+
+# (procedure, edge, pattern): 'start' opens a procedure for the UE, 'end' closes it
+UE_EVENT_RULES = [
+    ('registration', 'start', re.compile(r'Sending Initial Registration|switches to state \[MM-REGISTER(ED)?-INITIATED')),
+    ('registration', 'end', re.compile(r'Initial Registration is successful')),
+    ('authentication', 'start', re.compile(r'Authentication Request received')),
+    ('authentication', 'end', re.compile(r'Security Mode Command received')),
+    ('session_setup', 'start', re.compile(r'Sending PDU Session Establishment Request')),
+    ('session_setup', 'end', re.compile(r'PDU Session establishment is successful')),
+]
+
+
+def histogram(samples):
+    """Return summary statistics plus bucket counts for latency samples in ms."""
+    stats = summarize(samples)
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for value in samples:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    stats['buckets_ms'] = HISTOGRAM_BUCKETS_MS
+    stats['bucket_counts'] = counts
+    return stats
+
+
+class ProcedureTracer:
+    """Rebuild control-plane procedures per UE from streamed log lines."""
+
+    def __init__(self, run_start=None):
+        self.run_start = run_start
+        self.pending = {}          # (ue_key, procedure) -> start timestamp ms
+        self.completed = []        # dicts: ue, procedure, start_ms, end_ms, latency_ms, source
+        self.ip_to_imsi = {}       # UE IP -> IMSI, learned from SMF
+        self.aliases = {}          # UE container -> IMSI, learned from TUN IPs
+        self.pending_n4 = {}       # UE IP -> (imsi, SMF timestamp)
+        self.pending_upf = {}      # UE IP -> UPF timestamp, when seen before the SMF line
+        self.capture_rows = []     # NGAP/NAS latencies from capture KPIs
+        self._offsets = {}         # component -> characters consumed from its log text
+
+    def feed_text(self, component, text):
+        """Consume the part of a component's (growing) log that was not seen yet."""
+        offset = self._offsets.get(component, 0)
+        if len(text) < offset:
+            # Log was truncated or the container restarted; start over
+            offset = 0
+        end = text.rfind('\n') + 1
+        if end <= offset:
+            return
+        for line in text[offset:end].splitlines():
+            self.feed_line(component, line)
+        self._offsets[component] = end
+
+    def feed_file(self, component, path):
+        """Consume a log file from disk."""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            self.feed_text(component, f.read())
+
+    def feed_line(self, component, line):
+        """Process one log line of a component."""
+        ts, _severity, message = parse_log_line(line, self.run_start)
+        if ts is None:
+            return
+
+        # SMF and UPF logs may be fed in either order, so whichever side of
+        # the N4 session arrives first waits for the other
+        match = SMF_SESSION_RE.search(message)
+        if match:
+            imsi, ip = match.groups()
+            self.ip_to_imsi[ip] = imsi
+            installed = self.pending_upf.pop(ip, None)
+            if installed is not None and installed >= ts:
+                self._complete(imsi, 'session_n4', ts, installed, 'log')
+            else:
+                self.pending_n4[ip] = (imsi, ts)
+            return
+
+        match = UPF_SESSION_RE.search(message)
+        if match:
+            pending = self.pending_n4.pop(match.group(1), None)
+            if pending:
+                self._complete(pending[0], 'session_n4', pending[1], ts, 'log')
+            else:
+                self.pending_upf[match.group(1)] = ts
+            return
+
+        match = UE_TUN_RE.search(message)
+        if match and match.group(1) in self.ip_to_imsi:
+            self.aliases[self._ue_key(component, message)] = self.ip_to_imsi[match.group(1)]
+
+        for procedure, edge, pattern in UE_EVENT_RULES:
+            if pattern.search(message):
+                ue_key = self._ue_key(component, message)
+                if edge == 'start':
+                    self.pending[(ue_key, procedure)] = ts
+                else:
+                    started = self.pending.pop((ue_key, procedure), None)
+                    if started is not None:
+                        self._complete(ue_key, procedure, started, ts, 'log')
+                    if procedure == 'registration':
+                        # UERANSIM requests its PDU session right after registering;
+                        # use that as the session start when debug lines are absent
+                        self.pending.setdefault((ue_key, 'session_setup'), ts)
+                break
+
+    def _ue_key(self, component, message):
+        """Identify the UE a line belongs to: IMSI when logged, else the container."""
+        match = IMSI_TAG_RE.search(message) or IMSI_RE.search(message)
+        return match.group(1) if match else component
+
+    def _complete(self, ue_key, procedure, start_ms, end_ms, source):
+        self.completed.append({
+            'ue': ue_key,
+            'procedure': procedure,
+            'start_ms': start_ms,
+            'end_ms': end_ms,
+            'latency_ms': float(end_ms - start_ms),
+            'source': source,
+        })
+
+    def add_capture_kpis(self, rows):
+        """Attach NGAP/NAS latency rows computed from captures."""
+        self.capture_rows = [r for r in rows if r.get('kpi') == 'ngap_procedure_latency_ms']
+
+    def procedures(self):
+        """Return completed procedures with container names replaced by IMSIs where known."""
+        return [dict(p, ue=self.aliases.get(p['ue'], p['ue'])) for p in self.completed]
+
+    def histograms(self):
+        """Return latency histograms per procedure."""
+        samples = {}
+        for procedure in self.completed:
+            samples.setdefault(procedure['procedure'], []).append(procedure['latency_ms'])
+        return {name: histogram(values) for name, values in samples.items()}
+
+    def summary_lines(self):
+        """Return short human-readable p50/p95/p99 lines per procedure."""
+        lines = []
+        histograms = self.histograms()
+        for name in PROCEDURES + sorted(set(histograms) - set(PROCEDURES)):
+            stats = histograms.get(name)
+            if not stats:
+                continue
+            lines.append(f"{name.replace('_', ' ').title()}: n={stats['count']} "
+                         f"p50={stats['p50']:.0f} p95={stats['p95']:.0f} p99={stats['p99']:.0f} ms")
+        for row in self.capture_rows:
+            lines.append(f"NGAP {row['key'].replace('_', ' ')} ({row['node']} capture): n={row['count']} "
+                         f"p50={row['p50']:.0f} p95={row['p95']:.0f} p99={row['p99']:.0f} ms")
+        return lines
+
+    def to_dict(self):
+        """Return everything needed to export the latencies of a run."""
+        return {
+            'version': 1,
+            'generated': time.time(),
+            'summary': self.summary_lines(),
+            'histograms': self.histograms(),
+            'procedures': self.procedures(),
+            'capture_ngap_latency': self.capture_rows,
+        }
+
+    def export(self, output_path):
+        """Write latencies to a file; see write_latency_export()."""
+        return write_latency_export(self.to_dict(), output_path)
+
+
+def write_latency_export(data, output_path):
+    """Write ProcedureTracer.to_dict() output as JSON, or its procedures as CSV for .csv paths."""
+    if output_path.lower().endswith('.csv'):
+        columns = ['ue', 'procedure', 'start_ms', 'end_ms', 'latency_ms', 'source']
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(",".join(columns) + "\n")
+            for procedure in data.get('procedures', []):
+                f.write(",".join(str(procedure[c]) for c in columns) + "\n")
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    return output_path
+
+
+def trace_run(export_dir):
+    """Build a tracer from the log folder (and capture KPIs) of a run."""
+    tracer = ProcedureTracer(run_start_time(export_dir))
+    log_files = sorted(glob.glob(os.path.join(export_dir, "log", "*.log")))
+
+    # Interleave lines of all components in time order so cross-component
+    # procedures (SMF -> UPF) pair up regardless of file order
+    events = []
+    for path in log_files:
+        component = os.path.splitext(os.path.basename(path))[0]
+        if component.endswith('_capture'):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    ts = parse_log_line(line.rstrip('\n'), tracer.run_start)[0]
+                    if ts is not None:
+                        events.append((ts, component, line.rstrip('\n')))
+        except OSError as e:
+            warning_print(f"Cannot read log {path}: {e}")
+    events.sort(key=lambda e: e[0])
+    for _ts, component, line in events:
+        tracer.feed_line(component, line)
+
+    columnar_path = os.path.join(export_dir, "captures", COLUMNAR_FILENAME)
+    if os.path.exists(columnar_path):
+        try:
+            tracer.add_capture_kpis(read_columnar(columnar_path))
+        except Exception as e:
+            debug_print(f"Could not read capture KPIs {columnar_path}: {e}")
+    return tracer
+
+
+def export_run_latencies(export_dir, output_path=None):
+    """Trace a finished run and write its latencies next to its logs."""
+    try:
+        tracer = trace_run(export_dir)
+        output_path = output_path or os.path.join(export_dir, EXPORT_FILENAME)
+        tracer.export(output_path)
+        debug_print(f"Exported {len(tracer.completed)} procedure latencies to {output_path}")
+        return output_path
+    except Exception as e:
+        error_print(f"Failed to export procedure latencies for {export_dir}: {e}")
+        return None
@@ -0,0 +1,111 @@
+"""
+Startup Profiler for NetFlux5G Editor
+
+Reports where the time to open the editor goes (python3 main.py
+--profile-startup). enable() must run before the modules to be measured are
+imported: it wraps the import statement and records the self time of every
+module imported for the first time, i.e. without the modules it imports in
+turn. measure() records the cost of an initialization step, such as creating
+a manager. report() prints both tables.
+
+Steps measured after report() (e.g. a manager created on first use) are
+printed as they happen. When the profiler is not enabled, measure() does
+nothing and nothing is imported or printed.
+"""
+
+import sys
+import time
+import builtins
+import threading
+import importlib.util
+from contextlib import contextmanager
+
+# Number of imports listed by report()
+REPORT_TOP_IMPORTS = 30
+
+_enabled = False
+_reported = False
+_start_time = None
+_original_import = None
+_main_thread = None
+_import_stack = []    # time spent in nested imports of each import in progress
+_import_times = {}    # module name -> self time (s)
+_steps = []           # (label, time (s)) in order
+
+
+def enable():
+    """Start recording imports and initialization steps."""
+    global _enabled, _start_time, _original_import, _main_thread
+    if _enabled:
+        return
+    _enabled = True
+    _start_time = time.perf_counter()
+    _main_thread = threading.get_ident()
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+
+
+def is_enabled():
+    return _enabled
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    module_name = name
+    if level:
+        try:
+            module_name = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+        except (ImportError, ValueError):
+            pass
+    # Only the main thread's first import of a module is measured
+    if module_name in sys.modules or threading.get_ident() != _main_thread:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    _import_stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _import_stack.pop()
+        if _import_stack:
+            _import_stack[-1] += elapsed
+        _import_times[module_name] = _import_times.get(module_name, 0.0) + elapsed - nested
+
+
+@contextmanager
+def measure(label):
+    """Record the time spent in the with block as an initialization step."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _steps.append((label, elapsed))
+        if _reported:
+            print(f"[startup] {label}: {elapsed * 1000:.1f} ms")
+
+
+def report(file=None):
+    """Print the import and initialization costs recorded so far."""
+    global _reported
+    if not _enabled:
+        return
+    file = file or sys.stdout
+    _reported = True
+    total = time.perf_counter() - _start_time
+
+    imports = sorted(_import_times.items(), key=lambda item: item[1], reverse=True)
+    import_total = sum(_import_times.values())
+    print(f"\nStartup profile: {total * 1000:.0f} ms until the event loop started", file=file)
+    print(f"\nImports: {len(imports)} modules, {import_total * 1000:.0f} ms (self time, top {REPORT_TOP_IMPORTS})", file=file)
+    for module_name, elapsed in imports[:REPORT_TOP_IMPORTS]:
+        print(f"  {elapsed * 1000:8.1f} ms  {module_name}", file=file)
+
+    print(f"\nInitialization: {sum(t for _, t in _steps) * 1000:.0f} ms", file=file)
+    for label, elapsed in _steps:
+        print(f"  {elapsed * 1000:8.1f} ms  {label}", file=file)
+    print(file=file)
+    file.flush()
@@ -1,16 +1,32 @@
 """
 Template Configuration Updater for NetFlux5G Editor
 
-This module automatically updates template files (.nf5g) to ensure config_file_path
-and config_path values are correctly set for the current installation directory.
-This ensures templates work correctly regardless of where the application is installed.
+This module makes sure the config_file_path and config_path values of template
+files (.nf5g) point into the current installation directory, so templates work
+regardless of where the application is installed.
+
+A small manifest (examples/.template_manifest.json) records, per template, its
+mtime, size and SHA-256, the config base path it was checked against and
+whether its paths are stale. At startup, templates whose inputs did not change
+are skipped without being read; the others are hashed and scanned on a thread
+pool. Stale paths are not rewritten on disk but fixed in memory when a template
+is loaded (apply_config_paths()); update_all_templates(rewrite=True), used by
+--update-templates, still rewrites the files.
 """
 
 import os
 import json
 import glob
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from utils.debug import debug_print, error_print, warning_print
 
+MANIFEST_FILE = ".template_manifest.json"
+
+# Worker threads that scan changed templates
+MAX_WORKERS = 4
+
 class TemplateUpdater:
     """Updates template files to use correct config paths for the current installation."""
     
@@ -19,35 +35,139 @@ class TemplateUpdater:
         # Get the base directory of the NetFlux5G installation
         self.base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.config_base_path = os.path.join(self.base_dir, "export", "5g-configs")
+        self.examples_dir = os.path.join(self.base_dir, "examples")
+        self.manifest_path = os.path.join(self.examples_dir, MANIFEST_FILE)
+        self._manifest = None  # file name -> manifest entry, loaded on first use
+        self._lock = threading.Lock()
+        
+    def update_all_templates(self, rewrite=False):
+        """Check all template files in the examples directory against the manifest.
         
-    def update_all_templates(self):
-        """Update all template files in the examples directory."""
+        Only templates that changed since the last run (or whose config base path
+        changed) are read. With rewrite=True, stale templates are rewritten on disk;
+        otherwise their paths are fixed when they are loaded.
+        """
         try:
-            examples_dir = os.path.join(self.base_dir, "examples")
-            
-            if not os.path.exists(examples_dir):
-                warning_print(f"Examples directory not found: {examples_dir}")
+            if not os.path.exists(self.examples_dir):
+                warning_print(f"Examples directory not found: {self.examples_dir}")
                 return False
             
             # Find all .nf5g files in the examples directory
-            template_files = glob.glob(os.path.join(examples_dir, "*.nf5g"))
+            template_files = glob.glob(os.path.join(self.examples_dir, "*.nf5g"))
             
             if not template_files:
                 warning_print("No template files found in examples directory")
                 return False
             
-            updated_count = 0
+            manifest = self._load_manifest()
+            entries = {}
+            pending = []
             for template_file in template_files:
-                if self.update_template_file(template_file):
-                    updated_count += 1
-                    
-            debug_print(f"Updated {updated_count} template files with correct config paths")
+                name = os.path.basename(template_file)
+                entry = manifest.get(name)
+                if self._is_current(template_file, entry) and not (rewrite and entry['stale']):
+                    entries[name] = entry
+                else:
+                    pending.append((template_file, entry))
+            
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending))) as pool:
+                    results = pool.map(lambda job: self._scan_template(job[0], job[1], rewrite), pending)
+                    for (template_file, _entry), entry in zip(pending, results):
+                        if entry is not None:
+                            entries[os.path.basename(template_file)] = entry
+            
+            if entries != manifest:
+                self._save_manifest(entries)
+            with self._lock:
+                self._manifest = entries
+            
+            stale = sorted(name for name, entry in entries.items() if entry['stale'])
+            debug_print(f"Checked templates: {len(template_files) - len(pending)} unchanged, {len(pending)} scanned"
+                        + (f", config paths fixed on load for {', '.join(stale)}" if stale else ""))
             return True
             
         except Exception as e:
             error_print(f"Error updating templates: {e}")
             return False
     
+    def _load_manifest(self):
+        with self._lock:
+            if self._manifest is None:
+                try:
+                    with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                        self._manifest = json.load(f)
+                except (OSError, ValueError):
+                    self._manifest = {}
+            return dict(self._manifest)
+    
+    def _save_manifest(self, entries):
+        try:
+            temp_path = self.manifest_path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            warning_print(f"Could not write template manifest: {e}")
+    
+    def _is_current(self, template_file, entry):
+        """Return True if a manifest entry still describes a template file."""
+        if not entry or entry.get('config_base_path') != self.config_base_path:
+            return False
+        try:
+            stat = os.stat(template_file)
+        except OSError:
+            return False
+        return entry.get('mtime') == stat.st_mtime and entry.get('size') == stat.st_size
+    
+    def _scan_template(self, template_file, previous, rewrite):
+        """Hash a template and check its config paths. Returns its manifest entry, or None."""
+        try:
+            with open(template_file, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            stat = os.stat(template_file)
+            entry = {
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'sha256': digest,
+                'config_base_path': self.config_base_path,
+            }
+            # Touched but not modified: the previous result still holds
+            if (previous and previous.get('sha256') == digest and
+                    previous.get('config_base_path') == self.config_base_path and
+                    not (rewrite and previous.get('stale'))):
+                entry['stale'] = previous.get('stale', False)
+                return entry
+            
+            template_data = json.loads(data.decode('utf-8'))
+            entry['stale'] = self.apply_config_paths(template_data)
+            if entry['stale'] and rewrite:
+                self.update_template_file(template_file)
+                return self._scan_template(template_file, None, False)
+            return entry
+        except Exception as e:
+            error_print(f"Error scanning template file {template_file}: {e}")
+            return None
+    
+    def needs_config_paths(self, filename):
+        """Return True if a topology file is a template whose config paths must be fixed on load."""
+        path = os.path.abspath(filename)
+        if os.path.dirname(path) != self.examples_dir:
+            return False
+        entry = self._load_manifest().get(os.path.basename(path))
+        return not self._is_current(path, entry) or entry['stale']
+    
+    def apply_config_paths(self, topology_data):
+        """Fix the config paths of the VGcore nodes of loaded topology data in memory.
+        Returns True if any path changed."""
+        changes_made = False
+        for node in topology_data.get('nodes', []):
+            if node.get('type') == 'VGcore':
+                if self.update_node_config_paths(node):
+                    changes_made = True
+        return changes_made
+    
     def update_template_file(self, template_file):
         """Update a single template file with correct config paths."""
         try:
@@ -57,15 +177,8 @@ class TemplateUpdater:
             with open(template_file, 'r', encoding='utf-8') as f:
                 template_data = json.load(f)
             
-            # Track if any changes were made
-            changes_made = False
-            
             # Update nodes with VGcore (5G core) components
-            if 'nodes' in template_data:
-                for node in template_data['nodes']:
-                    if node.get('type') == 'VGcore':
-                        if self.update_node_config_paths(node):
-                            changes_made = True
+            changes_made = self.apply_config_paths(template_data)
             
             # Save the file if changes were made
             if changes_made:
@@ -200,7 +313,7 @@ class TemplateUpdater:
     def get_status_report(self):
         """Get a status report of the template updater."""
         try:
-            examples_dir = os.path.join(self.base_dir, "examples")
+            examples_dir = self.examples_dir
             template_files = glob.glob(os.path.join(examples_dir, "*.nf5g"))
             
             report = {
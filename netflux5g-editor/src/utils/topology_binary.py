@@ -0,0 +1,451 @@
+"""
+Binary Topology Format for NetFlux5G Editor
+
+An optional compact alternative to the JSON .nf5g format, stored as .nf5gb.
+The file is a small chunk directory followed by zlib-compressed chunks:
+
+    META  top-level keys other than nodes/links/config_blobs (JSON)
+    STRS  string table: names, types, dates... each stored once
+    NODE  columnar node table: string indexes, flags and x/y positions
+    PROP  light node properties, without the keys repeating the node's
+          name/type/x/y (JSON list)
+    HEVY  heavy properties of one node (5G NF config rows, large values),
+          one chunk per node (key = node index), decompressed on demand
+    LINK  columnar link table
+    LPRP  link properties, without the keys repeating the link's columns
+    BLOB  config store blobs (see utils/config_store.py)
+
+read_binary(path, lazy=True) returns the same structure as a parsed .nf5g,
+except that nodes with heavy properties carry a '_deferred_properties'
+callable instead of those keys; NetworkComponent.deferProperties() merges
+them when the properties are first needed (e.g. a properties dialog opens).
+
+Offline conversion and benchmark:
+
+    python3 -m utils.topology_binary to-binary examples/sdn_topology.nf5g
+    python3 -m utils.topology_binary to-json topology.nf5gb
+    python3 -m utils.topology_binary benchmark [files...]
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import zlib
+import struct
+import tempfile
+from utils.debug import debug_print
+
+BINARY_SUFFIX = ".nf5gb"
+MAGIC = b'NF5GBIN1'
+HEADER_FORMAT = '<8sI'            # magic, chunk count
+ENTRY_FORMAT = '<4sIQII'          # tag, key, offset, stored length, raw length
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+ENTRY_SIZE = struct.calcsize(ENTRY_FORMAT)
+
+NO_STRING = 0xFFFFFFFF
+
+# Node flags: which optional fields exist and which property keys repeat the node's columns
+NODE_HAS_POSITION = 0x01
+NODE_HAS_CREATED = 0x02
+NODE_HAS_ID = 0x04
+NODE_HAS_HEAVY = 0x08
+NODE_DUP_NAME = 0x10
+NODE_DUP_TYPE = 0x20
+NODE_DUP_X = 0x40
+NODE_DUP_Y = 0x80
+
+# Link flags
+LINK_HAS_CREATED = 0x01
+LINK_HAS_NAME = 0x02
+LINK_DUP_NAME = 0x04
+LINK_DUP_TYPE = 0x08
+LINK_DUP_SOURCE = 0x10
+LINK_DUP_DESTINATION = 0x20
+
+NODE_FIELDS = ('name', 'type', 'x', 'y', 'properties', 'created_date', 'component_id')
+LINK_FIELDS = ('source', 'destination', 'type', 'properties', 'name', 'created_date')
+
+# Property values larger than this (as JSON) go to the node's heavy chunk
+HEAVY_VALUE_BYTES = 2048
+
+DEFAULT_EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples", "*.nf5g")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _is_heavy(key, value):
+    return key.endswith('_configs') or len(_dumps(value)) > HEAVY_VALUE_BYTES
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+
+    def add(self, value):
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _pop_duplicate(properties, key, value, flag):
+    """Drop properties[key] if it repeats a column value. Returns the flag if dropped."""
+    if key in properties and properties[key] == value and type(properties[key]) is type(value):
+        del properties[key]
+        return flag
+    return 0
+
+
+def write_binary(topology_data, path):
+    """Atomically write topology data (as parsed from a .nf5g) in the binary format."""
+    strings = _StringTable()
+    chunks = []  # (tag, key, raw bytes)
+
+    nodes = topology_data.get('nodes', [])
+    node_columns = [[] for _ in range(4)]  # name, type, created, flags
+    xs, ys, ids, light = [], [], [], []
+    for index, node in enumerate(nodes):
+        flags = 0
+        properties = dict(node.get('properties') or {})
+        if 'x' in node or 'y' in node:
+            flags |= NODE_HAS_POSITION
+        x, y = float(node.get('x', 0)), float(node.get('y', 0))
+        if node.get('created_date') is not None:
+            flags |= NODE_HAS_CREATED
+        if node.get('component_id') is not None:
+            flags |= NODE_HAS_ID
+        flags |= _pop_duplicate(properties, 'name', node.get('name'), NODE_DUP_NAME)
+        flags |= _pop_duplicate(properties, 'type', node.get('type'), NODE_DUP_TYPE)
+        flags |= _pop_duplicate(properties, 'x', node.get('x'), NODE_DUP_X)
+        flags |= _pop_duplicate(properties, 'y', node.get('y'), NODE_DUP_Y)
+
+        heavy = {k: v for k, v in properties.items() if _is_heavy(k, v)}
+        if heavy:
+            flags |= NODE_HAS_HEAVY
+            chunks.append((b'HEVY', index, _dumps(heavy)))
+            properties = {k: v for k, v in properties.items() if k not in heavy}
+        extra = {k: v for k, v in node.items() if k not in NODE_FIELDS}
+        light.append([properties, extra] if extra else [properties])
+
+        node_columns[0].append(strings.add(node.get('name')))
+        node_columns[1].append(strings.add(node.get('type')))
+        node_columns[2].append(strings.add(node.get('created_date')))
+        node_columns[3].append(flags)
+        xs.append(x)
+        ys.append(y)
+        ids.append(int(node.get('component_id') or 0))
+
+    count = len(nodes)
+    chunks.append((b'NODE', 0, struct.pack('<I', count)
+                   + struct.pack(f'<{count}I', *node_columns[0])
+                   + struct.pack(f'<{count}I', *node_columns[1])
+                   + struct.pack(f'<{count}I', *node_columns[2])
+                   + struct.pack(f'<{count}B', *node_columns[3])
+                   + struct.pack(f'<{count}d', *xs)
+                   + struct.pack(f'<{count}d', *ys)
+                   + struct.pack(f'<{count}Q', *ids)))
+    chunks.append((b'PROP', 0, _dumps(light)))
+
+    links = topology_data.get('links', [])
+    link_columns = [[] for _ in range(6)]  # source, destination, type, name, created, flags
+    link_light = []
+    for link in links:
+        flags = 0
+        properties = dict(link.get('properties') or {})
+        destination = link.get('destination', link.get('dest'))
+        if link.get('created_date') is not None:
+            flags |= LINK_HAS_CREATED
+        if 'name' in link:
+            flags |= LINK_HAS_NAME
+        flags |= _pop_duplicate(properties, 'name', link.get('name'), LINK_DUP_NAME)
+        flags |= _pop_duplicate(properties, 'type', link.get('type'), LINK_DUP_TYPE)
+        flags |= _pop_duplicate(properties, 'source', link.get('source'), LINK_DUP_SOURCE)
+        flags |= _pop_duplicate(properties, 'destination', destination, LINK_DUP_DESTINATION)
+        extra = {k: v for k, v in link.items() if k not in LINK_FIELDS and k != 'dest'}
+        link_light.append([properties, extra] if extra else [properties])
+
+        link_columns[0].append(strings.add(link.get('source')))
+        link_columns[1].append(strings.add(destination))
+        link_columns[2].append(strings.add(link.get('type')))
+        link_columns[3].append(strings.add(link.get('name')))
+        link_columns[4].append(strings.add(link.get('created_date')))
+        link_columns[5].append(flags)
+
+    count = len(links)
+    chunks.append((b'LINK', 0, struct.pack('<I', count)
+                   + b''.join(struct.pack(f'<{count}I', *column) for column in link_columns[:5])
+                   + struct.pack(f'<{count}B', *link_columns[5])))
+    chunks.append((b'LPRP', 0, _dumps(link_light)))
+
+    meta = {k: v for k, v in topology_data.items() if k not in ('nodes', 'links', 'config_blobs')}
+    chunks.append((b'META', 0, _dumps(meta)))
+    if topology_data.get('config_blobs'):
+        chunks.append((b'BLOB', 0, _dumps(topology_data['config_blobs'])))
+    chunks.insert(0, (b'STRS', 0, '\0'.join(strings.strings).encode('utf-8')))
+
+    directory = []
+    payload = []
+    offset = HEADER_SIZE + ENTRY_SIZE * len(chunks)
+    for tag, key, raw in chunks:
+        stored = zlib.compress(raw, 6)
+        directory.append(struct.pack(ENTRY_FORMAT, tag, key, offset, len(stored), len(raw)))
+        payload.append(stored)
+        offset += len(stored)
+
+    directory_path = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(struct.pack(HEADER_FORMAT, MAGIC, len(chunks)))
+            f.write(b''.join(directory))
+            f.write(b''.join(payload))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    debug_print(f"DEBUG: Wrote binary topology {path} ({offset} bytes, {len(chunks)} chunks)")
+    return offset
+
+
+def is_binary_topology(path):
+    """Return True if path is a binary topology file."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _deferred_loader(stored):
+    """Return a callable that decompresses and parses a heavy chunk when called."""
+    def load():
+        return json.loads(zlib.decompress(stored))
+    return load
+
+
+class BinaryTopology:
+    """Parsed chunk directory of a binary topology file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER_SIZE:
+            raise ValueError("Not a NetFlux5G binary topology (file too short)")
+        magic, count = struct.unpack_from(HEADER_FORMAT, data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a NetFlux5G binary topology (bad magic)")
+        self._chunks = {}  # (tag, key) -> (compressed bytes, raw length)
+        for i in range(count):
+            tag, key, offset, length, raw_length = struct.unpack_from(ENTRY_FORMAT, data, HEADER_SIZE + i * ENTRY_SIZE)
+            if offset + length > len(data):
+                raise ValueError(f"Truncated binary topology (chunk {tag.decode('ascii', 'replace')})")
+            self._chunks[(tag, key)] = (data[offset:offset + length], raw_length)
+
+    def chunk(self, tag, key=0):
+        """Return the decompressed bytes of a chunk, or None if it does not exist."""
+        entry = self._chunks.get((tag, key))
+        if entry is None:
+            return None
+        raw = zlib.decompress(entry[0])
+        if len(raw) != entry[1]:
+            raise ValueError(f"Corrupted chunk {tag.decode('ascii', 'replace')}")
+        return raw
+
+    def topology_data(self, lazy=True):
+        """Return the topology in the JSON structure; heavy properties are deferred if lazy."""
+        strings_raw = self.chunk(b'STRS')
+        strings = strings_raw.decode('utf-8').split('\0') if strings_raw else []
+
+        def string(index):
+            return None if index == NO_STRING else strings[index]
+
+        topology = json.loads(self.chunk(b'META'))
+
+        raw = self.chunk(b'NODE')
+        count = struct.unpack_from('<I', raw, 0)[0]
+        offset = 4
+        columns = []
+        for fmt, size in (('I', 4), ('I', 4), ('I', 4), ('B', 1), ('d', 8), ('d', 8), ('Q', 8)):
+            columns.append(struct.unpack_from(f'<{count}{fmt}', raw, offset))
+            offset += count * size
+        names, types, created, flags, xs, ys, ids = columns
+        light = json.loads(self.chunk(b'PROP'))
+
+        nodes = []
+        for i in range(count):
+            name, node_type, node_flags = string(names[i]), string(types[i]), flags[i]
+            properties = {}
+            if node_flags & NODE_DUP_NAME:
+                properties['name'] = name
+            if node_flags & NODE_DUP_TYPE:
+                properties['type'] = node_type
+            if node_flags & NODE_DUP_X:
+                properties['x'] = xs[i]
+            if node_flags & NODE_DUP_Y:
+                properties['y'] = ys[i]
+            properties.update(light[i][0])
+            node = {'name': name, 'type': node_type}
+            if node_flags & NODE_HAS_POSITION:
+                node['x'], node['y'] = xs[i], ys[i]
+            node['properties'] = properties
+            if node_flags & NODE_HAS_CREATED:
+                node['created_date'] = string(created[i])
+            if node_flags & NODE_HAS_ID:
+                node['component_id'] = ids[i]
+            if len(light[i]) > 1:
+                node.update(light[i][1])
+            if node_flags & NODE_HAS_HEAVY:
+                stored = self._chunks[(b'HEVY', i)][0]
+                if lazy:
+                    node['_deferred_properties'] = _deferred_loader(stored)
+                else:
+                    properties.update(_deferred_loader(stored)())
+            nodes.append(node)
+
+        raw = self.chunk(b'LINK')
+        count = struct.unpack_from('<I', raw, 0)[0]
+        offset = 4
+        columns = []
+        for _ in range(5):
+            columns.append(struct.unpack_from(f'<{count}I', raw, offset))
+            offset += count * 4
+        link_flags = struct.unpack_from(f'<{count}B', raw, offset)
+        sources, destinations, link_types, link_names, link_created = columns
+        link_light = json.loads(self.chunk(b'LPRP'))
+
+        links = []
+        for i in range(count):
+            link_type, link_name = string(link_types[i]), string(link_names[i])
+            source, destination, link_flag = string(sources[i]), string(destinations[i]), link_flags[i]
+            properties = {}
+            if link_flag & LINK_DUP_NAME:
+                properties['name'] = link_name
+            if link_flag & LINK_DUP_TYPE:
+                properties['type'] = link_type
+            if link_flag & LINK_DUP_SOURCE:
+                properties['source'] = source
+            if link_flag & LINK_DUP_DESTINATION:
+                properties['destination'] = destination
+            properties.update(link_light[i][0])
+            link = {'source': source, 'destination': destination, 'type': link_type, 'properties': properties}
+            if link_flag & LINK_HAS_NAME:
+                link['name'] = link_name
+            if link_flag & LINK_HAS_CREATED:
+                link['created_date'] = string(link_created[i])
+            if len(link_light[i]) > 1:
+                link.update(link_light[i][1])
+            links.append(link)
+
+        topology['nodes'] = nodes
+        topology['links'] = links
+        blobs = self.chunk(b'BLOB')
+        if blobs:
+            topology['config_blobs'] = json.loads(blobs)
+        return topology
+
+
+def read_binary(path, lazy=True):
+    """Read a binary topology file. See BinaryTopology.topology_data()."""
+    return BinaryTopology(path).topology_data(lazy)
+
+
+def json_to_binary(json_path, binary_path=None):
+    """Convert a .nf5g file to the binary format. Returns the output path."""
+    binary_path = binary_path or os.path.splitext(json_path)[0] + BINARY_SUFFIX
+    with open(json_path, 'r', encoding='utf-8') as f:
+        write_binary(json.load(f), binary_path)
+    return binary_path
+
+
+def binary_to_json(binary_path, json_path=None):
+    """Convert a binary topology to a .nf5g file. Returns the output path."""
+    json_path = json_path or os.path.splitext(binary_path)[0] + ".nf5g"
+    topology = read_binary(binary_path, lazy=False)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(topology, f, indent=2, ensure_ascii=False)
+    return json_path
+
+
+def _best_time(func, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(paths):
+    """Compare size and load time of .nf5g files and their binary form. Returns result rows.
+
+    Raises ValueError if the binary form does not read back, or validate when
+    read lazily, like the original.
+    """
+    from utils.topology_validator import validate_topology
+    rows = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for path in paths:
+            binary_path = os.path.join(temp_dir, os.path.basename(os.path.splitext(path)[0]) + BINARY_SUFFIX)
+            json_to_binary(path, binary_path)
+
+            with open(path, 'r', encoding='utf-8') as f:
+                original = json.load(f)
+            if read_binary(binary_path, lazy=False) != original:
+                raise ValueError(f"Round trip of {path} does not match the original")
+            # Checks of a lazily read topology must see its deferred properties too
+            if validate_topology(read_binary(binary_path, lazy=True)) != validate_topology(original):
+                raise ValueError(f"Validation of lazily read {path} differs from the original")
+
+            def load_json():
+                with open(path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+
+            rows.append({
+                'file': os.path.basename(path),
+                'json_bytes': os.path.getsize(path),
+                'binary_bytes': os.path.getsize(binary_path),
+                'json_load_ms': _best_time(load_json) * 1000,
+                'binary_lazy_ms': _best_time(lambda: read_binary(binary_path, lazy=True)) * 1000,
+                'binary_full_ms': _best_time(lambda: read_binary(binary_path, lazy=False)) * 1000,
+            })
+    return rows
+
+
+def main(argv):
+    if len(argv) < 2 or argv[1] not in ('to-binary', 'to-json', 'benchmark'):
+        print("Usage: python3 -m utils.topology_binary to-binary|to-json <file>... | benchmark [file...]")
+        return 1
+    command, paths = argv[1], argv[2:]
+    if command == 'to-binary':
+        for path in paths:
+            print(json_to_binary(path))
+    elif command == 'to-json':
+        for path in paths:
+            print(binary_to_json(path))
+    else:
+        paths = paths or sorted(glob.glob(DEFAULT_EXAMPLES))
+        print(f"{'file':<32} {'json':>9} {'binary':>9} {'ratio':>6} {'json ms':>8} {'lazy ms':>8} {'full ms':>8}")
+        for row in benchmark(paths):
+            print(f"{row['file']:<32} {row['json_bytes']:>9} {row['binary_bytes']:>9} "
+                  f"{row['binary_bytes'] / row['json_bytes']:>6.2f} {row['json_load_ms']:>8.2f} "
+                  f"{row['binary_lazy_ms']:>8.2f} {row['binary_full_ms']:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
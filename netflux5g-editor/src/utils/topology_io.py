@@ -0,0 +1,280 @@
+"""
+Topology I/O for NetFlux5G Editor
+
+Reading and validating topology files, creating export directories and
+copying the 5G core configs of a topology into an export do not need Qt.
+They live here so the editor (manager/file.py, automation/automation_runner.py)
+and the headless command line (netflux5g.py) share one implementation.
+"""
+
+import os
+import json
+import shutil
+import time
+from datetime import datetime
+import yaml
+from utils.debug import debug_print, error_print, warning_print
+from utils.config_store import default_store, intern_config, NF_CONFIG_TYPES
+from utils.topology_binary import read_binary, is_binary_topology
+
+# Directory of main.py; relative config paths of topologies are relative to it
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORT_BASE_DIR = os.path.join(PROJECT_ROOT, "export", "mininet")
+EXPORT_DIR_PREFIX = "netflux5g_export_"
+MININET_SCRIPT_NAME = "netflux5g_topology.py"
+CONFIGS_DIR_NAME = "5g-configs"
+
+
+def load_json_file(filename):
+    """Load a JSON topology file."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON format: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Failed to read JSON file: {str(e)}")
+
+
+def load_yaml_file(filename):
+    """Load a YAML topology file and convert it to the standard format."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            yaml_data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML format: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Failed to read YAML file: {str(e)}")
+    if is_yaml_topology_format(yaml_data):
+        return convert_yaml_to_topology_format(yaml_data)
+    return yaml_data
+
+
+def is_yaml_topology_format(yaml_data):
+    return isinstance(yaml_data, dict) and ('nodes' in yaml_data or 'components' in yaml_data)
+
+
+def convert_yaml_to_topology_format(yaml_data):
+    """Convert YAML topology data (nodes/components, links/connections) to the standard format."""
+    return {
+        "version": "1.1",
+        "type": "NetFlux5G_Topology",
+        "metadata": {
+            "converted_from": "YAML",
+            "created_date": time.ctime(),
+            "editor_version": "2.0"
+        },
+        "nodes": yaml_data.get('nodes', yaml_data.get('components', [])),
+        "links": yaml_data.get('links', yaml_data.get('connections', [])),
+        "canvas_properties": yaml_data.get('canvas_properties', {})
+    }
+
+
+def validate_topology_data(topology_data):
+    """Check the structure of topology data. Returns False if it cannot be loaded."""
+    if not isinstance(topology_data, dict):
+        error_print("ERROR: Topology data is not a dictionary")
+        return False
+
+    if 'nodes' not in topology_data and 'components' not in topology_data:
+        error_print("ERROR: No 'nodes' or 'components' section found")
+        return False
+
+    # Check for required fields in nodes
+    nodes = topology_data.get('nodes', topology_data.get('components', []))
+    for i, node in enumerate(nodes):
+        if not isinstance(node, dict):
+            error_print(f"ERROR: Node {i} is not a dictionary")
+            return False
+        for field in ('name', 'type'):
+            if field not in node:
+                warning_print(f"WARNING: Node {i} missing required field '{field}'")
+
+    debug_print("DEBUG: Topology file validation passed")
+    return True
+
+
+def intern_configs(topology_data, store=None):
+    """Import the config blobs of a topology and move embedded 5G configs into the store.
+
+    Afterwards VGcore rows hold only config_ref; the YAML is parsed when needed.
+    """
+    try:
+        store = store or default_store()
+        store.import_blobs(topology_data.get('config_blobs'))
+        for node in topology_data.get('nodes', []):
+            if not isinstance(node, dict) or node.get('type') != 'VGcore':
+                continue
+            properties = node.get('properties', {})
+            for nf_type in NF_CONFIG_TYPES:
+                rows = properties.get(f"{nf_type}_configs")
+                if isinstance(rows, list):
+                    for row in rows:
+                        if isinstance(row, dict) and row.get('config_content'):
+                            intern_config(row, store)
+    except Exception as e:
+        # Rows that were not interned keep their embedded content
+        warning_print(f"WARNING: Failed to store 5G configurations: {e}")
+
+
+def read_topology_file(filename, template_updater=None, lazy=True, store_configs=True):
+    """Read, validate and intern a .nf5g, .nf5gb, JSON or YAML topology file.
+
+    Heavy properties of binary files stay compressed until used if lazy.
+    template_updater (utils/template_updater.py) fixes the config paths of
+    templates shipped with the editor in memory. With store_configs=False
+    nothing is written: embedded 5G configs stay in their rows instead of
+    going into the config store. Raises ValueError if the file is not a
+    topology.
+    """
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext in ['.yaml', '.yml']:
+        topology_data = load_yaml_file(filename)
+    elif is_binary_topology(filename):
+        topology_data = read_binary(filename, lazy=lazy)
+    else:
+        topology_data = load_json_file(filename)
+
+    if not validate_topology_data(topology_data):
+        raise ValueError("Invalid topology file format")
+
+    if template_updater is not None and template_updater.needs_config_paths(filename):
+        template_updater.apply_config_paths(topology_data)
+
+    if store_configs:
+        intern_configs(topology_data)
+    return topology_data
+
+
+def resolve_config_file_paths(properties):
+    """Make the relative config file paths of a VGcore's rows absolute (relative to PROJECT_ROOT)."""
+    try:
+        for nf_type in NF_CONFIG_TYPES:
+            configs = properties.get(f"{nf_type}_configs")
+            if not isinstance(configs, list):
+                continue
+            for config in configs:
+                if 'config_file_path' not in config:
+                    continue
+                file_path = config['config_file_path']
+                if file_path.startswith('./'):
+                    absolute_path = os.path.join(PROJECT_ROOT, file_path[2:])
+                elif file_path and not os.path.isabs(file_path):
+                    absolute_path = os.path.join(PROJECT_ROOT, file_path)
+                else:
+                    continue
+                config['config_file_path'] = absolute_path
+                debug_print(f"DEBUG: Resolved config path: {file_path} -> {absolute_path}")
+    except Exception as e:
+        warning_print(f"WARNING: Failed to resolve config file paths: {e}")
+
+
+def create_export_dir(base_dir=EXPORT_BASE_DIR, suffix=None):
+    """Create a new timestamped export directory (netflux5g_export_<time>[_<suffix>]) and return it.
+
+    The directory is always a new one: if another export created the same
+    name within the same second, _2, _3, ... is appended.
+    """
+    name = EXPORT_DIR_PREFIX + datetime.now().strftime("%Y%m%d_%H%M%S")
+    if suffix:
+        name += f"_{suffix}"
+    export_dir = os.path.join(base_dir, name)
+    attempt = 1
+    while True:
+        try:
+            os.makedirs(export_dir, exist_ok=False)
+            break
+        except FileExistsError:
+            attempt += 1
+            export_dir = os.path.join(base_dir, f"{name}_{attempt}")
+    debug_print(f"Created working directory: {export_dir}")
+    return export_dir
+
+
+def _config_filename(nf_type, index):
+    # The first instance gets a simple name, additional ones are numbered
+    if index == 0:
+        return f"{nf_type.lower()}.yaml"
+    return f"{nf_type.lower()}_{index + 1}.yaml"
+
+
+def copy_5g_configs(nodes, export_dir, store=None):
+    """Write the config of every 5G core row of the VGcore nodes to <export_dir>/5g-configs.
+
+    A row's config comes from its config file, the config store (hardlinked,
+    not serialized again) or embedded content, in that order. Returns
+    (copied, missing): lists of dicts describing each config.
+    """
+    copied_configs = []
+    missing_configs = []
+    core5g_components = [n for n in nodes if n.get('type') == 'VGcore']
+    if not core5g_components:
+        debug_print("DEBUG: No VGCore components found, skipping config copy")
+        return copied_configs, missing_configs
+
+    store = store or default_store()
+    configs_dir = os.path.join(export_dir, CONFIGS_DIR_NAME)
+    os.makedirs(configs_dir, exist_ok=True)
+    debug_print(f"DEBUG: Created 5g-configs directory: {configs_dir}")
+
+    for component in core5g_components:
+        properties = component.get('properties', {})
+        for nf_type in NF_CONFIG_TYPES:
+            config_key = f"{nf_type}_configs"
+            config_data = properties.get(config_key)
+            if not isinstance(config_data, list):
+                if config_key not in properties:
+                    debug_print(f"DEBUG: Key {config_key} not found in properties")
+                continue
+            for i, config_item in enumerate(config_data):
+                if not isinstance(config_item, dict):
+                    continue
+                config_name = config_item.get('name', f"{nf_type.lower()}{i + 1}")
+                config_file_path = config_item.get('config_file_path') or config_item.get('config_path') or None
+                config_content = config_item.get('config_content') or None
+                config_ref = config_item.get('config_ref')
+                dest_filename = _config_filename(nf_type, i)
+                dest_path = os.path.join(configs_dir, dest_filename)
+                entry = {'component': nf_type, 'name': config_name}
+
+                if config_file_path and os.path.isfile(config_file_path):
+                    source = config_file_path
+                elif config_ref and not config_content and store.contains(config_ref):
+                    source = 'config_store'
+                elif config_content:
+                    source = 'embedded_content'
+                else:
+                    missing_configs.append(dict(entry, path='not_specified',
+                                                error='No configuration file path or content specified'))
+                    debug_print(f"DEBUG: No config found for {nf_type} component '{config_name}'")
+                    continue
+
+                try:
+                    if source == 'config_store':
+                        # Link the stored blob instead of serializing the YAML again
+                        store.link(config_ref, dest_path)
+                    elif source == 'embedded_content':
+                        with open(dest_path, 'w', encoding='utf-8') as f:
+                            if isinstance(config_content, str):
+                                f.write(config_content)
+                            else:
+                                yaml.dump(config_content, f, default_flow_style=False)
+                    else:
+                        shutil.copy2(config_file_path, dest_path)
+                except Exception as e:
+                    error_msg = f"Failed to write {source} config for {config_name}: {str(e)}"
+                    debug_print(f"DEBUG: {error_msg}")
+                    missing_configs.append(dict(entry, path=source, error=error_msg))
+                    continue
+                copied_configs.append(dict(entry, source=source, destination=dest_path, filename=dest_filename))
+                debug_print(f"DEBUG: Wrote {nf_type} config '{config_name}' from {source} to {dest_path}")
+
+    if copied_configs:
+        debug_print(f"DEBUG: Successfully copied {len(copied_configs)} configuration files:")
+        for config in copied_configs:
+            debug_print(f"  - {config['component']} '{config['name']}': {config['source']} -> {config['filename']}")
+    if missing_configs:
+        debug_print(f"DEBUG: {len(missing_configs)} configuration files could not be copied:")
+        for config in missing_configs:
+            debug_print(f"  - {config['component']} '{config['name']}': {config['error']}")
+    return copied_configs, missing_configs
@@ -0,0 +1,541 @@
+"""
+Topology Validator for NetFlux5G Editor
+
+FileManager only checks that a topology file has the right structure; a
+topology with dangling links, two hosts on the same address or a gNB whose
+PLMN its AMF does not serve loads fine and only fails once Mininet and the
+5G core are running. TopologyValidator checks the topology itself:
+
+- referential integrity: link endpoints exist, component names are unique,
+  gNBs name an AMF of the core and UEs name a gNB
+- IP collisions: the same address on two components or link ends, UE address
+  pools (SMF session subnets) overlapping each other or containing addresses
+  of components
+- slice/PLMN consistency: the MCC/MNC, TAC and S-NSSAI of gNBs are served by
+  their AMF, UEs use the PLMN and a slice of their gNB, UE APNs exist as a DNN
+  of an SMF
+- name collisions after sanitize_name(), which turns display names into the
+  Python variables and container names of the exported script
+
+Everything a check needs is extracted from a component once ("facts"); the
+extractors, property keys and patterns are compiled at import time. The
+validator keeps the facts of the records it last saw, so the editor's live
+validation (manager/validation.py) only extracts the components that changed
+between two TopologySnapshots. Address checks sort the addresses and pools
+once and sweep over them, so a validation stays in the milliseconds for
+thousands of components.
+
+The module does not need Qt; the command line (netflux5g.py) uses it too.
+"""
+
+import re
+import bisect
+import ipaddress
+from collections import namedtuple
+from collections.abc import Mapping
+from utils.debug import warning_print
+from utils.config_store import resolve_config, NF_CONFIG_TYPES
+
+ERROR = 'error'
+WARNING = 'warning'
+
+
+class Issue(namedtuple('Issue', ['severity', 'component', 'message'])):
+    """A problem of a topology; component is None for the topology as a whole."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.component}: {self.message}" if self.component else self.message
+
+
+class Address(namedtuple('Address', ['version', 'value', 'prefix'])):
+    """An IP address as an int, with the prefix length of its subnet."""
+
+    __slots__ = ()
+
+    def range(self):
+        """Return the (version, first) and (version, last) keys of the address's subnet."""
+        host_bits = (32 if self.version == 4 else 128) - self.prefix
+        first = self.value >> host_bits << host_bits
+        return (self.version, first), (self.version, first | ((1 << host_bits) - 1))
+
+    def ip(self):
+        return str(ipaddress.IPv4Address(self.value) if self.version == 4 else ipaddress.IPv6Address(self.value))
+
+    def network(self):
+        first = self.range()[0][1]
+        first = ipaddress.IPv4Address(first) if self.version == 4 else ipaddress.IPv6Address(first)
+        return f"{first}/{self.prefix}"
+
+
+_INVALID_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+_IPV4_ADDRESS = re.compile(r'(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})(?:/(\d{1,2}))?\Z')
+
+# Prefix length Mininet gives addresses without one (Node.setIP())
+DEFAULT_PREFIX = 8
+
+# Address fields of each component type, and the placeholder the exporter leaves to Mininet
+NODE_IP_FIELDS = {
+    'Host': ('Host_IPAddress',),
+    'STA': ('STA_IPAddress',),
+    'UE': ('UE_IPAddress',),
+    'DockerHost': ('DockerHost_IPAddress',),
+}
+PLACEHOLDER_IPS = frozenset(['10.0.0.1'])
+
+# Property keys and defaults (utils/configmap.py) of the PLMN and slice of gNBs and UEs
+GNB_PLMN_KEYS = (('GNB_MCC', '999'), ('GNB_MNC', '70'), ('GNB_TAC', '1'), ('GNB_SST', '1'), ('GNB_SD', '0xffffff'))
+UE_PLMN_KEYS = (('UE_MCC', '999'), ('UE_MNC', '70'), ('UE_SST', '1'), ('UE_SD', '0xffffff'))
+VGCORE_PLMN_KEYS = (('VGCore_MCC', '999'), ('VGCore_MNC', '70'), ('VGCore_TAC', '1'), ('VGCore_SST', '1'),
+                    ('VGCore_SD', '0xffffff'))
+
+# An SD of 0xffffff means "no SD" (3GPP TS 23.003)
+NO_SD = 0xffffff
+
+
+def sanitize_name(name):
+    """Convert a display name to the Python variable name used in exported scripts."""
+    clean_name = _INVALID_NAME_CHARS.sub('_', str(name))
+    # Ensure it starts with a letter or underscore
+    if clean_name and clean_name[0].isdigit():
+        clean_name = '_' + clean_name
+    return clean_name or 'node'
+
+
+def _host_key(name):
+    """Key of a host name that gNB and UE configs refer to: the exported variable name,
+    without the 'mn.' prefix of its Mininet container name (e.g. 'mn.amf1', 'mn.GNB__1')."""
+    name = str(name)
+    if name[:3].lower() == 'mn.':
+        name = name[3:]
+    return sanitize_name(name)
+
+
+def _number(value):
+    """Return value (an int or a decimal/hex string) as an int, or None."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip(), 0)
+    except ValueError:
+        try:
+            # Leading zeros ("01") are not valid base-0 literals
+            return int(str(value).strip(), 10)
+        except ValueError:
+            return None
+
+
+def _format_plmn(mcc, mnc):
+    return f"{mcc:03d}/{mnc:02d}" if isinstance(mcc, int) and isinstance(mnc, int) else f"{mcc}/{mnc}"
+
+
+def _sd(value):
+    sd = _number(value)
+    return None if sd == NO_SD else sd
+
+
+def _parse_address(value, default_prefix=DEFAULT_PREFIX):
+    """Return the Address of "a.b.c.d[/len]" (or IPv6), or None if value is empty. Raises ValueError."""
+    text = str(value).strip() if value is not None else ''
+    if not text:
+        return None
+    # ipaddress is slow; parse the usual IPv4 addresses directly
+    match = _IPV4_ADDRESS.match(text)
+    if match:
+        a, b, c, d, prefix = match.groups()
+        octets = (int(a), int(b), int(c), int(d))
+        prefix = int(prefix) if prefix is not None else min(default_prefix, 32)
+        if max(octets) > 255 or prefix > 32:
+            raise ValueError(text)
+        return Address(4, (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3], prefix)
+    interface = ipaddress.ip_interface(text)
+    prefix = interface.network.prefixlen if '/' in text else min(default_prefix, interface.max_prefixlen)
+    return Address(interface.version, int(interface.ip), prefix)
+
+
+def _items(value):
+    """Return value as a list if it is a list or tuple (frozen snapshot properties), else []."""
+    return value if isinstance(value, (list, tuple)) else []
+
+
+# Facts of one component
+
+class _Facts:
+    """What the checks need to know about one component, extracted once."""
+
+    __slots__ = ('name', 'type', 'variable', 'addresses', 'issues', 'plmn', 'amf_name', 'gnb_name', 'apn',
+                 'nfs', 'amfs', 'pools', 'dnns')
+
+    def __init__(self, name, component_type):
+        self.name = name
+        self.type = component_type
+        self.variable = sanitize_name(name)
+        self.addresses = []   # (Address, property key)
+        self.issues = []      # problems found in the component on its own
+        self.plmn = None      # gNB: (mcc, mnc, tac, sst, sd), UE: (mcc, mnc, sst, sd)
+        self.amf_name = None  # gNB: AMF host name
+        self.gnb_name = None  # UE: gNB host name
+        self.apn = None       # UE
+        self.nfs = []         # VGcore: (nf type, row name)
+        self.amfs = []        # VGcore: (row name, plmns {(mcc, mnc)}, tacs {(mcc, mnc, tac)}, slices {(sst, sd)})
+        self.pools = []       # VGcore: (Address of the subnet, SMF row name)
+        self.dnns = set()     # VGcore: DNNs of the SMF sessions
+
+
+def _node_addresses(facts, properties):
+    for key in NODE_IP_FIELDS.get(facts.type, ()):
+        value = properties.get(key)
+        if value is None or str(value).strip() in PLACEHOLDER_IPS:
+            continue
+        try:
+            address = _parse_address(value)
+        except ValueError:
+            facts.issues.append(Issue(ERROR, facts.name, f"invalid IP address '{value}' ({key})"))
+            continue
+        if address is not None:
+            facts.addresses.append((address, key))
+
+
+def _plmn(properties, keys):
+    values = [properties.get(key) or default for key, default in keys]
+    return tuple(_number(value) for value in values[:-1]) + (_sd(values[-1]),)
+
+
+def _extract_gnb(facts, properties):
+    facts.plmn = _plmn(properties, GNB_PLMN_KEYS)
+    facts.amf_name = str(properties.get('GNB_AMFHostName') or 'amf').strip()
+
+
+def _extract_ue(facts, properties):
+    facts.plmn = _plmn(properties, UE_PLMN_KEYS)
+    facts.gnb_name = str(properties.get('UE_GNBHostName') or '').strip() or None
+    facts.apn = str(properties.get('UE_APN') or 'internet').strip()
+
+
+def _plmn_id(entry):
+    plmn_id = entry.get('plmn_id') if isinstance(entry, Mapping) else None
+    if not isinstance(plmn_id, Mapping):
+        return None
+    return _number(plmn_id.get('mcc')), _number(plmn_id.get('mnc'))
+
+
+def _amf_facts(config, vgcore_plmn):
+    """Return (plmns, tacs, slices) served by an AMF config; the VGcore's PLMN if it has none."""
+    amf = config.get('amf') if isinstance(config, Mapping) else None
+    plmns, tacs, slices = set(), set(), set()
+    if isinstance(amf, Mapping):
+        for entry in _items(amf.get('plmn_support')):
+            plmn = _plmn_id(entry)
+            if plmn is None:
+                continue
+            plmns.add(plmn)
+            for s_nssai in _items(entry.get('s_nssai')):
+                if isinstance(s_nssai, Mapping):
+                    slices.add((_number(s_nssai.get('sst')), _sd(s_nssai.get('sd'))))
+        for entry in _items(amf.get('tai')):
+            plmn = _plmn_id(entry)
+            if plmn is None:
+                continue
+            tac = entry.get('tac')
+            for value in (tac if isinstance(tac, (list, tuple)) else [tac]):
+                tacs.add(plmn + (_number(value),))
+    if not plmns:
+        mcc, mnc, tac, sst, sd = vgcore_plmn
+        plmns.add((mcc, mnc))
+        tacs.add((mcc, mnc, tac))
+        slices.add((sst, sd))
+    return plmns, tacs, slices
+
+
+def _smf_facts(facts, row_name, config):
+    smf = config.get('smf') if isinstance(config, Mapping) else None
+    if not isinstance(smf, Mapping):
+        return
+    for session in _items(smf.get('session')):
+        if not isinstance(session, Mapping):
+            continue
+        if session.get('dnn'):
+            facts.dnns.add(str(session['dnn']))
+        subnet = session.get('subnet')
+        if not subnet:
+            continue
+        try:
+            facts.pools.append((_parse_address(subnet, 128), row_name))
+        except ValueError:
+            facts.issues.append(Issue(ERROR, facts.name, f"SMF '{row_name}': invalid session subnet '{subnet}'"))
+        if not session.get('dnn'):
+            # A session without a DNN serves the default APN
+            facts.dnns.add('internet')
+
+
+def _extract_vgcore(facts, properties):
+    vgcore_plmn = _plmn(properties, VGCORE_PLMN_KEYS)
+    for nf_type in NF_CONFIG_TYPES:
+        for index, row in enumerate(_items(properties.get(f"{nf_type}_configs"))):
+            if not isinstance(row, Mapping) or not str(row.get('name') or '').strip():
+                continue
+            row_name = str(row['name']).strip()
+            facts.nfs.append((nf_type, row_name))
+            if nf_type not in ('AMF', 'SMF'):
+                continue
+            try:
+                config = resolve_config(row)
+            except Exception as e:
+                warning_print(f"WARNING: Could not read the {nf_type} config of '{row_name}': {e}")
+                config = None
+            if nf_type == 'AMF':
+                facts.amfs.append((row_name,) + _amf_facts(config, vgcore_plmn))
+            else:
+                _smf_facts(facts, row_name, config)
+
+
+_EXTRACTORS = {
+    'GNB': _extract_gnb,
+    'UE': _extract_ue,
+    'VGcore': _extract_vgcore,
+}
+
+# Types whose checks read *_configs rows, which binary topologies keep in the deferred heavy chunk
+DEFERRED_PROPERTY_TYPES = frozenset(['VGcore'])
+
+
+def _node_properties(node):
+    """Return the properties of a node dict, including deferred ones of a lazily read binary topology."""
+    properties = node.get('properties')
+    loader = node.get('_deferred_properties')
+    if loader is None or node.get('type') not in DEFERRED_PROPERTY_TYPES:
+        return properties
+    # As NetworkComponent.ensurePropertiesLoaded(): values already set take precedence
+    merged = dict(loader())
+    merged.update(properties or {})
+    return merged
+
+
+def _component_facts(name, component_type, properties):
+    facts = _Facts(name, component_type)
+    if not isinstance(properties, Mapping):
+        return facts
+    _node_addresses(facts, properties)
+    extractor = _EXTRACTORS.get(component_type)
+    if extractor is not None:
+        extractor(facts, properties)
+    return facts
+
+
+# Checks over all components
+
+def _check_names(facts_list, issues):
+    names = set()
+    variables = {}  # sanitized name -> display name
+    for facts in facts_list:
+        if facts.name in names:
+            issues.append(Issue(ERROR, facts.name, "duplicate component name"))
+            continue
+        names.add(facts.name)
+        # The VGcore itself is not a node of the exported network; its NFs are
+        candidates = [(facts.variable, facts.name)] if facts.type != 'VGcore' else []
+        candidates += [(sanitize_name(row), f"{nf_type} '{row}' of {facts.name}") for nf_type, row in facts.nfs]
+        for variable, label in candidates:
+            other = variables.setdefault(variable, label)
+            if other != label:
+                issues.append(Issue(ERROR, facts.name,
+                                    f"{label} and {other} are both exported as '{variable}'"))
+    return names
+
+
+def _link_endpoints(link):
+    if isinstance(link, Mapping):
+        return link.get('name'), link.get('source'), link.get('destination'), link.get('properties')
+    # LinkRecord of a TopologySnapshot
+    return link.name, link.source, link.destination, link.properties
+
+
+def _check_links(links, names, addresses, issues):
+    for index, link in enumerate(links):
+        link_name, source, destination, properties = _link_endpoints(link)
+        label = f"link {link_name or index + 1}"
+        for end, node in (('source', source), ('destination', destination)):
+            if node not in names:
+                issues.append(Issue(ERROR, label, f"unknown {end} '{node}'"))
+        if source is not None and source == destination:
+            issues.append(Issue(WARNING, label, f"connects '{source}' to itself"))
+        if not isinstance(properties, Mapping) or not properties.get('enable_ip'):
+            continue
+        ends = []
+        for key, node in (('source_ip', source), ('dest_ip', destination)):
+            try:
+                address = _parse_address(properties.get(key))
+            except ValueError:
+                issues.append(Issue(ERROR, label, f"invalid {key.replace('_', ' ')} '{properties.get(key)}'"))
+                continue
+            if address is not None:
+                ends.append(address)
+                addresses.append((address, node, f"{label} ({key.split('_')[0]} end)"))
+        if len(ends) == 2 and ends[0].range() != ends[1].range():
+            issues.append(Issue(WARNING, label, f"ends are in different subnets "
+                                                f"({ends[0].network()}, {ends[1].network()})"))
+
+
+def _check_addresses(addresses, pools, issues):
+    """Report addresses used twice, overlapping pools and addresses inside pools.
+
+    addresses: (Address, component, label); pools: (Address, component, label).
+    """
+    keyed = sorted(((address.version, address.value), component, label, address)
+                   for address, component, label in addresses)
+    for (key, component, label, address), previous in zip(keyed[1:], keyed):
+        if key == previous[0]:
+            issues.append(Issue(ERROR, component, f"{label} uses {address.ip()}, "
+                                                  f"already used by {previous[1]} ({previous[2]})"))
+
+    # Sweep over the pools sorted by start; a pool overlaps the open pool reaching furthest
+    intervals = sorted(pool.range() + (pool, component, label) for pool, component, label in pools)
+    reach = None
+    for start, end, pool, component, label in intervals:
+        if reach is not None and start <= reach[0]:
+            issues.append(Issue(WARNING, component, f"UE pool {pool.network()} of {label} overlaps "
+                                                    f"{reach[1].network()} of {reach[3]} ({reach[2]})"))
+        if reach is None or end > reach[0]:
+            reach = (end, pool, component, label)
+
+    # Addresses inside pools: binary search in the sorted addresses
+    keys = [entry[0] for entry in keyed]
+    for start, end, pool, component, label in intervals:
+        for key, owner, owner_label, address in keyed[bisect.bisect_left(keys, start):bisect.bisect_right(keys, end)]:
+            issues.append(Issue(WARNING, owner, f"{owner_label} {address.ip()} is inside UE pool "
+                                                f"{pool.network()} of {label} ({component})"))
+
+
+def _check_5g(facts_list, issues):
+    gnbs = [facts for facts in facts_list if facts.type == 'GNB']
+    ues = [facts for facts in facts_list if facts.type == 'UE']
+    cores = [facts for facts in facts_list if facts.type == 'VGcore']
+    if not gnbs and not ues:
+        return
+
+    amfs = {}  # _host_key() of the AMF name -> (plmns, tacs, slices)
+    dnns = set()
+    for core in cores:
+        for row_name, plmns, tacs, slices in core.amfs:
+            amfs[_host_key(row_name)] = (plmns, tacs, slices)
+        dnns |= core.dnns
+    if gnbs and not amfs:
+        issues.append(Issue(ERROR, None, "gNBs need a 5G core (VGcore) with an AMF"))
+
+    gnb_by_host = {}
+    for gnb in gnbs:
+        gnb_by_host[_host_key(gnb.name)] = gnb
+        mcc, mnc, tac, sst, sd = gnb.plmn
+        served = amfs.get(_host_key(gnb.amf_name))
+        if served is None:
+            if amfs:
+                issues.append(Issue(ERROR, gnb.name, f"AMF '{gnb.amf_name}' is not an AMF of the 5G core "
+                                                     f"(AMFs: {', '.join(sorted(amfs))})"))
+            continue
+        plmns, tacs, slices = served
+        if (mcc, mnc) not in plmns:
+            issues.append(Issue(ERROR, gnb.name, f"PLMN {_format_plmn(mcc, mnc)} is not served by AMF '{gnb.amf_name}'"))
+        elif (mcc, mnc, tac) not in tacs:
+            issues.append(Issue(WARNING, gnb.name, f"TAC {tac} is not in the tracking areas of AMF '{gnb.amf_name}'"))
+        if not any(sst == s and (sd is None or s_sd is None or sd == s_sd) for s, s_sd in slices):
+            issues.append(Issue(ERROR, gnb.name, f"slice SST {sst} is not supported by AMF '{gnb.amf_name}'"))
+
+    for ue in ues:
+        mcc, mnc, sst, sd = ue.plmn
+        gnb = gnb_by_host.get(_host_key(ue.gnb_name)) if ue.gnb_name else None
+        if gnb is None:
+            if ue.gnb_name and gnbs:
+                issues.append(Issue(WARNING, ue.name, f"gNB '{ue.gnb_name}' is not a gNB of the topology"))
+        else:
+            if (mcc, mnc) != gnb.plmn[:2]:
+                issues.append(Issue(ERROR, ue.name, f"PLMN {_format_plmn(mcc, mnc)} differs from {_format_plmn(*gnb.plmn[:2])} "
+                                                    f"of gNB {gnb.name}"))
+            if sst != gnb.plmn[3] or (sd is not None and gnb.plmn[4] is not None and sd != gnb.plmn[4]):
+                issues.append(Issue(ERROR, ue.name, f"slice SST {sst} is not the slice of gNB {gnb.name}"))
+        if dnns and ue.apn not in dnns:
+            issues.append(Issue(WARNING, ue.name, f"APN '{ue.apn}' is not a DNN of any SMF "
+                                                  f"({', '.join(sorted(dnns))})"))
+
+
+class TopologyValidator:
+    """Checks topologies; keeps the facts of the last validated components for the next run."""
+
+    def __init__(self):
+        self._facts = {}  # id(component) -> (component, facts)
+
+    def _factsOf(self, component):
+        cached = self._facts.get(id(component))
+        if cached is not None and cached[0] is component:
+            return cached[1]
+        if isinstance(component, Mapping):
+            facts = _component_facts(component.get('name'), component.get('type'), _node_properties(component))
+        else:
+            # ComponentRecord of a TopologySnapshot
+            facts = _component_facts(component.name, component.type, component.properties)
+        return facts
+
+    def validate(self, components, links):
+        """Return the Issues of a topology, errors first.
+
+        components and links are topology file dicts or the records of a
+        TopologySnapshot. Snapshot records are immutable and shared between
+        snapshots, so their facts are reused when the next snapshot still
+        holds the same record; dicts may be changed in place and are always
+        extracted again.
+        """
+        facts_list = []
+        cache = {}
+        for component in components:
+            facts = self._factsOf(component)
+            facts_list.append(facts)
+            if not isinstance(component, Mapping):
+                cache[id(component)] = (component, facts)
+        self._facts = cache
+
+        issues = []
+        for facts in facts_list:
+            issues.extend(facts.issues)
+        if not facts_list:
+            issues.append(Issue(ERROR, None, "no components"))
+        names = _check_names(facts_list, issues)
+
+        addresses = [(address, facts.name, key) for facts in facts_list for address, key in facts.addresses]
+        _check_links(links, names, addresses, issues)
+        pools = [(pool, facts.name, f"SMF '{row_name}'") for facts in facts_list for pool, row_name in facts.pools]
+        _check_addresses(addresses, pools, issues)
+        _check_5g(facts_list, issues)
+
+        issues.sort(key=lambda issue: issue.severity != ERROR)
+        return issues
+
+
+def validate_topology(topology_data):
+    """Return the Issues of topology data read from a file."""
+    nodes = topology_data.get('nodes', topology_data.get('components', []))
+    links = topology_data.get('links', topology_data.get('connections', []))
+    return TopologyValidator().validate([node for node in nodes if isinstance(node, Mapping)],
+                                        [link for link in links if isinstance(link, Mapping)])
+
+
+def errors(issues):
+    """Return the issues that are errors."""
+    return [issue for issue in issues if issue.severity == ERROR]
+
+
+def summarize(issues, limit=3):
+    """Return a one-line description of issues for a status bar."""
+    if not issues:
+        return "no problems"
+    error_count = len(errors(issues))
+    counts = []
+    if error_count:
+        counts.append(f"{error_count} error{'s' if error_count != 1 else ''}")
+    if len(issues) > error_count:
+        warning_count = len(issues) - error_count
+        counts.append(f"{warning_count} warning{'s' if warning_count != 1 else ''}")
+    shown = "; ".join(str(issue) for issue in issues[:limit])
+    more = f"; ... ({len(issues) - limit} more)" if len(issues) > limit else ""
+    return f"{', '.join(counts)}: {shown}{more}"
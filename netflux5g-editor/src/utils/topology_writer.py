@@ -0,0 +1,77 @@
+"""
+Topology File Writer for NetFlux5G Editor
+
+Streams a .nf5g topology to disk. Nodes and links are passed as already
+serialized JSON fragments, so callers can keep the fragment of every item and
+only re-encode the items that changed since the last save. Fragments are
+produced by the C-accelerated json encoder (one item per line); json.dump with
+indent=2 falls back to the much slower pure-Python encoder.
+
+The file is written to a temporary file in the target directory and moved
+over the target with os.replace(), so a crash or a full disk never leaves a
+truncated topology behind.
+"""
+
+import os
+import json
+import tempfile
+from utils.debug import debug_print
+
+_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def encode(value):
+    """Serialize a value to a single-line JSON fragment."""
+    return _encoder.encode(value)
+
+
+def _write_array(f, key, fragments, last):
+    f.write(f'  {encode(key)}: [')
+    first = True
+    for fragment in fragments:
+        f.write('\n    ' if first else ',\n    ')
+        f.write(fragment)
+        first = False
+    f.write('\n  ]' if not first else ']')
+    f.write('\n' if last else ',\n')
+
+
+def write_topology(path, header, node_fragments, link_fragments, trailer=None):
+    """Atomically write a topology file.
+
+    header and trailer are dicts of top-level keys written before the nodes
+    and after the links; node_fragments and link_fragments are iterables of
+    JSON strings (see encode()). Returns the number of bytes written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write('{\n')
+            for key, value in header.items():
+                f.write(f'  {encode(key)}: {encode(value)},\n')
+            _write_array(f, "nodes", node_fragments, False)
+            _write_array(f, "links", link_fragments, not trailer)
+            items = list((trailer or {}).items())
+            for i, (key, value) in enumerate(items):
+                f.write(f'  {encode(key)}: {encode(value)}')
+                f.write('\n' if i == len(items) - 1 else ',\n')
+            f.write('}\n')
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        # Keep the permissions of the file being replaced
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    debug_print(f"DEBUG: Wrote {size} bytes to {path}")
+    return size